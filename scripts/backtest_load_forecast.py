@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Offline backtest for adaptive throttling load forecasters.
+
+Replays recorded throttling metrics (the JSON returned by
+/api/throttling/metrics, JSON lines of ThrottlingMetrics.to_dict(), or CSV
+with timestamp, cpu_usage and memory_usage columns) through the linear
+LoadPredictor and the seasonal HoltWintersPredictor, and reports
+walk-forward forecast error at the chosen horizon. Without a metrics file a
+synthetic daily-cycle series is generated. --grid searches the Holt-Winters
+smoothing factors to pick values for a deployment.
+
+Usage:
+    python scripts/backtest_load_forecast.py
+    python scripts/backtest_load_forecast.py metrics.json --season-length 720 --horizon-steps 6
+    python scripts/backtest_load_forecast.py metrics.csv --season-length 288 --grid
+"""
+
+import argparse
+import itertools
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.utils.adaptive_throttling import (
+    HoltWintersPredictor, LoadPredictor, backtest_predictor, load_recorded_metrics
+)
+
+
+def synthetic_series(season_length: int, seasons: int, interval: float, seed: int):
+    """Daily-style load cycle with a slow trend, a sharp peak and noise"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    samples = []
+    for i in range(season_length * seasons):
+        phase = 2 * math.pi * (i % season_length) / season_length
+        load = 40 + 20 * math.sin(phase) + 15 * max(0.0, math.sin(2 * phase)) ** 4 + i * 0.002
+        samples.append((start + timedelta(seconds=i * interval), load + rng.gauss(0, 2)))
+    return samples
+
+
+def report(label: str, result: dict):
+    print(f"{label:<36} {result['mae']:8.2f} {result['rmse']:8.2f} "
+          f"{result['mape']:7.1f}% {result['bias']:+8.2f}  ({result['forecasts']} forecasts)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest load forecasters over recorded metrics")
+    parser.add_argument('metrics', nargs='?', help="Recorded metrics file (.json, .jsonl or .csv)")
+    parser.add_argument('--season-length', type=int, default=288, help="Samples per season")
+    parser.add_argument('--horizon-steps', type=int, default=6, help="Forecast horizon in samples")
+    parser.add_argument('--warmup', type=int, help="Unscored samples (default: two seasons)")
+    parser.add_argument('--seasons', type=int, default=6, help="Synthetic seasons when no file is given")
+    parser.add_argument('--interval', type=float, default=5.0, help="Synthetic sample interval in seconds")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--grid', action='store_true', help="Search Holt-Winters alpha/beta/gamma")
+    args = parser.parse_args()
+
+    if args.metrics:
+        samples = load_recorded_metrics(args.metrics)
+        source = args.metrics
+    else:
+        samples = synthetic_series(args.season_length, args.seasons, args.interval, args.seed)
+        source = "synthetic"
+    warmup = args.warmup if args.warmup is not None else 2 * args.season_length
+    if len(samples) <= warmup + args.horizon_steps:
+        parser.error(f"{len(samples)} samples is too few for warmup {warmup} "
+                     f"and horizon {args.horizon_steps}")
+
+    print(f"{len(samples)} samples from {source}, season {args.season_length}, "
+          f"horizon {args.horizon_steps} samples, warmup {warmup}")
+    print(f"{'predictor':<36} {'MAE':>8} {'RMSE':>8} {'MAPE':>8} {'bias':>8}")
+
+    report("linear (LoadPredictor)", backtest_predictor(
+        LoadPredictor(), samples, args.horizon_steps, warmup))
+    report("holt-winters (defaults)", backtest_predictor(
+        HoltWintersPredictor(season_length=args.season_length), samples, args.horizon_steps, warmup))
+
+    if args.grid:
+        results = []
+        for alpha, beta, gamma in itertools.product((0.1, 0.3, 0.5), (0.01, 0.05, 0.1), (0.1, 0.3, 0.5)):
+            predictor = HoltWintersPredictor(args.season_length, alpha=alpha, beta=beta, gamma=gamma)
+            results.append(((alpha, beta, gamma),
+                            backtest_predictor(predictor, samples, args.horizon_steps, warmup)))
+        results.sort(key=lambda item: item[1]['mae'])
+        for (alpha, beta, gamma), result in results[:5]:
+            report(f"holt-winters a={alpha} b={beta} g={gamma}", result)
+
+
+if __name__ == '__main__':
+    main()
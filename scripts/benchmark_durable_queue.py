@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the durable SQLite queue.
+
+Compares enqueue and dequeue+ack throughput of SQLiteDurableQueue with the
+in-memory PriorityScheduler used by RequestQueueManager. Durable enqueues are
+measured waiting for each commit from one thread, from several producer
+threads (which share group commits), and in batches via enqueue_many.
+
+Usage:
+    python scripts/benchmark_durable_queue.py
+    python scripts/benchmark_durable_queue.py --items 50000 --threads 16 --batch 500
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.utils.durable_queue import SQLiteDurableQueue
+from swarm_director.utils.request_queue import PriorityScheduler, QueuedRequest, QueuePriority, RequestType
+
+PAYLOAD = {'request_type': 'api_call', 'client_id': 'bench', 'flask_request_data': {'path': '/task'}}
+
+
+def report(label: str, items: int, seconds: float):
+    """Print items per second for one run"""
+    print(f"{label:<40} {items:>8} items  {seconds:8.3f}s  {items / seconds:>12,.0f} items/s")
+
+
+def bench_in_memory(items: int):
+    scheduler = PriorityScheduler()
+    requests = [QueuedRequest(request_id=str(i), request_type=RequestType.API_CALL,
+                              priority=QueuePriority.NORMAL, flask_request_data=PAYLOAD, client_id='bench')
+                for i in range(items)]
+
+    start = time.perf_counter()
+    for request in requests:
+        scheduler.push(request)
+    report("in-memory push", items, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    while scheduler.pop_nowait() is not None:
+        pass
+    report("in-memory pop", items, time.perf_counter() - start)
+
+
+def bench_durable(path: str, items: int, threads: int, batch: int):
+    durable = SQLiteDurableQueue(path)
+    try:
+        start = time.perf_counter()
+        for _ in range(items):
+            durable.enqueue(PAYLOAD)
+        report("durable enqueue (1 thread, per commit)", items, time.perf_counter() - start)
+
+        per_thread = items // threads
+
+        def produce():
+            futures = [durable.put(PAYLOAD) for _ in range(per_thread)]
+            for future in futures:
+                future.result()
+
+        workers = [threading.Thread(target=produce) for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        report(f"durable put ({threads} threads, group commit)", per_thread * threads,
+               time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, items, batch):
+            durable.enqueue_many([PAYLOAD] * min(batch, items - offset))
+        report(f"durable enqueue_many (batch {batch})", items, time.perf_counter() - start)
+
+        total = durable.qsize()
+        start = time.perf_counter()
+        drained = 0
+        while True:
+            leased = durable.dequeue(max_items=batch)
+            if not leased:
+                break
+            durable.ack_many(leased).result()
+            drained += len(leased)
+        report(f"durable dequeue+ack (batch {batch})", drained, time.perf_counter() - start)
+        assert drained == total
+        print(f"commits: {durable.get_stats()['commits']}")
+    finally:
+        durable.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark durable vs in-memory request queues")
+    parser.add_argument("--items", type=int, default=20000, help="Items per run")
+    parser.add_argument("--threads", type=int, default=8, help="Producer threads for the group-commit run")
+    parser.add_argument("--batch", type=int, default=200, help="Batch size for enqueue_many and dequeue")
+    args = parser.parse_args()
+
+    bench_in_memory(args.items)
+    with tempfile.TemporaryDirectory() as directory:
+        bench_durable(str(Path(directory) / "bench.db"), args.items, args.threads, args.batch)
+
+
+if __name__ == "__main__":
+    main()
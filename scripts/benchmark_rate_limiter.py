@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the API rate limiter key table.
+
+Drives the previous sliding-log limiter (a deque of timestamps per key
+under one global RLock) and the GCRA RateLimiter (one timestamp per key in
+lock-striped LRU shards) with the same random workload: many threads
+checking limits for keys drawn from a large key space. Reports throughput,
+per-call latency percentiles, memory held by the key table, and the GCRA
+limiter's shard contention counters.
+
+Usage:
+    python scripts/benchmark_rate_limiter.py
+    python scripts/benchmark_rate_limiter.py --keys 100000 --threads 32 --calls 20000 --shards 64
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.utils.rate_limiter import RateLimiter
+
+
+class SlidingLogRateLimiter:
+    """The previous RateLimiter.is_allowed, kept here as the baseline"""
+
+    def __init__(self):
+        self._requests = defaultdict(deque)
+        self._lock = threading.RLock()
+
+    def is_allowed(self, key, limit, window):
+        current_time = time.time()
+        with self._lock:
+            requests = self._requests[key]
+            cutoff_time = current_time - window
+            while requests and requests[0] < cutoff_time:
+                requests.popleft()
+            current_count = len(requests)
+            is_allowed = current_count < limit
+            if is_allowed:
+                requests.append(current_time)
+            return is_allowed, {
+                'limit': limit,
+                'remaining': max(0, limit - current_count - (1 if is_allowed else 0)),
+                'reset': int(cutoff_time + window),
+                'retry_after': int(window - (current_time - requests[0])) if requests else 0
+            }
+
+
+def table_memory(factory, keys: int, requests_per_key: int, limit: int, window: int) -> int:
+    """Bytes retained by a limiter after requests_per_key checks on each key"""
+    tracemalloc.start()
+    limiter = factory()
+    for _ in range(requests_per_key):
+        for key in range(keys):
+            limiter.is_allowed(f"ip:{key}", limit, window)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del limiter
+    return size
+
+
+def run(limiter, args):
+    """Hammer the limiter from args.threads threads; returns (seconds, latencies)"""
+    barrier = threading.Barrier(args.threads + 1)
+    latencies = [[] for _ in range(args.threads)]
+
+    def worker(index):
+        rng = random.Random(index)
+        keys = [f"ip:{rng.randrange(args.keys)}" for _ in range(args.calls)]
+        samples = latencies[index]
+        barrier.wait()
+        for key in keys:
+            started = time.perf_counter()
+            limiter.is_allowed(key, args.limit, args.window)
+            samples.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return elapsed, sorted(sample for samples in latencies for sample in samples)
+
+
+def report(label, elapsed, latencies, memory, keys):
+    calls = len(latencies)
+    p50 = latencies[calls // 2] * 1e6
+    p99 = latencies[int(calls * 0.99)] * 1e6
+    print(f"{label:<12} {calls / elapsed:>12,.0f} calls/s  p50 {p50:7.1f}us  p99 {p99:8.1f}us  "
+          f"table {memory / 1e6:7.1f} MB ({memory / keys:6.0f} B/key)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter key tables")
+    parser.add_argument('--keys', type=int, default=100000, help="Distinct keys")
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=20000, help="Checks per thread")
+    parser.add_argument('--shards', type=int, default=64)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--window', type=int, default=3600)
+    parser.add_argument('--requests-per-key', type=int, default=20,
+                        help="Checks per key when measuring table memory")
+    args = parser.parse_args()
+
+    def gcra():
+        # Headroom so uneven hashing across shards does not evict live keys
+        return RateLimiter(max_keys=args.keys * 2, num_shards=args.shards)
+
+    print(f"{args.keys:,} keys, {args.threads} threads x {args.calls:,} checks, "
+          f"limit {args.limit}/{args.window}s, {args.shards} shards")
+
+    baseline_memory = table_memory(SlidingLogRateLimiter, args.keys, args.requests_per_key,
+                                   args.limit, args.window)
+    elapsed, latencies = run(SlidingLogRateLimiter(), args)
+    report("sliding-log", elapsed, latencies, baseline_memory, args.keys)
+
+    gcra_memory = table_memory(gcra, args.keys, args.requests_per_key, args.limit, args.window)
+    limiter = gcra()
+    elapsed, latencies = run(limiter, args)
+    report("gcra", elapsed, latencies, gcra_memory, args.keys)
+
+    stats = limiter.get_stats()
+    print(f"gcra shards: {stats['keys']:,} keys held, {stats['evicted']:,} evicted, "
+          f"{stats['contended']:,}/{stats['acquisitions']:,} lock acquisitions contended "
+          f"({stats['contention_ratio']:.2%}), {stats['lock_wait_seconds'] * 1e3:.1f} ms waiting")
+
+
+if __name__ == '__main__':
+    main()
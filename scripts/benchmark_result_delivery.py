@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Wait-overhead benchmark for AsyncProcessor.get_task_result.
+
+Measures the time between a task finishing and its waiter returning. The
+"before" run reproduces the legacy wait loop, which checked the completed
+task table every 100ms; the "after" run uses the completion handle attached
+to every task.
+
+Usage:
+    python scripts/benchmark_result_delivery.py
+    python scripts/benchmark_result_delivery.py --tasks 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.utils.async_processor import AsyncProcessor, AsyncProcessorConfig
+
+
+async def legacy_get_task_result(processor: AsyncProcessor, task_id: str) -> object:
+    """The pre-completion-handle wait loop: poll the completed table every 100ms"""
+    while True:
+        with processor._lock:
+            task = processor.completed_tasks.get(task_id)
+        if task is not None:
+            if task.error:
+                raise task.error
+            return task.result
+        await asyncio.sleep(0.1)
+
+
+async def run_benchmark(tasks: int, concurrency: int, legacy: bool) -> list:
+    """Run the benchmark and return per-task wait overhead in milliseconds"""
+    processor = AsyncProcessor(AsyncProcessorConfig(
+        max_concurrent_tasks=concurrency, max_queue_size=tasks * 2,
+        enable_metrics=False, enable_resource_monitoring=False
+    ))
+    await processor.start()
+    finished_at = {}
+    overheads = []
+
+    async def work(index: int):
+        # Random durations so completions do not line up with the poll interval
+        await asyncio.sleep(random.uniform(0.001, 0.05))
+        finished_at[index] = time.perf_counter()
+        return index
+
+    async def wait_one(index: int):
+        task_id = await processor.submit_task(work, index)
+        if legacy:
+            await legacy_get_task_result(processor, task_id)
+        else:
+            await processor.get_task_result(task_id, timeout=30)
+        overheads.append((time.perf_counter() - finished_at[index]) * 1000)
+
+    try:
+        for start in range(0, tasks, concurrency):
+            await asyncio.gather(*(wait_one(i) for i in range(start, min(tasks, start + concurrency))))
+    finally:
+        await processor.stop()
+
+    return overheads
+
+
+def summarize(label: str, overheads: list):
+    """Print wait-overhead percentiles for one run"""
+    ordered = sorted(overheads)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(ordered):8.3f}ms  "
+          f"p50={statistics.median(ordered):8.3f}ms  p95={p95:8.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task result wait overhead")
+    parser.add_argument('--tasks', type=int, default=200, help='Tasks per run')
+    parser.add_argument('--concurrency', type=int, default=20, help='Tasks in flight at once')
+    args = parser.parse_args()
+
+    before = asyncio.run(run_benchmark(args.tasks, args.concurrency, legacy=True))
+    after = asyncio.run(run_benchmark(args.tasks, args.concurrency, legacy=False))
+
+    print(f"Result wait overhead over {args.tasks} tasks ({args.concurrency} in flight)")
+    summarize("before (100ms polling)", before)
+    summarize("after (completion handle)", after)
+    print(f"p50 reduction: {statistics.median(before) / max(statistics.median(after), 1e-6):.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the POST /task endpoint.
+
+Compares the legacy behaviour of constructing a DirectorAgent on every request
+(simulated by invalidating the director registry before each call) with the
+shared, pre-warmed director served by the registry.
+
+Usage:
+    python scripts/benchmark_task_endpoint.py
+    python scripts/benchmark_task_endpoint.py --requests 500
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.app import create_app
+from swarm_director.models.base import db
+from swarm_director.agents.director_registry import get_director_registry
+
+PAYLOAD = {
+    'type': 'analysis',
+    'title': 'Analyze weekly metrics',
+    'description': 'Review and evaluate performance statistics for the team'
+}
+
+
+def run_benchmark(requests: int, per_request_director: bool) -> list:
+    """Run the benchmark and return per-request latencies in milliseconds"""
+    app = create_app('testing')
+    latencies = []
+
+    with app.app_context():
+        db.create_all()
+        registry = get_director_registry(app)
+        registry.warm()
+        client = app.test_client()
+
+        for i in range(requests):
+            if per_request_director:
+                registry.invalidate()
+
+            start = time.perf_counter()
+            # Spread requests across client addresses so rate limiting stays out of the way
+            response = client.post('/task', data=json.dumps(PAYLOAD),
+                                   content_type='application/json',
+                                   headers={'X-Forwarded-For': f'10.0.{i // 250}.{i % 250}'})
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            if response.status_code >= 400:
+                raise RuntimeError(f"/task returned {response.status_code}: {response.get_data(as_text=True)}")
+
+        registry.shutdown()
+        db.drop_all()
+
+    return latencies
+
+
+def summarize(label: str, latencies: list):
+    """Print latency percentiles for one run"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(ordered):8.2f}ms  "
+          f"p50={statistics.median(ordered):8.2f}ms  p95={p95:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /task latency")
+    parser.add_argument('--requests', type=int, default=200, help='Requests per run')
+    args = parser.parse_args()
+
+    before = run_benchmark(args.requests, per_request_director=True)
+    after = run_benchmark(args.requests, per_request_director=False)
+
+    print(f"/task latency over {args.requests} requests")
+    summarize("before (director per call)", before)
+    summarize("after (shared director)", after)
+    print(f"p50 speedup: {statistics.median(before) / statistics.median(after):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
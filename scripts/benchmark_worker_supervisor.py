@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for process-group worker processes.
+
+Runs a CPU-bound handler over the same batch of request records with a
+thread pool (one interpreter, bound by the GIL) and with WorkerSupervisor at
+1..N worker processes, and reports throughput and speedup over one worker.
+Near-linear speedup is expected up to the number of physical cores.
+
+Usage:
+    python scripts/benchmark_worker_supervisor.py
+    python scripts/benchmark_worker_supervisor.py --requests 400 --work 200000 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from swarm_director.utils.worker_supervisor import WorkerSupervisor
+
+
+def burn_cpu(record):
+    """Handler: pure-Python CPU work proportional to record['work']"""
+    total = 0
+    for i in range(record['work']):
+        total += i * i % 7
+    return total
+
+
+def report(label: str, requests: int, seconds: float, baseline: float):
+    rate = requests / seconds
+    print(f"{label:<24} {seconds:8.3f}s  {rate:>10,.1f} req/s  {rate / baseline:5.2f}x")
+    return rate
+
+
+def run_threads(records, threads: int) -> float:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(burn_cpu, records))
+        return time.perf_counter() - start
+
+
+def run_processes(records, workers: int) -> float:
+    supervisor = WorkerSupervisor('bench', 'benchmark_worker_supervisor:burn_cpu', worker_count=workers)
+    supervisor.start()
+    try:
+        # Warm up so process start-up is not measured
+        for future in [supervisor.submit(f'warm-{i}', {'work': 1}) for i in range(workers * 2)]:
+            future.result()
+        start = time.perf_counter()
+        futures = [supervisor.submit(str(i), record) for i, record in enumerate(records)]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - start
+    finally:
+        supervisor.stop()
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark worker process scaling")
+    parser.add_argument("--requests", type=int, default=200, help="Request records per run")
+    parser.add_argument("--work", type=int, default=100000, help="Loop iterations per request")
+    parser.add_argument("--max-workers", type=int, default=cpu_count, help="Largest worker count to try")
+    args = parser.parse_args()
+
+    records = [{'work': args.work} for _ in range(args.requests)]
+    print(f"cpu_count={cpu_count} requests={args.requests} work={args.work}")
+
+    single = run_processes(records, 1)
+    baseline = report("1 process", args.requests, single, args.requests / single)
+    report(f"{args.max_workers} threads (GIL)", args.requests, run_threads(records, args.max_workers), baseline)
+
+    workers = 2
+    while workers <= args.max_workers:
+        report(f"{workers} processes", args.requests, run_processes(records, workers), baseline)
+        workers *= 2
+    if args.max_workers > 1 and args.max_workers & (args.max_workers - 1):
+        report(f"{args.max_workers} processes", args.requests, run_processes(records, args.max_workers), baseline)
+
+
+if __name__ == "__main__":
+    main()
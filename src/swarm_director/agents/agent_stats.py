@@ -0,0 +1,164 @@
+"""
+Live agent performance statistics for SwarmDirector routing
+Tracks in-flight work, EWMA latency and success rate, and a window of recent
+latencies per agent so routing can pick lightly loaded, fast agents and
+report execution time estimates from observed behaviour.
+"""
+
+import math
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Any
+
+
+@dataclass
+class AgentStats:
+    """Rolling statistics for one agent"""
+    in_flight: int = 0
+    completed: int = 0
+    failures: int = 0
+    ewma_latency: Optional[float] = None
+    ewma_success: float = 1.0
+    latencies: Deque[float] = field(default_factory=deque)
+
+
+class AgentStatsTracker:
+    """
+    Thread-safe per-agent load and latency tracker.
+
+    Callers bracket each execution with begin/end. Latency and success are
+    smoothed with an exponentially weighted moving average, and the most
+    recent `window` latencies are kept for percentile estimates. Agents
+    without a latency sample are costed at the mean latency of observed
+    agents, or prior_latency before anything has been observed.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 512, rng: Optional[random.Random] = None,
+                 prior_latency: float = 1.0):
+        self.alpha = alpha
+        self.window = window
+        self.prior_latency = prior_latency
+        self._rng = rng or random.Random()
+        self._stats: Dict[str, AgentStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, agent: str) -> AgentStats:
+        stats = self._stats.get(agent)
+        if stats is None:
+            stats = AgentStats(latencies=deque(maxlen=self.window))
+            self._stats[agent] = stats
+        return stats
+
+    def begin(self, agent: str):
+        """Mark an execution as started on an agent"""
+        with self._lock:
+            self._get(agent).in_flight += 1
+
+    def end(self, agent: str, seconds: float, success: bool):
+        """Mark an execution started with begin as finished"""
+        with self._lock:
+            stats = self._get(agent)
+            stats.in_flight = max(0, stats.in_flight - 1)
+            self._record_locked(stats, seconds, success)
+
+    def record(self, agent: str, seconds: float, success: bool = True):
+        """Record a completed execution without in-flight accounting"""
+        with self._lock:
+            self._record_locked(self._get(agent), seconds, success)
+
+    def _record_locked(self, stats: AgentStats, seconds: float, success: bool):
+        stats.completed += 1
+        if not success:
+            stats.failures += 1
+        stats.latencies.append(seconds)
+        if stats.ewma_latency is None:
+            stats.ewma_latency = seconds
+        else:
+            stats.ewma_latency += self.alpha * (seconds - stats.ewma_latency)
+        stats.ewma_success += self.alpha * ((1.0 if success else 0.0) - stats.ewma_success)
+
+    def in_flight(self, agent: str) -> int:
+        """Executions currently running on an agent"""
+        with self._lock:
+            stats = self._stats.get(agent)
+            return stats.in_flight if stats else 0
+
+    def in_flight_counts(self) -> Dict[str, int]:
+        """In-flight executions for every known agent"""
+        with self._lock:
+            return {agent: stats.in_flight for agent, stats in self._stats.items()}
+
+    def sample_count(self, agent: str) -> int:
+        """Number of latency samples in an agent's window"""
+        with self._lock:
+            stats = self._stats.get(agent)
+            return len(stats.latencies) if stats else 0
+
+    def ewma_success(self, agent: str) -> Optional[float]:
+        """Smoothed success rate, or None before the first completion"""
+        with self._lock:
+            stats = self._stats.get(agent)
+            return stats.ewma_success if stats and stats.completed else None
+
+    def percentile(self, agent: str, percentile: float) -> Optional[float]:
+        """Latency percentile over the recent window, or None without samples"""
+        with self._lock:
+            stats = self._stats.get(agent)
+            samples = sorted(stats.latencies) if stats else []
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(percentile * len(samples)) - 1))
+        return samples[index]
+
+    def cost(self, agent: str) -> float:
+        """
+        Expected cost of sending one more task to an agent: outstanding work
+        times smoothed latency, inflated by the smoothed failure rate. Agents
+        without observations use the prior latency, so they are explored ahead
+        of slower-than-average agents but still pay for their in-flight work.
+        """
+        with self._lock:
+            stats = self._stats.get(agent)
+            in_flight = stats.in_flight if stats else 0
+            if stats is None or stats.ewma_latency is None:
+                return (in_flight + 1) * self._prior_latency_locked()
+            return (in_flight + 1) * stats.ewma_latency / max(stats.ewma_success, 0.05)
+
+    def _prior_latency_locked(self) -> float:
+        """Mean smoothed latency across observed agents, or the configured prior"""
+        observed = [stats.ewma_latency for stats in self._stats.values() if stats.ewma_latency is not None]
+        return sum(observed) / len(observed) if observed else self.prior_latency
+
+    def choose(self, candidates: List[str]) -> Optional[str]:
+        """Power-of-two-choices: sample two candidates and keep the cheaper one"""
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = self._rng.sample(candidates, 2)
+        return first if self.cost(first) <= self.cost(second) else second
+
+    def rank(self, candidates: List[str]) -> List[str]:
+        """Order candidates by cost, least outstanding work first"""
+        return sorted(candidates, key=self.cost)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current statistics for every known agent"""
+        with self._lock:
+            agents = {agent: (stats.in_flight, stats.completed, stats.failures,
+                              stats.ewma_latency, stats.ewma_success)
+                      for agent, stats in self._stats.items()}
+        return {
+            agent: {
+                'in_flight': in_flight,
+                'completed': completed,
+                'failures': failures,
+                'ewma_latency_seconds': ewma_latency,
+                'ewma_success_rate': ewma_success,
+                'p50_latency_seconds': self.percentile(agent, 0.5),
+                'p95_latency_seconds': self.percentile(agent, 0.95)
+            }
+            for agent, (in_flight, completed, failures, ewma_latency, ewma_success) in agents.items()
+        }
@@ -4,6 +4,8 @@ Base agent class for SwarmDirector
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
+from sqlalchemy import inspect
+from ..models.base import db
 from ..models.agent import Agent, AgentStatus
 from ..models.task import Task
 from ..utils.logging import log_agent_action
@@ -34,10 +36,22 @@ class BaseAgent(ABC):
         old_status = self.status
         self.status = new_status
         self.db_agent.status = new_status
-        self.db_agent.save()
+        row = self._session_row()
+        row.status = new_status
+        row.save()
         
         log_agent_action(self.name, f"Status changed from {old_status.value} to {new_status.value}")
     
+    def _session_row(self) -> Agent:
+        """
+        This agent's row in the current session. Agents shared across requests
+        hold a detached row; writing through a per-session copy keeps it out of
+        any one request's session.
+        """
+        if not inspect(self.db_agent).detached:
+            return self.db_agent
+        return db.session.get(Agent, self.agent_id)
+    
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics for this agent"""
         total_tasks = len(self.get_assigned_tasks())
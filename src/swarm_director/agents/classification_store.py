@@ -0,0 +1,234 @@
+"""
+Persistent classification cache for SwarmDirector
+A host-local SQLite (WAL mode) store shared by every worker process, so an
+intent classification paid for in one process is reused by the others.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    cache_key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_classifications_created_at ON classifications (created_at);
+"""
+
+
+class SQLiteClassificationStore:
+    """
+    Read-through / write-behind classification store on a local SQLite file.
+
+    Reads use a per-thread connection and never block on writers thanks to
+    WAL journaling. Writes are queued and applied in batches by a background
+    thread; expired rows and rows beyond max_entries (oldest first) are pruned
+    periodically by the writer.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl_seconds: float = 24 * 3600,
+                 flush_interval_seconds: float = 0.05, prune_every: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval_seconds
+        self.prune_every = max(1, prune_every)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writes_since_prune = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'pruned': 0, 'errors': 0}
+
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.commit()
+
+        self._writer = threading.Thread(target=self._run_writer, name="classification-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Look up a classification; returns (intent, confidence) or None"""
+        try:
+            row = self._connect().execute(
+                "SELECT intent, confidence, created_at FROM classifications WHERE cache_key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Classification store read failed: {e}")
+            self._count('errors')
+            return None
+
+        if row is None:
+            self._count('misses')
+            return None
+        if time.time() - row[2] > self.ttl_seconds:
+            self._count('expired')
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return row[0], row[1]
+
+    def put(self, key: str, version: str, intent: str, confidence: float):
+        """Queue a classification to be written by the background writer"""
+        if not self._closed:
+            self._queue.put(('put', (key, version, intent, confidence, time.time())))
+
+    def invalidate(self, key: str):
+        """Queue removal of a classification"""
+        if not self._closed:
+            self._queue.put(('delete', (key,)))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until queued writes have been applied"""
+        done = threading.Event()
+        self._queue.put(('flush', (done,)))
+        return done.wait(timeout)
+
+    def prune(self):
+        """Prune expired and excess rows now instead of waiting for the writer's schedule"""
+        self._queue.put(('prune', ()))
+        self.flush()
+
+    def close(self):
+        """Apply pending writes and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics including the current row count"""
+        try:
+            entries = self._connect().execute("SELECT COUNT(*) FROM classifications").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({'entries': entries, 'max_entries': self.max_entries, 'path': self.path})
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _run_writer(self):
+        """Drain the write queue in batches, one transaction per batch"""
+        connection = self._connect()
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            stop = batch[-1] is None
+            self._apply(connection, [entry for entry in batch if entry is not None])
+            if stop:
+                connection.close()
+                return
+
+    def _apply(self, connection: sqlite3.Connection, batch):
+        """Apply a batch of queued operations in order, in one transaction"""
+        writes = 0
+        force_prune = False
+
+        try:
+            with connection:
+                for op, args in batch:
+                    if op == 'put':
+                        connection.execute(
+                            "INSERT OR REPLACE INTO classifications "
+                            "(cache_key, version, intent, confidence, created_at) VALUES (?, ?, ?, ?, ?)",
+                            args
+                        )
+                        writes += 1
+                    elif op == 'delete':
+                        connection.execute("DELETE FROM classifications WHERE cache_key = ?", args)
+                    elif op == 'prune':
+                        force_prune = True
+            self._count('writes', writes)
+
+            self._writes_since_prune += writes
+            if force_prune or self._writes_since_prune >= self.prune_every:
+                self._writes_since_prune = 0
+                self._prune(connection)
+        except sqlite3.Error as e:
+            logger.warning(f"Classification store write failed: {e}")
+            self._count('errors')
+        finally:
+            for op, args in batch:
+                if op == 'flush':
+                    args[0].set()
+
+    def _prune(self, connection: sqlite3.Connection):
+        """Drop expired rows and the oldest rows beyond max_entries"""
+        with connection:
+            expired = connection.execute(
+                "DELETE FROM classifications WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            excess = connection.execute("SELECT COUNT(*) FROM classifications").fetchone()[0] - self.max_entries
+            evicted = 0
+            if excess > 0:
+                evicted = connection.execute(
+                    "DELETE FROM classifications WHERE cache_key IN "
+                    "(SELECT cache_key FROM classifications ORDER BY created_at LIMIT ?)", (excess,)
+                ).rowcount
+        self._count('pruned', expired + evicted)
+
+
+_stores: Dict[str, SQLiteClassificationStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_classification_store(path: str, max_entries: int = 100000,
+                             ttl_seconds: float = 24 * 3600) -> SQLiteClassificationStore:
+    """
+    Get the process-wide store for a file path, creating it on first use.
+    A store inherited across fork is replaced, since its writer thread and
+    connections belong to the parent process.
+    """
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None or store.pid != os.getpid():
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None or store.pid != os.getpid():
+                store = SQLiteClassificationStore(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+                _stores[key] = store
+    return store
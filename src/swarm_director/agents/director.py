@@ -7,39 +7,52 @@ based on intent classification and manages the overall workflow.
 import json
 import logging
 import threading
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Set, Union, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
+import math
+import re
 import time
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future, wait, FIRST_COMPLETED
+from collections import defaultdict, deque, OrderedDict
+from itertools import islice
 
 from .supervisor_agent import SupervisorAgent
+from .llm_classifier import (
+    ClassificationBatcher, LLMClassificationProvider, get_llm_provider,
+    HAS_OPENAI, HAS_ANTHROPIC
+)
+from .similarity_classifier import SimilarityIntentClassifier, HAS_NUMPY
+from .agent_stats import AgentStatsTracker
+from .classification_store import SQLiteClassificationStore, get_classification_store
 from ..models.task import Task, TaskStatus, TaskPriority, TaskType
 from ..models.agent import Agent, AgentType, AgentStatus
+from ..models.base import db
 from ..utils.logging import log_agent_action
 
-# Import for LLM-based classification
-try:
-    import openai
-    import anthropic
-    HAS_LLM_SUPPORT = True
-except ImportError:
-    HAS_LLM_SUPPORT = False
-
-# Import for embeddings-based similarity
-try:
-    import numpy as np
-    from sklearn.metrics.pairwise import cosine_similarity
-    HAS_EMBEDDING_SUPPORT = True
-except ImportError:
-    HAS_EMBEDDING_SUPPORT = False
+# LLM-based classification is available when at least one provider SDK is installed
+HAS_LLM_SUPPORT = HAS_OPENAI or HAS_ANTHROPIC
+
+# Offline similarity classification over dataset examples needs numpy
+HAS_EMBEDDING_SUPPORT = HAS_NUMPY
 
 logger = logging.getLogger(__name__)
 
+# Bump when the LLM prompt or parsing changes so cached LLM results are not reused
+LLM_CLASSIFIER_VERSION = "llm:v1"
+
+# Agent result statuses treated as failures during parallel execution
+FAILED_RESULT_STATUSES = frozenset({'error', 'execution_error', 'failed', 'timeout'})
+
+# Result keys that differ between otherwise identical answers
+VOLATILE_RESULT_KEYS = frozenset({
+    'timestamp', 'execution_time', 'agent', 'agent_id', 'agent_name',
+    'task_id', 'created_at', 'completed_at', 'director_agent'
+})
+
 class DirectorState(Enum):
     """Enumeration for director agent states"""
     INITIALIZING = "initializing"
@@ -115,6 +128,35 @@ class DirectorConfig:
     agent_selection_criteria: AgentSelectionCriteria = AgentSelectionCriteria.PERFORMANCE
     enable_result_aggregation: bool = True
     consensus_threshold: float = 0.75
+    # Completion policy for PARALLEL_AGENTS: all, first_n or quorum
+    parallel_completion_mode: str = "quorum"
+    parallel_first_n: int = 1
+    # Hedged requests: retry on a fallback agent once the primary exceeds its p95 latency
+    enable_hedged_requests: bool = True
+    hedge_latency_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_budget_ratio: float = 0.1  # hedges per primary request, capped at 1.0
+    hedge_pool_size: int = 8  # threads for hedged primaries and hedges, separate from fan-out
+    # Live agent statistics used for load balancing and execution time estimates
+    latency_sample_size: int = 512
+    latency_ewma_alpha: float = 0.2
+    # Recent routing decisions and feedback kept for inspection; analytics use running counters
+    routing_history_size: int = 1000
+    feedback_history_size: int = 1000
+    # Classification cache configuration
+    classification_cache_size: int = 10000
+    classification_cache_ttl_seconds: int = 24 * 3600
+    # Optional SQLite file shared by all worker processes on a host for LLM classifications
+    persistent_cache_path: Optional[str] = None
+    persistent_cache_max_entries: int = 100000
+    # LLM classification batching
+    llm_batch_window_ms: float = 20.0
+    llm_max_batch_size: int = 16
+    llm_request_timeout_seconds: float = 30.0
+    # Offline similarity classification, tried before LLM/keyword classification
+    enable_similarity_classification: bool = False
+    similarity_confidence_threshold: float = 0.7
+    similarity_top_k: int = 5
 
 @dataclass
 class DirectorMetrics:
@@ -129,6 +171,8 @@ class DirectorMetrics:
     # New parallel execution metrics
     parallel_executions: int = 0
     aggregated_results: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
     agent_performance_scores: Dict[str, float] = field(default_factory=dict)
     routing_strategy_usage: Dict[str, int] = field(default_factory=dict)
     
@@ -144,6 +188,8 @@ class DirectorMetrics:
             'error_counts': dict(self.error_counts),
             'parallel_executions': self.parallel_executions,
             'aggregated_results': self.aggregated_results,
+            'hedged_requests': self.hedged_requests,
+            'hedge_wins': self.hedge_wins,
             'agent_performance_scores': dict(self.agent_performance_scores),
             'routing_strategy_usage': dict(self.routing_strategy_usage)
         }
@@ -177,12 +223,157 @@ class ClassificationCache:
     method: str
     timestamp: datetime
     hit_count: int = 1
+    score: int = 0  # Keyword hits behind the decision (keyword method only)
     
     def is_valid(self, max_age_hours: int = 24) -> bool:
         """Check if cache entry is still valid"""
         age = datetime.utcnow() - self.timestamp
         return age.total_seconds() < (max_age_hours * 3600)
 
+class ClassificationLRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with TTL for classification results.
+    Lookups, inserts and evictions are O(1); expiry uses a monotonic clock.
+    """
+    
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[ClassificationCache, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Optional[ClassificationCache]:
+        """Get a live entry and mark it most recently used"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            
+            entry, stored_at = item
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            entry.hit_count += 1
+            self.hits += 1
+            return entry
+    
+    def put(self, key: str, entry: ClassificationCache):
+        """Insert or replace an entry, evicting the least recently used if full"""
+        with self._lock:
+            self._entries[key] = (entry, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: str) -> bool:
+        """Remove an entry; returns True if it was present"""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+    
+    def cleanup_expired(self, max_age_seconds: Optional[float] = None) -> int:
+        """Remove entries older than max_age_seconds (defaults to the TTL)"""
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, stored_at) in self._entries.items()
+                       if now - stored_at >= max_age]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "total_hits": self.hits,
+                "total_misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+class ClassificationFeedbackStats:
+    """
+    Running classification feedback counters.
+
+    Keeps a predicted -> actual confusion matrix per classification method so
+    analytics cost O(departments^2) regardless of how much feedback was seen.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.correct = 0
+        self.confusion: Dict[str, Dict[Tuple[str, str], int]] = defaultdict(lambda: defaultdict(int))
+    
+    def record(self, feedback: ClassificationFeedback):
+        """Fold one feedback item into the counters"""
+        self.total += 1
+        if feedback.predicted_intent == feedback.actual_intent:
+            self.correct += 1
+        self.confusion[feedback.classification_method][
+            (feedback.predicted_intent, feedback.actual_intent)
+        ] += 1
+    
+    def accuracy(self) -> Optional[float]:
+        """Overall accuracy, or None without feedback"""
+        return self.correct / self.total if self.total else None
+    
+    def method_performance(self) -> Dict[str, Dict[str, Any]]:
+        """Accuracy and sample count per classification method"""
+        performance = {}
+        for method, matrix in self.confusion.items():
+            samples = sum(matrix.values())
+            correct = sum(count for (predicted, actual), count in matrix.items() if predicted == actual)
+            performance[method] = {
+                'accuracy': correct / samples,
+                'total_samples': samples
+            }
+        return performance
+    
+    def misclassifications(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Most frequent predicted -> actual confusions across methods"""
+        counts: Dict[str, int] = defaultdict(int)
+        for matrix in self.confusion.values():
+            for (predicted, actual), count in matrix.items():
+                if predicted != actual:
+                    counts[f"{predicted} -> {actual}"] += count
+        return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+    
+    def confusion_matrix(self) -> Dict[str, Dict[str, int]]:
+        """Combined confusion matrix as {predicted: {actual: count}}"""
+        matrix: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for method_matrix in self.confusion.values():
+            for (predicted, actual), count in method_matrix.items():
+                matrix[predicted][actual] = matrix[predicted].get(actual, 0) + count
+        return dict(matrix)
+
+
 class IntentDatasetManager:
     """Manages training datasets for intent classification"""
     
@@ -333,6 +524,34 @@ class IntentDatasetManager:
     
     def get_training_prompt(self, include_examples: int = 5) -> str:
         """Generate training prompt for LLM classification"""
+        prompt = self._build_prompt_header(include_examples)
+        prompt += """
+Please classify the following request and provide a confidence score (0.0-1.0):
+Format your response as: DEPARTMENT|CONFIDENCE
+
+Request: """
+        
+        return prompt
+    
+    def get_batch_training_prompt(self, requests: List[str], include_examples: int = 3) -> str:
+        """Generate one prompt classifying several requests, answered as numbered lines"""
+        if len(requests) == 1:
+            return self.get_training_prompt(include_examples) + requests[0]
+        
+        prompt = self._build_prompt_header(include_examples)
+        prompt += f"""
+Please classify each of the following {len(requests)} requests and provide a confidence score (0.0-1.0) for each.
+Respond with exactly one line per request, numbered to match, formatted as: NUMBER. DEPARTMENT|CONFIDENCE
+
+Requests:
+"""
+        for number, text in enumerate(requests, 1):
+            prompt += f"{number}. {' '.join(text.split())}\n"
+        
+        return prompt
+    
+    def _build_prompt_header(self, include_examples: int) -> str:
+        """Build the shared few-shot section of the classification prompt"""
         prompt = """You are an expert at classifying user requests into these departments:
 
 1. COMMUNICATIONS: Email, messaging, notifications, announcements, correspondence
@@ -352,14 +571,93 @@ Here are some examples:
             for example in selected_examples:
                 prompt += f"- {example.text}\n"
         
-        prompt += """
-Please classify the following request and provide a confidence score (0.0-1.0):
-Format your response as: DEPARTMENT|CONFIDENCE
-
-Request: """
-        
         return prompt
 
+class KeywordIntentMatcher:
+    """
+    Compiled multi-keyword matcher for intent classification.
+
+    All department keywords are folded into a prefix trie and compiled into one
+    lookahead regex, so a single pass over the task text finds every keyword
+    occurrence (including overlapping ones) at a cost that grows with text
+    length rather than keyword count. Results match per-keyword substring
+    checks exactly.
+    """
+    
+    def __init__(self, intent_keywords: Dict[str, List[str]]):
+        self.source = {dept: tuple(keywords) for dept, keywords in intent_keywords.items()}
+        self.departments = list(self.source.keys())
+        # Identifies the keyword set in classification cache keys
+        self.version = hashlib.md5(repr(sorted(self.source.items())).encode()).hexdigest()[:12]
+        
+        # keyword -> departments it scores for (a keyword may belong to several)
+        self.keyword_departments: Dict[str, List[str]] = defaultdict(list)
+        for dept, keywords in self.source.items():
+            for keyword in keywords:
+                if keyword:
+                    self.keyword_departments[keyword].append(dept)
+        
+        # The trie regex is greedy, so each position reports its longest keyword;
+        # shorter keywords contained in it are recovered through `implied`
+        keywords = list(self.keyword_departments)
+        self.implied: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in keywords if other in keyword)
+            for keyword in keywords
+        }
+        self.pattern = (
+            re.compile("(?=(" + self._build_trie_pattern(keywords) + "))")
+            if keywords else None
+        )
+    
+    @staticmethod
+    def _build_trie_pattern(keywords: List[str]) -> str:
+        """Build a regex from a prefix trie so shared prefixes are tested once"""
+        trie: Dict[str, Any] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        
+        def build(node: Dict[str, Any]) -> str:
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # A keyword ending here makes the longer continuations optional
+            return '(?:' + pattern + ')?' if '' in node else pattern
+        
+        return build(trie)
+    
+    def matches_source(self, intent_keywords: Dict[str, List[str]]) -> bool:
+        """Check whether the matcher was compiled from these keywords"""
+        if len(intent_keywords) != len(self.source):
+            return False
+        for dept, keywords in intent_keywords.items():
+            if self.source.get(dept) != tuple(keywords):
+                return False
+        return True
+    
+    def find_keywords(self, task_text: str) -> set:
+        """Return the set of distinct keywords present in the text"""
+        if self.pattern is None:
+            return set()
+        found = set()
+        for longest in set(self.pattern.findall(task_text)):
+            found.update(self.implied[longest])
+        return found
+    
+    def score(self, task_text: str) -> Tuple[Dict[str, int], int]:
+        """Score departments by distinct keyword hits; returns (scores, total_hits)"""
+        scores = dict.fromkeys(self.departments, 0)
+        total = 0
+        for keyword in self.find_keywords(task_text):
+            for dept in self.keyword_departments[keyword]:
+                scores[dept] += 1
+                total += 1
+        return scores, total
+
 class DirectorAgent(SupervisorAgent):
     """
     Enhanced Director agent that routes tasks to appropriate department agents
@@ -383,21 +681,41 @@ class DirectorAgent(SupervisorAgent):
         
         # Enhanced classification system
         self.dataset_manager = IntentDatasetManager()
-        self.classification_cache: Dict[str, ClassificationCache] = {}
-        self.feedback_history: List[ClassificationFeedback] = []
+        self._llm_providers: Optional[List[LLMClassificationProvider]] = None
+        self._llm_batcher: Optional[ClassificationBatcher] = None
+        self._similarity_classifier: Optional[SimilarityIntentClassifier] = None
+        self.classification_cache = ClassificationLRUCache(
+            max_entries=self.config.classification_cache_size,
+            ttl_seconds=self.config.classification_cache_ttl_seconds
+        )
+        self.persistent_cache: Optional[SQLiteClassificationStore] = self._open_persistent_cache()
+        self.feedback_history: deque = deque(maxlen=self.config.feedback_history_size)
+        self.feedback_stats = ClassificationFeedbackStats()
         
         # Routing infrastructure for parallel execution and advanced strategies
         self.thread_pool = ThreadPoolExecutor(max_workers=self.config.max_parallel_agents)
-        self.routing_decisions: List[RoutingDecision] = []
-        self.agent_workload: Dict[str, int] = defaultdict(int)
+        self.hedge_pool = ThreadPoolExecutor(max_workers=self.config.hedge_pool_size,
+                                             thread_name_prefix="director-hedge")
+        self.routing_decisions: deque = deque(maxlen=self.config.routing_history_size)
+        self.total_routing_decisions = 0
+        self.agent_stats = AgentStatsTracker(
+            alpha=self.config.latency_ewma_alpha,
+            window=self.config.latency_sample_size
+        )
+        self.hedge_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'eligible': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_exhausted': 0}
+        )
+        self._hedge_tokens: Dict[str, float] = defaultdict(float)
         
         # Metrics and performance tracking  
         self.metrics = DirectorMetrics()
         
         # Initialize core components
+        self._keyword_matcher: Optional[KeywordIntentMatcher] = None
         try:
             self.intent_keywords = self._initialize_intent_keywords()
             self.department_agents = {}  # Initialize as empty dict first
+            self.department_intents: Dict[str, Set[str]] = {}  # Extra intents each department serves
             self._initialize_department_agents()  # Then populate it
             self.routing_stats = self._initialize_routing_stats()
             
@@ -494,6 +812,24 @@ class DirectorAgent(SupervisorAgent):
             ]
         }
     
+    @property
+    def intent_keywords(self) -> Dict[str, List[str]]:
+        """Keyword mappings used by the keyword classifier"""
+        return self._intent_keywords
+    
+    @intent_keywords.setter
+    def intent_keywords(self, keywords: Dict[str, List[str]]):
+        self._intent_keywords = keywords
+        self._keyword_matcher = None
+    
+    def _get_keyword_matcher(self) -> KeywordIntentMatcher:
+        """Get the compiled keyword matcher, rebuilding it if keywords changed"""
+        matcher = self._keyword_matcher
+        if matcher is None or not matcher.matches_source(self._intent_keywords):
+            matcher = KeywordIntentMatcher(self._intent_keywords)
+            self._keyword_matcher = matcher
+        return matcher
+    
     def _initialize_routing_stats(self) -> Dict[str, Any]:
         """Initialize legacy routing statistics for backward compatibility"""
         return {
@@ -617,8 +953,12 @@ class DirectorAgent(SupervisorAgent):
         try:
             task_text = self._extract_task_text(task)
             
+            if self.config.enable_similarity_classification:
+                result = self._classify_intent_similarity(task_text)
+                if result is not None:
+                    return result
+            
             if self.config.enable_llm_classification:
-                # Future: implement LLM-based classification
                 return self._classify_intent_llm(task_text)
             else:
                 return self._classify_intent_keyword(task_text)
@@ -647,90 +987,218 @@ class DirectorAgent(SupervisorAgent):
         
         return " ".join(text_parts).lower()
 
+    def classify_many(self, tasks: List[Union[Task, str]]) -> List[Tuple[str, float]]:
+        """
+        Classify a batch of tasks (Task objects or raw text) for bulk ingestion.
+        Returns (intent, confidence) tuples in input order.
+        """
+        texts = [task.lower() if isinstance(task, str) else self._extract_task_text(task)
+                 for task in tasks]
+        results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        
+        # Confident similarity matches are settled in one vectorized pass
+        classifier = self._get_similarity_classifier()
+        if classifier is not None:
+            threshold = self.config.similarity_confidence_threshold
+            for i, (intent, confidence) in enumerate(classifier.classify_many(texts)):
+                if confidence >= threshold:
+                    results[i] = (intent, confidence)
+        
+        remaining = [i for i, result in enumerate(results) if result is None]
+        if self.config.enable_llm_classification:
+            for i, result in zip(remaining, self._classify_many_llm([texts[i] for i in remaining])):
+                results[i] = result
+        else:
+            matcher = self._get_keyword_matcher()
+            for i in remaining:
+                results[i] = self._classify_keyword_cached(matcher, texts[i])[:2]
+        
+        log_agent_action(self.name, f"Classified batch of {len(results)} tasks "
+                                    f"({len(texts) - len(remaining)} by similarity)")
+        return results
+    
+    def _get_similarity_classifier(self) -> Optional[SimilarityIntentClassifier]:
+        """Get the similarity classifier, building it on first use when enabled"""
+        if not (self.config.enable_similarity_classification and HAS_EMBEDDING_SUPPORT):
+            return None
+        
+        if self._similarity_classifier is None:
+            with self._lock:
+                if self._similarity_classifier is None:
+                    self._similarity_classifier = SimilarityIntentClassifier(
+                        self.dataset_manager,
+                        top_k=self.config.similarity_top_k,
+                        fallback_department=self.config.fallback_department
+                    )
+        return self._similarity_classifier
+    
+    def _classify_intent_similarity(self, task_text: str) -> Optional[tuple[str, float]]:
+        """
+        Classify intent by similarity to dataset examples.
+        Returns None when unavailable or below the confidence threshold so the
+        caller can fall through to LLM or keyword classification.
+        """
+        classifier = self._get_similarity_classifier()
+        if classifier is None:
+            return None
+        
+        try:
+            intent, confidence = classifier.classify(task_text)
+        except Exception as e:
+            logger.warning(f"Similarity classification failed: {e}")
+            return None
+        
+        if confidence < self.config.similarity_confidence_threshold:
+            return None
+        return intent, confidence
+    
     def _classify_intent_keyword(self, task_text: str) -> tuple[str, float]:
         """
         Classify intent using keyword matching with confidence scoring
         """
-        intent_scores = {}
-        total_keywords_matched = 0
+        intent, confidence, best_score = self._classify_keyword_cached(
+            self._get_keyword_matcher(), task_text
+        )
         
-        # Score each department based on keyword matches
-        for department, keywords in self.intent_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in task_text:
-                    score += 1
-                    total_keywords_matched += 1
-            intent_scores[department] = score
+        log_agent_action(self.name, 
+                        f"Classified intent as '{intent}' (score: {best_score}, confidence: {confidence:.2f})")
+        return intent, confidence
+    
+    def _classification_cache_key(self, task_text: str, classifier_version: str) -> str:
+        """Build a cache key from whitespace/case-normalized text and classifier version"""
+        normalized = " ".join(task_text.lower().split())
+        return hashlib.md5(f"{classifier_version}\x00{normalized}".encode()).hexdigest()
+    
+    def _classify_keyword_cached(self, matcher: KeywordIntentMatcher,
+                                 task_text: str) -> Tuple[str, float, int]:
+        """Keyword classification through the shared classification cache"""
+        # Classify the same normalized text the cache key is built from
+        task_text = " ".join(task_text.lower().split())
+        cache_key = self._classification_cache_key(task_text, f"keyword:{matcher.version}")
+        cache_entry = self.classification_cache.get(cache_key)
+        if cache_entry is not None:
+            return cache_entry.intent, cache_entry.confidence, cache_entry.score
+        
+        intent, confidence, best_score = self._score_keyword_intent(matcher, task_text)
+        self.classification_cache.put(cache_key, ClassificationCache(
+            text_hash=cache_key,
+            intent=intent,
+            confidence=confidence,
+            method='keyword',
+            timestamp=datetime.utcnow(),
+            score=best_score
+        ))
+        return intent, confidence, best_score
+    
+    def _score_keyword_intent(self, matcher: KeywordIntentMatcher,
+                              task_text: str) -> Tuple[str, float, int]:
+        """Score one text with the compiled matcher; returns (intent, confidence, best_score)"""
+        intent_scores, total_keywords_matched = matcher.score(task_text)
         
         # Find the department with the highest score
-        best_intent = max(intent_scores.items(), key=lambda x: x[1])
+        best_intent = max(intent_scores.items(), key=lambda x: x[1],
+                          default=(self.config.fallback_department, 0))
         
         # Calculate confidence score
         if best_intent[1] == 0:
             # No keywords matched
-            intent = self.config.fallback_department
-            confidence = 0.0
-        else:
-            intent = best_intent[0]
-            # Confidence based on score relative to total matches
-            confidence = min(1.0, best_intent[1] / max(1, total_keywords_matched))
+            return self.config.fallback_department, 0.0, 0
         
-        log_agent_action(self.name, 
-                        f"Classified intent as '{intent}' (score: {best_intent[1]}, confidence: {confidence:.2f})")
-        return intent, confidence
+        # Confidence based on score relative to total matches
+        confidence = min(1.0, best_intent[1] / max(1, total_keywords_matched))
+        return best_intent[0], confidence, best_intent[1]
 
     def _classify_intent_llm(self, task_text: str) -> tuple[str, float]:
         """
-        LLM-based intent classification with caching and multiple provider support
+        LLM-based intent classification with caching, request batching and
+        multiple provider support
         """
-        # Check cache first
-        text_hash = hashlib.md5(task_text.encode()).hexdigest()
-        if text_hash in self.classification_cache:
-            cache_entry = self.classification_cache[text_hash]
-            if cache_entry.is_valid():
-                cache_entry.hit_count += 1
-                log_agent_action(self.name, f"Using cached LLM classification for task")
-                return cache_entry.intent, cache_entry.confidence
-        
-        # Check if LLM support is available
-        if not HAS_LLM_SUPPORT:
-            logger.warning("LLM libraries not available, falling back to keyword classification")
+        text_hash = self._classification_cache_key(task_text, LLM_CLASSIFIER_VERSION)
+        cached = self._get_cached_llm_classification(text_hash)
+        if cached is not None:
+            return cached
+        
+        # Check if an LLM provider is available
+        providers = self._get_llm_providers()
+        if not providers:
+            logger.warning("LLM providers not available, falling back to keyword classification")
             return self._classify_intent_keyword(task_text)
         
         try:
-            # Get training prompt
-            prompt = self.dataset_manager.get_training_prompt(include_examples=3)
-            full_prompt = prompt + task_text
-            
-            # Try different LLM providers in order of preference
-            result = None
-            providers_tried = []
-            
-            # Try OpenAI first
-            try:
-                from flask import current_app
-                api_key = current_app.config.get('OPENAI_API_KEY')
-                if api_key:
-                    result = self._classify_with_openai(full_prompt, api_key)
-                    providers_tried.append('openai')
-            except Exception as e:
-                logger.debug(f"OpenAI classification failed: {e}")
-            
-            # Try Anthropic if OpenAI failed
-            if not result:
-                try:
-                    from flask import current_app
-                    api_key = current_app.config.get('ANTHROPIC_API_KEY')
-                    if api_key:
-                        result = self._classify_with_anthropic(full_prompt, api_key)
-                        providers_tried.append('anthropic')
-                except Exception as e:
-                    logger.debug(f"Anthropic classification failed: {e}")
+            # Concurrent callers share one multi-item prompt and provider round trip
+            future = self._get_llm_batcher(providers).submit(task_text)
+        except Exception as e:
+            logger.error(f"LLM classification error: {e}")
+            future = None
+        return self._finish_llm_classification(task_text, text_hash, future, providers)
+    
+    def _classify_many_llm(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        LLM classification for a batch: every uncached text is submitted to the
+        batcher before any result is awaited, so they share multi-item prompts
+        """
+        hashes = [self._classification_cache_key(text, LLM_CLASSIFIER_VERSION) for text in texts]
+        results: List[Optional[Tuple[str, float]]] = [
+            self._get_cached_llm_classification(text_hash) for text_hash in hashes
+        ]
+        uncached = [i for i, result in enumerate(results) if result is None]
+        if not uncached:
+            return results
+        
+        providers = self._get_llm_providers()
+        if not providers:
+            logger.warning("LLM providers not available, falling back to keyword classification")
+            for i in uncached:
+                results[i] = self._classify_intent_keyword(texts[i])
+            return results
+        
+        # Identical texts share one submission
+        futures: Dict[str, Optional[Future]] = {}
+        try:
+            batcher = self._get_llm_batcher(providers)
+            for i in uncached:
+                if hashes[i] not in futures:
+                    futures[hashes[i]] = batcher.submit(texts[i])
+        except Exception as e:
+            logger.error(f"LLM classification error: {e}")
+        
+        for i in uncached:
+            results[i] = self._finish_llm_classification(texts[i], hashes[i], futures.get(hashes[i]),
+                                                         providers)
+        return results
+    
+    def _get_cached_llm_classification(self, text_hash: str) -> Optional[Tuple[str, float]]:
+        """Look up an LLM classification in the local cache, then the shared store"""
+        cache_entry = self.classification_cache.get(text_hash)
+        if cache_entry is not None:
+            log_agent_action(self.name, f"Using cached LLM classification for task")
+            return cache_entry.intent, cache_entry.confidence
+        
+        # Then the host-wide store shared with other worker processes
+        if self.persistent_cache is not None:
+            stored = self.persistent_cache.get(text_hash)
+            if stored is not None:
+                intent, confidence = stored
+                self.classification_cache.put(text_hash, ClassificationCache(
+                    text_hash=text_hash,
+                    intent=intent,
+                    confidence=confidence,
+                    method='llm',
+                    timestamp=datetime.utcnow()
+                ))
+                log_agent_action(self.name, f"Using shared cached LLM classification for task")
+                return intent, confidence
+        return None
+    
+    def _finish_llm_classification(self, task_text: str, text_hash: str, future: Optional[Future],
+                                   providers: List[LLMClassificationProvider]) -> Tuple[str, float]:
+        """Wait for a submitted LLM classification, validate and cache it, or fall back to keywords"""
+        try:
+            result = future.result(timeout=self.config.llm_request_timeout_seconds) if future else None
             
             # Parse result
             if result:
-                intent, confidence = self._parse_llm_response(result)
+                intent, confidence = result
                 
                 # Validate and normalize
                 if intent not in ['communications', 'analysis', 'automation', 'coordination']:
@@ -745,10 +1213,12 @@ class DirectorAgent(SupervisorAgent):
                     method='llm',
                     timestamp=datetime.utcnow()
                 )
-                self.classification_cache[text_hash] = cache_entry
+                self.classification_cache.put(text_hash, cache_entry)
+                if self.persistent_cache is not None:
+                    self.persistent_cache.put(text_hash, LLM_CLASSIFIER_VERSION, intent, confidence)
                 
                 log_agent_action(self.name, 
-                               f"LLM classified intent as '{intent}' (confidence: {confidence:.2f}, providers: {providers_tried})")
+                               f"LLM classified intent as '{intent}' (confidence: {confidence:.2f}, providers: {[p.name for p in providers]})")
                 return intent, confidence
             
         except Exception as e:
@@ -758,40 +1228,75 @@ class DirectorAgent(SupervisorAgent):
         logger.info("LLM classification failed, falling back to keyword classification")
         return self._classify_intent_keyword(task_text)
     
-    def _classify_with_openai(self, prompt: str, api_key: str) -> Optional[str]:
-        """Classify using OpenAI API"""
+    def _open_persistent_cache(self) -> Optional[SQLiteClassificationStore]:
+        """Open the shared on-disk classification store when configured"""
+        if not self.config.persistent_cache_path:
+            return None
         try:
-            client = openai.OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert task classifier. Respond with only DEPARTMENT|CONFIDENCE format."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.1
+            return get_classification_store(
+                self.config.persistent_cache_path,
+                max_entries=self.config.persistent_cache_max_entries,
+                ttl_seconds=self.config.classification_cache_ttl_seconds
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
-            logger.debug(f"OpenAI API error: {e}")
+            logger.warning(f"Persistent classification cache unavailable: {e}")
             return None
     
-    def _classify_with_anthropic(self, prompt: str, api_key: str) -> Optional[str]:
-        """Classify using Anthropic API"""
+    def set_llm_providers(self, providers: Optional[List[LLMClassificationProvider]]):
+        """Override the LLM providers used for classification (None restores app config lookup)"""
+        with self._lock:
+            self._llm_providers = list(providers) if providers is not None else None
+    
+    def _get_llm_providers(self) -> List[LLMClassificationProvider]:
+        """Resolve pooled LLM providers in order of preference"""
+        if self._llm_providers is not None:
+            return self._llm_providers
+        
+        providers = []
         try:
-            client = anthropic.Anthropic(api_key=api_key)
-            response = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=50,
-                temperature=0.1,
-                messages=[
-                    {"role": "user", "content": f"You are an expert task classifier. Respond with only DEPARTMENT|CONFIDENCE format.\n\n{prompt}"}
-                ]
-            )
-            return response.content[0].text.strip()
+            from flask import current_app
+            for name, config_key in (('openai', 'OPENAI_API_KEY'), ('anthropic', 'ANTHROPIC_API_KEY')):
+                api_key = current_app.config.get(config_key)
+                if api_key:
+                    provider = get_llm_provider(name, api_key)
+                    if provider:
+                        providers.append(provider)
         except Exception as e:
-            logger.debug(f"Anthropic API error: {e}")
-            return None
+            logger.debug(f"Could not resolve LLM providers: {e}")
+        
+        return providers
+    
+    def _get_llm_batcher(self, providers: List[LLMClassificationProvider]) -> ClassificationBatcher:
+        """Get the classification batcher, replacing it when the providers change"""
+        retired = None
+        with self._lock:
+            batcher = self._llm_batcher
+            if batcher is None or batcher.providers != providers:
+                retired = batcher
+                batcher = ClassificationBatcher(
+                    providers=providers,
+                    prompt_builder=lambda texts: self.dataset_manager.get_batch_training_prompt(
+                        texts, include_examples=3
+                    ),
+                    parse_line=self._parse_llm_response,
+                    batch_window_ms=self.config.llm_batch_window_ms,
+                    max_batch_size=self.config.llm_max_batch_size
+                )
+                self._llm_batcher = batcher
+        
+        if retired is not None:
+            retired.close()
+        return batcher
+    
+    def _classify_with_openai(self, prompt: str, api_key: str) -> Optional[str]:
+        """Classify using OpenAI API"""
+        provider = get_llm_provider('openai', api_key)
+        return provider.complete(prompt, max_tokens=50) if provider else None
+    
+    def _classify_with_anthropic(self, prompt: str, api_key: str) -> Optional[str]:
+        """Classify using Anthropic API"""
+        provider = get_llm_provider('anthropic', api_key)
+        return provider.complete(prompt, max_tokens=50) if provider else None
     
     def _parse_llm_response(self, response: str) -> tuple[str, float]:
         """Parse LLM response in DEPARTMENT|CONFIDENCE format"""
@@ -857,7 +1362,14 @@ class DirectorAgent(SupervisorAgent):
             task.assign_to_agent(agent.db_agent)
             
             # Execute the task through the agent
-            result = agent.execute_task(task)
+            start_time = time.perf_counter()
+            succeeded = False
+            self.agent_stats.begin(intent)
+            try:
+                result = agent.execute_task(task)
+                succeeded = not (isinstance(result, dict) and result.get('status') in FAILED_RESULT_STATUSES)
+            finally:
+                self._finish_agent_execution(intent, time.perf_counter() - start_time, succeeded)
             
             log_agent_action(self.name, f"Successfully routed task {task.id} to {intent} department")
             
@@ -1044,9 +1556,13 @@ class DirectorAgent(SupervisorAgent):
                     / self.metrics.tasks_processed
                 )
 
-    def register_department_agent(self, department: str, agent):
-        """Register a department agent for routing"""
+    def register_department_agent(self, department: str, agent, intents: Optional[List[str]] = None):
+        """
+        Register a department agent for routing. intents lists other intents the
+        agent can also serve, making it a routing candidate for them.
+        """
         self.department_agents[department] = agent
+        self.department_intents[department] = set(intents or ())
         log_agent_action(self.name, f"Registered {department} department agent: {agent.name}")
         
         # Initialize stats for this department
@@ -1058,19 +1574,21 @@ class DirectorAgent(SupervisorAgent):
         if department in self.department_agents:
             agent_name = self.department_agents[department].name
             del self.department_agents[department]
+            self.department_intents.pop(department, None)
             log_agent_action(self.name, f"Unregistered {department} department agent: {agent_name}")
     
     def _update_routing_stats(self, department: str, success: bool):
         """Update routing statistics"""
-        self.routing_stats['total_routed'] += 1
-        
-        if success:
-            self.routing_stats['successful_routes'] += 1
-        else:
-            self.routing_stats['failed_routes'] += 1
-        
-        if department in self.routing_stats['department_counts']:
-            self.routing_stats['department_counts'][department] += 1
+        with self._lock:
+            self.routing_stats['total_routed'] += 1
+            
+            if success:
+                self.routing_stats['successful_routes'] += 1
+            else:
+                self.routing_stats['failed_routes'] += 1
+            
+            if department in self.routing_stats['department_counts']:
+                self.routing_stats['department_counts'][department] += 1
     
     def get_routing_stats(self) -> Dict[str, Any]:
         """Get routing statistics"""
@@ -1152,6 +1670,15 @@ class DirectorAgent(SupervisorAgent):
             logger.error(f"Error updating configuration: {e}")
             return False
 
+    def shutdown(self):
+        """Release worker threads held by this director"""
+        with self._lock:
+            batcher, self._llm_batcher = self._llm_batcher, None
+        if batcher is not None:
+            batcher.close()
+        self.thread_pool.shutdown(wait=False)
+        self.hedge_pool.shutdown(wait=False)
+
     def get_health_status(self) -> Dict[str, Any]:
         """Get comprehensive health status"""
         uptime = (datetime.utcnow() - self.created_at).total_seconds()
@@ -1165,6 +1692,7 @@ class DirectorAgent(SupervisorAgent):
             "metrics": self.metrics.to_dict(),
             "configuration": {
                 "enable_llm_classification": self.config.enable_llm_classification,
+                "enable_similarity_classification": self.config.enable_similarity_classification,
                 "fallback_department": self.config.fallback_department,
                 "enable_auto_retry": self.config.enable_auto_retry,
                 "max_retries": self.config.max_retries,
@@ -1206,7 +1734,9 @@ class DirectorAgent(SupervisorAgent):
                 classification_method='llm' if self.config.enable_llm_classification else 'keyword'
             )
             
-            self.feedback_history.append(feedback)
+            with self._lock:
+                self.feedback_history.append(feedback)
+                self.feedback_stats.record(feedback)
             
             # Add corrected example to training data if significantly different
             if predicted_intent != actual_intent:
@@ -1227,9 +1757,15 @@ class DirectorAgent(SupervisorAgent):
                         self.dataset_manager.add_example(training_example)
                         
                         # Clear cache for this text to force reclassification
-                        text_hash = hashlib.md5(task_text.encode()).hexdigest()
-                        if text_hash in self.classification_cache:
-                            del self.classification_cache[text_hash]
+                        llm_key = self._classification_cache_key(task_text, LLM_CLASSIFIER_VERSION)
+                        self.classification_cache.invalidate(llm_key)
+                        if self.persistent_cache is not None:
+                            self.persistent_cache.invalidate(llm_key)
+                        self.classification_cache.invalidate(
+                            self._classification_cache_key(
+                                task_text, f"keyword:{self._get_keyword_matcher().version}"
+                            )
+                        )
                         
                         log_agent_action(self.name, 
                                        f"Added feedback: {predicted_intent} -> {actual_intent} for task {task_id}")
@@ -1247,7 +1783,15 @@ class DirectorAgent(SupervisorAgent):
         """
         Get comprehensive analytics about classification performance
         """
-        if not self.feedback_history:
+        with self._lock:
+            total_feedback = self.feedback_stats.total
+            correct_classifications = self.feedback_stats.correct
+            accuracy = self.feedback_stats.accuracy()
+            method_performance = self.feedback_stats.method_performance()
+            common_misclassifications = self.feedback_stats.misclassifications()
+            confusion_matrix = self.feedback_stats.confusion_matrix()
+        
+        if not total_feedback:
             return {
                 "total_feedback": 0,
                 "accuracy": None,
@@ -1256,39 +1800,13 @@ class DirectorAgent(SupervisorAgent):
                 "cache_performance": self._get_cache_performance()
             }
         
-        total_feedback = len(self.feedback_history)
-        correct_classifications = sum(1 for f in self.feedback_history 
-                                    if f.predicted_intent == f.actual_intent)
-        
-        accuracy = correct_classifications / total_feedback if total_feedback > 0 else 0
-        
-        # Analyze performance by method
-        method_performance = {}
-        for method in ['keyword', 'llm', 'hybrid']:
-            method_feedback = [f for f in self.feedback_history if f.classification_method == method]
-            if method_feedback:
-                method_correct = sum(1 for f in method_feedback if f.predicted_intent == f.actual_intent)
-                method_performance[method] = {
-                    'accuracy': method_correct / len(method_feedback),
-                    'total_samples': len(method_feedback)
-                }
-        
-        # Find common misclassifications
-        misclassifications = {}
-        for f in self.feedback_history:
-            if f.predicted_intent != f.actual_intent:
-                key = f"{f.predicted_intent} -> {f.actual_intent}"
-                misclassifications[key] = misclassifications.get(key, 0) + 1
-        
-        common_misclassifications = sorted(misclassifications.items(), 
-                                         key=lambda x: x[1], reverse=True)[:5]
-        
         return {
             "total_feedback": total_feedback,
             "accuracy": accuracy,
             "correct_classifications": correct_classifications,
             "method_performance": method_performance,
             "common_misclassifications": common_misclassifications,
+            "confusion_matrix": confusion_matrix,
             "training_examples": {
                 dept: len(examples) for dept, examples in self.dataset_manager.get_examples().items()
             },
@@ -1296,38 +1814,23 @@ class DirectorAgent(SupervisorAgent):
         }
     
     def _get_cache_performance(self) -> Dict[str, Any]:
-        """Get cache hit/miss statistics"""
-        if not self.classification_cache:
-            return {"cache_entries": 0, "total_hits": 0, "cache_efficiency": 0}
-        
-        total_hits = sum(entry.hit_count - 1 for entry in self.classification_cache.values())  # -1 because first access isn't a hit
-        cache_entries = len(self.classification_cache)
+        """Get cache hit/miss/eviction statistics"""
+        stats = self.classification_cache.get_stats()
         
         # Calculate cache efficiency (hits per entry)
-        cache_efficiency = total_hits / cache_entries if cache_entries > 0 else 0
-        
-        return {
-            "cache_entries": cache_entries,
-            "total_hits": total_hits,
-            "cache_efficiency": cache_efficiency,
-            "valid_entries": sum(1 for entry in self.classification_cache.values() if entry.is_valid())
-        }
+        stats["cache_efficiency"] = (
+            stats["total_hits"] / stats["cache_entries"] if stats["cache_entries"] > 0 else 0
+        )
+        if self.persistent_cache is not None:
+            stats["persistent_cache"] = self.persistent_cache.get_stats()
+        return stats
     
     def cleanup_classification_cache(self, max_age_hours: int = 24) -> int:
         """
         Clean up expired cache entries
         Returns number of entries removed
         """
-        removed_count = 0
-        expired_keys = []
-        
-        for key, entry in self.classification_cache.items():
-            if not entry.is_valid(max_age_hours):
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.classification_cache[key]
-            removed_count += 1
+        removed_count = self.classification_cache.cleanup_expired(max_age_hours * 3600)
         
         if removed_count > 0:
             log_agent_action(self.name, f"Cleaned up {removed_count} expired cache entries")
@@ -1390,10 +1893,9 @@ class DirectorAgent(SupervisorAgent):
             )
             
             # Store decision for analytics
-            self.routing_decisions.append(decision)
-            
-            # Update strategy usage metrics
             with self._lock:
+                self.routing_decisions.append(decision)
+                self.total_routing_decisions += 1
                 self.metrics.routing_strategy_usage[strategy.value] = (
                     self.metrics.routing_strategy_usage.get(strategy.value, 0) + 1
                 )
@@ -1426,7 +1928,7 @@ class DirectorAgent(SupervisorAgent):
         available_agents = self._get_available_agents_for_intent(intent)
         
         # Strategy selection logic
-        if task_complexity >= 8 and len(available_agents) >= 2:
+        if task_complexity >= 8 and len(self._get_scatter_gather_agents(intent)) >= 2:
             # High complexity tasks benefit from multiple perspectives
             return RoutingStrategy.SCATTER_GATHER
         elif confidence < self.config.routing_confidence_threshold and len(available_agents) >= 2:
@@ -1471,19 +1973,33 @@ class DirectorAgent(SupervisorAgent):
         return min(complexity_score, 10)  # Cap at 10
 
     def _get_available_agents_for_intent(self, intent: str) -> List[str]:
-        """Get list of available agents that can handle the given intent"""
-        available_agents = []
-        
-        # Check primary department agent
-        if intent in self.department_agents:
-            agent = self.department_agents[intent]
-            if agent.is_available():
-                available_agents.append(intent)
-        
-        # Check for alternative agents (future enhancement)
-        # This could include agents from related departments or multi-skilled agents
+        """
+        Get list of available agents that can handle the given intent: the
+        intent's own department first, then other registered departments that
+        serve it
+        """
+        candidates = [intent] if intent in self.department_agents else []
+        candidates.extend(department for department in self.department_agents
+                          if department != intent and self._department_serves_intent(department, intent))
         
-        return available_agents
+        return [department for department in candidates if self.department_agents[department].is_available()]
+    
+    def _department_serves_intent(self, department: str, intent: str) -> bool:
+        """Whether a department's agent was registered for, or declares the capability of, an intent"""
+        if intent in self.department_intents.get(department, ()):
+            return True
+        capabilities = getattr(self.department_agents[department], 'capabilities', None)
+        return isinstance(capabilities, (list, tuple, set, dict)) and intent in capabilities
+    
+    def _get_scatter_gather_agents(self, intent: str) -> List[str]:
+        """The intent's department plus available complementary departments, for diverse perspectives"""
+        selected = [intent]
+        for dept in self._get_complementary_departments(intent):
+            if dept in self.department_agents and self.department_agents[dept].is_available():
+                selected.append(dept)
+                if len(selected) >= self.config.max_parallel_agents:
+                    break
+        return selected
 
     def _select_agents_for_strategy(self, strategy: RoutingStrategy, intent: str, task: Task) -> List[str]:
         """Select specific agents based on routing strategy"""
@@ -1492,31 +2008,19 @@ class DirectorAgent(SupervisorAgent):
             return [intent]
         
         elif strategy == RoutingStrategy.PARALLEL_AGENTS:
-            # Select up to max_parallel_agents for parallel execution
+            # Select up to max_parallel_agents for parallel execution, least outstanding work first
             available_agents = self._get_available_agents_for_intent(intent)
-            return available_agents[:self.config.max_parallel_agents]
+            return self.agent_stats.rank(available_agents)[:self.config.max_parallel_agents]
         
         elif strategy == RoutingStrategy.SCATTER_GATHER:
             # Select agents from different departments for diverse perspectives
-            selected = [intent]
-            
-            # Add complementary departments
-            complementary_depts = self._get_complementary_departments(intent)
-            for dept in complementary_depts:
-                if dept in self.department_agents and self.department_agents[dept].is_available():
-                    selected.append(dept)
-                    if len(selected) >= self.config.max_parallel_agents:
-                        break
-            
-            return selected
+            return self._get_scatter_gather_agents(intent)
         
         elif strategy == RoutingStrategy.LOAD_BALANCED:
-            # Select agent with lowest current workload
+            # Power-of-two-choices over in-flight work, EWMA latency and success rate
             available_agents = self._get_available_agents_for_intent(intent)
             if available_agents:
-                # Sort by workload (ascending)
-                sorted_agents = sorted(available_agents, key=lambda a: self.agent_workload.get(a, 0))
-                return [sorted_agents[0]]
+                return [self.agent_stats.choose(available_agents)]
             
         return [intent]  # Fallback
 
@@ -1532,7 +2036,28 @@ class DirectorAgent(SupervisorAgent):
         return complementary_map.get(primary_intent, [])
 
     def _estimate_execution_time(self, strategy: RoutingStrategy, selected_agents: List[str], task: Task) -> float:
-        """Estimate execution time based on strategy and agents"""
+        """
+        Estimate execution time from observed agent latencies, falling back to a
+        complexity heuristic for agents that have not completed any tasks yet
+        """
+        estimates = []
+        for agent in selected_agents:
+            observed = self.agent_stats.percentile(agent, 0.5)
+            if observed is None:
+                return self._estimate_execution_time_heuristic(strategy, task)
+            estimates.append(observed)
+        
+        if not estimates:
+            return self._estimate_execution_time_heuristic(strategy, task)
+        if strategy == RoutingStrategy.PARALLEL_AGENTS and self.config.parallel_completion_mode == 'first_n':
+            return min(estimates)
+        if strategy in (RoutingStrategy.PARALLEL_AGENTS, RoutingStrategy.SCATTER_GATHER):
+            # Waiting on several agents is bounded by the slowest of them
+            return max(estimates)
+        return estimates[0]
+
+    def _estimate_execution_time_heuristic(self, strategy: RoutingStrategy, task: Task) -> float:
+        """Estimate execution time from task complexity when no latencies are observed"""
         
         base_time = 30.0  # Base execution time in seconds
         
@@ -1595,9 +2120,16 @@ class DirectorAgent(SupervisorAgent):
             # Make routing decision
             decision = self.make_routing_decision(task, intent, confidence)
             
-            # For now, use existing routing logic but with enhanced decision metadata
-            # Future enhancement: implement full parallel execution
-            result = self.route_task(task, intent, confidence)
+            if (decision.strategy in (RoutingStrategy.PARALLEL_AGENTS, RoutingStrategy.SCATTER_GATHER)
+                    and len(decision.selected_agents) > 1):
+                result = self._execute_parallel(task, intent, decision)
+            else:
+                # Load balancing may have picked an agent other than the intent's default
+                primary = decision.selected_agents[0] if decision.selected_agents else intent
+                if self._should_hedge(primary, confidence, decision):
+                    result = self._execute_hedged(task, primary, decision)
+                else:
+                    result = self.route_task(task, primary, confidence)
             
             # Add routing metadata to result
             result["routing_decision"] = {
@@ -1616,17 +2148,351 @@ class DirectorAgent(SupervisorAgent):
             log_agent_action(self.name, error_msg)
             return self._create_error_response(error_msg, task.id)
 
+    def _execute_parallel(self, task: Task, intent: str, decision: RoutingDecision) -> Dict[str, Any]:
+        """
+        Fan a task out to the selected department agents and aggregate their results.
+        PARALLEL_AGENTS completes according to parallel_completion_mode while
+        SCATTER_GATHER waits for every agent; both are bounded by
+        parallel_timeout_seconds, and agents still queued once the outcome is
+        decided are cancelled.
+        """
+        agents = [(department, self.department_agents[department])
+                  for department in decision.selected_agents if department in self.department_agents]
+        if len(agents) < 2:
+            return self.route_task(task, intent, decision.confidence)
+        
+        if decision.strategy == RoutingStrategy.SCATTER_GATHER:
+            mode = 'all'
+        else:
+            mode = self.config.parallel_completion_mode
+        required = self._required_parallel_results(mode, len(agents))
+        
+        from flask import current_app, has_app_context
+        app = current_app._get_current_object() if has_app_context() else None
+        
+        futures = {
+            self.thread_pool.submit(self._run_parallel_agent, app, task, department, agent): department
+            for department, agent in agents
+        }
+        with self._lock:
+            self.metrics.parallel_executions += 1
+        
+        results: List[TaskExecutionResult] = []
+        pending = set(futures)
+        deadline = time.monotonic() + self.config.parallel_timeout_seconds
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            results.extend(future.result() for future in done)
+            if self._parallel_outcome_decided(mode, required, results):
+                break
+        
+        # Queued stragglers are cancelled; running ones finish in the background and are ignored
+        cancelled = [futures[future] for future in pending if future.cancel()]
+        abandoned = [futures[future] for future in pending if not future.cancelled()]
+        
+        aggregated = self._aggregate_parallel_results(decision.strategy, mode, intent, results)
+        if aggregated is None:
+            error_msg = f"All {len(agents)} parallel agents failed or timed out for task {task.id}"
+            log_agent_action(self.name, error_msg)
+            return self._create_error_response(error_msg, task.id)
+        
+        with self._lock:
+            self.metrics.aggregated_results += 1
+        
+        aggregated.execution_summary.update({
+            'required_results': required,
+            'cancelled_agents': cancelled,
+            'abandoned_agents': abandoned
+        })
+        primary = aggregated.individual_results[0]
+        response = self._create_success_response(primary.department, primary.agent_name,
+                                                 task.id, aggregated.primary_result)
+        response["aggregation"] = {
+            "method": aggregated.aggregation_method,
+            "consensus_score": aggregated.consensus_score,
+            "conflicts_detected": aggregated.conflicts_detected,
+            "execution_summary": aggregated.execution_summary,
+            "individual_results": [
+                {
+                    "agent_name": r.agent_name,
+                    "department": r.department,
+                    "status": r.status,
+                    "execution_time": r.execution_time,
+                    "errors": r.errors
+                }
+                for r in aggregated.individual_results
+            ]
+        }
+        if decision.strategy == RoutingStrategy.SCATTER_GATHER:
+            response["aggregation"]["department_results"] = {
+                r.department: r.result for r in aggregated.individual_results if r.status == 'success'
+            }
+        
+        log_agent_action(self.name, f"Parallel execution of task {task.id} across {len(agents)} agents "
+                                    f"({aggregated.aggregation_method}, consensus {aggregated.consensus_score:.2f})")
+        return response
+
+    def _should_hedge(self, intent: str, confidence: float, decision: RoutingDecision) -> bool:
+        """Hedge single-agent routes that have a registered, available fallback agent"""
+        if not self.config.enable_hedged_requests:
+            return False
+        if confidence < self.config.routing_confidence_threshold:
+            return False
+        primary = self.department_agents.get(intent)
+        if primary is None or not primary.is_available():
+            return False
+        return self._get_hedge_department(intent, decision) is not None
+
+    def _get_hedge_department(self, intent: str, decision: RoutingDecision) -> Optional[str]:
+        """First fallback department with an available agent other than the primary"""
+        for department in decision.fallback_agents or []:
+            agent = self.department_agents.get(department)
+            if department != intent and agent is not None and agent.is_available():
+                return department
+        return None
+
+    @property
+    def agent_workload(self) -> Dict[str, int]:
+        """Executions currently in flight per department agent"""
+        return self.agent_stats.in_flight_counts()
+
+    def _finish_agent_execution(self, department: str, seconds: float, success: bool):
+        """Record a finished execution in the live agent statistics"""
+        self.agent_stats.end(department, seconds, success)
+        success_rate = self.agent_stats.ewma_success(department)
+        with self._lock:
+            self.metrics.agent_performance_scores[department] = success_rate
+
+    def get_latency_percentile(self, department: str, percentile: float) -> Optional[float]:
+        """Observed latency percentile for a department, or None without samples"""
+        return self.agent_stats.percentile(department, percentile)
+
+    def _acquire_hedge_token(self, department: str) -> bool:
+        """
+        Credit the department's hedge budget for one primary request and try to
+        spend a token on a hedge. The ratio is capped at 1.0 so hedging can at
+        most double a department's load.
+        """
+        ratio = min(max(self.config.hedge_budget_ratio, 0.0), 1.0)
+        with self._lock:
+            tokens = min(self._hedge_tokens[department] + ratio, max(1.0, ratio * 10))
+            if tokens >= 1.0:
+                self._hedge_tokens[department] = tokens - 1.0
+                return True
+            self._hedge_tokens[department] = tokens
+            self.hedge_stats[department]['budget_exhausted'] += 1
+            return False
+
+    def _execute_hedged(self, task: Task, intent: str, decision: RoutingDecision) -> Dict[str, Any]:
+        """
+        Run the task on the primary department agent and, if it has not answered
+        by its observed latency percentile, launch the same task on the first
+        fallback agent. The first successful answer wins; the loser is cancelled
+        if still queued and ignored otherwise.
+        
+        Both run on their own pool, and the hedge delay is counted from when the
+        primary starts executing, so time spent queued never triggers a hedge.
+        """
+        hedge_department = self._get_hedge_department(intent, decision)
+        samples = self.agent_stats.sample_count(intent)
+        if hedge_department is None or samples < self.config.hedge_min_samples:
+            return self.route_task(task, intent, decision.confidence)
+        
+        hedge_delay = self.get_latency_percentile(intent, self.config.hedge_latency_percentile)
+        with self._lock:
+            self.hedge_stats[intent]['eligible'] += 1
+        
+        from flask import current_app, has_app_context
+        app = current_app._get_current_object() if has_app_context() else None
+        
+        deadline = time.monotonic() + self.config.task_timeout_minutes * 60
+        primary_started = threading.Event()
+        primary_future = self.hedge_pool.submit(self._run_parallel_agent, app, task, intent,
+                                                self.department_agents[intent], primary_started)
+        futures = {primary_future: intent}
+        primary_started.wait(timeout=max(0.0, deadline - time.monotonic()))
+        done, _ = wait([primary_future], timeout=hedge_delay)
+        
+        # A primary that already failed fails over without spending hedge budget
+        primary_failed = bool(done) and primary_future.result().status != 'success'
+        hedged = not done and self._acquire_hedge_token(intent)
+        if primary_failed or hedged:
+            hedge_future = self.hedge_pool.submit(self._run_parallel_agent, app, task, hedge_department,
+                                                  self.department_agents[hedge_department])
+            futures[hedge_future] = hedge_department
+        if hedged:
+            with self._lock:
+                self.hedge_stats[intent]['hedged'] += 1
+                self.metrics.hedged_requests += 1
+            log_agent_action(self.name, f"Hedging task {task.id} to {hedge_department} after {hedge_delay:.3f}s")
+        
+        failures: List[TaskExecutionResult] = []
+        pending = set(futures)
+        winner: Optional[TaskExecutionResult] = None
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                execution = future.result()
+                if execution.status == 'success' and winner is None:
+                    winner = execution
+                elif execution.status != 'success':
+                    failures.append(execution)
+        
+        for future in pending:
+            future.cancel()
+        
+        if winner is None:
+            errors = "; ".join(error for f in failures for error in (f.errors or []))
+            error_msg = f"Hedged execution failed for task {task.id}: {errors or 'timed out'}"
+            log_agent_action(self.name, error_msg)
+            return self._create_error_response(error_msg, task.id)
+        
+        if hedged and winner.department == hedge_department:
+            with self._lock:
+                self.hedge_stats[intent]['hedge_wins'] += 1
+                self.metrics.hedge_wins += 1
+        
+        response = self._create_success_response(winner.department, winner.agent_name, task.id, winner.result)
+        response["hedge"] = {
+            "hedged": hedged,
+            "failed_over": primary_failed,
+            "hedge_department": hedge_department,
+            "hedge_delay_seconds": hedge_delay,
+            "winner": winner.department
+        }
+        return response
+
+    def _required_parallel_results(self, mode: str, agent_count: int) -> int:
+        """Number of results needed before a parallel execution can complete"""
+        if mode == 'first_n':
+            return min(max(1, self.config.parallel_first_n), agent_count)
+        if mode == 'quorum':
+            return min(max(1, math.ceil(self.config.consensus_threshold * agent_count)), agent_count)
+        return agent_count
+
+    def _parallel_outcome_decided(self, mode: str, required: int,
+                                  results: List[TaskExecutionResult]) -> bool:
+        """
+        Check whether a parallel execution can stop waiting for stragglers.
+        Short of the target, every agent is awaited so a best-effort answer survives.
+        """
+        if mode == 'all':
+            return False
+        
+        successful = [r for r in results if r.status == 'success']
+        if mode == 'first_n':
+            reached = len(successful)
+        else:
+            groups = self._group_agreeing_results(successful)
+            reached = max((len(group) for group in groups.values()), default=0)
+        
+        return reached >= required
+
+    def _run_parallel_agent(self, app, task: Task, department: str, agent,
+                            started: Optional[threading.Event] = None) -> TaskExecutionResult:
+        """
+        Execute a task on one department agent inside a worker thread, through
+        _execute_through_agent so assignment, agent statistics and auto-retry apply
+        """
+        if started is not None:
+            started.set()
+        start_time = time.perf_counter()
+        try:
+            if app is not None:
+                with app.app_context():
+                    response = self._execute_through_agent(self._load_task_for_worker(task), department, agent)
+            else:
+                response = self._execute_through_agent(task, department, agent)
+        except Exception as e:
+            response = {"status": "error", "error": str(e)}
+        
+        result = response.get('result') if response.get('status') == 'success' else None
+        if result is not None and not isinstance(result, dict):
+            result = {"result": result}
+        failed = result is None or result.get('status') in FAILED_RESULT_STATUSES
+        error = (result or response).get('error') if failed else None
+        if failed:
+            logger.error(f"Parallel execution on {department} agent failed: {error}")
+        return TaskExecutionResult(
+            agent_name=getattr(agent, 'name', department),
+            department=department,
+            status='error' if failed else 'success',
+            result=result or {},
+            execution_time=time.perf_counter() - start_time,
+            errors=[str(error)] if error else None
+        )
+
+    def _load_task_for_worker(self, task: Task) -> Task:
+        """Load the task into the worker thread's own session"""
+        if isinstance(task, Task) and task.id is not None:
+            return db.session.get(Task, task.id) or task
+        return task
+
+    def _group_agreeing_results(self, results: List[TaskExecutionResult]) -> Dict[str, List[TaskExecutionResult]]:
+        """Group results whose payloads agree, ignoring volatile keys like timestamps"""
+        groups: Dict[str, List[TaskExecutionResult]] = OrderedDict()
+        for result in results:
+            payload = {k: v for k, v in result.result.items() if k not in VOLATILE_RESULT_KEYS}
+            signature = hashlib.md5(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+            groups.setdefault(signature, []).append(result)
+        return groups
+
+    def _aggregate_parallel_results(self, strategy: RoutingStrategy, mode: str, intent: str,
+                                    results: List[TaskExecutionResult]) -> Optional[AggregatedResult]:
+        """
+        Aggregate parallel results into one answer. The largest group of agreeing
+        results wins; scatter-gather prefers the primary department's answer.
+        Returns None when no agent succeeded.
+        """
+        successful = [r for r in results if r.status == 'success']
+        if not successful:
+            return None
+        
+        groups = self._group_agreeing_results(successful)
+        majority = max(groups.values(), key=len)
+        consensus_score = len(majority) / len(successful)
+        
+        if strategy == RoutingStrategy.SCATTER_GATHER:
+            method = 'scatter_gather'
+            primary = next((r for r in successful if r.department == intent), majority[0])
+        else:
+            method = mode
+            primary = majority[0]
+        
+        ordered = [primary] + [r for r in results if r is not primary]
+        return AggregatedResult(
+            primary_result=primary.result,
+            individual_results=ordered,
+            aggregation_method=method,
+            consensus_score=consensus_score,
+            conflicts_detected=len(groups) > 1,
+            execution_summary={
+                'responses': len(results),
+                'successful': len(successful),
+                'failed': len(results) - len(successful),
+                'consensus_reached': consensus_score >= self.config.consensus_threshold
+            }
+        )
+
     def get_routing_analytics(self) -> Dict[str, Any]:
         """Get comprehensive routing analytics and performance metrics"""
         
         with self._lock:
             analytics = {
-                "routing_decisions": len(self.routing_decisions),
+                "routing_decisions": self.total_routing_decisions,
                 "strategy_usage": dict(self.metrics.routing_strategy_usage),
                 "agent_performance": dict(self.metrics.agent_performance_scores),
                 "agent_workload": dict(self.agent_workload),
+                "agent_stats": self.agent_stats.snapshot(),
                 "parallel_executions": self.metrics.parallel_executions,
                 "aggregated_results": self.metrics.aggregated_results,
+                "hedging": self._get_hedging_analytics(),
                 "recent_decisions": [
                     {
                         "strategy": d.strategy.value,
@@ -1635,8 +2501,30 @@ class DirectorAgent(SupervisorAgent):
                         "reasoning": d.reasoning,
                         "timestamp": d.created_at.isoformat()
                     }
-                    for d in self.routing_decisions[-10:]  # Last 10 decisions
+                    for d in reversed(list(islice(reversed(self.routing_decisions), 10)))  # Last 10 decisions
                 ]
             }
         
-        return analytics 
\ No newline at end of file
+        return analytics
+
+    def _get_hedging_analytics(self) -> Dict[str, Any]:
+        """Summarize hedged request counts overall and per department"""
+        with self._lock:
+            per_department = {dept: dict(stats) for dept, stats in self.hedge_stats.items()}
+        
+        for dept, stats in per_department.items():
+            stats['hedge_rate'] = stats['hedged'] / stats['eligible'] if stats['eligible'] else 0.0
+            stats['hedge_delay_seconds'] = self.get_latency_percentile(dept, self.config.hedge_latency_percentile)
+        
+        eligible = sum(stats['eligible'] for stats in per_department.values())
+        hedged = sum(stats['hedged'] for stats in per_department.values())
+        wins = sum(stats['hedge_wins'] for stats in per_department.values())
+        return {
+            "eligible_requests": eligible,
+            "hedged_requests": hedged,
+            "hedge_wins": wins,
+            "hedge_rate": hedged / eligible if eligible else 0.0,
+            "hedge_win_rate": wins / hedged if hedged else 0.0,
+            "per_department": per_department
+        }
+ 
\ No newline at end of file
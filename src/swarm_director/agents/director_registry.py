@@ -0,0 +1,237 @@
+"""
+Director registry for SwarmDirector
+Keeps one long-lived DirectorAgent (and its department agents) per Flask app so
+request handlers do not rebuild the classifier, thread pool and department
+agents on every task submission.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from sqlalchemy import event, inspect
+
+from .director import DirectorAgent, DirectorConfig
+from ..models.base import db
+from ..models.agent import Agent, AgentType
+
+logger = logging.getLogger(__name__)
+
+DIRECTOR_AGENT_NAME = 'DirectorAgent'
+
+# Bumped whenever an Agent row is inserted, updated or deleted in this process
+_agent_generation = 0
+_generation_lock = threading.Lock()
+
+# Columns agents rewrite while serving traffic; the shared director keeps its own
+# copy of these, so updates touching only them do not make it stale
+_RUNTIME_AGENT_COLUMNS = frozenset({
+    'status', 'tasks_completed', 'success_rate', 'average_response_time', 'updated_at'
+})
+
+
+def _bump_agent_generation(mapper, connection, target):
+    """SQLAlchemy mapper hook marking cached directors as stale"""
+    global _agent_generation
+    with _generation_lock:
+        _agent_generation += 1
+
+
+def _bump_on_structural_update(mapper, connection, target):
+    """Mark cached directors stale unless only runtime columns changed"""
+    state = inspect(target)
+    changed = {attr.key for attr in state.attrs if attr.history.has_changes()}
+    if changed - _RUNTIME_AGENT_COLUMNS:
+        _bump_agent_generation(mapper, connection, target)
+
+
+def get_agent_generation() -> int:
+    """Get the current Agent table generation counter"""
+    return _agent_generation
+
+
+event.listen(Agent, 'after_insert', _bump_agent_generation)
+event.listen(Agent, 'after_update', _bump_on_structural_update)
+event.listen(Agent, 'after_delete', _bump_agent_generation)
+
+
+class DirectorRegistry:
+    """
+    Builds a DirectorAgent once and shares it across request threads.
+
+    The director is rebuilt lazily when the registry is invalidated, when the
+    configuration changes through update_config, or when an Agent row changes.
+    Readers never block on a rebuild already in progress; they keep using the
+    previous instance until the new one has been swapped in.
+    """
+
+    def __init__(self, app=None, config: Optional[DirectorConfig] = None):
+        self.app = app
+        self.config = config
+        self._director: Optional[DirectorAgent] = None
+        self._generation = -1
+        self._build_lock = threading.Lock()
+        # Guards _stats; separate from _build_lock so hits never wait on a build
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'builds': 0,
+            'rebuilds': 0,
+            'hits': 0,
+            'build_failures': 0,
+            'last_build_seconds': 0.0
+        }
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Attach the registry to a Flask application"""
+        self.app = app
+        if self.config is None:
+            self.config = app.config.get('DIRECTOR_CONFIG')
+        app.extensions['director_registry'] = self
+
+    def get_director(self) -> DirectorAgent:
+        """
+        Get the shared DirectorAgent, building or rebuilding it when stale.
+        Must be called inside an application context.
+        """
+        director = self._director
+        if director is not None and self._generation == get_agent_generation():
+            self._count('hits')
+            return director
+
+        with self._build_lock:
+            # Another thread may have rebuilt while we waited for the lock
+            if self._director is not None and self._generation == get_agent_generation():
+                self._count('hits')
+                return self._director
+            return self._rebuild(self.config)
+
+    def warm(self) -> bool:
+        """Build the director ahead of the first request"""
+        try:
+            with self.app.app_context():
+                self.get_director()
+            return True
+        except Exception as e:
+            logger.info(f"DirectorAgent warm-up deferred until first request: {e}")
+            return False
+
+    def update_config(self, new_config: DirectorConfig) -> DirectorAgent:
+        """Build a director with the new configuration and swap it in"""
+        with self._build_lock:
+            director = self._rebuild(new_config)
+            self.config = new_config
+            return director
+
+    def invalidate(self):
+        """Force the next get_director call to build a fresh instance"""
+        with self._build_lock:
+            self._generation = -1
+
+    def shutdown(self):
+        """Release the shared director and its worker threads"""
+        with self._build_lock:
+            if self._director is not None:
+                self._retire(self._director)
+                self._director = None
+            self._generation = -1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            'director_ready': self._director is not None,
+            'generation': self._generation,
+            'agent_generation': get_agent_generation()
+        }
+
+    def _rebuild(self, config: Optional[DirectorConfig]) -> DirectorAgent:
+        """Build a new director and atomically replace the current one"""
+        start_time = time.perf_counter()
+        try:
+            director = DirectorAgent(self._get_or_create_director_db(), config)
+            self._detach_agent_rows(director)
+        except Exception:
+            self._count('build_failures')
+            db.session.rollback()
+            raise
+
+        # Rows created while building bump the generation; take it afterwards
+        previous = self._director
+        self._director = director
+        self._generation = get_agent_generation()
+
+        if previous is None:
+            self._count('builds')
+        else:
+            self._count('rebuilds')
+            self._retire(previous)
+
+        build_seconds = time.perf_counter() - start_time
+        with self._stats_lock:
+            self._stats['last_build_seconds'] = build_seconds
+        logger.info(f"DirectorAgent built in {build_seconds:.3f}s")
+        return director
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def _get_or_create_director_db(self) -> Agent:
+        """Get or create the DirectorAgent database row"""
+        director_db = Agent.query.filter_by(
+            agent_type=AgentType.SUPERVISOR,
+            name=DIRECTOR_AGENT_NAME
+        ).first()
+
+        if not director_db:
+            director_db = Agent(
+                name=DIRECTOR_AGENT_NAME,
+                agent_type=AgentType.SUPERVISOR,
+                capabilities=['routing', 'intent_classification', 'task_delegation']
+            )
+            director_db.save()
+
+        return director_db
+
+    def _detach_agent_rows(self, director: DirectorAgent):
+        """
+        Load and detach the director's and its departments' Agent rows so they
+        remain readable after the building request's session is closed. Other
+        rows in the session stay with it; agents write through a
+        session-local copy of their row (see BaseAgent.update_status).
+        """
+        rows = [director.db_agent] + [getattr(agent, 'db_agent', None)
+                                      for agent in director.department_agents.values()]
+        for row in rows:
+            if isinstance(row, Agent) and row in db.session:
+                db.session.refresh(row)
+                db.session.expunge(row)
+
+    def _retire(self, director: DirectorAgent):
+        """Stop accepting new work on a replaced director"""
+        try:
+            director.shutdown()
+        except Exception as e:
+            logger.debug(f"Error shutting down retired director: {e}")
+
+
+def get_director_registry(app=None) -> Optional[DirectorRegistry]:
+    """Get the director registry attached to the given or current app"""
+    if app is None:
+        from flask import current_app
+        app = current_app
+    return app.extensions.get('director_registry')
+
+
+def initialize_director_registry(app, warm: bool = True) -> DirectorRegistry:
+    """Create the director registry for an app and optionally warm it"""
+    registry = DirectorRegistry(app)
+    if warm and app.config.get('DIRECTOR_WARM_ON_STARTUP', True):
+        registry.warm()
+    return registry
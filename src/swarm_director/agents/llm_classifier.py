@@ -0,0 +1,307 @@
+"""
+LLM intent classification support for SwarmDirector
+Provides long-lived provider clients and a micro-batcher that folds concurrent
+classification requests into a single multi-item prompt.
+"""
+
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Optional provider SDKs
+try:
+    import openai
+    HAS_OPENAI = True
+except ImportError:
+    HAS_OPENAI = False
+
+try:
+    import anthropic
+    HAS_ANTHROPIC = True
+except ImportError:
+    HAS_ANTHROPIC = False
+
+logger = logging.getLogger(__name__)
+
+CLASSIFIER_SYSTEM_MESSAGE = "You are an expert task classifier. Respond with only DEPARTMENT|CONFIDENCE format."
+
+# Matches "3. ANALYSIS|0.9", "3) analysis | 0.9" or "3: ANALYSIS|0.9"
+_NUMBERED_LINE = re.compile(r'^\s*(\d+)\s*[\.\):]\s*(.+?)\s*$')
+
+
+class LLMClassificationProvider:
+    """Base class for LLM providers used for intent classification"""
+
+    name = "base"
+
+    def complete(self, prompt: str, max_tokens: int = 50) -> Optional[str]:
+        """Send a prompt and return the raw text response, or None on failure"""
+        raise NotImplementedError
+
+
+class OpenAIClassificationProvider(LLMClassificationProvider):
+    """OpenAI chat completions provider holding one long-lived client"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Create the SDK client on first use; it pools HTTP connections internally"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
+    def complete(self, prompt: str, max_tokens: int = 50) -> Optional[str]:
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": CLASSIFIER_SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.1
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.debug(f"OpenAI API error: {e}")
+            return None
+
+
+class AnthropicClassificationProvider(LLMClassificationProvider):
+    """Anthropic messages provider holding one long-lived client"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = "claude-3-haiku-20240307"):
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Create the SDK client on first use; it pools HTTP connections internally"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = anthropic.Anthropic(api_key=self.api_key)
+        return self._client
+
+    def complete(self, prompt: str, max_tokens: int = 50) -> Optional[str]:
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                messages=[
+                    {"role": "user", "content": f"{CLASSIFIER_SYSTEM_MESSAGE}\n\n{prompt}"}
+                ]
+            )
+            return response.content[0].text.strip()
+        except Exception as e:
+            logger.debug(f"Anthropic API error: {e}")
+            return None
+
+
+_PROVIDER_CLASSES = {
+    'openai': OpenAIClassificationProvider,
+    'anthropic': AnthropicClassificationProvider
+}
+_provider_pool: Dict[Tuple[str, str], LLMClassificationProvider] = {}
+_provider_pool_lock = threading.Lock()
+
+
+def get_llm_provider(name: str, api_key: str) -> Optional[LLMClassificationProvider]:
+    """
+    Get the process-wide provider for a name/API key pair.
+    Returns None when the provider SDK is not installed.
+    """
+    if name == 'openai' and not HAS_OPENAI:
+        return None
+    if name == 'anthropic' and not HAS_ANTHROPIC:
+        return None
+
+    key = (name, api_key)
+    provider = _provider_pool.get(key)
+    if provider is None:
+        with _provider_pool_lock:
+            provider = _provider_pool.get(key)
+            if provider is None:
+                provider = _PROVIDER_CLASSES[name](api_key)
+                _provider_pool[key] = provider
+    return provider
+
+
+def parse_batch_response(response: str, count: int,
+                         parse_line: Callable[[str], Tuple[str, float]]) -> List[Optional[Tuple[str, float]]]:
+    """
+    Parse a numbered multi-item response into per-request results.
+    Items the model skipped come back as None.
+    """
+    results: List[Optional[Tuple[str, float]]] = [None] * count
+
+    for line in response.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        if 0 <= index < count and results[index] is None:
+            results[index] = parse_line(match.group(2))
+
+    # A single request may be answered without numbering
+    if count == 1 and results[0] is None and response.strip():
+        results[0] = parse_line(response)
+
+    return results
+
+
+class _PendingClassification:
+    """A request waiting in the batcher queue"""
+
+    __slots__ = ('text', 'future')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future: Future = Future()
+
+
+class ClassificationBatcher:
+    """
+    Collects concurrent classification requests for a short window and sends
+    them to the LLM as one multi-item prompt, then fans the parsed
+    DEPARTMENT|CONFIDENCE results back to the waiting callers.
+    """
+
+    def __init__(self, providers: List[LLMClassificationProvider],
+                 prompt_builder: Callable[[List[str]], str],
+                 parse_line: Callable[[str], Tuple[str, float]],
+                 batch_window_ms: float = 20.0,
+                 max_batch_size: int = 16,
+                 max_inflight_batches: int = 4):
+        self.providers = list(providers)
+        self.prompt_builder = prompt_builder
+        self.parse_line = parse_line
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: "queue.Queue[Optional[_PendingClassification]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight_batches,
+                                            thread_name_prefix="llm-classify")
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {
+            'requests': 0,
+            'batches': 0,
+            'provider_calls': 0,
+            'failed_items': 0,
+            'max_batch_size_seen': 0
+        }
+
+    def submit(self, text: str) -> Future:
+        """Queue a task text; the future resolves to (intent, confidence) or None"""
+        pending = _PendingClassification(text)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ClassificationBatcher is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="llm-batcher", daemon=True)
+                self._worker.start()
+            self.stats['requests'] += 1
+            # Enqueued under the lock so it cannot land behind close()'s sentinel
+            self._queue.put(pending)
+        return pending.future
+
+    def classify(self, text: str, timeout: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """Submit and wait for a single classification"""
+        return self.submit(text).result(timeout=timeout)
+
+    def close(self):
+        """Stop the collector thread; queued requests are still dispatched"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    def _run(self):
+        """Collector loop: block for the first item, then gather until the window closes"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._executor.submit(self._dispatch, batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[_PendingClassification]):
+        """Send one batch, trying providers in order until every item is answered"""
+        results: List[Optional[Tuple[str, float]]] = [None] * len(batch)
+
+        try:
+            with self._lock:
+                self.stats['batches'] += 1
+                self.stats['max_batch_size_seen'] = max(self.stats['max_batch_size_seen'], len(batch))
+
+            for provider in self.providers:
+                missing = [i for i, result in enumerate(results) if result is None]
+                if not missing:
+                    break
+
+                texts = [batch[i].text for i in missing]
+                prompt = self.prompt_builder(texts)
+                with self._lock:
+                    self.stats['provider_calls'] += 1
+                response = provider.complete(prompt, max_tokens=20 + 16 * len(texts))
+                if not response:
+                    continue
+
+                for i, parsed in zip(missing, parse_batch_response(response, len(texts), self.parse_line)):
+                    results[i] = parsed
+
+        except Exception as e:
+            logger.error(f"LLM batch classification error: {e}")
+
+        finally:
+            failed = 0
+            for pending, result in zip(batch, results):
+                if result is None:
+                    failed += 1
+                pending.future.set_result(result)
+            if failed:
+                with self._lock:
+                    self.stats['failed_items'] += failed
@@ -0,0 +1,225 @@
+"""
+Similarity-based intent classification for SwarmDirector
+Classifies tasks offline by comparing hashed TF-IDF vectors of the task text
+against the labelled examples held by IntentDatasetManager.
+"""
+
+import logging
+import math
+import re
+import threading
+import zlib
+from typing import Dict, List, Tuple
+
+# numpy is optional; the classifier is disabled without it
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class SimilarityIntentClassifier:
+    """
+    Top-k nearest-neighbour intent classifier over hashed character n-grams.
+
+    Each text is reduced to word tokens plus character 3- and 4-grams, hashed
+    into a fixed number of features and weighted with sublinear TF-IDF. A batch
+    of tasks is scored against every example with one matrix product; the k
+    most similar examples vote for their department, weighted by similarity.
+
+    New examples appended to the dataset manager (through add_example or
+    classification feedback) are featurized incrementally on the next call and
+    appended to the example matrix under the current IDF weights. IDF and the
+    full matrix are recomputed only once the example count has grown by
+    idf_refresh_growth since the last rebuild, so feedback costs O(D) per
+    example amortized rather than O(N*D).
+    """
+
+    def __init__(self, dataset_manager, n_features: int = 4096, top_k: int = 5,
+                 min_similarity: float = 0.05, fallback_department: str = 'coordination',
+                 batch_size: int = 512, idf_refresh_growth: float = 0.1):
+        if not HAS_NUMPY:
+            raise ImportError("numpy is required for similarity classification")
+
+        self.dataset_manager = dataset_manager
+        self.n_features = n_features
+        self.top_k = max(1, top_k)
+        self.min_similarity = min_similarity
+        self.fallback_department = fallback_department
+        self.batch_size = max(1, batch_size)
+        self.idf_refresh_growth = max(0.0, idf_refresh_growth)
+
+        self._lock = threading.Lock()
+        self._consumed: Dict[str, int] = {}
+        self._rows: List[Tuple["np.ndarray", "np.ndarray"]] = []
+        self._labels: List[int] = []
+        self._departments: List[str] = []
+        self._department_index: Dict[str, int] = {}
+        self._document_frequency = np.zeros(n_features, dtype=np.float32)
+        self._idf = np.ones(n_features, dtype=np.float32)
+        # Rows past len(self._rows) are spare capacity for appended examples
+        self._buffer = np.zeros((0, n_features), dtype=np.float32)
+        self._matrix = self._buffer
+        self._idf_documents = 0  # Example count when IDF was last computed
+        self._rebuilds = 0
+        self._label_array = np.zeros(0, dtype=np.int64)
+
+    def refresh(self) -> int:
+        """Featurize examples added since the last call; returns how many were ingested"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """Classify one task text"""
+        return self.classify_many([text])[0]
+
+    def classify_many(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Classify a batch of task texts with vectorized similarity scoring"""
+        with self._lock:
+            self._refresh_locked()
+            matrix, labels, idf = self._matrix, self._label_array, self._idf
+            departments = list(self._departments)
+
+        if not texts:
+            return []
+        if matrix.shape[0] == 0:
+            return [(self.fallback_department, 0.0)] * len(texts)
+
+        results: List[Tuple[str, float]] = []
+        k = min(self.top_k, matrix.shape[0])
+        for start in range(0, len(texts), self.batch_size):
+            chunk = texts[start:start + self.batch_size]
+            queries = self._vectorize(chunk, idf)
+            similarities = queries @ matrix.T
+
+            # Indices of the k most similar examples per row (unordered)
+            if k < matrix.shape[0]:
+                neighbours = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            else:
+                neighbours = np.broadcast_to(np.arange(k), (len(chunk), k))
+            neighbour_sims = np.take_along_axis(similarities, neighbours, axis=1)
+            weights = np.clip(neighbour_sims, 0.0, None)
+
+            votes = np.zeros((len(chunk), len(departments)), dtype=np.float32)
+            rows = np.repeat(np.arange(len(chunk)), k)
+            np.add.at(votes, (rows, labels[neighbours].ravel()), weights.ravel())
+
+            best = votes.argmax(axis=1)
+            totals = votes.sum(axis=1)
+            top_similarity = neighbour_sims.max(axis=1)
+
+            for i in range(len(chunk)):
+                if top_similarity[i] < self.min_similarity or totals[i] <= 0:
+                    results.append((self.fallback_department, 0.0))
+                else:
+                    results.append((departments[best[i]], float(votes[i, best[i]] / totals[i])))
+
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get classifier size statistics"""
+        with self._lock:
+            return {
+                'examples': len(self._labels),
+                'departments': len(self._departments),
+                'n_features': self.n_features,
+                'top_k': self.top_k,
+                'matrix_rebuilds': self._rebuilds
+            }
+
+    def _refresh_locked(self) -> int:
+        """Ingest the tail of each department's example list"""
+        added = 0
+        first_new = len(self._rows)
+        for department, examples in self.dataset_manager.get_examples().items():
+            consumed = self._consumed.get(department, 0)
+            if len(examples) <= consumed:
+                continue
+
+            if department not in self._department_index:
+                self._department_index[department] = len(self._departments)
+                self._departments.append(department)
+            label = self._department_index[department]
+
+            for example in examples[consumed:]:
+                indices, counts = self._features(example.text)
+                self._rows.append((indices, counts))
+                self._labels.append(label)
+                self._document_frequency[indices] += 1
+                added += 1
+            self._consumed[department] = len(examples)
+
+        if added:
+            self._update_matrix(first_new)
+        return added
+
+    def _update_matrix(self, first_new: int):
+        """Append rows from first_new on, or rebuild once the dataset has outgrown its IDF"""
+        documents = len(self._rows)
+        if documents > self._idf_documents * (1.0 + self.idf_refresh_growth):
+            self._rebuild_matrix()
+            return
+
+        if documents > self._buffer.shape[0]:
+            # Readers may hold a view of the old buffer, so grow into a new one
+            grown = np.zeros((max(documents, 2 * self._buffer.shape[0]), self.n_features), dtype=np.float32)
+            grown[:first_new] = self._buffer[:first_new]
+            self._buffer = grown
+        self._buffer[first_new:documents] = self._normalize(self._dense(self._rows[first_new:]) * self._idf)
+        self._matrix = self._buffer[:documents]
+        self._label_array = np.asarray(self._labels, dtype=np.int64)
+
+    def _rebuild_matrix(self):
+        """Recompute IDF weights and the normalized example matrix"""
+        documents = len(self._rows)
+        self._idf = (np.log((1.0 + documents) / (1.0 + self._document_frequency)) + 1.0).astype(np.float32)
+
+        self._buffer = self._normalize(self._dense(self._rows) * self._idf)
+        self._matrix = self._buffer
+        self._label_array = np.asarray(self._labels, dtype=np.int64)
+        self._idf_documents = documents
+        self._rebuilds += 1
+
+    def _dense(self, rows: List[Tuple["np.ndarray", "np.ndarray"]]) -> "np.ndarray":
+        """Scatter sparse (indices, counts) rows into a dense term-frequency matrix"""
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float32)
+        for row, (indices, counts) in enumerate(rows):
+            matrix[row, indices] = counts
+        return matrix
+
+    def _vectorize(self, texts: List[str], idf: "np.ndarray") -> "np.ndarray":
+        """Build normalized TF-IDF query vectors"""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices, counts = self._features(text)
+            matrix[row, indices] = counts
+        return self._normalize(matrix * idf)
+
+    def _features(self, text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Hash words and character n-grams into (feature indices, sublinear tf)"""
+        counts: Dict[int, int] = {}
+        for word in _TOKEN.findall(text.lower()):
+            padded = f"<{word}>"
+            grams = [f"w:{word}"]
+            for n in (3, 4):
+                grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+            for gram in grams:
+                index = zlib.crc32(gram.encode()) % self.n_features
+                counts[index] = counts.get(index, 0) + 1
+
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter((1.0 + math.log(c) for c in counts.values()),
+                             dtype=np.float32, count=len(counts))
+        return indices, values
+
+    @staticmethod
+    def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+        """L2-normalize rows, leaving all-zero rows untouched"""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
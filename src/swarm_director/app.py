@@ -85,7 +85,7 @@ def create_app(config_name='default'):
     initialize_async_processing(app)
     
     # Initialize request queue system for high load handling
-    initialize_request_queue_system(app)
+    initialize_request_queue_system(app, config_name)
     
     # Initialize adaptive throttling system
     initialize_adaptive_throttling_system(app)
@@ -123,6 +123,9 @@ def create_app(config_name='default'):
         print(f"Warning: Could not import models - {e}")
         pass
     
+    # Build the shared DirectorAgent ahead of the first /task request
+    initialize_director(app)
+    
     # Register CLI commands
     register_database_commands(app)
     
@@ -738,8 +741,7 @@ def register_routes(app):
             
             # Import here to avoid circular imports
             from .models.task import Task, TaskStatus, TaskPriority
-            from .models.agent import Agent, AgentType
-            from .agents.director import DirectorAgent
+            from .agents.director_registry import get_director_registry
             
             # Create task in database
             from datetime import datetime
@@ -765,29 +767,15 @@ def register_routes(app):
             # Generate unique task_id for response
             task_id = f"task_{task.id}_{task.created_at.strftime('%Y%m%d_%H%M%S')}"
             
-            # Get or create DirectorAgent
+            # Get the shared DirectorAgent (built once per app and reused)
             try:
-                director_db = Agent.query.filter_by(
-                    agent_type=AgentType.SUPERVISOR,
-                    name='DirectorAgent'
-                ).first()
-                
-                if not director_db:
-                    # Create DirectorAgent if it doesn't exist
-                    director_db = Agent(
-                        name='DirectorAgent',
-                        agent_type=AgentType.SUPERVISOR,
-                        capabilities=['routing', 'intent_classification', 'task_delegation']
-                    )
-                    director_db.save()
+                director = get_director_registry(app).get_director()
             except Exception as db_error:
                 raise DatabaseError(
                     f"Failed to access or create DirectorAgent: {str(db_error)}",
                     details={'operation': 'agent_access'}
                 )
             
-            director = DirectorAgent(director_db)
-            
             # Submit task for async processing
             try:
                 # Get the concurrency manager
@@ -3282,10 +3270,29 @@ def initialize_cost_tracking_system(app):
         pass
 
 
-def initialize_request_queue_system(app):
+def initialize_director(app):
+    """Initialize the shared DirectorAgent registry and warm it if possible"""
+    try:
+        from .agents.director_registry import initialize_director_registry
+        
+        registry = initialize_director_registry(app)
+        app.logger.info(
+            f"Director registry initialized (warm: {registry.get_stats()['director_ready']})"
+        )
+        return registry
+        
+    except Exception as e:
+        app.logger.error(f"Failed to initialize director registry: {e}")
+        return None
+
+
+def initialize_request_queue_system(app, config_name='default'):
     """Initialize request queue system for high load handling"""
     try:
-        from .utils.request_queue import initialize_request_queue_manager, RequestQueueConfig
+        from .utils.request_queue import (
+            initialize_request_queue_manager, get_request_queue_manager, RequestQueueConfig,
+            RequestType, QueuePriority
+        )
         from .utils.queue_middleware import initialize_queue_middleware
         
         # Create configuration for request queue system
@@ -3302,45 +3309,32 @@ def initialize_request_queue_system(app):
             process_groups_enabled=True
         )
         
-        # Initialize request queue manager
-        queue_manager = initialize_request_queue_manager(config)
+        # Queued requests replay through a copy of this app in each worker process
+        worker_processes = app.config.get('REQUEST_QUEUE_WORKER_PROCESSES', 0)
+        if worker_processes:
+            config.worker_handler = 'swarm_director.utils.queue_middleware:replay_in_worker'
+            config.worker_initializer = 'swarm_director.utils.queue_middleware:init_replay_worker'
+            config.worker_initargs = ('swarm_director.app:create_app', config_name)
+        
+        # Initialize request queue manager (shared by every app in the process)
+        queue_manager = get_request_queue_manager() or initialize_request_queue_manager(config)
+        if worker_processes and queue_manager.process_groups:
+            queue_manager.process_groups.configure_group(
+                'task_processing', worker_processes=worker_processes,
+                max_workers=max(worker_processes, queue_manager.process_groups.get_group_setting(
+                    'task_processing', 'max_workers', 1))
+            )
         
         # Store in app extensions
         app.extensions['request_queue_manager'] = queue_manager
         
-        # Initialize queue middleware
+        # Initialize queue middleware; the manager's event loop is started on
+        # the first request that actually gets queued
         queue_middleware = initialize_queue_middleware(app, queue_manager)
+        queue_middleware.queue_route('submit_task', RequestType.TASK_SUBMISSION, QueuePriority.NORMAL)
         
         app.logger.info("Request queue system initialized successfully")
         
-        # Initialize and start queue manager on first request
-        @app.before_first_request
-        def init_request_queue():
-            """Initialize request queue system on first request"""
-            try:
-                import asyncio
-                import threading
-                
-                async def start_queue_manager():
-                    await queue_manager.initialize()
-                    await queue_manager.start()
-                    app.logger.info("Request queue manager started successfully")
-                
-                def run_in_thread():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        new_loop.run_until_complete(start_queue_manager())
-                    finally:
-                        new_loop.close()
-                
-                # Start in background thread
-                thread = threading.Thread(target=run_in_thread, daemon=True)
-                thread.start()
-                
-            except Exception as e:
-                app.logger.error(f"Failed to start request queue manager: {e}")
-        
         return queue_manager, queue_middleware
         
     except ImportError as e:
@@ -3480,6 +3474,7 @@ def initialize_adaptive_throttling_system(app):
             enable_predictive_scaling=True,
             enable_emergency_throttling=True,
             smoothing_window=3,
+            season_length=1200,  # One hour of 3-second samples
             monitor_config=monitor_config
         )
         
@@ -35,6 +35,9 @@ class Config:
     AGENTS_PER_PAGE = 20
     LOG_TO_STDOUT = os.environ.get('LOG_TO_STDOUT')
     
+    # OS worker processes that run queued task submissions (0 runs them in-process)
+    REQUEST_QUEUE_WORKER_PROCESSES = int(os.environ.get('REQUEST_QUEUE_WORKER_PROCESSES', 0))
+    
     @staticmethod
     def init_app(app):
         """Initialize application with this configuration"""
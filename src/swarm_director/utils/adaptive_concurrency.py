@@ -0,0 +1,178 @@
+"""
+Adaptive Concurrency Limits for SwarmDirector
+Adjusts how much work may run at once from observed latency and errors,
+instead of a hand-tuned static max_concurrent.
+
+Two algorithms are available:
+- 'aimd': additive increase of one slot per limit's worth of good samples,
+  multiplicative decrease on an error or a sample slower than a latency
+  threshold, at most once per limit's worth of samples (TCP-style
+  congestion control).
+- 'gradient': compares a short-term latency average with the no-load
+  latency (the minimum seen); as queueing inflates latency the limit
+  shrinks in proportion, with headroom of sqrt(limit) so it keeps probing
+  for capacity. Under sustained load latency never returns to no-load, so
+  every probe_interval round trips the limit is halved and the no-load
+  latency measured afresh; this also follows a backend that got slower.
+
+A round trip is a limit's worth of samples: each slot reports about once
+per round trip, so per-sample adjustments are scaled by 1/limit.
+"""
+
+import math
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LIMIT_ALGORITHMS = ('aimd', 'gradient')
+
+@dataclass
+class AdaptiveLimitConfig:
+    """Configuration for an adaptive concurrency limit"""
+    algorithm: str = 'gradient'
+    initial_limit: int = 20
+    min_limit: int = 1
+    max_limit: int = 200
+    backoff_ratio: float = 0.9  # Multiplicative decrease on errors / slow samples
+    latency_threshold_seconds: Optional[float] = None  # AIMD: slower samples count as congestion
+    tolerance: float = 1.0  # Gradient: latency inflation accepted before the limit shrinks
+    smoothing: float = 0.5  # Gradient: share of the gap to a new estimate closed per round trip
+    short_window: int = 10  # Gradient: samples in the short-term latency average
+    probe_interval: int = 100  # Gradient: round trips between no-load latency probes (0 disables)
+    history_size: int = 500  # Limit changes kept for get_history()
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe concurrency limit driven by completed-work samples.
+
+    Callers take a slot with try_acquire() and return it with release(),
+    reporting how long the work took and whether it succeeded. Work beyond
+    the current limit is rejected immediately rather than queued, so
+    excess load is shed instead of inflating latency for everyone.
+    """
+
+    def __init__(self, config: Optional[AdaptiveLimitConfig] = None):
+        self.config = config or AdaptiveLimitConfig()
+        if self.config.algorithm not in LIMIT_ALGORITHMS:
+            raise ValueError(f"Unknown limit algorithm: {self.config.algorithm}")
+        if not 1 <= self.config.min_limit <= self.config.max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+
+        self._lock = threading.Lock()
+        self._limit = float(min(max(self.config.initial_limit, self.config.min_limit), self.config.max_limit))
+        self._in_flight = 0
+        self._short_rtt: Optional[float] = None
+        self._no_load_rtt: Optional[float] = None
+        self._rounds_since_probe = 0.0
+        self._samples_since_decrease = int(self._limit)  # The first congestion signal always counts
+        self._history: deque = deque(maxlen=self.config.history_size)
+        self._history.append((time.time(), int(self._limit)))
+        self.stats = {'acquired': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0, 'abandoned': 0}
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent slots"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free under the current limit"""
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self.stats['rejected'] += 1
+                return False
+            self._in_flight += 1
+            self.stats['acquired'] += 1
+            return True
+
+    def release(self, latency_seconds: float, success: bool = True):
+        """Return a slot and feed its latency and outcome into the limit"""
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight = max(0, self._in_flight - 1)
+            self.stats['succeeded' if success else 'failed'] += 1
+
+            if self.config.algorithm == 'aimd':
+                new_limit = self._aimd(latency_seconds, success, in_flight)
+            else:
+                new_limit = self._gradient(latency_seconds, success, in_flight)
+
+            new_limit = min(max(new_limit, self.config.min_limit), self.config.max_limit)
+            if int(new_limit) != int(self._limit):
+                self._history.append((time.time(), int(new_limit)))
+            self._limit = new_limit
+
+    def abandon(self):
+        """Return a slot without a sample, for work cancelled before it could say anything about load"""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self.stats['abandoned'] += 1
+
+    def _aimd(self, latency: float, success: bool, in_flight: int) -> float:
+        threshold = self.config.latency_threshold_seconds
+        self._samples_since_decrease += 1
+        if not success or (threshold is not None and latency > threshold):
+            # Work already in flight saw the same congestion; back off once per window
+            if self._samples_since_decrease < self._limit:
+                return self._limit
+            self._samples_since_decrease = 0
+            return self._limit * self.config.backoff_ratio
+        # Only grow while the limit is actually being used
+        if in_flight * 2 >= self._limit:
+            return self._limit + 1.0 / self._limit
+        return self._limit
+
+    def _gradient(self, latency: float, success: bool, in_flight: int) -> float:
+        if not success:
+            # Failures often return fast; keep them out of the latency estimates
+            return self._limit * (1 - (1 - self.config.backoff_ratio) / self._limit)
+
+        if self._short_rtt is None:
+            self._short_rtt = latency
+        else:
+            self._short_rtt += 2.0 / (self.config.short_window + 1) * (latency - self._short_rtt)
+
+        self._rounds_since_probe += 1.0 / self._limit
+        if self.config.probe_interval and self._rounds_since_probe >= self.config.probe_interval:
+            self._rounds_since_probe = 0.0
+            self._no_load_rtt = None
+            self._short_rtt = None
+            return self._limit / 2
+        if self._no_load_rtt is None or latency < self._no_load_rtt:
+            self._no_load_rtt = latency
+
+        if in_flight * 2 < self._limit:
+            return self._limit
+
+        gradient = max(0.5, min(1.0, self.config.tolerance * self._no_load_rtt / max(self._short_rtt, 1e-9)))
+        estimate = self._limit * gradient + math.sqrt(self._limit)
+        weight = self.config.smoothing / self._limit
+        return self._limit * (1 - weight) + estimate * weight
+
+    def get_history(self, since: Optional[float] = None) -> List[Tuple[float, int]]:
+        """(timestamp, limit) for each limit change, optionally after a time.time() value"""
+        with self._lock:
+            return [entry for entry in self._history if since is None or entry[0] >= since]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, usage and latency estimates"""
+        with self._lock:
+            return {
+                **self.stats,
+                'algorithm': self.config.algorithm,
+                'limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'min_limit': self.config.min_limit,
+                'max_limit': self.config.max_limit,
+                'short_latency_seconds': self._short_rtt,
+                'no_load_latency_seconds': self._no_load_rtt,
+                'limit_changes': len(self._history)
+            }
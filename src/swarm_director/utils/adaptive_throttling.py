@@ -4,6 +4,8 @@ Dynamically adjusts processing based on system load and resource availability
 """
 
 import asyncio
+import csv
+import json
 import threading
 import time
 import logging
@@ -53,6 +55,8 @@ class ThrottlingMetrics:
     target_concurrency: int
     throttle_action: ThrottleAction
     load_level: LoadLevel
+    predicted_load: Optional[float] = None
+    shed_priorities: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -66,7 +70,9 @@ class ThrottlingMetrics:
             'current_concurrency': self.current_concurrency,
             'target_concurrency': self.target_concurrency,
             'throttle_action': self.throttle_action.value,
-            'load_level': self.load_level.value
+            'load_level': self.load_level.value,
+            'predicted_load': self.predicted_load,
+            'shed_priorities': self.shed_priorities
         }
 
 @dataclass
@@ -104,6 +110,16 @@ class AdaptiveThrottlingConfig:
     enable_emergency_throttling: bool = True
     smoothing_window: int = 3  # Number of samples for smoothing
     
+    # Load forecasting: 'holt_winters' (seasonal) or 'linear' (LoadPredictor)
+    load_predictor: str = 'holt_winters'
+    season_length: int = 720  # Samples per season (one hour at the default interval)
+    forecast_horizon_seconds: float = 30.0  # How far ahead predicted peaks pre-scale limits
+    
+    # Admission control: shed low-priority requests at the queue before saturation
+    admission_control: bool = False
+    shed_low_priority_load: float = 70.0  # Current or predicted load at which LOW is shed
+    shed_normal_priority_load: float = 85.0  # ... and NORMAL too; HIGH and CRITICAL are never shed
+    
     # Integration settings
     monitor_config: Optional[MonitorConfig] = None
 
@@ -115,9 +131,9 @@ class LoadPredictor:
         self._load_history: deque = deque(maxlen=window_size)
         self._trend_history: deque = deque(maxlen=5)
     
-    def add_sample(self, load_value: float):
+    def add_sample(self, load_value: float, timestamp: Optional[datetime] = None):
         """Add a load sample"""
-        self._load_history.append((datetime.now(), load_value))
+        self._load_history.append((timestamp or datetime.now(), load_value))
     
     def predict_load(self, horizon_seconds: int = 30) -> float:
         """Predict load for the next horizon_seconds"""
@@ -149,6 +165,171 @@ class LoadPredictor:
         
         # Clamp to reasonable bounds
         return max(0, min(100, predicted))
+    
+    def predict_peak(self, horizon_seconds: float = 30) -> float:
+        """Highest load expected between now and the horizon"""
+        current = self._load_history[-1][1] if self._load_history else 0.0
+        return max(current, self.predict_load(horizon_seconds))
+
+class HoltWintersPredictor:
+    """
+    Seasonal load forecaster using additive Holt-Winters (triple exponential
+    smoothing): a smoothed level, trend and per-slot seasonal offset over
+    season_length slots of sample_interval seconds. A sample's slot comes
+    from its timestamp, so late or missed samples do not shift the season
+    out of phase with the clock. Until two full seasons have been seen it
+    forecasts an EWMA of the samples. Drop-in replacement for LoadPredictor.
+    """
+    
+    def __init__(self, season_length: int = 720, alpha: float = 0.3, beta: float = 0.05,
+                 gamma: float = 0.3, sample_interval: Optional[float] = None):
+        if season_length < 2:
+            raise ValueError("season_length must be at least 2")
+        for name, value in (('alpha', alpha), ('beta', beta), ('gamma', gamma)):
+            if not 0 < value <= 1:
+                raise ValueError(f"{name} must be in (0, 1]")
+        if sample_interval is not None and sample_interval <= 0:
+            raise ValueError("sample_interval must be positive")
+        
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        # Seconds per seasonal slot; taken from the first sample gap when not
+        # given, then fixed so slots stay aligned to the clock
+        self.sample_interval = sample_interval
+        
+        self._warmup: List[Tuple[datetime, float]] = []
+        self._ewma: Optional[float] = None
+        self._level = 0.0
+        self._trend = 0.0
+        self._seasonals: List[float] = []
+        self._last_tick = 0  # Slot count since the epoch of the last sample
+        self._samples = 0
+        self._last_timestamp: Optional[datetime] = None
+        self._mean_abs_error = 0.0  # Smoothed one-step-ahead forecast error
+    
+    @property
+    def seasonal(self) -> bool:
+        """Whether enough history has been seen to forecast seasonally"""
+        return bool(self._seasonals)
+    
+    def _tick(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // self.sample_interval)
+    
+    def add_sample(self, load_value: float, timestamp: Optional[datetime] = None):
+        """Add a load sample"""
+        timestamp = timestamp or datetime.now()
+        if self.sample_interval is None and self._last_timestamp is not None:
+            gap = (timestamp - self._last_timestamp).total_seconds()
+            if gap > 0:
+                self.sample_interval = gap
+        self._last_timestamp = timestamp
+        
+        if self._seasonals:
+            tick = self._tick(timestamp)
+            steps = max(0, tick - self._last_tick)
+            error = abs(load_value - self.forecast(max(1, steps)))
+        else:
+            error = abs(load_value - self.forecast(1))
+        if self._samples:
+            self._mean_abs_error += self.alpha * (error - self._mean_abs_error)
+        self._samples += 1
+        self._ewma = load_value if self._ewma is None else self._ewma + self.alpha * (load_value - self._ewma)
+        
+        if not self._seasonals:
+            self._warmup.append((timestamp, load_value))
+            self._try_initialize()
+            return
+        
+        # Skipped slots keep their seasonal offsets; level and trend are
+        # carried across them. Repeat samples within a slot refine it in place.
+        slot = tick % self.season_length if steps else self._last_tick % self.season_length
+        last_level = self._level
+        self._level = (self.alpha * (load_value - self._seasonals[slot])
+                       + (1 - self.alpha) * (self._level + steps * self._trend))
+        if steps:
+            self._trend = (self.beta * (self._level - last_level) / steps
+                           + (1 - self.beta) * self._trend)
+            self._last_tick = tick
+        self._seasonals[slot] = (self.gamma * (load_value - self._level)
+                                 + (1 - self.gamma) * self._seasonals[slot])
+    
+    def _try_initialize(self):
+        """
+        Seed level, trend and seasonal offsets once the warmup covers two
+        seasons of slots. Slots with several samples are averaged; empty
+        slots repeat the previous slot's value.
+        """
+        if self.sample_interval is None:
+            return
+        length = self.season_length
+        end_tick = self._tick(self._warmup[-1][0])
+        start_tick = end_tick - 2 * length + 1
+        if self._tick(self._warmup[0][0]) > start_tick:
+            return
+        
+        self._warmup = [(t, v) for t, v in self._warmup if self._tick(t) >= start_tick]
+        by_tick: Dict[int, List[float]] = {}
+        for timestamp, value in self._warmup:
+            by_tick.setdefault(self._tick(timestamp) - start_tick, []).append(value)
+        # Too sparse to seed every slot from a neighbour; keep warming up
+        if len(by_tick) < length:
+            return
+        
+        values = []
+        previous = by_tick[min(by_tick)]
+        for index in range(2 * length):
+            if index in by_tick:
+                previous = by_tick[index]
+            values.append(sum(previous) / len(previous))
+        
+        first, second = values[:length], values[length:]
+        first_mean, second_mean = sum(first) / length, sum(second) / length
+        offsets = [((a - first_mean) + (b - second_mean)) / 2 for a, b in zip(first, second)]
+        # Index i of the window is slot (start_tick + i) of the season
+        self._seasonals = [0.0] * length
+        for index, offset in enumerate(offsets):
+            self._seasonals[(start_tick + index) % length] = offset
+        self._trend = (second_mean - first_mean) / length
+        # The season mean sits mid-season; carry it forward to the last slot
+        self._level = second_mean + self._trend * (length - 1) / 2
+        self._last_tick = end_tick
+        self._warmup = []
+    
+    def forecast(self, steps: int = 1) -> float:
+        """Unclamped forecast for the slot `steps` ahead of the last sample"""
+        if not self._seasonals:
+            return self._ewma if self._ewma is not None else 50.0
+        slot = (self._last_tick + steps) % self.season_length
+        return self._level + steps * self._trend + self._seasonals[slot]
+    
+    def _horizon_steps(self, horizon_seconds: float) -> int:
+        return max(1, round(horizon_seconds / (self.sample_interval or 1.0)))
+    
+    def predict_load(self, horizon_seconds: float = 30) -> float:
+        """Predict load horizon_seconds ahead"""
+        return float(max(0, min(100, self.forecast(self._horizon_steps(horizon_seconds)))))
+    
+    def predict_peak(self, horizon_seconds: float = 30) -> float:
+        """Highest load expected between now and the horizon"""
+        steps = self._horizon_steps(horizon_seconds)
+        peak = max(self.forecast(step) for step in range(1, min(steps, self.season_length) + 1))
+        if steps > self.season_length:
+            peak = max(peak, self.forecast(steps))
+        return float(max(0, min(100, peak)))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Model state and accuracy for monitoring"""
+        return {
+            'seasonal': self.seasonal,
+            'samples': self._samples,
+            'season_length': self.season_length,
+            'sample_interval': self.sample_interval,
+            'level': self._level if self._seasonals else self._ewma,
+            'trend': self._trend,
+            'mean_abs_error': self._mean_abs_error
+        }
 
 class AdaptiveThrottlingManager:
     """Main adaptive throttling manager"""
@@ -162,12 +343,15 @@ class AdaptiveThrottlingManager:
         # Components
         self._system_monitor: Optional[SystemResourceMonitor] = None
         self._queue_manager: Optional[RequestQueueManager] = None
-        self._load_predictor = LoadPredictor()
+        self._load_predictor = self._create_load_predictor()
         
         # State
         self._current_concurrency = self.config.thresholds.default_concurrency
         self._target_concurrency = self.config.thresholds.default_concurrency
         self._last_adjustment_time = datetime.now()
+        self._predicted_load: Optional[float] = None
+        self._shed_priorities: frozenset = frozenset()
+        self._requests_shed = 0
         
         # Metrics
         self._metrics_history: deque = deque(maxlen=self.config.metrics_history_size)
@@ -175,6 +359,15 @@ class AdaptiveThrottlingManager:
         
         logger.info("AdaptiveThrottlingManager initialized")
     
+    def _create_load_predictor(self):
+        """Build the configured load predictor"""
+        if self.config.load_predictor == 'holt_winters':
+            return HoltWintersPredictor(season_length=self.config.season_length,
+                                        sample_interval=self.config.adjustment_interval)
+        if self.config.load_predictor == 'linear':
+            return LoadPredictor()
+        raise ValueError(f"Unknown load predictor: {self.config.load_predictor}")
+    
     def start(self):
         """Start the adaptive throttling system"""
         with self._lock:
@@ -195,6 +388,9 @@ class AdaptiveThrottlingManager:
                 logger.error("Request queue manager not available")
                 return
             
+            if self.config.admission_control:
+                self._queue_manager.admission_policy = self.should_admit
+            
             self._running = True
             self._adjustment_thread = threading.Thread(
                 target=self._adjustment_loop,
@@ -215,6 +411,10 @@ class AdaptiveThrottlingManager:
             if self._adjustment_thread and self._adjustment_thread.is_alive():
                 self._adjustment_thread.join(timeout=5.0)
             
+            if self._queue_manager and getattr(self._queue_manager, 'admission_policy', None) == self.should_admit:
+                self._queue_manager.admission_policy = None
+            self._shed_priorities = frozenset()
+            
             logger.info("Adaptive throttling stopped")
     
     def add_adjustment_callback(self, callback: Callable[[ThrottlingMetrics], None]):
@@ -230,6 +430,31 @@ class AdaptiveThrottlingManager:
         """Get target concurrency limit"""
         return self._target_concurrency
     
+    def get_predicted_load(self) -> Optional[float]:
+        """Peak load forecast over the configured horizon at the last adjustment"""
+        return self._predicted_load
+    
+    def should_admit(self, priority: QueuePriority, request_type: Optional[RequestType] = None) -> bool:
+        """
+        Admission policy for RequestQueueManager: False when the request's
+        priority is being shed because current or predicted load is nearing
+        saturation.
+        """
+        if priority in self._shed_priorities:
+            with self._lock:
+                self._requests_shed += 1
+            return False
+        return True
+    
+    def get_admission_status(self) -> Dict[str, Any]:
+        """Current admission-control state"""
+        return {
+            'enabled': self.config.admission_control,
+            'shed_priorities': sorted(p.name for p in self._shed_priorities),
+            'requests_shed': self._requests_shed,
+            'predicted_load': self._predicted_load
+        }
+    
     def get_latest_metrics(self) -> Optional[ThrottlingMetrics]:
         """Get the latest throttling metrics"""
         with self._lock:
@@ -287,6 +512,11 @@ class AdaptiveThrottlingManager:
                 snapshot, health_score, load_level, queue_size, active_requests
             )
             
+            # Shed low-priority work ahead of saturation
+            combined_load = (snapshot.cpu_percent + snapshot.memory_percent) / 2
+            if self.config.admission_control:
+                self._shed_priorities = self._calculate_shed_priorities(combined_load)
+            
             # Determine throttle action
             throttle_action = self._determine_throttle_action(old_target, self._target_concurrency)
             
@@ -308,7 +538,9 @@ class AdaptiveThrottlingManager:
                 current_concurrency=self._current_concurrency,
                 target_concurrency=self._target_concurrency,
                 throttle_action=throttle_action,
-                load_level=load_level
+                load_level=load_level,
+                predicted_load=self._predicted_load,
+                shed_priorities=sorted(p.name for p in self._shed_priorities)
             )
             
             # Store metrics and notify callbacks
@@ -316,7 +548,6 @@ class AdaptiveThrottlingManager:
             self._notify_callbacks(metrics)
             
             # Update load predictor
-            combined_load = (snapshot.cpu_percent + snapshot.memory_percent) / 2
             self._load_predictor.add_sample(combined_load)
             
             logger.debug(f"Throttling adjustment: {throttle_action.value}, "
@@ -369,11 +600,16 @@ class AdaptiveThrottlingManager:
         else:
             target = current
         
-        # Predictive scaling if enabled
+        # Predictive scaling: pre-scale ahead of a forecast peak the current
+        # load level has not reached yet
         if self.config.enable_predictive_scaling:
-            predicted_load = self._load_predictor.predict_load(30)
-            if predicted_load > thresholds.high_load_threshold:
-                target = int(target * 0.8)  # Preemptive scaling down
+            predicted_load = self._load_predictor.predict_peak(self.config.forecast_horizon_seconds)
+            self._predicted_load = predicted_load
+            if load_level not in (LoadLevel.CRITICAL, LoadLevel.EMERGENCY):
+                if predicted_load >= thresholds.critical_load_threshold:
+                    target = int(target * thresholds.scale_down_factor)
+                elif predicted_load > thresholds.high_load_threshold:
+                    target = int(target * 0.8)  # Preemptive scaling down
         
         # Queue-based adjustments
         if queue_size > current * 2:  # Queue building up
@@ -384,6 +620,15 @@ class AdaptiveThrottlingManager:
         return max(thresholds.min_concurrency, 
                   min(thresholds.max_concurrency, target))
     
+    def _calculate_shed_priorities(self, combined_load: float) -> frozenset:
+        """Priorities to refuse at admission for the current and forecast load"""
+        load = max(combined_load, self._predicted_load or 0.0)
+        if load >= self.config.shed_normal_priority_load:
+            return frozenset((QueuePriority.LOW, QueuePriority.NORMAL))
+        if load >= self.config.shed_low_priority_load:
+            return frozenset((QueuePriority.LOW,))
+        return frozenset()
+    
     def _determine_throttle_action(self, old_target: int, new_target: int) -> ThrottleAction:
         """Determine the type of throttling action"""
         if new_target > old_target:
@@ -451,6 +696,66 @@ class AdaptiveThrottlingManager:
             except Exception as e:
                 logger.error(f"Error in throttling callback: {e}")
 
+def load_recorded_metrics(path: str) -> List[Tuple[datetime, float]]:
+    """
+    Read recorded throttling metrics as (timestamp, combined load) samples for
+    offline backtesting. Accepts a JSON list of ThrottlingMetrics.to_dict()
+    records (or the /api/throttling/metrics response), JSON lines, or CSV
+    with timestamp, cpu_usage and memory_usage columns.
+    """
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            records = list(csv.DictReader(f))
+        else:
+            text = f.read()
+            try:
+                records = json.loads(text)
+            except json.JSONDecodeError:
+                records = [json.loads(line) for line in text.splitlines() if line.strip()]
+            if isinstance(records, dict):
+                records = records.get('data', records).get('metrics', [])
+    
+    samples = [(datetime.fromisoformat(record['timestamp']),
+                (float(record['cpu_usage']) + float(record['memory_usage'])) / 2)
+               for record in records]
+    samples.sort(key=lambda sample: sample[0])
+    return samples
+
+def backtest_predictor(predictor, samples: List[Tuple[datetime, float]],
+                       horizon_steps: int = 1, warmup: int = 0) -> Dict[str, float]:
+    """
+    Walk-forward backtest: feed samples in order and, after each one, score
+    the forecast horizon_steps samples ahead against what actually arrived.
+    Forecasts made during the first `warmup` samples are not scored. Samples
+    are assumed to be evenly spaced, as the adjustment loop records them.
+    """
+    if len(samples) < 2:
+        raise ValueError("Backtesting needs at least two samples")
+    interval = (samples[-1][0] - samples[0][0]).total_seconds() / (len(samples) - 1)
+    
+    forecasts: Dict[int, float] = {}
+    errors: List[float] = []
+    percentage_errors: List[float] = []
+    for index, (timestamp, load) in enumerate(samples):
+        if index in forecasts:
+            error = forecasts.pop(index) - load
+            errors.append(error)
+            if load:
+                percentage_errors.append(abs(error) / load)
+        predictor.add_sample(load, timestamp)
+        if index >= warmup:
+            forecasts[index + horizon_steps] = predictor.predict_load(horizon_steps * interval)
+    
+    if not errors:
+        raise ValueError("No forecasts fell inside the series; lower warmup or horizon_steps")
+    return {
+        'forecasts': len(errors),
+        'mae': sum(abs(e) for e in errors) / len(errors),
+        'rmse': math.sqrt(sum(e * e for e in errors) / len(errors)),
+        'mape': 100 * sum(percentage_errors) / len(percentage_errors) if percentage_errors else 0.0,
+        'bias': sum(errors) / len(errors)
+    }
+
 # Global throttling manager instance
 _throttling_manager: Optional[AdaptiveThrottlingManager] = None
 
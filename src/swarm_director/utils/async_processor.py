@@ -5,6 +5,9 @@ resource management, and performance monitoring
 """
 
 import asyncio
+import multiprocessing
+import os
+import pickle
 import threading
 import time
 import uuid
@@ -12,7 +15,8 @@ from typing import Dict, List, Any, Optional, Callable, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, Future
+from concurrent.futures.process import BrokenProcessPool
 import logging
 
 from .metrics import metrics_collector, track_performance_metrics
@@ -47,6 +51,17 @@ class AsyncProcessorConfig:
     cleanup_interval_seconds: int = 300
     enable_metrics: bool = True
     enable_resource_monitoring: bool = True
+    process_worker_count: int = 0  # Process lane workers; 0 means one per CPU
+    cpu_bound_task_types: List[str] = field(default_factory=list)  # Task types sent to the process lane
+    process_start_method: str = 'spawn'  # Forking a threaded server is unsafe
+    # How long a process-lane task may keep running after its timeout before the
+    # pool is recycled to stop it; None waits for it however long it takes
+    process_overrun_grace_seconds: Optional[float] = 30.0
+
+# Execution lanes: 'default' runs coroutines on the loop and sync callables in
+# the thread pool; 'process' runs picklable callables in a process pool
+DEFAULT_LANE = 'default'
+PROCESS_LANE = 'process'
 
 @dataclass
 class ProcessorMetrics:
@@ -55,6 +70,7 @@ class ProcessorMetrics:
     tasks_completed: int = 0
     tasks_failed: int = 0
     tasks_timeout: int = 0
+    tasks_cancelled: int = 0
     peak_queue_size: int = 0
     peak_concurrent_tasks: int = 0
     total_processing_time: float = 0.0
@@ -62,6 +78,29 @@ class ProcessorMetrics:
     start_time: Optional[datetime] = None
     last_reset: Optional[datetime] = field(default_factory=datetime.now)
 
+@dataclass
+class LaneMetrics:
+    """Per-lane task counts and timings"""
+    tasks_queued: int = 0
+    tasks_completed: int = 0
+    tasks_failed: int = 0
+    total_wait_time: float = 0.0
+    total_run_time: float = 0.0
+    overrunning: int = 0  # Timed-out tasks still occupying a pool process
+    pool_recycles: int = 0
+
+@dataclass
+class TaskEnvelope:
+    """What a process-lane worker receives: a picklable callable and its arguments"""
+    function: Callable
+    args: tuple
+    kwargs: dict
+
+def _run_envelope(payload: bytes) -> Any:
+    """Entry point in a process-lane worker"""
+    envelope = pickle.loads(payload)
+    return envelope.function(*envelope.args, **envelope.kwargs)
+
 @dataclass
 class AsyncTask:
     """Wrapper for async task with metadata"""
@@ -79,6 +118,58 @@ class AsyncTask:
     error: Optional[Exception] = None
     retry_count: int = 0
     max_retries: int = 0
+    task_type: Optional[str] = None
+    lane: str = DEFAULT_LANE
+    envelope: Optional[bytes] = field(default=None, repr=False, compare=False)  # Pickled TaskEnvelope
+    completion: Future = field(default_factory=Future, repr=False, compare=False)
+
+class TaskCancelledError(RuntimeError):
+    """Error a task resolves with when it is cancelled before it starts"""
+
+def resolve_completion(handle: Future, result: Any = None, error: Optional[BaseException] = None):
+    """Resolve a completion handle once; later calls are ignored"""
+    if handle.done():
+        return
+    try:
+        if error is not None:
+            handle.set_exception(error)
+        else:
+            handle.set_result(result)
+    except Exception:
+        # Another thread resolved it first
+        pass
+
+async def wait_for_completion(handle: Future, timeout: Optional[float] = None) -> bool:
+    """
+    Wait for a completion handle without polling.
+
+    The handle is a thread-safe concurrent.futures.Future, so it can be resolved
+    from any thread and awaited from any event loop. Returns False if the
+    timeout elapses first; giving up never cancels the handle itself.
+    """
+    if handle.done():
+        return True
+    
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+    
+    def _wake_waiter():
+        if not waiter.done():
+            waiter.set_result(True)
+    
+    def _on_done(_):
+        try:
+            loop.call_soon_threadsafe(_wake_waiter)
+        except RuntimeError:
+            # The waiting loop has already been closed
+            pass
+    
+    handle.add_done_callback(_on_done)
+    try:
+        await asyncio.wait_for(waiter, timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
 
 class TaskQueue:
     """Priority-based async task queue with backpressure"""
@@ -195,6 +286,9 @@ class AsyncProcessor:
         
         # Core components
         self.task_queue = TaskQueue(self.config)
+        self.process_queue = TaskQueue(self.config)
+        self.lane_metrics: Dict[str, LaneMetrics] = {DEFAULT_LANE: LaneMetrics(), PROCESS_LANE: LaneMetrics()}
+        self.pending_tasks: Dict[str, AsyncTask] = {}
         self.active_tasks: Dict[str, AsyncTask] = {}
         self.completed_tasks: Dict[str, AsyncTask] = {}
         
@@ -208,6 +302,10 @@ class AsyncProcessor:
             thread_name_prefix="AsyncProcessor"
         )
         
+        # Process pool for CPU-bound tasks, started on first use
+        self.process_worker_count = self.config.process_worker_count or os.cpu_count() or 1
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        
         # Background tasks
         self._worker_tasks: List[asyncio.Task] = []
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -236,6 +334,14 @@ class AsyncProcessor:
             )
             self._worker_tasks.append(worker_task)
         
+        # The process lane has its own workers, one per pool process, so
+        # CPU-bound tasks never hold the default lane's workers
+        for i in range(self.process_worker_count):
+            worker_task = asyncio.create_task(
+                self._worker_loop(f"process-worker-{i}", self.process_queue)
+            )
+            self._worker_tasks.append(worker_task)
+        
         # Start background tasks
         if self.config.enable_resource_monitoring:
             self._monitor_task = asyncio.create_task(self._monitoring_loop())
@@ -269,8 +375,19 @@ class AsyncProcessor:
         if self._worker_tasks:
             await asyncio.wait(self._worker_tasks, timeout=timeout)
         
-        # Shutdown thread pool
+        # Shutdown thread and process pools
         self.thread_pool.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+        
+        # Fail anything that never ran so waiters are released
+        with self._lock:
+            unfinished = list(self.pending_tasks.values()) + list(self.active_tasks.values())
+        for task in unfinished:
+            resolve_completion(task.completion, error=RuntimeError(
+                f"AsyncProcessor stopped before task {task.task_id} completed"
+            ))
         
         self.state = ProcessorState.STOPPED
         logger.info("AsyncProcessor stopped")
@@ -282,8 +399,15 @@ class AsyncProcessor:
                          timeout: Optional[float] = None,
                          callback: Optional[Callable] = None,
                          max_retries: int = 0,
+                         cpu_bound: bool = False,
+                         task_type: Optional[str] = None,
                          **kwargs) -> str:
-        """Submit a task for async processing"""
+        """
+        Submit a task for async processing. CPU-bound work (cpu_bound=True,
+        or a task_type listed in cpu_bound_task_types) runs in the process
+        lane; its function must be a module-level callable and it and its
+        arguments must be picklable.
+        """
         
         if self.state not in [ProcessorState.RUNNING, ProcessorState.PAUSED]:
             raise ValueError(f"Cannot submit task in state: {self.state}")
@@ -297,18 +421,34 @@ class AsyncProcessor:
             priority=priority,
             timeout=timeout or self.config.task_timeout_seconds,
             callback=callback,
-            max_retries=max_retries
+            max_retries=max_retries,
+            task_type=task_type
         )
         
-        success = await self.task_queue.put(task)
+        if cpu_bound or (task_type is not None and task_type in self.config.cpu_bound_task_types):
+            if asyncio.iscoroutinefunction(function):
+                raise ValueError("Coroutine functions cannot run in the process lane")
+            try:
+                task.envelope = pickle.dumps(TaskEnvelope(function, args, kwargs))
+            except Exception as e:
+                raise ValueError(f"CPU-bound task is not picklable: {e}")
+            task.lane = PROCESS_LANE
+        
+        with self._lock:
+            self.pending_tasks[task_id] = task
+        
+        success = await self._queue_for(task).put(task)
         if not success:
+            with self._lock:
+                self.pending_tasks.pop(task_id, None)
             raise ValueError("Task queue is full (backpressure active)")
         
         with self._lock:
             self.metrics.tasks_queued += 1
+            self.lane_metrics[task.lane].tasks_queued += 1
             self.metrics.peak_queue_size = max(
                 self.metrics.peak_queue_size, 
-                self.task_queue.size()
+                self.task_queue.size() + self.process_queue.size()
             )
         
         if self.config.enable_metrics:
@@ -320,35 +460,65 @@ class AsyncProcessor:
         logger.debug(f"Task {task_id} queued with priority {priority.name}")
         return task_id
     
+    def get_task(self, task_id: str) -> Optional[AsyncTask]:
+        """Look up a submitted task whether pending, running or completed"""
+        with self._lock:
+            return (self.completed_tasks.get(task_id) or self.active_tasks.get(task_id)
+                    or self.pending_tasks.get(task_id))
+    
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a task that has not started; it resolves with an error and is
+        skipped when dequeued. Running tasks cannot be interrupted, so
+        returns False for them (and for unknown or finished tasks).
+        """
+        with self._lock:
+            task = self.pending_tasks.pop(task_id, None)
+            if task is None:
+                return False
+            task.error = TaskCancelledError(f"Task {task_id} cancelled")
+            task.completed_at = datetime.now()
+            self.completed_tasks[task_id] = task
+            self.metrics.tasks_cancelled += 1
+        
+        resolve_completion(task.completion, error=task.error)
+        return True
+    
     async def get_task_result(self, task_id: str, timeout: Optional[float] = None) -> Any:
-        """Get result of a submitted task"""
-        start_time = time.time()
+        """Get result of a submitted task, returning as soon as it finishes"""
+        task = self.get_task(task_id)
         
-        while True:
-            # Check completed tasks
-            with self._lock:
-                if task_id in self.completed_tasks:
-                    task = self.completed_tasks[task_id]
-                    if task.error:
-                        raise task.error
-                    return task.result
-            
-            # Check timeout
-            if timeout and (time.time() - start_time) > timeout:
-                raise TimeoutError(f"Task {task_id} result timeout")
-            
-            await asyncio.sleep(0.1)
+        if task is None:
+            raise ValueError(f"Unknown task {task_id}")
+        
+        if not await wait_for_completion(task.completion, timeout):
+            raise TimeoutError(f"Task {task_id} result timeout")
+        
+        return task.completion.result()
+    
+    def _queue_for(self, task: AsyncTask) -> TaskQueue:
+        return self.process_queue if task.lane == PROCESS_LANE else self.task_queue
     
-    async def _worker_loop(self, worker_name: str):
-        """Main worker loop for processing tasks"""
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use, or again after a worker crash broke it"""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_worker_count,
+                mp_context=multiprocessing.get_context(self.config.process_start_method)
+            )
+        return self._process_pool
+    
+    async def _worker_loop(self, worker_name: str, queue: Optional[TaskQueue] = None):
+        """Main worker loop for processing tasks from one lane's queue"""
         logger.debug(f"Worker {worker_name} started")
+        queue = queue or self.task_queue
         
         while self.state == ProcessorState.RUNNING:
             try:
                 # Get next task
-                task = await self.task_queue.get()
-                if not task:
-                    continue
+                task = await queue.get()
+                if not task or task.completion.done():
+                    continue  # Empty wake-up, or cancelled while queued
                 
                 # Process the task
                 await self._process_task(task, worker_name)
@@ -365,8 +535,11 @@ class AsyncProcessor:
     async def _process_task(self, task: AsyncTask, worker_name: str):
         """Process a single task"""
         task.started_at = datetime.now()
+        requeued = False
+        overrun: Optional[asyncio.Future] = None
         
         with self._lock:
+            self.pending_tasks.pop(task.task_id, None)
             self.active_tasks[task.task_id] = task
             self.metrics.peak_concurrent_tasks = max(
                 self.metrics.peak_concurrent_tasks,
@@ -377,7 +550,22 @@ class AsyncProcessor:
         
         try:
             # Execute the task
-            if asyncio.iscoroutinefunction(task.function):
+            if task.lane == PROCESS_LANE:
+                loop = asyncio.get_running_loop()
+                pool = self._get_process_pool()
+                pool_future = loop.run_in_executor(pool, _run_envelope, task.envelope)
+                try:
+                    # Shielded: cancelling an executor future does not stop a running process
+                    result = await asyncio.wait_for(asyncio.shield(pool_future), timeout=task.timeout)
+                except asyncio.TimeoutError:
+                    overrun = pool_future
+                    raise
+                except BrokenProcessPool:
+                    # A worker died; replace the pool for later tasks
+                    if self._process_pool is pool:
+                        self._process_pool = None
+                    raise
+            elif asyncio.iscoroutinefunction(task.function):
                 result = await asyncio.wait_for(
                     task.function(*task.args, **task.kwargs),
                     timeout=task.timeout
@@ -410,6 +598,10 @@ class AsyncProcessor:
             with self._lock:
                 self.metrics.tasks_completed += 1
                 processing_time = (task.completed_at - task.started_at).total_seconds()
+                lane_metrics = self.lane_metrics[task.lane]
+                lane_metrics.tasks_completed += 1
+                lane_metrics.total_wait_time += (task.started_at - task.created_at).total_seconds()
+                lane_metrics.total_run_time += processing_time
                 self.metrics.total_processing_time += processing_time
                 self.metrics.average_task_time = (
                     self.metrics.total_processing_time / self.metrics.tasks_completed
@@ -435,10 +627,7 @@ class AsyncProcessor:
                 self.metrics.tasks_timeout += 1
             
             if self.config.enable_metrics:
-                metrics_collector.increment_counter(
-                    'async_processor_tasks_timeout_total',
-                    {'priority': task.priority.name.lower()}
-                )
+                metrics_collector.track_error_rate('async_processor', 'timeout')
             
             logger.warning(f"Task {task.task_id} timeout")
         
@@ -454,27 +643,78 @@ class AsyncProcessor:
                 task.error = None
                 
                 # Re-queue the task
-                await self.task_queue.put(task)
+                requeued = await self._queue_for(task).put(task)
+                if not requeued:
+                    task.error = e
+                    task.completed_at = datetime.now()
+                    logger.error(f"Task {task.task_id} could not be re-queued: {e}")
+                    return
                 logger.info(f"Task {task.task_id} retrying (attempt {task.retry_count})")
                 return
             
             with self._lock:
                 self.metrics.tasks_failed += 1
+                self.lane_metrics[task.lane].tasks_failed += 1
             
             if self.config.enable_metrics:
-                metrics_collector.increment_counter(
-                    'async_processor_tasks_failed_total',
-                    {'priority': task.priority.name.lower(), 'error_type': type(e).__name__}
-                )
+                metrics_collector.track_error_rate('async_processor', type(e).__name__)
             
             logger.error(f"Task {task.task_id} failed: {e}")
         
+        except asyncio.CancelledError:
+            task.error = RuntimeError(f"Task {task.task_id} cancelled")
+            task.completed_at = datetime.now()
+            raise
+        
         finally:
-            # Move task to completed
+            # Move task to completed, or back to pending if it was re-queued
             with self._lock:
                 if task.task_id in self.active_tasks:
                     del self.active_tasks[task.task_id]
-                self.completed_tasks[task.task_id] = task
+                if requeued:
+                    self.pending_tasks[task.task_id] = task
+                else:
+                    self.completed_tasks[task.task_id] = task
+            
+            if not requeued:
+                resolve_completion(task.completion, task.result, task.error)
+        
+        if overrun is not None:
+            await self._wait_for_overrun(task, pool, overrun)
+    
+    async def _wait_for_overrun(self, task: AsyncTask, pool: ProcessPoolExecutor, pool_future: asyncio.Future):
+        """
+        Hold this process-lane worker until a timed-out task's pool process is
+        free, so the lane never has more work inside the pool than processes.
+        A task still running after process_overrun_grace_seconds gets the pool
+        recycled, which stops it.
+        """
+        with self._lock:
+            self.lane_metrics[PROCESS_LANE].overrunning += 1
+        try:
+            grace = self.config.process_overrun_grace_seconds
+            done, _ = await asyncio.wait({pool_future}, timeout=grace)
+            if not done:
+                logger.warning(f"Task {task.task_id} still running {grace}s after its timeout; "
+                               f"recycling the process pool")
+                self._recycle_process_pool(pool)
+                await asyncio.wait({pool_future}, timeout=5.0)
+        finally:
+            with self._lock:
+                self.lane_metrics[PROCESS_LANE].overrunning -= 1
+            if pool_future.done() and not pool_future.cancelled():
+                pool_future.exception()  # Nobody is waiting for this result any more
+    
+    def _recycle_process_pool(self, pool: ProcessPoolExecutor):
+        """Terminate a pool's processes; the next process-lane task starts a fresh pool"""
+        if self._process_pool is pool:
+            self._process_pool = None
+        # ProcessPoolExecutor has no public way to stop a running call
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self.lane_metrics[PROCESS_LANE].pool_recycles += 1
     
     async def _cleanup_loop(self):
         """Background cleanup of completed tasks"""
@@ -512,7 +752,7 @@ class AsyncProcessor:
                 # Collect current state metrics
                 with self._lock:
                     current_metrics = {
-                        'queue_size': self.task_queue.size(),
+                        'queue_size': self.task_queue.size() + self.process_queue.size(),
                         'active_tasks': len(self.active_tasks),
                         'completed_tasks': len(self.completed_tasks),
                         'tasks_queued': self.metrics.tasks_queued,
@@ -552,14 +792,16 @@ class AsyncProcessor:
         with self._lock:
             return {
                 'state': self.state.value,
-                'queue_size': self.task_queue.size(),
+                'queue_size': self.task_queue.size() + self.process_queue.size(),
                 'active_tasks': len(self.active_tasks),
                 'completed_tasks': len(self.completed_tasks),
+                'lanes': self._get_lane_status(),
                 'metrics': {
                     'tasks_queued': self.metrics.tasks_queued,
                     'tasks_completed': self.metrics.tasks_completed,
                     'tasks_failed': self.metrics.tasks_failed,
                     'tasks_timeout': self.metrics.tasks_timeout,
+                    'tasks_cancelled': self.metrics.tasks_cancelled,
                     'peak_queue_size': self.metrics.peak_queue_size,
                     'peak_concurrent_tasks': self.metrics.peak_concurrent_tasks,
                     'average_task_time': self.metrics.average_task_time,
@@ -571,9 +813,34 @@ class AsyncProcessor:
                     'max_concurrent_tasks': self.config.max_concurrent_tasks,
                     'max_queue_size': self.config.max_queue_size,
                     'worker_thread_count': self.config.worker_thread_count,
+                    'process_worker_count': self.process_worker_count,
                     'backpressure_threshold': self.config.backpressure_threshold
                 }
             }
+    
+    def _get_lane_status(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, running tasks and timings per lane (caller holds the lock)"""
+        lanes = {}
+        for lane, queue in ((DEFAULT_LANE, self.task_queue), (PROCESS_LANE, self.process_queue)):
+            metrics = self.lane_metrics[lane]
+            active = sum(1 for task in self.active_tasks.values() if task.lane == lane)
+            lanes[lane] = {
+                'queue_size': queue.size(),
+                'active_tasks': active,
+                'tasks_queued': metrics.tasks_queued,
+                'tasks_completed': metrics.tasks_completed,
+                'tasks_failed': metrics.tasks_failed,
+                'average_wait_time': metrics.total_wait_time / metrics.tasks_completed
+                                     if metrics.tasks_completed else 0.0,
+                'average_run_time': metrics.total_run_time / metrics.tasks_completed
+                                    if metrics.tasks_completed else 0.0
+            }
+        lanes[PROCESS_LANE].update({
+            'busy_processes': lanes[PROCESS_LANE]['active_tasks'] + self.lane_metrics[PROCESS_LANE].overrunning,
+            'overrunning_tasks': self.lane_metrics[PROCESS_LANE].overrunning,
+            'pool_recycles': self.lane_metrics[PROCESS_LANE].pool_recycles
+        })
+        return lanes
 
 # Global async processor instance
 async_processor: Optional[AsyncProcessor] = None
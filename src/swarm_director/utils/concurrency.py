@@ -6,18 +6,20 @@ Provides high-level concurrency management integrating async processing and reso
 import asyncio
 import functools
 import time
-from typing import Dict, List, Any, Optional, Callable, Union, TypeVar, Awaitable
+from typing import Dict, List, Any, Optional, Callable, Union, TypeVar, Awaitable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 
 from .async_processor import (
-    AsyncProcessor, AsyncProcessorConfig, TaskPriority, 
+    AsyncProcessor, AsyncProcessorConfig, TaskPriority, TaskCancelledError,
     get_async_processor, initialize_async_processor
 )
 from .resource_monitor import (
     ResourceMonitor, ResourceMonitorConfig, ResourceState,
     get_resource_monitor, initialize_resource_monitor
 )
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter, AdaptiveLimitConfig
 from .metrics import metrics_collector
 
 logger = logging.getLogger(__name__)
@@ -29,7 +31,8 @@ class ConcurrencyManager:
     
     def __init__(self, 
                  async_config: Optional[AsyncProcessorConfig] = None,
-                 resource_config: Optional[ResourceMonitorConfig] = None):
+                 resource_config: Optional[ResourceMonitorConfig] = None,
+                 limit_config: Optional[AdaptiveLimitConfig] = None):
         
         self.async_processor: Optional[AsyncProcessor] = None
         self.resource_monitor: Optional[ResourceMonitor] = None
@@ -37,6 +40,11 @@ class ConcurrencyManager:
         self.async_config = async_config or AsyncProcessorConfig()
         self.resource_config = resource_config or ResourceMonitorConfig()
         
+        # Optional adaptive cap on submitted-but-unfinished tasks
+        self.limiter: Optional[AdaptiveConcurrencyLimiter] = (
+            AdaptiveConcurrencyLimiter(limit_config) if limit_config else None
+        )
+        
         self.is_initialized = False
         
         logger.info("ConcurrencyManager created")
@@ -95,13 +103,47 @@ class ConcurrencyManager:
                     f"Insufficient resources for task. Current state: {current_metrics.overall_state.value}"
                 )
         
-        # Submit to async processor
-        return await self.async_processor.submit_task(
-            function, *args,
-            priority=priority,
-            timeout=timeout,
-            **kwargs
-        )
+        if self.limiter is None:
+            return await self.async_processor.submit_task(
+                function, *args,
+                priority=priority,
+                timeout=timeout,
+                **kwargs
+            )
+        
+        # Shed work beyond the adaptive limit instead of letting latency grow
+        if not self.limiter.try_acquire():
+            raise ResourceError(f"Concurrency limit reached ({self.limiter.limit} tasks in flight)")
+        
+        submitted_at = time.monotonic()
+        try:
+            task_id = await self.async_processor.submit_task(
+                function, *args,
+                priority=priority,
+                timeout=timeout,
+                **kwargs
+            )
+        except Exception:
+            self.limiter.release(time.monotonic() - submitted_at, success=False)
+            raise
+        
+        # The slot is held until the task finishes, queueing time included
+        task = self.async_processor.get_task(task_id)
+        if task is None:
+            self.limiter.release(time.monotonic() - submitted_at)
+        else:
+            task.completion.add_done_callback(
+                lambda completion: self._release_slot(completion, time.monotonic() - submitted_at)
+            )
+        return task_id
+    
+    def _release_slot(self, completion, latency: float):
+        """Return a task's limiter slot; cancellations are not load signals"""
+        if completion.cancelled() or isinstance(completion.exception(), TaskCancelledError):
+            # Cancelled by fail_fast or a consumer that stopped early, not by overload
+            self.limiter.abandon()
+        else:
+            self.limiter.release(latency, success=completion.exception() is None)
     
     async def get_task_result(self, task_id: str, timeout: Optional[float] = None) -> Any:
         """Get result of a submitted task"""
@@ -110,6 +152,12 @@ class ConcurrencyManager:
         
         return await self.async_processor.get_task_result(task_id, timeout)
     
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a submitted task that has not started yet"""
+        if not self.is_initialized:
+            return False
+        return self.async_processor.cancel_task(task_id)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive status of concurrency system"""
         status = {
@@ -123,6 +171,9 @@ class ConcurrencyManager:
         if self.resource_monitor:
             status['resource_monitor'] = self.resource_monitor.get_resource_summary()
         
+        if self.limiter:
+            status['concurrency_limit'] = self.limiter.get_stats()
+        
         return status
 
 class ResourceError(Exception):
@@ -138,7 +189,8 @@ def get_concurrency_manager() -> Optional[ConcurrencyManager]:
 
 def initialize_concurrency_manager(
     async_config: Optional[AsyncProcessorConfig] = None,
-    resource_config: Optional[ResourceMonitorConfig] = None
+    resource_config: Optional[ResourceMonitorConfig] = None,
+    limit_config: Optional[AdaptiveLimitConfig] = None
 ) -> ConcurrencyManager:
     """Initialize the global concurrency manager"""
     global concurrency_manager
@@ -146,7 +198,7 @@ def initialize_concurrency_manager(
     if concurrency_manager is not None:
         raise ValueError("ConcurrencyManager already initialized")
     
-    concurrency_manager = ConcurrencyManager(async_config, resource_config)
+    concurrency_manager = ConcurrencyManager(async_config, resource_config, limit_config)
     return concurrency_manager
 
 async def shutdown_concurrency_manager():
@@ -216,8 +268,9 @@ def concurrent_task(priority: TaskPriority = TaskPriority.NORMAL,
     return decorator
 
 def resource_aware(estimated_cpu: float = 10.0, 
-                  estimated_memory_mb: float = 100.0):
-    """Decorator to add resource awareness to a function"""
+                  estimated_memory_mb: float = 100.0,
+                  limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+    """Decorator to add resource awareness (and optionally an adaptive concurrency limit) to a function"""
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
@@ -231,7 +284,19 @@ def resource_aware(estimated_cpu: float = 10.0,
                         f"Current state: {current_metrics.overall_state.value}"
                     )
             
-            return func(*args, **kwargs)
+            if limiter is None:
+                return func(*args, **kwargs)
+            
+            if not limiter.try_acquire():
+                raise ResourceError(f"Concurrency limit reached for {func.__name__} ({limiter.limit})")
+            start_time = time.monotonic()
+            success = False
+            try:
+                result = func(*args, **kwargs)
+                success = True
+                return result
+            finally:
+                limiter.release(time.monotonic() - start_time, success)
         
         return wrapper
     
@@ -239,35 +304,106 @@ def resource_aware(estimated_cpu: float = 10.0,
 
 # Utility functions for concurrent execution
 
-async def run_concurrent_tasks(tasks: List[Callable], 
-                              priority: TaskPriority = TaskPriority.NORMAL,
-                              timeout: Optional[float] = None,
-                              max_concurrent: Optional[int] = None) -> List[Any]:
-    """Run multiple tasks concurrently and return results"""
+@dataclass
+class TaskOutcome:
+    """One finished task from an as-completed stream; index is its submission order"""
+    index: int
+    result: Any = None
+    error: Optional[BaseException] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+async def _stream_outcomes(manager: ConcurrencyManager,
+                           submissions: Iterator[Callable[[], Awaitable[str]]],
+                           timeout: Optional[float],
+                           max_concurrent: Optional[int],
+                           fail_fast: bool) -> AsyncIterator[TaskOutcome]:
+    """
+    Drive submissions (each returns a task id) keeping at most max_concurrent
+    unfinished, yielding outcomes in completion order. Submissions are pulled
+    lazily, so only in-flight work is held in memory.
+    """
+    limit = max_concurrent if max_concurrent and max_concurrent > 0 else float('inf')
+    submissions = enumerate(submissions)
+    in_flight: Dict[asyncio.Future, tuple] = {}
+    exhausted = False
     
+    try:
+        while True:
+            while not exhausted and len(in_flight) < limit:
+                try:
+                    index, submit = next(submissions)
+                except StopIteration:
+                    exhausted = True
+                    break
+                task_id = await submit()
+                waiter = asyncio.ensure_future(manager.get_task_result(task_id, timeout))
+                in_flight[waiter] = (index, task_id)
+            
+            if not in_flight:
+                return
+            
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in sorted(done, key=lambda finished: in_flight[finished][0]):
+                index, task_id = in_flight.pop(waiter)
+                error = waiter.exception()
+                if error is None:
+                    yield TaskOutcome(index, waiter.result())
+                    continue
+                
+                if isinstance(error, TimeoutError):
+                    # Per-item timeout: don't let it run later for nobody
+                    manager.cancel_task(task_id)
+                if fail_fast:
+                    raise error
+                yield TaskOutcome(index, error=error)
+    finally:
+        # First error, consumer stopped early, or cancelled: drop the rest
+        for waiter, (_, task_id) in in_flight.items():
+            waiter.cancel()
+            manager.cancel_task(task_id)
+
+def iter_concurrent_tasks(tasks: Iterable[Callable],
+                          priority: TaskPriority = TaskPriority.NORMAL,
+                          timeout: Optional[float] = None,
+                          max_concurrent: Optional[int] = None,
+                          fail_fast: bool = False) -> AsyncIterator[TaskOutcome]:
+    """
+    Run tasks concurrently and yield a TaskOutcome for each as soon as it
+    finishes. At most max_concurrent run at once and tasks (which may be a
+    generator) are consumed lazily. timeout applies to each task from its
+    submission. Failures are yielded as outcomes with error set, unless
+    fail_fast is set: then the first error is raised and tasks not yet
+    started are cancelled, as they are when the consumer stops iterating.
+    """
     manager = get_concurrency_manager()
     if not manager:
         raise ValueError("ConcurrencyManager not initialized")
     
-    # Submit all tasks
-    task_ids = []
-    for task in tasks:
-        if callable(task):
-            task_id = await manager.submit_task(
-                task,
-                priority=priority,
-                timeout=timeout
-            )
-            task_ids.append(task_id)
-        else:
-            raise ValueError("All items in tasks list must be callable")
-    
-    # Collect results
-    results = []
-    for task_id in task_ids:
-        result = await manager.get_task_result(task_id, timeout)
-        results.append(result)
+    def submissions():
+        for task in tasks:
+            if not callable(task):
+                raise ValueError("All items in tasks list must be callable")
+            yield functools.partial(manager.submit_task, task, priority=priority, timeout=timeout)
     
+    return _stream_outcomes(manager, submissions(), timeout, max_concurrent, fail_fast)
+
+async def run_concurrent_tasks(tasks: List[Callable], 
+                              priority: TaskPriority = TaskPriority.NORMAL,
+                              timeout: Optional[float] = None,
+                              max_concurrent: Optional[int] = None) -> List[Any]:
+    """
+    Run multiple tasks concurrently and return results in input order.
+    The first failure is raised and cancels tasks that have not started.
+    """
+    if not all(callable(task) for task in tasks):
+        raise ValueError("All items in tasks list must be callable")
+    
+    results: List[Any] = [None] * len(tasks)
+    async for outcome in iter_concurrent_tasks(tasks, priority, timeout, max_concurrent, fail_fast=True):
+        results[outcome.index] = outcome.result
     return results
 
 async def run_with_resource_limits(func: Callable, 
@@ -319,11 +455,16 @@ async def run_with_resource_limits(func: Callable,
 # Context managers for resource management
 
 class ResourceContext:
-    """Context manager for resource-aware execution"""
+    """
+    Context manager for resource-aware execution. With a limiter the block
+    also holds one of its slots, and its duration and outcome feed the limit.
+    """
     
-    def __init__(self, estimated_cpu: float = 10.0, estimated_memory_mb: float = 100.0):
+    def __init__(self, estimated_cpu: float = 10.0, estimated_memory_mb: float = 100.0,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None):
         self.estimated_cpu = estimated_cpu
         self.estimated_memory_mb = estimated_memory_mb
+        self.limiter = limiter
         self.start_time = None
     
     def __enter__(self):
@@ -337,6 +478,9 @@ class ResourceContext:
                     f"Insufficient resources. Current state: {current_metrics.overall_state.value}"
                 )
         
+        if self.limiter and not self.limiter.try_acquire():
+            raise ResourceError(f"Concurrency limit reached ({self.limiter.limit})")
+        
         self.start_time = time.time()
         return self
     
@@ -344,6 +488,9 @@ class ResourceContext:
         if self.start_time:
             execution_time = time.time() - self.start_time
             
+            if self.limiter:
+                self.limiter.release(execution_time, success=exc_type is None)
+            
             # Track metrics
             if metrics_collector:
                 metrics_collector.track_request_time(
@@ -402,4 +549,30 @@ class AsyncBatch:
             result = await manager.get_task_result(task_id, timeout)
             results.append(result)
         
-        return results 
\ No newline at end of file
+        return results
+    
+    def as_completed(self, timeout: Optional[float] = None,
+                     fail_fast: bool = False) -> AsyncIterator[TaskOutcome]:
+        """
+        Yield a TaskOutcome for every task in the batch as it finishes,
+        indexed in the order tasks were added. At most batch_size tasks are
+        awaited at once; tasks not yet submitted are submitted as earlier
+        ones finish. timeout and fail_fast behave as in iter_concurrent_tasks.
+        """
+        manager = get_concurrency_manager()
+        if not manager:
+            raise ValueError("ConcurrencyManager not initialized")
+        
+        submitted, unsubmitted = list(self.task_ids), list(self.tasks)
+        self.tasks.clear()
+        
+        async def known(task_id: str) -> str:
+            return task_id
+        
+        def submissions():
+            for task_id in submitted:
+                yield functools.partial(known, task_id)
+            for func, args, kwargs in unsubmitted:
+                yield functools.partial(manager.submit_task, func, *args, priority=self.priority, **kwargs)
+        
+        return _stream_outcomes(manager, submissions(), timeout, self.batch_size, fail_fast) 
\ No newline at end of file
@@ -0,0 +1,392 @@
+"""
+Durable work queue for SwarmDirector
+A host-local SQLite (WAL mode) queue so queued work survives deploys and
+crashes. Items are leased to consumers for a visibility timeout and are
+redelivered when they are not acknowledged in time or when the process
+holding the lease has died.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# fcntl is POSIX-only; without it the exclusive owner lock is not enforced
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_items (
+    item_id TEXT PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    visible_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_token TEXT,
+    lease_owner INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_queue_items_order ON queue_items (priority, enqueued_at);
+CREATE INDEX IF NOT EXISTS idx_queue_items_lease_owner ON queue_items (lease_owner);
+"""
+
+_INSERT = ("INSERT OR REPLACE INTO queue_items (item_id, priority, payload, enqueued_at, visible_at) "
+           "VALUES (?, ?, ?, ?, ?)")
+
+
+@dataclass
+class LeasedItem:
+    """An item held by a consumer until it is acked, nacked or its lease expires"""
+    item_id: str
+    payload: Dict[str, Any]
+    priority: int
+    attempts: int
+    lease_token: str
+    lease_expires_at: float
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process on this host is still running"""
+    if os.name == 'nt':
+        # No signal-0 probe on Windows; rely on the visibility timeout
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SQLiteDurableQueue:
+    """
+    Priority work queue on a local SQLite file.
+
+    Writes (enqueue, ack, claim) go through a background writer that commits
+    everything submitted since its last commit in one transaction, so
+    concurrent producers share fsync-free WAL commits. Each write returns a
+    Future resolved once it is committed. dequeue() leases items in a single
+    immediate transaction on the caller's connection; a leased item becomes
+    visible again when its lease expires, and recover() releases leases held
+    by processes that are no longer running.
+
+    With exclusive, the queue holds an exclusive lock on <path>.lock while it
+    is open, and opening a file that another open queue holds raises
+    RuntimeError. This is for a consumer that treats everything in the file as
+    its own, such as RequestQueueManager recovering unfinished requests.
+    """
+
+    def __init__(self, path: str, visibility_timeout_seconds: float = 30.0, max_batch_size: int = 1000,
+                 exclusive: bool = False, lock_timeout_seconds: float = 0.0):
+        self.path = path
+        self.visibility_timeout = visibility_timeout_seconds
+        self.max_batch_size = max(1, max_batch_size)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = self._acquire_owner_lock(lock_timeout_seconds) if exclusive else None
+
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[Tuple[str, Any, Future]]]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats = {'enqueued': 0, 'delivered': 0, 'redelivered': 0, 'acked': 0,
+                      'nacked': 0, 'recovered': 0, 'commits': 0, 'errors': 0}
+
+        self._connect().executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._run_writer, name="durable-queue", daemon=True)
+        self._writer.start()
+
+    def _acquire_owner_lock(self, timeout: float):
+        """Lock <path>.lock, waiting up to timeout seconds for another owner to close it"""
+        lock_file = open(self.path + '.lock', 'a')
+        if not HAS_FCNTL:
+            logger.warning(f"Cannot lock durable queue {self.path} on this platform; "
+                           "a second consumer will not be refused")
+            return lock_file
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except OSError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise RuntimeError(f"Durable queue {self.path} is in use by another consumer")
+                time.sleep(0.05)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection: sqlite3.Connection):
+        """Write transaction that takes the database write lock up front"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def put(self, payload: Dict[str, Any], priority: int = 3, item_id: Optional[str] = None) -> Future:
+        """
+        Queue an item for writing. The returned Future resolves to the item
+        id once the item is durable.
+        """
+        item_id = item_id or str(uuid.uuid4())
+        now = time.time()
+        return self._submit('put', [(item_id, priority, json.dumps(payload, default=str), now, now)], item_id)
+
+    def enqueue(self, payload: Dict[str, Any], priority: int = 3, item_id: Optional[str] = None,
+                timeout: float = 5.0) -> str:
+        """Add an item and wait until it is durable"""
+        return self.put(payload, priority, item_id).result(timeout)
+
+    def enqueue_many(self, payloads: Iterable[Dict[str, Any]], priority: int = 3,
+                     timeout: float = 5.0) -> List[str]:
+        """Add several items in one transaction and wait until they are durable"""
+        now = time.time()
+        rows = [(str(uuid.uuid4()), priority, json.dumps(payload, default=str), now, now)
+                for payload in payloads]
+        self._submit('put', rows).result(timeout)
+        return [row[0] for row in rows]
+
+    def dequeue(self, max_items: int = 1, visibility_timeout: Optional[float] = None) -> List[LeasedItem]:
+        """
+        Lease up to max_items visible items, best priority then oldest first.
+        Items not acked before their lease expires are delivered again.
+        """
+        now = time.time()
+        expires_at = now + (self.visibility_timeout if visibility_timeout is None else visibility_timeout)
+        connection = self._connect()
+
+        try:
+            with self._transaction(connection):
+                rows = connection.execute(
+                    "SELECT item_id, priority, payload, attempts FROM queue_items "
+                    "WHERE visible_at <= ? ORDER BY priority, enqueued_at LIMIT ?", (now, max_items)
+                ).fetchall()
+                items = [LeasedItem(item_id, json.loads(payload), priority, attempts + 1,
+                                    uuid.uuid4().hex, expires_at)
+                         for item_id, priority, payload, attempts in rows]
+                connection.executemany(
+                    "UPDATE queue_items SET visible_at = ?, attempts = ?, lease_token = ?, lease_owner = ? "
+                    "WHERE item_id = ?",
+                    [(expires_at, item.attempts, item.lease_token, self.pid, item.item_id) for item in items]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Durable queue dequeue failed: {e}")
+            self._count('errors')
+            return []
+
+        self._count('delivered', len(items))
+        self._count('redelivered', sum(1 for item in items if item.attempts > 1))
+        return items
+
+    def claim(self, item_id: str, lease_seconds: Optional[float] = None) -> Future:
+        """
+        Lease a specific item to this process, e.g. when work known by id
+        starts running. The Future resolves to the lease token, or None if
+        the item no longer exists.
+        """
+        expires_at = time.time() + (self.visibility_timeout if lease_seconds is None else lease_seconds)
+        return self._submit('claim', (item_id, expires_at, uuid.uuid4().hex, self.pid))
+
+    def ack(self, item_id: str, lease_token: Optional[str] = None) -> Future:
+        """
+        Remove a finished item. With a lease token the ack only applies while
+        that lease is current. The Future resolves to whether a row was removed.
+        """
+        return self._submit('ack', [(item_id, lease_token, lease_token)])
+
+    def ack_many(self, items: Iterable[LeasedItem]) -> Future:
+        """Remove several leased items in one transaction; resolves to the count removed"""
+        return self._submit('ack_many', [(item.item_id, item.lease_token, item.lease_token) for item in items])
+
+    def nack(self, item_id: str, lease_token: str, delay_seconds: float = 0.0, timeout: float = 5.0) -> bool:
+        """Give a leased item back, visible again after delay_seconds"""
+        return self._submit('nack', (item_id, lease_token, time.time() + delay_seconds)).result(timeout)
+
+    def extend_lease(self, item_id: str, lease_token: str, seconds: float, timeout: float = 5.0) -> bool:
+        """Keep a long-running item leased for another `seconds`"""
+        return self._submit('extend', (item_id, lease_token, time.time() + seconds)).result(timeout)
+
+    def recover(self, release_own: bool = False) -> int:
+        """
+        Make items leased by processes that have exited visible again; returns
+        the count. release_own also releases this process's leases, for a sole
+        consumer restarting without the work it had in memory.
+        """
+        connection = self._connect()
+        try:
+            owners = [row[0] for row in connection.execute(
+                "SELECT DISTINCT lease_owner FROM queue_items WHERE lease_owner IS NOT NULL"
+            )]
+            dead = [(time.time(), owner) for owner in owners
+                    if (owner == self.pid and release_own) or (owner != self.pid and not _pid_alive(owner))]
+            if not dead:
+                return 0
+            with self._transaction(connection):
+                released = connection.executemany(
+                    "UPDATE queue_items SET visible_at = ?, lease_token = NULL, lease_owner = NULL "
+                    "WHERE lease_owner = ?", dead
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Durable queue recovery failed: {e}")
+            self._count('errors')
+            return 0
+
+        self._count('recovered', released)
+        if released:
+            logger.info(f"Recovered {released} queued items from exited processes")
+        return released
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until submitted writes have been committed"""
+        try:
+            self._submit('flush', None).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def qsize(self) -> int:
+        """Number of unacknowledged items, leased or not"""
+        return self._connect().execute("SELECT COUNT(*) FROM queue_items").fetchone()[0]
+
+    def close(self):
+        """Commit pending writes and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        if self._lock_file is not None:
+            # Closing the descriptor releases the owner lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics including current depth and in-flight count"""
+        try:
+            queued, in_flight = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(lease_token IS NOT NULL AND visible_at > ?), 0) FROM queue_items",
+                (time.time(),)
+            ).fetchone()
+        except sqlite3.Error:
+            queued = in_flight = None
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({'queued': queued, 'in_flight': in_flight, 'path': self.path})
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _submit(self, op: str, args: Any, result: Any = None) -> Future:
+        if self._closed:
+            raise ValueError("Durable queue is closed")
+        future: Future = Future()
+        self._queue.put((op, args, future, result))
+        return future
+
+    def _run_writer(self):
+        """Commit everything submitted since the last commit as one transaction"""
+        connection = self._connect()
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            stop = batch[-1] is None
+            self._apply(connection, [entry for entry in batch if entry is not None])
+            if stop:
+                connection.close()
+                return
+
+    def _apply(self, connection: sqlite3.Connection, batch):
+        """Apply a batch of writes in order, in one transaction, then resolve their futures"""
+        results = []
+        enqueued = acked = nacked = 0
+        try:
+            with self._transaction(connection):
+                for op, args, future, result in batch:
+                    if op == 'put':
+                        connection.executemany(_INSERT, args)
+                        enqueued += len(args)
+                    elif op == 'claim':
+                        item_id, expires_at, token, owner = args
+                        updated = connection.execute(
+                            "UPDATE queue_items SET visible_at = ?, attempts = attempts + 1, lease_token = ?, "
+                            "lease_owner = ? WHERE item_id = ?", (expires_at, token, owner, item_id)
+                        ).rowcount
+                        result = token if updated else None
+                    elif op in ('ack', 'ack_many'):
+                        removed = connection.executemany(
+                            "DELETE FROM queue_items WHERE item_id = ? AND (? IS NULL OR lease_token = ?)", args
+                        ).rowcount
+                        acked += removed
+                        result = removed if op == 'ack_many' else bool(removed)
+                    elif op == 'nack':
+                        item_id, token, visible_at = args
+                        result = bool(connection.execute(
+                            "UPDATE queue_items SET visible_at = ?, lease_token = NULL, lease_owner = NULL "
+                            "WHERE item_id = ? AND lease_token = ?", (visible_at, item_id, token)
+                        ).rowcount)
+                        nacked += result
+                    elif op == 'extend':
+                        item_id, token, visible_at = args
+                        result = bool(connection.execute(
+                            "UPDATE queue_items SET visible_at = ? WHERE item_id = ? AND lease_token = ?",
+                            (visible_at, item_id, token)
+                        ).rowcount)
+                    results.append(result)
+        except sqlite3.Error as e:
+            logger.warning(f"Durable queue write failed: {e}")
+            self._count('errors')
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.stats['enqueued'] += enqueued
+            self.stats['acked'] += acked
+            self.stats['nacked'] += nacked
+            self.stats['commits'] += 1
+        for (_, _, future, _), result in zip(batch, results):
+            future.set_result(result)
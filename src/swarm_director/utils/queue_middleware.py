@@ -1,17 +1,27 @@
 """
 Flask Middleware for Request Queuing
 Automatically queues requests during high load periods using the RequestQueueManager
+
+Matched routes are handed to the queue instead of running on the web thread:
+the client gets 202 Accepted with a status URL and Retry-After, the view runs
+in the queue's handler pool, and the status endpoint long-polls until the
+original response is ready.
 """
 
 import asyncio
+import base64
 import logging
+import math
+import threading
 import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
-from flask import Flask, request, g, jsonify, current_app
+from flask import Flask, Response, request, g, jsonify, current_app, make_response, url_for
 
 from .request_queue import (
-    RequestQueueManager, RequestType, QueuePriority, 
+    RequestQueueManager, RequestType, QueuePriority,
     get_request_queue_manager, RequestStatus
 )
 from .response_formatter import ResponseFormatter
@@ -19,33 +29,257 @@ from .metrics import metrics_collector
 
 logger = logging.getLogger(__name__)
 
+# Marks the replayed request inside a queue worker so it is not queued again
+QUEUED_DISPATCH_ENVIRON_KEY = 'swarm_director.queued_dispatch'
+
+# Headers recomputed by the status endpoint when replaying a stored response
+_HOP_HEADERS = {'content-length', 'transfer-encoding', 'connection'}
+
+# Credentials left out of replay descriptions written to a durable queue file;
+# a request recovered after a restart replays without them
+CREDENTIAL_HEADERS = frozenset({'authorization', 'proxy-authorization', 'cookie', 'x-api-key'})
+
+@dataclass
+class QueuedRoute:
+    """How requests to one endpoint are queued"""
+    request_type: RequestType = RequestType.API_CALL
+    priority: QueuePriority = QueuePriority.NORMAL
+    always: bool = False
+
 class QueueMiddleware:
     """Flask middleware for automatic request queuing"""
-    
+
     def __init__(self, app: Optional[Flask] = None, queue_manager: Optional[RequestQueueManager] = None):
         self.app = app
         self.queue_manager = queue_manager
         self.enabled = True
         self.load_threshold = 0.8  # Queue requests when system load exceeds this
-        
+        self.max_long_poll_seconds = 30.0
+        self.routes: Dict[str, QueuedRoute] = {}
+        self.durable_excluded_headers = set(CREDENTIAL_HEADERS)
+
+        # Matched requests currently running synchronously on web threads
+        self._inline_requests = 0
+        self._inline_lock = threading.Lock()
+
         if app:
             self.init_app(app)
-    
+
     def init_app(self, app: Flask):
         """Initialize middleware with Flask app"""
         self.app = app
-        
+
         # Get queue manager from app extensions or global
         if not self.queue_manager:
             self.queue_manager = app.extensions.get('request_queue_manager') or get_request_queue_manager()
-        
+
         # Store middleware in app extensions
         if self.queue_manager:
             app.extensions['queue_middleware'] = self
+            if self.queue_manager.handler_factory is None:
+                # Lets requests recovered from a durable queue replay through this app
+                self.queue_manager.handler_factory = lambda replay: self._make_handler(
+                    app, self._captured_from_replay(replay)
+                )
+            if self.queue_manager.durable_replay_filter is None:
+                self.queue_manager.durable_replay_filter = self._durable_replay
+            app.before_request(self._before_request)
+            app.teardown_request(self._teardown_request)
+            app.add_url_rule('/api/queue/requests/<request_id>', 'queued_request_status',
+                             self.request_status_view, methods=['GET'])
             logger.info("QueueMiddleware initialized successfully")
         else:
             logger.warning("QueueMiddleware initialized without RequestQueueManager")
 
+    def queue_route(self, endpoint: str, request_type: RequestType = RequestType.API_CALL,
+                    priority: QueuePriority = QueuePriority.NORMAL, always: bool = False):
+        """
+        Make an endpoint eligible for queuing. It is queued when the client
+        sends `Prefer: respond-async`, when always is set, or when load
+        reaches load_threshold; otherwise it runs inline as usual.
+        """
+        self.routes[endpoint] = QueuedRoute(request_type, priority, always)
+
+    def get_load(self) -> float:
+        """Inline, running and queued matched requests as a fraction of queue capacity"""
+        queue_load = self.queue_manager.get_load() if self.queue_manager._running else 0.0
+        with self._inline_lock:
+            inline = self._inline_requests
+        return queue_load + inline / max(1, self.queue_manager.get_worker_capacity())
+
+    def should_queue(self, route: QueuedRoute) -> bool:
+        """Decide whether the current request goes to the queue"""
+        if not self.enabled:
+            return False
+        if route.always or 'respond-async' in request.headers.get('Prefer', ''):
+            return True
+        return self.get_load() >= self.load_threshold
+
+    def _before_request(self):
+        route = self.routes.get(request.endpoint)
+        if route is None or request.environ.get(QUEUED_DISPATCH_ENVIRON_KEY):
+            return None
+
+        if not self.should_queue(route):
+            # Count inline work so a spike pushes later requests onto the queue
+            with self._inline_lock:
+                self._inline_requests += 1
+            g._queue_middleware_inline = True
+            return None
+
+        try:
+            return self._enqueue_current_request(route)
+        except (ValueError, RuntimeError, FuturesTimeoutError) as e:
+            # Queue full, backpressure, or a queue loop that is stopped or not
+            # answering: shed load instead of running inline
+            logger.warning(f"Request queue rejected {request.endpoint}: {e!r}")
+            response = make_response(ResponseFormatter.error(
+                str(e) or 'Request queue is not accepting requests', 'SERVICE_UNAVAILABLE', status_code=503
+            ))
+            response.headers['Retry-After'] = str(self._retry_after())
+            return response
+
+    def _teardown_request(self, exc=None):
+        if g.pop('_queue_middleware_inline', False):
+            with self._inline_lock:
+                self._inline_requests -= 1
+
+    def _enqueue_current_request(self, route: QueuedRoute) -> Response:
+        """Queue the current request and answer 202 Accepted"""
+        if not self.queue_manager._running:
+            self.queue_manager.start_background()
+
+        captured = {
+            'path': request.path,
+            'base_url': request.host_url,
+            'method': request.method,
+            'query_string': request.query_string.decode('latin-1'),
+            'headers': [(key, value) for key, value in request.headers.items()
+                        if key.lower() != 'prefer'],
+            'data': request.get_data(),
+            'environ_overrides': {
+                'REMOTE_ADDR': request.remote_addr,
+                QUEUED_DISPATCH_ENVIRON_KEY: True
+            }
+        }
+        request_id = self.queue_manager.queue_request_threadsafe(
+            route.request_type,
+            {'method': request.method, 'path': request.path, 'endpoint': request.endpoint},
+            priority=route.priority,
+            client_id=request.remote_addr or 'unknown',
+            handler=self._make_handler(current_app._get_current_object(), captured),
+            replay=self._replay_from_captured(captured)
+        )
+
+        metrics_collector.track_request_time('queue_middleware_requests_queued', 1.0)
+        logger.debug(f"Queued {request.method} {request.path} as request {request_id}")
+        return self._accepted_response(request_id, RequestStatus.QUEUED)
+
+    @staticmethod
+    def _make_handler(app: Flask, captured: Dict[str, Any]) -> Callable[[], Dict[str, Any]]:
+        """Build the callable that replays the request through Flask in a queue worker"""
+        def handler() -> Dict[str, Any]:
+            with app.test_request_context(**captured):
+                response = app.full_dispatch_request()
+                return {
+                    'status_code': response.status_code,
+                    'headers': [(key, value) for key, value in response.headers.items()
+                                if key.lower() not in _HOP_HEADERS],
+                    'body': response.get_data()
+                }
+        return handler
+
+    @staticmethod
+    def _replay_from_captured(captured: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-serializable form of a captured request, stored for durable redelivery"""
+        replay = dict(captured)
+        replay['data'] = base64.b64encode(captured['data']).decode('ascii')
+        return replay
+
+    def _durable_replay(self, replay: Dict[str, Any]) -> Dict[str, Any]:
+        """Replay description as written to the durable queue, without credential headers"""
+        stored = dict(replay)
+        stored['headers'] = [(key, value) for key, value in replay['headers']
+                             if key.lower() not in self.durable_excluded_headers]
+        return stored
+
+    @staticmethod
+    def _captured_from_replay(replay: Dict[str, Any]) -> Dict[str, Any]:
+        captured = dict(replay)
+        captured['data'] = base64.b64decode(replay['data'])
+        captured['headers'] = [tuple(header) for header in replay['headers']]
+        return captured
+
+    def _retry_after(self) -> int:
+        """Whole seconds a client should wait before polling"""
+        return max(1, math.ceil(self.queue_manager.estimate_wait_seconds()))
+
+    def _accepted_response(self, request_id: str, status: RequestStatus) -> Response:
+        status_url = url_for('queued_request_status', request_id=request_id)
+        response = make_response(ResponseFormatter.success(
+            data={'request_id': request_id, 'state': status.value, 'status_url': status_url},
+            message='Request accepted for processing',
+            status_code=202
+        ))
+        response.headers['Location'] = status_url
+        response.headers['Retry-After'] = str(self._retry_after())
+        return response
+
+    def request_status_view(self, request_id: str):
+        """
+        Report a queued request. With ?wait=<seconds> the call long-polls;
+        once finished the original response is returned as-is.
+        """
+        try:
+            wait = min(float(request.args.get('wait', 0)), self.max_long_poll_seconds)
+        except ValueError:
+            return ResponseFormatter.error('wait must be a number of seconds', 'VALIDATION_ERROR',
+                                           status_code=400, field='wait')
+
+        queued = self.queue_manager.wait_for_request(request_id, max(0.0, wait))
+        if queued is None:
+            return ResponseFormatter.error(f'Unknown queued request {request_id}', 'NOT_FOUND',
+                                           status_code=404)
+
+        if not queued.completion.done():
+            return self._accepted_response(request_id, queued.status)
+
+        if queued.status == RequestStatus.COMPLETED and isinstance(queued.result, dict) \
+                and 'status_code' in queued.result:
+            response = Response(queued.result['body'], status=queued.result['status_code'],
+                                headers=queued.result['headers'])
+            response.headers['X-Queued-Request-Id'] = request_id
+            return response
+
+        if queued.status == RequestStatus.COMPLETED:
+            return ResponseFormatter.success(data={'request_id': request_id, 'result': queued.result})
+
+        status_code = 504 if queued.status in (RequestStatus.TIMEOUT, RequestStatus.EXPIRED) else 500
+        return ResponseFormatter.error(
+            str(queued.error) if queued.error else 'Queued request did not complete',
+            'GATEWAY_TIMEOUT' if status_code == 504 else 'QUEUED_REQUEST_FAILED',
+            status_code=status_code,
+            details={'request_id': request_id, 'state': queued.status.value}
+        )
+
+# Flask app used by replay_in_worker inside a queue worker process
+_worker_app: Optional[Flask] = None
+
+def init_replay_worker(app_factory: str = 'swarm_director.app:create_app', *factory_args):
+    """Worker process initializer: build the app queued requests replay through"""
+    global _worker_app
+    from .worker_supervisor import import_callable
+    _worker_app = import_callable(app_factory)(*factory_args)
+
+def replay_in_worker(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker process handler: replay a queued request record through the worker's app"""
+    if _worker_app is None:
+        raise RuntimeError("init_replay_worker has not run in this worker process")
+    if record.get('replay') is None:
+        raise ValueError(f"Request {record.get('request_id')} has no replay description")
+    captured = QueueMiddleware._captured_from_replay(record['replay'])
+    return QueueMiddleware._make_handler(_worker_app, captured)()
+
 def get_queue_middleware() -> Optional[QueueMiddleware]:
     """Get the current queue middleware instance"""
     if current_app:
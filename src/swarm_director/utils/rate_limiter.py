@@ -3,40 +3,66 @@ Rate limiting utilities for SwarmDirector API
 Provides memory-based rate limiting with IP and user-based limits
 """
 
+import math
 import time
 import threading
-from typing import Dict, Optional, Tuple
-from collections import defaultdict, deque
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify, current_app
 import logging
 
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
-    """Thread-safe in-memory rate limiter"""
+class _RateLimitShard:
+    """One lock stripe of the key table, kept in least-recently-used order"""
     
     def __init__(self):
-        self._requests = defaultdict(deque)  # key -> deque of timestamps
-        self._lock = threading.RLock()
-        self._cleanup_interval = 3600  # Cleanup old entries every hour
-        self._last_cleanup = time.time()
+        self.lock = threading.Lock()
+        self.tats: "OrderedDict[str, float]" = OrderedDict()  # key -> theoretical arrival time
+        self.allowed = 0
+        self.denied = 0
+        self.evicted = 0
+        self.evicted_throttled = 0  # Evicted while still limited, so their state was lost
+        self.acquisitions = 0
+        self.contended = 0
+        self.lock_wait_seconds = 0.0
+
+class RateLimiter:
+    """
+    Thread-safe in-memory rate limiter using the generic cell rate algorithm
+    (GCRA).
+
+    Each key stores a single theoretical arrival time: a limit of N per
+    window spaces requests window/N apart and allows a burst of up to N, so
+    state is O(1) per key however busy it is. Keys are spread over
+    lock-striped shards, each an LRU map capped at max_keys/num_shards, so
+    memory is bounded without a periodic cleanup. Shard lock waits are
+    counted for get_stats().
+    """
     
-    def _cleanup_old_entries(self, current_time: float, window: int):
-        """Remove expired entries to prevent memory leaks"""
-        if current_time - self._last_cleanup > self._cleanup_interval:
-            with self._lock:
-                cutoff_time = current_time - window
-                for key in list(self._requests.keys()):
-                    # Remove old timestamps
-                    while self._requests[key] and self._requests[key][0] < cutoff_time:
-                        self._requests[key].popleft()
-                    
-                    # Remove empty deques
-                    if not self._requests[key]:
-                        del self._requests[key]
-                
-                self._last_cleanup = current_time
+    def __init__(self, max_keys: int = 100000, num_shards: int = 64):
+        self.num_shards = max(1, num_shards)
+        self.max_keys = max_keys
+        self._shard_max_keys = max(1, max_keys // self.num_shards)
+        self._shards = [_RateLimitShard() for _ in range(self.num_shards)]
+    
+    def _shard(self, key: str) -> _RateLimitShard:
+        return self._shards[hash(key) % self.num_shards]
+    
+    def _acquire(self, shard: _RateLimitShard):
+        """
+        Take a shard lock, recording whether and how long we had to wait. The
+        wait includes getting the GIL back once the lock is released.
+        """
+        if shard.lock.acquire(blocking=False):
+            shard.acquisitions += 1
+            return
+        started = time.perf_counter()
+        shard.lock.acquire()
+        shard.acquisitions += 1
+        shard.contended += 1
+        shard.lock_wait_seconds += time.perf_counter() - started
     
     def is_allowed(self, key: str, limit: int, window: int) -> Tuple[bool, Dict[str, int]]:
         """
@@ -50,38 +76,57 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, rate_limit_info)
         """
-        current_time = time.time()
+        if limit <= 0 or window <= 0:
+            raise ValueError("Rate limit and window must be positive")
         
-        with self._lock:
-            # Cleanup old entries periodically
-            self._cleanup_old_entries(current_time, window)
-            
-            # Get request history for this key
-            requests = self._requests[key]
-            
-            # Remove requests outside the current window
-            cutoff_time = current_time - window
-            while requests and requests[0] < cutoff_time:
-                requests.popleft()
-            
-            # Check if under limit
-            current_count = len(requests)
-            is_allowed = current_count < limit
-            
+        interval = window / limit
+        shard = self._shard(key)
+        now = time.monotonic()
+        self._acquire(shard)
+        try:
+            tat = max(shard.tats.get(key, now), now)
+            is_allowed = tat + interval - now <= window
             if is_allowed:
-                requests.append(current_time)
-            
-            # Calculate reset time (when oldest request will expire)
-            reset_time = int(cutoff_time + window) if requests else int(current_time + window)
-            
-            rate_limit_info = {
-                'limit': limit,
-                'remaining': max(0, limit - current_count - (1 if is_allowed else 0)),
-                'reset': reset_time,
-                'retry_after': int(window - (current_time - requests[0])) if requests else 0
-            }
+                tat += interval
+                shard.allowed += 1
+            else:
+                shard.denied += 1
             
-            return is_allowed, rate_limit_info
+            shard.tats[key] = tat
+            shard.tats.move_to_end(key)
+            if len(shard.tats) > self._shard_max_keys:
+                _, oldest_tat = shard.tats.popitem(last=False)
+                shard.evicted += 1
+                if oldest_tat > now:
+                    shard.evicted_throttled += 1
+        finally:
+            shard.lock.release()
+        
+        backlog = tat - now  # Seconds of emission intervals already spent
+        return is_allowed, {
+            'limit': limit,
+            'remaining': max(0, int((window - backlog) / interval + 1e-9)),
+            'reset': int(time.time() + backlog),  # When the full burst is available again
+            'retry_after': 0 if is_allowed else math.ceil(backlog + interval - window)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Key count, decisions, evictions and lock contention across shards"""
+        stats = {'keys': 0, 'allowed': 0, 'denied': 0, 'evicted': 0, 'evicted_throttled': 0,
+                 'acquisitions': 0, 'contended': 0, 'lock_wait_seconds': 0.0}
+        for shard in self._shards:
+            with shard.lock:
+                stats['keys'] += len(shard.tats)
+                stats['allowed'] += shard.allowed
+                stats['denied'] += shard.denied
+                stats['evicted'] += shard.evicted
+                stats['evicted_throttled'] += shard.evicted_throttled
+                stats['acquisitions'] += shard.acquisitions
+                stats['contended'] += shard.contended
+                stats['lock_wait_seconds'] += shard.lock_wait_seconds
+        stats['contention_ratio'] = stats['contended'] / stats['acquisitions'] if stats['acquisitions'] else 0.0
+        stats.update({'shards': self.num_shards, 'max_keys': self.max_keys})
+        return stats
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
@@ -5,20 +5,27 @@ Provides coordination mechanisms using semaphores and mutexes for queue access c
 """
 
 import asyncio
+import heapq
+import itertools
+import math
+import sys
 import threading
 import time
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Callable, Union, Set
+from typing import Dict, List, Any, Optional, Callable, Union, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from contextlib import asynccontextmanager
-from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait as wait_futures
 from flask import request as flask_request, g, has_request_context
 
 from .metrics import metrics_collector, track_performance_metrics
-from .async_processor import TaskPriority
+from .async_processor import TaskPriority, resolve_completion, wait_for_completion
+from .durable_queue import SQLiteDurableQueue
+from .worker_supervisor import WorkerSupervisor
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +46,7 @@ class RequestStatus(Enum):
     FAILED = "failed"
     TIMEOUT = "timeout"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"  # Deadline could not be met, dropped before execution
 
 class QueuePriority(Enum):
     """Priority levels for request queuing"""
@@ -60,6 +68,33 @@ class RequestQueueConfig:
     enable_metrics: bool = True
     enable_blackboard: bool = True
     process_groups_enabled: bool = True
+    priority_aging_seconds: float = 10.0
+    wait_time_sample_size: int = 1000
+    handler_thread_count: int = 0  # 0 means one thread per request worker
+    client_weights: Dict[str, float] = field(default_factory=dict)  # fair-share weight per client id
+    max_tracked_clients: int = 1000
+    # SQLite file that makes queued requests survive restarts. It holds each unfinished
+    # request's record in plaintext: request data and replay description (path, body and
+    # headers, less whatever durable_replay_filter removes), so restrict its permissions
+    durable_queue_path: Optional[str] = None
+    durable_visibility_timeout_seconds: float = 300.0
+    # The manager owns its durable file exclusively; a second manager opening it waits this
+    # long for the owner to close it (e.g. a restart overlapping the old process), then fails
+    durable_lock_timeout_seconds: float = 0.0
+    # Deadline given to requests recovered from the durable queue (see DURABLE_RECOVERY_DEADLINES)
+    durable_recovery_deadline: str = 'reset'
+    durable_recovery_grace_seconds: float = 0.0  # Added to the remaining time under 'original'
+    deadline_scheduling: bool = False  # Earliest deadline first within each client's queue
+    drop_expired_requests: bool = True  # Reject/drop requests that cannot finish before their deadline
+    blackboard_shards: int = 16
+    blackboard_max_entries: int = 10000
+    blackboard_max_bytes: int = 64 * 1024 * 1024
+    blackboard_request_ttl_seconds: float = 300.0  # How long per-request entries outlive their last update
+    # 'module:function' run in OS worker processes for groups with worker_processes > 0
+    worker_handler: Optional[str] = None
+    worker_initializer: Optional[str] = None  # 'module:function' called once in each worker process
+    worker_initargs: Tuple[Any, ...] = ()
+    worker_start_method: str = 'spawn'
 
 @dataclass
 class QueuedRequest:
@@ -78,6 +113,12 @@ class QueuedRequest:
     timeout: Optional[float] = None
     process_group: Optional[str] = None
     blackboard_data: Dict[str, Any] = field(default_factory=dict)
+    enqueued_at: Optional[float] = None
+    deadline: Optional[float] = None  # Absolute time.monotonic() by which the request must finish
+    handler: Optional[Callable[[], Any]] = field(default=None, repr=False, compare=False)
+    replay: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    durable_lease: Optional[str] = field(default=None, repr=False, compare=False)
+    completion: Future = field(default_factory=Future, repr=False, compare=False)
 
 @dataclass
 class QueueMetrics:
@@ -88,6 +129,10 @@ class QueueMetrics:
     requests_failed: int = 0
     requests_timeout: int = 0
     requests_cancelled: int = 0
+    requests_expired: int = 0  # Dropped before execution because the deadline could not be met
+    requests_rejected_deadline: int = 0  # Refused at admission for the same reason
+    requests_shed_admission: int = 0  # Refused by the admission policy
+    expired_work_saved_seconds: float = 0.0  # Estimated execution time not spent on them
     peak_queue_size: int = 0
     peak_concurrent_requests: int = 0
     average_queue_time: float = 0.0
@@ -96,59 +141,348 @@ class QueueMetrics:
     total_processing_time: float = 0.0
     last_reset: datetime = field(default_factory=datetime.now)
 
-class BlackboardSystem:
-    """Shared knowledge space for request coordination"""
+@dataclass
+class BlackboardEntry:
+    """A stored blackboard value with its version and expiry"""
+    value: Any
+    version: int
+    expires_at: Optional[float] = None  # time.monotonic(), None for no TTL
+    size: int = 0  # Estimated bytes, counted against the shard's cap
+
+@dataclass
+class BlackboardChange:
+    """A change delivered to watchers; version is 0 when the key was removed"""
+    key: str
+    value: Any
+    old_value: Any
+    version: int
+
+def _estimate_size(value: Any, depth: int = 0) -> int:
+    """Rough in-memory size of a value, following containers a few levels deep"""
+    size = sys.getsizeof(value)
+    if depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k, depth + 1) + _estimate_size(v, depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, depth + 1) for item in value)
+    return size
+
+class _BlackboardShard:
+    """One lock stripe of the blackboard, kept in least-recently-written order"""
     
     def __init__(self):
-        self._data: Dict[str, Any] = {}
-        self._lock = threading.RLock()
+        self.lock = threading.RLock()
+        self.entries: "OrderedDict[str, BlackboardEntry]" = OrderedDict()
+        self.bytes = 0
+        self.last_sweep = time.monotonic()
+        self.expired = 0
+        self.evicted = 0
+
+class BlackboardWatch:
+    """
+    Async stream of blackboard changes under a key prefix. Iterate it with
+    `async for`, or await get(); close() (or leaving `async with`) ends it.
+    If the consumer falls more than max_pending changes behind, the oldest
+    are dropped and counted in `dropped`.
+    """
+    
+    def __init__(self, blackboard: 'BlackboardSystem', prefix: str, loop: asyncio.AbstractEventLoop,
+                 max_pending: int):
+        self.prefix = prefix
+        self.dropped = 0
+        self._blackboard = blackboard
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._closed = False
+    
+    def _deliver(self, change: Optional[BlackboardChange]):
+        """Hand a change to the watch's loop; safe from any thread"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, change)
+        except RuntimeError:
+            pass  # Loop already closed
+    
+    def _put(self, change: Optional[BlackboardChange]):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(change)
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[BlackboardChange]:
+        """Wait for the next change; None once the watch is closed"""
+        if self._closed and self._queue.empty():
+            return None
+        return await asyncio.wait_for(self._queue.get(), timeout)
+    
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._blackboard._remove_watch(self)
+            self._deliver(None)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> BlackboardChange:
+        change = await self.get()
+        if change is None:
+            raise StopAsyncIteration
+        return change
+    
+    async def __aenter__(self) -> 'BlackboardWatch':
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+class BlackboardSystem:
+    """
+    Shared knowledge space for request coordination.
+
+    Keys are spread over lock-striped shards so writers of different keys do
+    not contend. Entries can carry a TTL and are expired lazily when read and
+    by a sweep of each shard at most every sweep_interval_seconds; each shard
+    is capped in entries and estimated bytes, evicting the least recently
+    written keys. Every write gets a new version for compare_and_set, and
+    watch() streams changes under a key prefix to asyncio consumers.
+    """
+    
+    def __init__(self, num_shards: int = 16, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl_seconds: Optional[float] = None, sweep_interval_seconds: float = 1.0):
+        self.num_shards = max(1, num_shards)
+        self.default_ttl = default_ttl_seconds
+        self.sweep_interval = sweep_interval_seconds
+        self._shard_max_entries = max(1, max_entries // self.num_shards)
+        self._shard_max_bytes = max(1, max_bytes // self.num_shards)
+        self._shards = [_BlackboardShard() for _ in range(self.num_shards)]
+        self._versions = itertools.count(1)
+        
+        # Listeners are called outside the shard locks
+        self._listeners_lock = threading.Lock()
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        self._watches: List[BlackboardWatch] = []
+    
+    def write(self, key: str, value: Any, notify: bool = True, ttl_seconds: Optional[float] = None):
+        """Write data to blackboard, optionally expiring after ttl_seconds"""
+        shard = self._shard(key)
+        with shard.lock:
+            now = time.monotonic()
+            old = self._live_entry(shard, key, now)
+            entry = self._store(shard, key, value, ttl_seconds, now)
+            removed = self._maintain(shard, now)
         
-    def write(self, key: str, value: Any, notify: bool = True):
-        """Write data to blackboard"""
-        with self._lock:
-            old_value = self._data.get(key)
-            self._data[key] = value
-            
-            if notify and old_value != value:
-                self._notify_subscribers(key, value, old_value)
+        old_value = old.value if old else None
+        if notify and old_value != value:
+            self._notify(key, value, old_value, entry.version)
+        self._notify_removed(removed)
     
     def read(self, key: str, default: Any = None) -> Any:
         """Read data from blackboard"""
-        with self._lock:
-            return self._data.get(key, default)
+        value, version = self.read_versioned(key)
+        return value if version else default
+    
+    def read_versioned(self, key: str) -> Tuple[Any, int]:
+        """Read a value with its version; (None, 0) if the key is absent"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(shard, key)
+                shard.expired += 1
+                removed = [(key, entry.value)]
+                entry = None
+            else:
+                removed = []
+        
+        self._notify_removed(removed)
+        return (entry.value, entry.version) if entry else (None, 0)
     
-    def update(self, key: str, updater: Callable[[Any], Any], default: Any = None):
+    def compare_and_set(self, key: str, expected_version: int, value: Any,
+                        ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Write only if the key is still at expected_version (0: key must be
+        absent). Returns whether the write happened.
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            now = time.monotonic()
+            old = self._live_entry(shard, key, now)
+            if (old.version if old else 0) != expected_version:
+                return False
+            entry = self._store(shard, key, value, ttl_seconds, now)
+            removed = self._maintain(shard, now)
+        
+        self._notify(key, value, old.value if old else None, entry.version)
+        self._notify_removed(removed)
+        return True
+    
+    def update(self, key: str, updater: Callable[[Any], Any], default: Any = None,
+               ttl_seconds: Optional[float] = None):
         """Atomically update data in blackboard"""
-        with self._lock:
-            current_value = self._data.get(key, default)
+        shard = self._shard(key)
+        with shard.lock:
+            now = time.monotonic()
+            old = self._live_entry(shard, key, now)
+            current_value = old.value if old else default
             new_value = updater(current_value)
-            self._data[key] = new_value
-            self._notify_subscribers(key, new_value, current_value)
+            entry = self._store(shard, key, new_value, ttl_seconds, now)
+            removed = self._maintain(shard, now)
+        
+        self._notify(key, new_value, current_value, entry.version)
+        self._notify_removed(removed)
+    
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns whether it was present"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = self._live_entry(shard, key, time.monotonic())
+            if entry is not None:
+                self._remove(shard, key)
+        
+        if entry is None:
+            return False
+        self._notify(key, None, entry.value, 0)
+        return True
+    
+    def purge_expired(self) -> int:
+        """Drop every expired entry now; returns how many were removed"""
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed = self._sweep(shard, time.monotonic())
+            self._notify_removed(removed)
+            total += len(removed)
+        return total
     
     def subscribe(self, key: str, callback: Callable[[str, Any, Any], None]):
         """Subscribe to changes on a key"""
-        with self._lock:
+        with self._listeners_lock:
             self._subscribers[key].append(callback)
     
     def unsubscribe(self, key: str, callback: Callable):
         """Unsubscribe from changes on a key"""
-        with self._lock:
-            if callback in self._subscribers[key]:
+        with self._listeners_lock:
+            if callback in self._subscribers.get(key, ()):
                 self._subscribers[key].remove(callback)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+    
+    def watch(self, key_prefix: str = '', max_pending: int = 1000) -> BlackboardWatch:
+        """Stream changes to keys starting with key_prefix to the running event loop"""
+        watch = BlackboardWatch(self, key_prefix, asyncio.get_running_loop(), max_pending)
+        with self._listeners_lock:
+            self._watches.append(watch)
+        return watch
+    
+    def _remove_watch(self, watch: BlackboardWatch):
+        with self._listeners_lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
     
-    def _notify_subscribers(self, key: str, new_value: Any, old_value: Any):
-        """Notify subscribers of changes"""
-        for callback in self._subscribers[key]:
+    def _shard(self, key: str) -> _BlackboardShard:
+        return self._shards[hash(key) % self.num_shards]
+    
+    def _live_entry(self, shard: _BlackboardShard, key: str, now: float) -> Optional[BlackboardEntry]:
+        """Current entry for a key, dropping it if expired (caller holds the shard lock)"""
+        entry = shard.entries.get(key)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+            self._remove(shard, key)
+            shard.expired += 1
+            return None
+        return entry
+    
+    def _store(self, shard: _BlackboardShard, key: str, value: Any, ttl_seconds: Optional[float],
+               now: float) -> BlackboardEntry:
+        size = _estimate_size(key) + _estimate_size(value)
+        if size > self._shard_max_bytes:
+            raise ValueError(f"Blackboard value for {key} is too large ({size} bytes)")
+        
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl
+        self._remove(shard, key)
+        entry = BlackboardEntry(value, next(self._versions), now + ttl if ttl is not None else None, size)
+        shard.entries[key] = entry
+        shard.bytes += size
+        return entry
+    
+    def _remove(self, shard: _BlackboardShard, key: str) -> Optional[BlackboardEntry]:
+        entry = shard.entries.pop(key, None)
+        if entry is not None:
+            shard.bytes -= entry.size
+        return entry
+    
+    def _maintain(self, shard: _BlackboardShard, now: float) -> List[Tuple[str, Any]]:
+        """Periodic expiry and cap enforcement after a write; returns removed (key, value) pairs"""
+        removed = self._sweep(shard, now) if now - shard.last_sweep >= self.sweep_interval else []
+        while len(shard.entries) > self._shard_max_entries or shard.bytes > self._shard_max_bytes:
+            key, entry = shard.entries.popitem(last=False)
+            shard.bytes -= entry.size
+            shard.evicted += 1
+            removed.append((key, entry.value))
+        return removed
+    
+    def _sweep(self, shard: _BlackboardShard, now: float) -> List[Tuple[str, Any]]:
+        shard.last_sweep = now
+        expired = [key for key, entry in shard.entries.items()
+                   if entry.expires_at is not None and entry.expires_at <= now]
+        removed = [(key, self._remove(shard, key).value) for key in expired]
+        shard.expired += len(removed)
+        return removed
+    
+    def _notify_removed(self, removed: List[Tuple[str, Any]]):
+        for key, old_value in removed:
+            self._notify(key, None, old_value, 0)
+    
+    def _notify(self, key: str, new_value: Any, old_value: Any, version: int):
+        """Notify subscribers and watches of a change"""
+        with self._listeners_lock:
+            callbacks = list(self._subscribers.get(key, ()))
+            watches = [watch for watch in self._watches if key.startswith(watch.prefix)]
+        
+        for callback in callbacks:
             try:
                 callback(key, new_value, old_value)
             except Exception as e:
                 logger.error(f"Error notifying blackboard subscriber: {e}")
+        
+        if watches:
+            change = BlackboardChange(key, new_value, old_value, version)
+            for watch in watches:
+                watch._deliver(change)
     
     def get_all_data(self) -> Dict[str, Any]:
         """Get all blackboard data (for monitoring)"""
-        with self._lock:
-            return self._data.copy()
+        now = time.monotonic()
+        data = {}
+        for shard in self._shards:
+            with shard.lock:
+                data.update((key, entry.value) for key, entry in shard.entries.items()
+                            if entry.expires_at is None or entry.expires_at > now)
+        return data
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, estimated bytes, expiries and evictions across shards"""
+        stats = {'entries': 0, 'bytes': 0, 'expired': 0, 'evicted': 0}
+        for shard in self._shards:
+            with shard.lock:
+                stats['entries'] += len(shard.entries)
+                stats['bytes'] += shard.bytes
+                stats['expired'] += shard.expired
+                stats['evicted'] += shard.evicted
+        stats.update({'shards': self.num_shards, 'watches': len(self._watches)})
+        return stats
+
+# What a process group does with a new request once its queue is under backpressure:
+# 'reject' refuses the new request, 'shed_lowest' evicts the queued request with
+# the worst effective priority to make room for it
+REJECTION_POLICIES = ('reject', 'shed_lowest')
+
+# Deadline of a request redelivered from the durable queue after a restart:
+# 'reset' gives it its full timeout again from the moment it is recovered, so an
+# outage longer than the timeout does not expire everything that survived it;
+# 'original' keeps the deadline from the first enqueue plus
+# durable_recovery_grace_seconds, so work nobody is still waiting for is dropped
+DURABLE_RECOVERY_DEADLINES = ('reset', 'original')
 
 class ProcessGroupManager:
     """Manages worker groups for different request types"""
@@ -166,30 +500,35 @@ class ProcessGroupManager:
         default_groups = {
             'task_processing': {
                 'max_workers': 8,
+                'max_queue_size': 400,
                 'request_types': [RequestType.TASK_SUBMISSION],
                 'priority_boost': 0,
                 'resource_limits': {'cpu_percent': 60, 'memory_mb': 1000}
             },
             'agent_operations': {
                 'max_workers': 4,
+                'max_queue_size': 200,
                 'request_types': [RequestType.AGENT_OPERATION],
                 'priority_boost': 1,
                 'resource_limits': {'cpu_percent': 30, 'memory_mb': 500}
             },
             'analytics': {
                 'max_workers': 3,
+                'max_queue_size': 150,
                 'request_types': [RequestType.ANALYTICS_QUERY],
                 'priority_boost': -1,
                 'resource_limits': {'cpu_percent': 20, 'memory_mb': 300}
             },
             'streaming': {
                 'max_workers': 6,
+                'max_queue_size': 100,
                 'request_types': [RequestType.STREAMING_REQUEST],
                 'priority_boost': 2,
                 'resource_limits': {'cpu_percent': 40, 'memory_mb': 600}
             },
             'general': {
                 'max_workers': 4,
+                'max_queue_size': 150,
                 'request_types': [RequestType.API_CALL, RequestType.HEALTH_CHECK],
                 'priority_boost': 0,
                 'resource_limits': {'cpu_percent': 20, 'memory_mb': 200}
@@ -199,12 +538,48 @@ class ProcessGroupManager:
         with self._lock:
             for group_name, config in default_groups.items():
                 self._groups[group_name] = {
+                    'rejection_policy': 'reject',
+                    'worker_processes': 0,
                     **config,
                     'active_workers': 0,
                     'total_processed': 0,
-                    'total_failed': 0
+                    'total_failed': 0,
+                    'total_rejected': 0,
+                    'total_shed': 0
                 }
     
+    def configure_group(self, group_name: str, **settings):
+        """
+        Override settings for a group (max_workers, max_queue_size,
+        rejection_policy, worker_processes, ...). Queue limits and policies
+        apply immediately; max_workers and worker_processes apply the next
+        time the manager starts.
+        """
+        policy = settings.get('rejection_policy')
+        if policy is not None and policy not in REJECTION_POLICIES:
+            raise ValueError(f"Unknown rejection policy: {policy}")
+        
+        with self._lock:
+            if group_name not in self._groups:
+                raise ValueError(f"Unknown process group: {group_name}")
+            self._groups[group_name].update(settings)
+    
+    def get_group_names(self) -> List[str]:
+        """Names of all configured groups"""
+        with self._lock:
+            return list(self._groups)
+    
+    def get_group_setting(self, group_name: str, key: str, default: Any = None) -> Any:
+        """Read one setting of a group"""
+        with self._lock:
+            return self._groups.get(group_name, {}).get(key, default)
+    
+    def record_rejection(self, group_name: str, shed: bool = False):
+        """Count a request refused (or evicted) by a group's backpressure policy"""
+        with self._lock:
+            if group_name in self._groups:
+                self._groups[group_name]['total_shed' if shed else 'total_rejected'] += 1
+    
     def get_group_for_request(self, request_type: RequestType) -> str:
         """Get appropriate process group for request type"""
         with self._lock:
@@ -251,6 +626,11 @@ class ProcessGroupManager:
                     'utilization': group['active_workers'] / group['max_workers'],
                     'total_processed': group['total_processed'],
                     'total_failed': group['total_failed'],
+                    'total_rejected': group['total_rejected'],
+                    'total_shed': group['total_shed'],
+                    'max_queue_size': group['max_queue_size'],
+                    'rejection_policy': group['rejection_policy'],
+                    'worker_processes': group['worker_processes'],
                     'success_rate': (
                         group['total_processed'] / 
                         max(1, group['total_processed'] + group['total_failed'])
@@ -260,48 +640,151 @@ class ProcessGroupManager:
             }
 
 class RequestCoordinator:
-    """Coordination mechanisms using semaphores and mutexes"""
+    """
+    Coordination mechanisms using asyncio semaphores and locks.
+
+    Waiting for a processing slot or a named resource only suspends the
+    coroutine that asked for it; the event loop keeps running everything
+    else. Resource locks are always taken in sorted name order, so callers
+    needing several resources cannot deadlock each other. Threads outside the
+    event loop use the *_threadsafe facades, which run the acquisition on the
+    coordinator's loop.
+    """
     
-    def __init__(self, config: RequestQueueConfig):
+    def __init__(self, config: RequestQueueConfig, max_concurrent: Optional[int] = None):
         self.config = config
+        self.max_concurrent = max_concurrent or config.max_concurrent_requests
         
-        # Semaphores for controlling concurrent access
-        self._queue_semaphore = threading.Semaphore(config.max_concurrent_requests)
-        self._processing_semaphore = threading.Semaphore(config.max_concurrent_requests)
+        # Async primitives bind to the loop that first waits on them
+        self._processing_semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._resource_locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
-        # Mutexes for critical sections
+        # Short critical sections shared with other threads
         self._queue_mutex = threading.RLock()
-        self._metrics_mutex = threading.RLock()
-        self._blackboard_mutex = threading.RLock()
-        
-        # Coordination events
-        self._shutdown_event = threading.Event()
-        self._backpressure_event = threading.Event()
         
         # Request tracking
         self._active_requests: Set[str] = set()
-        self._request_futures: Dict[str, asyncio.Future] = {}
+    
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Set the event loop the thread-safe facades run on"""
+        self._loop = loop
     
     @asynccontextmanager
-    async def acquire_processing_slot(self, request_id: str):
-        """Acquire a processing slot with timeout"""
-        acquired = False
+    async def acquire_processing_slot(self, request_id: str, timeout: Optional[float] = None):
+        """Acquire a processing slot, waiting at most queue_timeout_seconds by default"""
+        await self._acquire_slot(request_id, timeout)
         try:
-            # Try to acquire semaphore with timeout
-            acquired = self._processing_semaphore.acquire(timeout=self.config.queue_timeout_seconds)
-            if not acquired:
-                raise TimeoutError("Could not acquire processing slot")
-            
-            with self._queue_mutex:
-                self._active_requests.add(request_id)
-            
             yield
-            
         finally:
-            if acquired:
-                self._processing_semaphore.release()
-                with self._queue_mutex:
-                    self._active_requests.discard(request_id)
+            self._release_slot(request_id)
+    
+    @asynccontextmanager
+    async def acquire_resources(self, *resources: str, timeout: Optional[float] = None):
+        """
+        Hold the named resource locks for the duration of the block. All
+        locks are acquired within timeout or none are held.
+        """
+        held = await self._acquire_resources(resources, timeout)
+        try:
+            yield
+        finally:
+            self._release_resources(held)
+    
+    @contextmanager
+    def acquire_processing_slot_threadsafe(self, request_id: str, timeout: Optional[float] = None):
+        """Synchronous acquire_processing_slot for threads outside the event loop"""
+        loop = self._get_facade_loop()
+        asyncio.run_coroutine_threadsafe(self._acquire_slot(request_id, timeout), loop).result()
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(self._release_slot, request_id)
+    
+    @contextmanager
+    def acquire_resources_threadsafe(self, *resources: str, timeout: Optional[float] = None):
+        """Synchronous acquire_resources for threads outside the event loop"""
+        loop = self._get_facade_loop()
+        held = asyncio.run_coroutine_threadsafe(self._acquire_resources(resources, timeout), loop).result()
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(self._release_resources, held)
+    
+    async def _acquire_slot(self, request_id: str, timeout: Optional[float]):
+        self._loop = asyncio.get_running_loop()
+        timeout = self.config.queue_timeout_seconds if timeout is None else timeout
+        
+        if not await self._acquire_with_timeout(self._processing_semaphore, timeout):
+            raise TimeoutError("Could not acquire processing slot")
+        
+        with self._queue_mutex:
+            self._active_requests.add(request_id)
+    
+    def _release_slot(self, request_id: str):
+        self._processing_semaphore.release()
+        with self._queue_mutex:
+            self._active_requests.discard(request_id)
+    
+    async def _acquire_resources(self, resources, timeout: Optional[float]) -> List[asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        deadline = None if timeout is None else loop.time() + timeout
+        held: List[asyncio.Lock] = []
+        
+        try:
+            for name in sorted(set(resources)):
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                lock = self._get_resource_lock(name)
+                if not await self._acquire_with_timeout(lock, remaining):
+                    raise TimeoutError(f"Could not acquire resource {name}")
+                held.append(lock)
+        except BaseException:
+            self._release_resources(held)
+            raise
+        
+        return held
+    
+    @staticmethod
+    def _release_resources(held: List[asyncio.Lock]):
+        for lock in reversed(held):
+            lock.release()
+    
+    @staticmethod
+    async def _acquire_with_timeout(primitive, timeout: Optional[float]) -> bool:
+        """Acquire an asyncio lock or semaphore; False if the timeout passes first"""
+        if timeout is None:
+            await primitive.acquire()
+            return True
+        if not primitive.locked():
+            # Give an uncontended acquire at least one loop turn to complete
+            timeout = max(timeout, 0.001)
+        elif timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(primitive.acquire(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _get_resource_lock(self, name: str) -> asyncio.Lock:
+        with self._queue_mutex:
+            lock = self._resource_locks.get(name)
+            if lock is None:
+                lock = self._resource_locks[name] = asyncio.Lock()
+            return lock
+    
+    def _get_facade_loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            raise RuntimeError("RequestCoordinator is not bound to a running event loop")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("Use the async coordinator methods from the event loop thread")
+        return loop
     
     def is_backpressure_active(self, queue_size: int) -> bool:
         """Check if backpressure should be activated"""
@@ -318,23 +801,376 @@ class RequestCoordinator:
         with self._queue_mutex:
             return len(self._active_requests)
 
+class ClientFairQueue:
+    """
+    Deficit round robin across clients for one priority level.
+
+    Each client with queued work has its own FIFO. Clients are visited in
+    round-robin order and may send up to their weight in requests per visit
+    (fractional weights carry over as deficit), so one client's backlog
+    cannot push other clients' work behind it. Clients beyond max_clients
+    share a single overflow queue, keeping the tracked set bounded.
+    
+    With deadline_first, each client's requests are served earliest deadline
+    first instead of FIFO; fairness still decides which client goes next.
+    """
+    
+    OVERFLOW_CLIENT = '__overflow__'
+    
+    def __init__(self, weights: Optional[Dict[str, float]] = None, max_clients: int = 1000,
+                 deadline_first: bool = False):
+        for client, weight in (weights or {}).items():
+            # A weight of zero or less would never earn a whole request of deficit
+            if not weight > 0:
+                raise ValueError(f"Client weight for {client} must be positive, got {weight}")
+        self.weights = weights or {}
+        self.max_clients = max_clients
+        self.deadline_first = deadline_first
+        # Per-client deque of (seq, request), or heap of (deadline, seq, request) with deadline_first
+        self._queues: "OrderedDict[str, Any]" = OrderedDict()  # round-robin order
+        self._deficits: Dict[str, float] = {}
+        self._arrivals: List[tuple] = []  # (enqueued_at, seq, request), pruned lazily
+        # Sequence numbers of arrival entries whose request has left the queue; a
+        # request pushed again gets a new entry, so its old one stays dead
+        self._removed: Set[int] = set()
+        self._sequence = itertools.count()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def client_key(self, client_id: str) -> str:
+        """Queue a client's requests are kept in"""
+        if client_id in self._queues or len(self._queues) < self.max_clients:
+            return client_id
+        return self.OVERFLOW_CLIENT
+    
+    def push(self, request: QueuedRequest):
+        key = self.client_key(request.client_id)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = [] if self.deadline_first else deque()
+            self._deficits[key] = 0.0
+        sequence = next(self._sequence)
+        if self.deadline_first:
+            deadline = request.deadline if request.deadline is not None else math.inf
+            heapq.heappush(queue, (deadline, sequence, request))
+        else:
+            queue.append((sequence, request))
+        heapq.heappush(self._arrivals, (request.enqueued_at, sequence, request))
+        self._size += 1
+    
+    def pop(self) -> Optional[QueuedRequest]:
+        """Take the next request in deficit round-robin order"""
+        if not self._size:
+            return None
+        
+        while True:
+            client, queue = next(iter(self._queues.items()))
+            if self._deficits[client] < 1.0:
+                self._deficits[client] += self.weights.get(client, 1.0)
+                if self._deficits[client] < 1.0:
+                    self._queues.move_to_end(client)
+                    continue
+            
+            entry = heapq.heappop(queue) if self.deadline_first else queue.popleft()
+            self._deficits[client] -= 1.0
+            if not queue:
+                del self._queues[client]
+                del self._deficits[client]
+            elif self._deficits[client] < 1.0:
+                self._queues.move_to_end(client)
+            return self._forget(entry[-2], entry[-1])
+    
+    def pop_newest_of_deepest(self) -> Optional[QueuedRequest]:
+        """
+        Remove the most recent request (latest deadline with deadline_first)
+        of the client with the longest queue
+        """
+        if not self._size:
+            return None
+        
+        client = max(self._queues, key=lambda key: len(self._queues[key]))
+        queue = self._queues[client]
+        if self.deadline_first:
+            index = max(range(len(queue)), key=lambda i: queue[i][:2])
+            entry = queue[index]
+            queue[index] = queue[-1]
+            queue.pop()
+            heapq.heapify(queue)
+        else:
+            entry = queue.pop()
+        if not queue:
+            del self._queues[client]
+            del self._deficits[client]
+        return self._forget(entry[-2], entry[-1])
+    
+    def oldest_enqueued_at(self) -> Optional[float]:
+        """Arrival time of the longest-waiting request, used for aging"""
+        while self._arrivals and self._arrivals[0][1] in self._removed:
+            self._removed.discard(heapq.heappop(self._arrivals)[1])
+        return self._arrivals[0][0] if self._arrivals else None
+    
+    def drain(self) -> List[QueuedRequest]:
+        requests = [entry[2] for entry in sorted(self._arrivals) if entry[1] not in self._removed]
+        self._queues.clear()
+        self._deficits.clear()
+        self._arrivals.clear()
+        self._removed.clear()
+        self._size = 0
+        return requests
+    
+    def depth_by_client(self) -> Dict[str, int]:
+        return {client: len(queue) for client, queue in self._queues.items()}
+    
+    def _forget(self, sequence: int, request: QueuedRequest) -> QueuedRequest:
+        self._removed.add(sequence)
+        self._size -= 1
+        return request
+
+class PriorityScheduler:
+    """
+    Queued requests ordered by effective priority, with aging, and fair
+    queuing across clients within each priority.
+
+    A request's effective priority improves by one level for every
+    aging_seconds it waits, so LOW traffic is never starved by a steady stream
+    of CRITICAL/HIGH requests. The next priority served is the one whose
+    longest-waiting request has the best effective priority
+    (enqueued_at + priority * aging_seconds); within it, clients are served
+    by weighted deficit round robin (see ClientFairQueue).
+
+    The queue is driven from one event loop, but its statistics are read from
+    other threads; lanes, samples and served counts are guarded by a lock,
+    which schedulers sharing a sample store must also share.
+    """
+    
+    def __init__(self, aging_seconds: float = 10.0, max_size: int = 0, sample_size: int = 1000,
+                 wait_times: Optional[Dict[QueuePriority, deque]] = None,
+                 client_weights: Optional[Dict[str, float]] = None, max_clients: int = 1000,
+                 rate_window_seconds: float = 60.0, deadline_first: bool = False,
+                 lock: Optional[threading.RLock] = None):
+        self.aging_seconds = aging_seconds
+        self.max_size = max_size
+        self.max_clients = max_clients
+        self.rate_window = rate_window_seconds
+        self._lock = lock if lock is not None else threading.RLock()
+        self._lanes: Dict[QueuePriority, ClientFairQueue] = {
+            priority: ClientFairQueue(client_weights, max_clients, deadline_first) for priority in QueuePriority
+        }
+        self._size = 0
+        self._waiters: deque = deque()
+        # Schedulers may share one sample store so percentiles cover all of them
+        self._wait_times: Dict[QueuePriority, deque] = wait_times if wait_times is not None else {
+            priority: deque(maxlen=sample_size) for priority in QueuePriority
+        }
+        # Bounded LRU of client -> [served, decayed rate, last update]
+        self._served: "OrderedDict[str, List[float]]" = OrderedDict()
+    
+    def push(self, request: QueuedRequest):
+        """Queue a request and wake one waiting consumer"""
+        if self.max_size and self._size >= self.max_size:
+            raise asyncio.QueueFull()
+        
+        if request.enqueued_at is None:
+            request.enqueued_at = time.monotonic()
+        with self._lock:
+            self._lanes[request.priority].push(request)
+            self._size += 1
+        self._wake_next()
+    
+    def pop_nowait(self) -> Optional[QueuedRequest]:
+        """Take the next request to serve, or None if empty"""
+        with self._lock:
+            lane = self._select_lane(best=True)
+            if lane is None:
+                return None
+            
+            request = lane.pop()
+            if request is None:
+                return None
+            self._size -= 1
+            now = time.monotonic()
+            self._wait_times[request.priority].append(now - request.enqueued_at)
+            self._record_served(lane.client_key(request.client_id), now)
+            return request
+    
+    async def pop(self) -> QueuedRequest:
+        """Wait until a request is available and take it"""
+        while not self._size:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up we were given on to the next consumer
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        
+        return self.pop_nowait()
+    
+    def pop_lowest(self) -> Optional[QueuedRequest]:
+        """
+        Remove a request to shed: the newest request of the deepest client in
+        the priority with the worst effective priority. None if empty.
+        """
+        with self._lock:
+            lane = self._select_lane(best=False)
+            if lane is None:
+                return None
+            
+            request = lane.pop_newest_of_deepest()
+            if request is not None:
+                self._size -= 1
+            return request
+    
+    def _select_lane(self, best: bool) -> Optional[ClientFairQueue]:
+        """Non-empty priority lane with the best (or worst) effective priority"""
+        chosen, chosen_key = None, None
+        for priority, lane in self._lanes.items():
+            oldest = lane.oldest_enqueued_at()
+            if oldest is None:
+                continue
+            key = oldest + priority.value * self.aging_seconds
+            if chosen is None or (key < chosen_key if best else key > chosen_key):
+                chosen, chosen_key = lane, key
+        return chosen
+    
+    def _record_served(self, client: str, now: float):
+        entry = self._served.get(client)
+        if entry is None:
+            entry = self._served[client] = [0, 0.0, now]
+            if len(self._served) > self.max_clients:
+                self._served.popitem(last=False)
+        else:
+            self._served.move_to_end(client)
+        entry[0] += 1
+        entry[1] = entry[1] * math.exp(-(now - entry[2]) / self.rate_window) + 1.0 / self.rate_window
+        entry[2] = now
+    
+    def _wake_next(self):
+        """Wake the longest-waiting consumer, skipping cancelled ones"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+    
+    def drain(self) -> List[QueuedRequest]:
+        """Remove and return every queued request"""
+        requests = []
+        with self._lock:
+            for lane in self._lanes.values():
+                requests.extend(lane.drain())
+            self._size = 0
+        return requests
+    
+    def qsize(self) -> int:
+        """Number of queued requests"""
+        return self._size
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def size_by_priority(self) -> Dict[str, int]:
+        """Queued requests per priority level"""
+        with self._lock:
+            return {priority.name: len(lane) for priority, lane in self._lanes.items()}
+    
+    def client_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue depth, requests served and exponentially decayed served rate
+        (per second, over rate_window_seconds) for each tracked client
+        """
+        now = time.monotonic()
+        stats: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            depths = [lane.depth_by_client() for lane in self._lanes.values()]
+            served_rates = [(client, *entry) for client, entry in self._served.items()]
+        for lane_depths in depths:
+            for client, depth in lane_depths.items():
+                stats.setdefault(client, {'queued': 0, 'served': 0, 'served_per_second': 0.0})
+                stats[client]['queued'] += depth
+        for client, served, rate, updated in served_rates:
+            entry = stats.setdefault(client, {'queued': 0, 'served': 0, 'served_per_second': 0.0})
+            entry['served'] = served
+            entry['served_per_second'] = rate * math.exp(-(now - updated) / self.rate_window)
+        return stats
+    
+    def wait_time_percentiles(self) -> Dict[str, Dict[str, Any]]:
+        """Queue wait-time percentiles (seconds) over recent requests, per priority"""
+        percentiles = {}
+        with self._lock:
+            snapshot = {priority: sorted(samples) for priority, samples in self._wait_times.items()}
+        for priority, ordered in snapshot.items():
+            stats: Dict[str, Any] = {'count': len(ordered)}
+            for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+                if ordered:
+                    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+                    stats[name] = ordered[index]
+                else:
+                    stats[name] = None
+            percentiles[priority.name] = stats
+        return percentiles
+
 class RequestQueueManager:
     """Main request queuing system with blackboard architecture"""
     
     def __init__(self, config: Optional[RequestQueueConfig] = None):
         self.config = config or RequestQueueConfig()
+        if self.config.durable_recovery_deadline not in DURABLE_RECOVERY_DEADLINES:
+            raise ValueError(f"Unknown durable recovery deadline: {self.config.durable_recovery_deadline}")
         self.metrics = QueueMetrics()
         
         # Core components
-        self.blackboard = BlackboardSystem() if self.config.enable_blackboard else None
+        self.blackboard = BlackboardSystem(
+            num_shards=self.config.blackboard_shards,
+            max_entries=self.config.blackboard_max_entries,
+            max_bytes=self.config.blackboard_max_bytes
+        ) if self.config.enable_blackboard else None
         self.process_groups = ProcessGroupManager(self.config) if self.config.process_groups_enabled else None
-        self.coordinator = RequestCoordinator(self.config)
+        self.coordinator = RequestCoordinator(self.config, self.get_worker_capacity())
         
         # Queue storage
-        self._request_queues: Dict[QueuePriority, asyncio.Queue] = {}
+        self._scheduler = PriorityScheduler(
+            aging_seconds=self.config.priority_aging_seconds,
+            max_size=self.config.max_queue_size,
+            sample_size=self.config.wait_time_sample_size,
+            client_weights=self.config.client_weights,
+            max_clients=self.config.max_tracked_clients,
+            deadline_first=self.config.deadline_scheduling
+        )
+        
+        # Bulkheads: each process group gets its own bounded queue and workers
+        self._group_schedulers: Dict[str, PriorityScheduler] = {}
+        if self.process_groups:
+            for group_name in self.process_groups.get_group_names():
+                self._group_schedulers[group_name] = self._create_group_scheduler(group_name)
+        self._pending_requests: Dict[str, QueuedRequest] = {}
         self._active_requests: Dict[str, QueuedRequest] = {}
         self._completed_requests: Dict[str, QueuedRequest] = {}
         
+        # Optional on-disk copy of every unfinished request, redelivered on start
+        self.durable_queue = SQLiteDurableQueue(
+            self.config.durable_queue_path,
+            visibility_timeout_seconds=self.config.durable_visibility_timeout_seconds,
+            exclusive=True,
+            lock_timeout_seconds=self.config.durable_lock_timeout_seconds
+        ) if self.config.durable_queue_path else None
+        # Rebuilds a recovered request's handler from its replay description
+        self.handler_factory: Optional[Callable[[Dict[str, Any]], Callable[[], Any]]] = None
+        # Applied to a replay description before it is written to the durable queue
+        self.durable_replay_filter: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+        # Consulted before queuing; returning False sheds the request (see adaptive throttling)
+        self.admission_policy: Optional[Callable[[QueuePriority, RequestType], bool]] = None
+        
+        # Moving average of execution time per request type, for deadline checks
+        self._service_times: Dict[RequestType, float] = {}
+        
         # Synchronization
         self._lock = threading.RLock()
         self._initialized = False
@@ -345,6 +1181,17 @@ class RequestQueueManager:
         self._cleanup_task: Optional[asyncio.Task] = None
         self._monitor_task: Optional[asyncio.Task] = None
         
+        # Blocking request handlers run here, off the event loop
+        self._handler_pool: Optional[ThreadPoolExecutor] = None
+        
+        # OS worker processes for groups configured with worker_processes
+        self._supervisors: Dict[str, WorkerSupervisor] = {}
+        
+        # Dedicated event loop when driven from synchronous (WSGI) threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._background_lock = threading.Lock()
+        
         logger.info("RequestQueueManager initialized", extra={
             'config': {
                 'max_queue_size': self.config.max_queue_size,
@@ -358,12 +1205,6 @@ class RequestQueueManager:
         if self._initialized:
             return
         
-        # Initialize priority queues
-        for priority in QueuePriority:
-            self._request_queues[priority] = asyncio.Queue(
-                maxsize=self.config.max_queue_size // len(QueuePriority)
-            )
-        
         # Initialize blackboard data
         if self.blackboard:
             self.blackboard.write('queue_status', 'initialized')
@@ -384,12 +1225,30 @@ class RequestQueueManager:
         
         self._running = True
         
-        # Start worker tasks
-        for i in range(self.config.max_concurrent_requests):
-            worker_task = asyncio.create_task(
-                self._worker_loop(f"request-worker-{i}")
-            )
-            self._worker_tasks.append(worker_task)
+        # Size processing slots to the worker count so they never block a worker
+        self.coordinator = RequestCoordinator(self.config, self.get_worker_capacity())
+        self.coordinator.bind_loop(asyncio.get_running_loop())
+        
+        # Start worker tasks: a fixed pool per process group when groups are
+        # enabled, so a saturated group cannot take workers from the others
+        if self.process_groups:
+            for group_name, scheduler in self._group_schedulers.items():
+                for i in range(self.process_groups.get_group_setting(group_name, 'max_workers', 1)):
+                    worker_task = asyncio.create_task(
+                        self._worker_loop(f"request-worker-{group_name}-{i}", scheduler)
+                    )
+                    self._worker_tasks.append(worker_task)
+        else:
+            for i in range(self.config.max_concurrent_requests):
+                worker_task = asyncio.create_task(
+                    self._worker_loop(f"request-worker-{i}")
+                )
+                self._worker_tasks.append(worker_task)
+        
+        self._start_supervisors()
+        
+        if self.durable_queue:
+            self._recover_durable_requests()
         
         # Start background tasks
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
@@ -426,6 +1285,27 @@ class RequestQueueManager:
         if self._worker_tasks:
             await asyncio.wait(self._worker_tasks, timeout=timeout)
         
+        # Cancel anything that never ran so waiters are released
+        for scheduler in self._all_schedulers():
+            scheduler.drain()
+        with self._lock:
+            unfinished = list(self._pending_requests.values())
+        for request in unfinished:
+            # Durable requests stay on disk and are redelivered on the next start
+            self._cancel_queued_request(request, "queue stopped", forget=False)
+        if self.durable_queue:
+            self.durable_queue.flush()
+        
+        if self._handler_pool is not None:
+            self._handler_pool.shutdown(wait=False)
+            self._handler_pool = None
+        
+        supervisors = list(self._supervisors.values())
+        self._supervisors = {}
+        if supervisors:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(None, supervisor.stop) for supervisor in supervisors))
+        
         # Update blackboard
         if self.blackboard:
             self.blackboard.write('queue_status', 'stopped')
@@ -437,12 +1317,27 @@ class RequestQueueManager:
                            flask_request_data: Dict[str, Any],
                            priority: QueuePriority = QueuePriority.NORMAL,
                            timeout: Optional[float] = None,
-                           client_id: Optional[str] = None) -> str:
-        """Queue a request for processing"""
+                           client_id: Optional[str] = None,
+                           handler: Optional[Callable[[], Any]] = None,
+                           replay: Optional[Dict[str, Any]] = None,
+                           deadline: Optional[float] = None) -> str:
+        """
+        Queue a request for processing. If a handler is given it is called
+        in the handler thread pool and its return value becomes the result.
+        replay is a JSON-serializable description handed to handler_factory
+        to rebuild the handler if the request is recovered after a restart.
+        deadline is an absolute time.monotonic() value and defaults to now
+        plus the timeout.
+        """
         
         if not self._running:
             raise ValueError("RequestQueueManager is not running")
         
+        if self.admission_policy and not self.admission_policy(priority, request_type):
+            with self._lock:
+                self.metrics.requests_shed_admission += 1
+            raise ValueError(f"Request shed by admission control (priority {priority.name})")
+        
         # Generate request ID
         request_id = str(uuid.uuid4())
         
@@ -457,29 +1352,47 @@ class RequestQueueManager:
             process_group = self.process_groups.get_group_for_request(request_type)
         
         # Create queued request
+        timeout = timeout or self.config.request_timeout_seconds
         queued_request = QueuedRequest(
             request_id=request_id,
             request_type=request_type,
             priority=priority,
             flask_request_data=flask_request_data,
             client_id=client_id,
-            timeout=timeout or self.config.request_timeout_seconds,
-            process_group=process_group
+            timeout=timeout,
+            deadline=deadline if deadline is not None else time.monotonic() + timeout,
+            process_group=process_group,
+            handler=handler,
+            replay=replay
         )
         
-        # Check backpressure
         current_queue_size = self._get_total_queue_size()
-        if self.coordinator.is_backpressure_active(current_queue_size):
-            if self.blackboard:
-                self.blackboard.write('backpressure_active', True)
-            raise ValueError("Request queue is full (backpressure active)")
+        if self.config.drop_expired_requests and self._misses_deadline(queued_request, current_queue_size):
+            with self._lock:
+                self.metrics.requests_rejected_deadline += 1
+            raise ValueError(f"Request cannot finish before its deadline ({timeout}s)")
         
-        # Add to appropriate priority queue
-        queue = self._request_queues[priority]
-        try:
-            queue.put_nowait(queued_request)
-        except asyncio.QueueFull:
-            raise ValueError(f"Priority queue {priority.name} is full")
+        if process_group:
+            # Bulkhead: only this group's queue decides backpressure
+            self._admit_to_group(queued_request)
+        else:
+            # Check backpressure
+            if self.coordinator.is_backpressure_active(current_queue_size):
+                if self.blackboard:
+                    self.blackboard.write('backpressure_active', True)
+                raise ValueError("Request queue is full (backpressure active)")
+            
+            # Add to the scheduler, waking an idle worker
+            try:
+                self._scheduler.push(queued_request)
+            except asyncio.QueueFull:
+                raise ValueError("Request queue is full")
+        
+        with self._lock:
+            self._pending_requests[request_id] = queued_request
+        
+        if self.durable_queue:
+            await self._persist_request(queued_request)
         
         # Update metrics and blackboard
         with self._lock:
@@ -503,275 +1416,347 @@ class RequestQueueManager:
         logger.debug(f"Request {request_id} queued with priority {priority.name}")
         return request_id
     
-    async def get_request_result(self, request_id: str, timeout: Optional[float] = None) -> Any:
-        """Get result of a queued request"""
-        start_time = time.time()
-        timeout = timeout or self.config.request_timeout_seconds
+    def _admit_to_group(self, request: QueuedRequest):
+        """
+        Queue a request on its process group's scheduler, applying the
+        group's backpressure limit and rejection policy.
+        """
+        group_name = request.process_group
+        scheduler = self._group_schedulers[group_name]
+        max_queue_size = self.process_groups.get_group_setting(group_name, 'max_queue_size', 0)
+        limit = max(1, int(max_queue_size * self.config.backpressure_threshold)) if max_queue_size else 0
         
-        while True:
-            # Check completed requests
-            with self._lock:
-                if request_id in self._completed_requests:
-                    request = self._completed_requests[request_id]
-                    if request.error:
-                        raise request.error
-                    return request.result
-            
-            # Check timeout
-            if (time.time() - start_time) > timeout:
-                # Cancel request if still active
-                with self._lock:
-                    if request_id in self._active_requests:
-                        self._active_requests[request_id].status = RequestStatus.TIMEOUT
-                raise TimeoutError(f"Request {request_id} result timeout")
+        if limit and len(scheduler) >= limit:
+            policy = self.process_groups.get_group_setting(group_name, 'rejection_policy', 'reject')
+            victim = scheduler.pop_lowest() if policy == 'shed_lowest' else None
+            if victim is None or self._outranks(victim, request):
+                if victim is not None:
+                    scheduler.push(victim)
+                self.process_groups.record_rejection(group_name)
+                if self.blackboard:
+                    self.blackboard.write(f'backpressure_{group_name}', True)
+                raise ValueError(f"Process group {group_name} queue is full (backpressure active)")
             
-            await asyncio.sleep(0.1)
-    
-    async def _worker_loop(self, worker_name: str):
-        """Main worker loop for processing requests"""
-        logger.debug(f"Request worker {worker_name} started")
+            self.process_groups.record_rejection(group_name, shed=True)
+            self._cancel_queued_request(victim, f"shed by {group_name} backpressure")
         
-        while self._running:
-            try:
-                # Get next request from highest priority queue
-                request = await self._get_next_request()
-                if not request:
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                # Process the request
-                await self._process_request(request, worker_name)
-                
-            except asyncio.CancelledError:
-                logger.debug(f"Request worker {worker_name} cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Request worker {worker_name} error: {e}")
-                await asyncio.sleep(1)
-        
-        logger.debug(f"Request worker {worker_name} stopped")
+        scheduler.push(request)
     
-    async def _process_request(self, request: QueuedRequest, worker_name: str):
-        """Process a single request"""
-        request.started_at = datetime.now()
-        request.status = RequestStatus.PROCESSING
-        
-        # Check process group availability
-        if self.process_groups and request.process_group:
-            if not self.process_groups.acquire_worker(request.process_group):
-                # Re-queue if no workers available
-                queue = self._request_queues[request.priority]
-                await queue.put(request)
-                return
-        
+    def _outranks(self, queued: QueuedRequest, incoming: QueuedRequest) -> bool:
+        """Whether an already-queued request should be kept over an incoming one"""
+        scheduler = self._group_schedulers[queued.process_group]
+        now = time.monotonic()
+        return (queued.enqueued_at + queued.priority.value * scheduler.aging_seconds
+                <= now + incoming.priority.value * scheduler.aging_seconds)
+    
+    def _cancel_queued_request(self, request: QueuedRequest, reason: str, forget: bool = True):
+        """
+        Finish a request that never ran as CANCELLED and release its waiters.
+        With forget=False a durable copy is kept for redelivery.
+        """
+        request.status = RequestStatus.CANCELLED
+        request.completed_at = datetime.now()
+        request.error = RuntimeError(f"Request {request.request_id} cancelled: {reason}")
         with self._lock:
-            self._active_requests[request.request_id] = request
-            self.metrics.peak_concurrent_requests = max(
-                self.metrics.peak_concurrent_requests,
-                len(self._active_requests)
-            )
+            self._pending_requests.pop(request.request_id, None)
+            self._completed_requests[request.request_id] = request
+            self.metrics.requests_cancelled += 1
+        if forget and self.durable_queue:
+            self.durable_queue.ack(request.request_id)
+        resolve_completion(request.completion, error=request.error)
+    
+    def _estimated_service_time(self, request_type: RequestType) -> float:
+        """Recent average execution time for a request type, 0 until one has finished"""
+        return self._service_times.get(request_type, 0.0)
+    
+    def _misses_deadline(self, request: QueuedRequest, queued_ahead: int = 0) -> bool:
+        """
+        Whether a request is predicted to finish after its deadline, given
+        queued_ahead requests that will be served first
+        """
+        if request.deadline is None:
+            return False
+        queue_wait = queued_ahead / max(1, self.get_worker_capacity()) * self.metrics.average_processing_time
+        finish = time.monotonic() + queue_wait + self._estimated_service_time(request.request_type)
+        return finish > request.deadline
+    
+    def _expire_request(self, request: QueuedRequest):
+        """Drop a request that can no longer meet its deadline, before it runs"""
+        saved = self._estimated_service_time(request.request_type)
+        request.status = RequestStatus.EXPIRED
+        request.completed_at = datetime.now()
+        request.error = TimeoutError(f"Request {request.request_id} expired before execution")
+        with self._lock:
+            self._pending_requests.pop(request.request_id, None)
+            self._completed_requests[request.request_id] = request
+            self.metrics.requests_expired += 1
+            self.metrics.expired_work_saved_seconds += saved
         
-        # Update blackboard
-        if self.blackboard:
-            self.blackboard.write('active_requests', len(self._active_requests))
-            self.blackboard.write(f'request_{request.request_id}', {
-                'status': request.status.value,
-                'type': request.request_type.value,
-                'started_at': request.started_at.isoformat(),
-                'worker': worker_name
-            })
+        if self.durable_queue:
+            self.durable_queue.ack(request.request_id)
         
-        logger.debug(f"Worker {worker_name} processing request {request.request_id}")
+        if self.config.enable_metrics:
+            metrics_collector.track_error_rate('request_queue', 'expired')
         
+        logger.debug(f"Request {request.request_id} expired before execution")
+        resolve_completion(request.completion, error=request.error)
+    
+    @staticmethod
+    def _request_record(request: QueuedRequest) -> Dict[str, Any]:
+        """Serializable form of a request, stored durably and sent to worker processes"""
+        return {
+            'request_type': request.request_type.value,
+            'priority': request.priority.value,
+            'client_id': request.client_id,
+            'timeout': request.timeout,
+            'created_at': request.created_at.isoformat(),
+            'flask_request_data': request.flask_request_data,
+            'replay': request.replay
+        }
+    
+    async def _persist_request(self, request: QueuedRequest):
+        """Write a queued request to the durable queue, waiting for the commit"""
+        record = self._request_record(request)
+        if record['replay'] is not None and self.durable_replay_filter is not None:
+            record['replay'] = self.durable_replay_filter(record['replay'])
         try:
-            # Use coordinator to manage processing
-            async with self.coordinator.acquire_processing_slot(request.request_id):
-                # Process the request (this would integrate with existing Flask request handling)
-                result = await self._execute_request(request)
-                
-                request.result = result
-                request.status = RequestStatus.COMPLETED
-                request.completed_at = datetime.now()
+            await asyncio.wrap_future(
+                self.durable_queue.put(record, request.priority.value, item_id=request.request_id)
+            )
+        except Exception as e:
+            # Keep serving from memory; only restart durability is lost
+            logger.error(f"Could not persist request {request.request_id}: {e}")
+    
+    def _recover_durable_requests(self):
+        """
+        Queue requests left unfinished by a previous run of this queue file.
+        The manager holds the file's owner lock, so no other live manager has
+        work in it and its own old leases are released too. Their deadlines follow durable_recovery_deadline.
+        """
+        self.durable_queue.recover(release_own=True)
+        recovered = 0
+        while True:
+            items = self.durable_queue.dequeue(
+                max_items=500, visibility_timeout=self.config.durable_visibility_timeout_seconds
+            )
+            if not items:
+                break
             
-            # Update metrics
-            with self._lock:
-                self.metrics.requests_processed += 1
+            for item in items:
+                record = item.payload
+                request_type = RequestType(record['request_type'])
+                replay = record.get('replay')
+                created_at = datetime.fromisoformat(record['created_at'])
+                timeout = record.get('timeout') or self.config.request_timeout_seconds
+                if self.config.durable_recovery_deadline == 'reset':
+                    remaining = timeout
+                else:
+                    elapsed = (datetime.now() - created_at).total_seconds()
+                    remaining = timeout - elapsed + self.config.durable_recovery_grace_seconds
+                request = QueuedRequest(
+                    request_id=item.item_id,
+                    request_type=request_type,
+                    priority=QueuePriority(record['priority']),
+                    flask_request_data=record.get('flask_request_data') or {},
+                    client_id=record.get('client_id') or 'system',
+                    created_at=created_at,
+                    timeout=timeout,
+                    deadline=time.monotonic() + remaining,
+                    process_group=(self.process_groups.get_group_for_request(request_type)
+                                   if self.process_groups else None),
+                    handler=(self.handler_factory(replay)
+                             if replay is not None and self.handler_factory else None),
+                    replay=replay,
+                    durable_lease=item.lease_token
+                )
                 
-                # Calculate timing metrics
-                queue_time = (request.started_at - request.created_at).total_seconds()
-                processing_time = (request.completed_at - request.started_at).total_seconds()
+                scheduler = (self._group_schedulers[request.process_group]
+                             if request.process_group else self._scheduler)
+                try:
+                    scheduler.push(request)
+                except asyncio.QueueFull:
+                    # Leave it on disk for the next start
+                    self.durable_queue.nack(item.item_id, item.lease_token)
+                    continue
                 
-                self.metrics.total_queue_time += queue_time
-                self.metrics.total_processing_time += processing_time
-                self.metrics.average_queue_time = (
-                    self.metrics.total_queue_time / self.metrics.requests_processed
-                )
-                self.metrics.average_processing_time = (
-                    self.metrics.total_processing_time / self.metrics.requests_processed
-                )
-            
-            if self.config.enable_metrics:
-                metrics_collector.track_request_time(
-                    'request_queue_requests_processed',
-                    1.0
-                )
-                metrics_collector.track_request_time(
-                    'request_queue_processing_time',
-                    processing_time * 1000  # Convert to milliseconds
-                )
+                with self._lock:
+                    self._pending_requests[request.request_id] = request
+                    self.metrics.total_requests += 1
+                    self.metrics.requests_queued += 1
+                recovered += 1
             
-            logger.debug(f"Request {request.request_id} completed successfully")
+            if len(items) < 500:
+                break
         
-        except asyncio.TimeoutError:
-            request.error = TimeoutError(f"Request {request.request_id} timeout")
-            request.status = RequestStatus.TIMEOUT
-            request.completed_at = datetime.now()
-            
-            with self._lock:
-                self.metrics.requests_timeout += 1
-            
-            logger.warning(f"Request {request.request_id} timeout")
+        if recovered:
+            logger.info(f"Redelivered {recovered} requests from the durable queue")
+    
+    def _create_group_scheduler(self, group_name: str) -> PriorityScheduler:
+        """Create a process group's queue, sharing wait-time samples with the main scheduler"""
+        return PriorityScheduler(
+            aging_seconds=self.config.priority_aging_seconds,
+            wait_times=self._scheduler._wait_times,
+            lock=self._scheduler._lock,
+            client_weights=self.config.client_weights,
+            max_clients=self.config.max_tracked_clients,
+            deadline_first=self.config.deadline_scheduling
+        )
+    
+    def _all_schedulers(self) -> List[PriorityScheduler]:
+        return [self._scheduler] + list(self._group_schedulers.values())
+    
+    def get_worker_capacity(self) -> int:
+        """Total request workers: the group pools when groups are enabled"""
+        if self.process_groups:
+            return sum(self.process_groups.get_group_setting(name, 'max_workers', 1)
+                       for name in self.process_groups.get_group_names())
+        return self.config.max_concurrent_requests
+    
+    async def get_request_result(self, request_id: str, timeout: Optional[float] = None) -> Any:
+        """Get result of a queued request, returning as soon as it finishes"""
+        timeout = timeout or self.config.request_timeout_seconds
         
-        except Exception as e:
-            request.error = e
-            request.status = RequestStatus.FAILED
-            request.completed_at = datetime.now()
-            
+        with self._lock:
+            request = (self._completed_requests.get(request_id) or self._active_requests.get(request_id)
+                       or self._pending_requests.get(request_id))
+        
+        if request is None:
+            raise ValueError(f"Unknown request {request_id}")
+        
+        if not await wait_for_completion(request.completion, timeout):
+            # Cancel request if still active
             with self._lock:
-                self.metrics.requests_failed += 1
-            
-            if self.config.enable_metrics:
-                metrics_collector.increment_counter(
-                    'request_queue_requests_failed_total',
-                    {'type': request.request_type.value, 'error_type': type(e).__name__}
-                )
-            
-            logger.error(f"Request {request.request_id} failed: {e}")
+                if request_id in self._active_requests:
+                    self._active_requests[request_id].status = RequestStatus.TIMEOUT
+            raise TimeoutError(f"Request {request_id} result timeout")
         
-        finally:
-            # Release process group worker
-            if self.process_groups and request.process_group:
-                success = request.status == RequestStatus.COMPLETED
-                self.process_groups.release_worker(request.process_group, success)
+        return request.completion.result()
+    
+    def start_background(self):
+        """
+        Start the manager on its own event loop thread so synchronous (WSGI)
+        code can queue requests. Safe to call repeatedly.
+        """
+        with self._background_lock:
+            if self._running:
+                if self._loop_thread is not None and self._loop_thread.is_alive():
+                    return
+                raise ValueError("RequestQueueManager is already running on another event loop")
             
-            # Move request to completed
-            with self._lock:
-                if request.request_id in self._active_requests:
-                    del self._active_requests[request.request_id]
-                self._completed_requests[request.request_id] = request
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="request-queue-loop", daemon=True)
+            thread.start()
+            asyncio.run_coroutine_threadsafe(self.start(), loop).result(timeout=10)
+            self._loop, self._loop_thread = loop, thread
+    
+    def stop_background(self, timeout: float = 30.0):
+        """Stop a manager started with start_background and its loop thread"""
+        with self._background_lock:
+            loop, thread = self._loop, self._loop_thread
+            if loop is None:
+                return
             
-            # Update blackboard
-            if self.blackboard:
-                self.blackboard.write('active_requests', len(self._active_requests))
-                self.blackboard.write(f'request_{request.request_id}', {
-                    'status': request.status.value,
-                    'completed_at': request.completed_at.isoformat() if request.completed_at else None,
-                    'error': str(request.error) if request.error else None
-                })
+            asyncio.run_coroutine_threadsafe(self.stop(timeout), loop).result(timeout=timeout + 5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+            self._loop, self._loop_thread = None, None
     
-    async def _cleanup_loop(self):
-        """Background cleanup of completed requests"""
-        while self._running:
-            try:
-                cutoff_time = datetime.now() - timedelta(
-                    seconds=self.config.cleanup_interval_seconds
-                )
-                
-                with self._lock:
-                    # Remove old completed requests
-                    to_remove = [
-                        request_id for request_id, request in self._completed_requests.items()
-                        if request.completed_at and request.completed_at < cutoff_time
-                    ]
-                    
-                    for request_id in to_remove:
-                        del self._completed_requests[request_id]
-                        # Clean up blackboard data
-                        if self.blackboard:
-                            self.blackboard.write(f'request_{request_id}', None)
-                
-                if to_remove:
-                    logger.debug(f"Cleaned up {len(to_remove)} completed requests")
-                
-                await asyncio.sleep(self.config.cleanup_interval_seconds)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Cleanup loop error: {e}")
-                await asyncio.sleep(60)
+    def queue_request_threadsafe(self, request_type: RequestType, flask_request_data: Dict[str, Any],
+                                 **kwargs) -> str:
+        """Queue a request from a thread outside the manager's background loop"""
+        if self._loop is None:
+            raise ValueError("RequestQueueManager is not running in the background")
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self.queue_request(request_type, flask_request_data, **kwargs), self._loop
+        )
+        try:
+            return future.result(timeout=self.config.queue_timeout_seconds)
+        except FuturesTimeoutError:
+            # The caller reports failure, so do not let the request be queued later
+            future.cancel()
+            raise
     
-    async def _monitoring_loop(self):
-        """Background monitoring and metrics collection"""
+    def get_request(self, request_id: str) -> Optional[QueuedRequest]:
+        """Look up a queued, active or recently completed request"""
+        with self._lock:
+            return (self._completed_requests.get(request_id) or self._active_requests.get(request_id)
+                    or self._pending_requests.get(request_id))
+    
+    def wait_for_request(self, request_id: str, timeout: float) -> Optional[QueuedRequest]:
+        """
+        Block the calling thread until a request finishes or the timeout
+        passes. Returns the request (finished or not), or None if unknown.
+        """
+        request = self.get_request(request_id)
+        if request is not None and timeout > 0:
+            wait_futures([request.completion], timeout=timeout)
+        return request
+    
+    def get_load(self) -> float:
+        """Queued plus running requests as a fraction of worker capacity"""
+        with self._lock:
+            active = len(self._active_requests)
+        return (active + self._get_total_queue_size()) / max(1, self.get_worker_capacity())
+    
+    def estimate_wait_seconds(self) -> float:
+        """Rough time until a newly queued request finishes, for Retry-After hints"""
+        per_request = self.metrics.average_processing_time or 1.0
+        backlog = self._get_total_queue_size() / max(1, self.get_worker_capacity())
+        return per_request * (backlog + 1)
+    
+    async def _worker_loop(self, worker_name: str, scheduler: Optional[PriorityScheduler] = None):
+        """Main worker loop for processing requests from one scheduler"""
+        logger.debug(f"Request worker {worker_name} started")
+        
         while self._running:
             try:
-                # Update blackboard with current metrics
-                if self.blackboard:
-                    current_metrics = {
-                        'queue_size': self._get_total_queue_size(),
-                        'active_requests': len(self._active_requests),
-                        'completed_requests': len(self._completed_requests),
-                        'metrics': {
-                            'total_requests': self.metrics.total_requests,
-                            'requests_processed': self.metrics.requests_processed,
-                            'requests_failed': self.metrics.requests_failed,
-                            'average_processing_time': self.metrics.average_processing_time
-                        }
-                    }
-                    self.blackboard.write('current_metrics', current_metrics)
+                # Wait for the request with the best effective priority
+                request = await self._get_next_request(scheduler)
                 
-                # Check for backpressure resolution
-                current_queue_size = self._get_total_queue_size()
-                if self.coordinator.should_resume_processing(current_queue_size):
-                    if self.blackboard:
-                        self.blackboard.write('backpressure_active', False)
-                
-                if self.config.enable_metrics:
-                    metrics_collector.track_gauge(
-                        'request_queue_size', 
-                        current_queue_size
-                    )
-                    metrics_collector.track_gauge(
-                        'request_queue_active_requests', 
-                        len(self._active_requests)
-                    )
-                
-                await asyncio.sleep(30)  # Monitor every 30 seconds
+                # Process the request
+                await self._process_request(request, worker_name)
                 
             except asyncio.CancelledError:
+                logger.debug(f"Request worker {worker_name} cancelled")
                 break
             except Exception as e:
-                logger.error(f"Monitoring loop error: {e}")
-                await asyncio.sleep(60)
+                logger.error(f"Request worker {worker_name} error: {e}")
+                await asyncio.sleep(1)
+        
+        logger.debug(f"Request worker {worker_name} stopped")
     
-    async def _get_next_request(self) -> Optional[QueuedRequest]:
-        """Get next request from highest priority queue"""
-        # Check queues in priority order
-        for priority in [QueuePriority.CRITICAL, QueuePriority.HIGH, 
-                        QueuePriority.NORMAL, QueuePriority.LOW]:
-            queue = self._request_queues[priority]
-            try:
-                request = queue.get_nowait()
-                return request
-            except asyncio.QueueEmpty:
-                continue
+    async def _get_next_request(self, scheduler: Optional[PriorityScheduler] = None) -> QueuedRequest:
+        """Wait for the next request in effective priority order"""
+        request = await (scheduler if scheduler is not None else self._scheduler).pop()
         
-        return None
+        if self.config.enable_metrics:
+            metrics_collector.track_request_time(
+                f'request_queue_wait_time_{request.priority.name.lower()}',
+                (time.monotonic() - request.enqueued_at) * 1000  # Convert to milliseconds
+            )
+        
+        return request
     
     async def _process_request(self, request: QueuedRequest, worker_name: str):
         """Process a single request"""
+        if self.config.drop_expired_requests and self._misses_deadline(request):
+            self._expire_request(request)
+            return
+        
         request.started_at = datetime.now()
         request.status = RequestStatus.PROCESSING
         
-        # Check process group availability
-        if self.process_groups and request.process_group:
-            if not self.process_groups.acquire_worker(request.process_group):
-                # Re-queue if no workers available
-                queue = self._request_queues[request.priority]
-                await queue.put(request)
-                return
+        # The group's own worker pool bounds its concurrency; this only does
+        # the accounting, so a request is never bounced back to a queue
+        group_acquired = bool(
+            self.process_groups and request.process_group
+            and self.process_groups.acquire_worker(request.process_group)
+        )
         
         with self._lock:
+            self._pending_requests.pop(request.request_id, None)
             self._active_requests[request.request_id] = request
             self.metrics.peak_concurrent_requests = max(
                 self.metrics.peak_concurrent_requests,
@@ -786,7 +1771,11 @@ class RequestQueueManager:
                 'type': request.request_type.value,
                 'started_at': request.started_at.isoformat(),
                 'worker': worker_name
-            })
+            }, ttl_seconds=self.config.blackboard_request_ttl_seconds)
+        
+        # Lease the durable copy for as long as the request may run
+        if self.durable_queue and request.durable_lease is None:
+            self.durable_queue.claim(request.request_id, request.timeout)
         
         logger.debug(f"Worker {worker_name} processing request {request.request_id}")
         
@@ -816,6 +1805,11 @@ class RequestQueueManager:
                 self.metrics.average_processing_time = (
                     self.metrics.total_processing_time / self.metrics.requests_processed
                 )
+                
+                previous = self._service_times.get(request.request_type)
+                self._service_times[request.request_type] = (
+                    processing_time if previous is None else previous + 0.2 * (processing_time - previous)
+                )
             
             if self.config.enable_metrics:
                 metrics_collector.track_request_time(
@@ -848,16 +1842,22 @@ class RequestQueueManager:
                 self.metrics.requests_failed += 1
             
             if self.config.enable_metrics:
-                metrics_collector.increment_counter(
-                    'request_queue_requests_failed_total',
-                    {'type': request.request_type.value, 'error_type': type(e).__name__}
-                )
+                metrics_collector.track_error_rate('request_queue', type(e).__name__)
             
             logger.error(f"Request {request.request_id} failed: {e}")
         
+        except asyncio.CancelledError:
+            request.error = RuntimeError(f"Request {request.request_id} cancelled")
+            request.status = RequestStatus.CANCELLED
+            request.completed_at = datetime.now()
+            
+            with self._lock:
+                self.metrics.requests_cancelled += 1
+            raise
+        
         finally:
             # Release process group worker
-            if self.process_groups and request.process_group:
+            if group_acquired:
                 success = request.status == RequestStatus.COMPLETED
                 self.process_groups.release_worker(request.process_group, success)
             
@@ -874,12 +1874,42 @@ class RequestQueueManager:
                     'status': request.status.value,
                     'completed_at': request.completed_at.isoformat() if request.completed_at else None,
                     'error': str(request.error) if request.error else None
-                })
+                }, ttl_seconds=self.config.blackboard_request_ttl_seconds)
+            
+            # A cancelled request is being stopped; its durable copy is redelivered
+            if self.durable_queue and request.status != RequestStatus.CANCELLED:
+                self.durable_queue.ack(request.request_id)
+            
+            resolve_completion(request.completion, request.result, request.error)
     
     async def _execute_request(self, request: QueuedRequest) -> Any:
-        """Execute the actual request (placeholder for integration)"""
-        # This is where we would integrate with the existing Flask request processing
-        # For now, return a placeholder result
+        """
+        Execute the request in its group's worker processes, or its handler
+        in the handler thread pool
+        """
+        # Only the time left before the deadline is available to run in
+        timeout = request.timeout
+        if request.deadline is not None:
+            timeout = max(0.0, request.deadline - time.monotonic())
+        
+        supervisor = self._supervisors.get(request.process_group) if request.process_group else None
+        # In-process handlers without a replay description cannot cross processes
+        if supervisor is not None and (request.replay is not None or request.handler is None):
+            record = self._request_record(request)
+            record['request_id'] = request.request_id
+            return await asyncio.wait_for(
+                asyncio.wrap_future(supervisor.submit(request.request_id, record)),
+                timeout=timeout
+            )
+        
+        if request.handler is not None:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_handler_pool(), request.handler),
+                timeout=timeout
+            )
+        
+        # Requests queued without a handler get a placeholder result
         await asyncio.sleep(0.1)  # Simulate processing time
         return {
             'request_id': request.request_id,
@@ -888,6 +1918,31 @@ class RequestQueueManager:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _start_supervisors(self):
+        """Start OS worker processes for groups configured with worker_processes"""
+        if not self.process_groups or not self.config.worker_handler:
+            return
+        for group_name in self.process_groups.get_group_names():
+            count = self.process_groups.get_group_setting(group_name, 'worker_processes', 0)
+            if count <= 0:
+                continue
+            supervisor = WorkerSupervisor(
+                group_name, self.config.worker_handler, worker_count=count,
+                initializer=self.config.worker_initializer, initargs=self.config.worker_initargs,
+                start_method=self.config.worker_start_method
+            )
+            supervisor.start()
+            self._supervisors[group_name] = supervisor
+    
+    def _get_handler_pool(self) -> ThreadPoolExecutor:
+        """Create the handler thread pool on first use"""
+        if self._handler_pool is None:
+            self._handler_pool = ThreadPoolExecutor(
+                max_workers=self.config.handler_thread_count or self.get_worker_capacity(),
+                thread_name_prefix="RequestQueueHandler"
+            )
+        return self._handler_pool
+    
     async def _cleanup_loop(self):
         """Background cleanup of completed requests"""
         while self._running:
@@ -907,7 +1962,10 @@ class RequestQueueManager:
                         del self._completed_requests[request_id]
                         # Clean up blackboard data
                         if self.blackboard:
-                            self.blackboard.write(f'request_{request_id}', None)
+                            self.blackboard.delete(f'request_{request_id}')
+                
+                if self.blackboard:
+                    self.blackboard.purge_expired()
                 
                 if to_remove:
                     logger.debug(f"Cleaned up {len(to_remove)} completed requests")
@@ -965,11 +2023,35 @@ class RequestQueueManager:
     
     def _get_total_queue_size(self) -> int:
         """Get total size across all priority queues"""
-        return sum(queue.qsize() for queue in self._request_queues.values())
+        with self._scheduler._lock:
+            return sum(len(scheduler) for scheduler in self._all_schedulers())
+    
+    def _get_queue_size_by_priority(self) -> Dict[str, int]:
+        """Queued requests per priority across every scheduler"""
+        sizes: Dict[str, int] = defaultdict(int)
+        with self._scheduler._lock:
+            by_scheduler = [scheduler.size_by_priority() for scheduler in self._all_schedulers()]
+        for scheduler_sizes in by_scheduler:
+            for priority, size in scheduler_sizes.items():
+                sizes[priority] += size
+        return dict(sizes)
+    
+    def get_client_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-client queue depth and served counts/rates across every scheduler"""
+        clients: Dict[str, Dict[str, Any]] = {}
+        with self._scheduler._lock:
+            by_scheduler = [scheduler.client_stats() for scheduler in self._all_schedulers()]
+        for scheduler_stats in by_scheduler:
+            for client, stats in scheduler_stats.items():
+                merged = clients.setdefault(client, {'queued': 0, 'served': 0, 'served_per_second': 0.0})
+                for name, value in stats.items():
+                    merged[name] += value
+        return clients
     
     def get_status(self) -> Dict[str, Any]:
         """Get current queue status"""
-        with self._lock:
+        # The scheduler lock makes every queue figure below one snapshot
+        with self._lock, self._scheduler._lock:
             status = {
                 'running': self._running,
                 'queue_size': self._get_total_queue_size(),
@@ -981,11 +2063,19 @@ class RequestQueueManager:
                     'requests_processed': self.metrics.requests_processed,
                     'requests_failed': self.metrics.requests_failed,
                     'requests_timeout': self.metrics.requests_timeout,
+                    'requests_expired': self.metrics.requests_expired,
+                    'requests_rejected_deadline': self.metrics.requests_rejected_deadline,
+                    'requests_shed_admission': self.metrics.requests_shed_admission,
+                    'expired_work_saved_seconds': self.metrics.expired_work_saved_seconds,
                     'peak_queue_size': self.metrics.peak_queue_size,
                     'peak_concurrent_requests': self.metrics.peak_concurrent_requests,
                     'average_queue_time': self.metrics.average_queue_time,
-                    'average_processing_time': self.metrics.average_processing_time
+                    'average_processing_time': self.metrics.average_processing_time,
+                    'wait_time_percentiles': self._scheduler.wait_time_percentiles()
                 },
+                'queue_size_by_priority': self._get_queue_size_by_priority(),
+                'clients': self.get_client_stats(),
+                'durable_queue': self.durable_queue.get_stats() if self.durable_queue else None,
                 'config': {
                     'max_queue_size': self.config.max_queue_size,
                     'max_concurrent_requests': self.config.max_concurrent_requests,
@@ -996,10 +2086,16 @@ class RequestQueueManager:
             # Add process group status if enabled
             if self.process_groups:
                 status['process_groups'] = self.process_groups.get_group_status()
+                for group_name, group_status in status['process_groups'].items():
+                    scheduler = self._group_schedulers.get(group_name)
+                    group_status['queue_size'] = len(scheduler) if scheduler is not None else 0
+                    supervisor = self._supervisors.get(group_name)
+                    group_status['worker_supervisor'] = supervisor.get_stats() if supervisor else None
             
             # Add blackboard data if enabled
             if self.blackboard:
                 status['blackboard'] = self.blackboard.get_all_data()
+                status['blackboard_stats'] = self.blackboard.get_stats()
             
             return status
 
@@ -0,0 +1,356 @@
+"""
+Worker Process Supervisor for SwarmDirector
+Runs queued requests in real OS worker processes so a process group can use
+every core instead of sharing one interpreter's GIL.
+
+Each worker is shared-nothing: it owns a duplex pipe to the supervisor,
+imports its handler (and optional initializer) by dotted path, and handles
+one request record at a time. A single receiver thread in the supervisor
+resolves results back to the originating caller and notices workers that
+exit unexpectedly; they are restarted from a separate thread so a restart
+backoff never holds up results from the healthy workers.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait as wait_connections
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def import_callable(path: str) -> Callable:
+    """Resolve a 'package.module:attribute' path to a callable"""
+    module_name, _, attribute = path.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f"Expected 'module:callable', got {path!r}")
+    target = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def _worker_main(connection: Connection, handler_path: str, initializer_path: Optional[str],
+                 initargs: tuple):
+    """Worker process loop: receive (request_id, record), send (request_id, ok, result)"""
+    if initializer_path:
+        import_callable(initializer_path)(*initargs)
+    handler = import_callable(handler_path)
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+
+        request_id, record = message
+        try:
+            reply = (request_id, True, handler(record))
+        except Exception as e:
+            reply = (request_id, False, f"{type(e).__name__}: {e}")
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # Unpicklable result: report it instead of losing the request
+            connection.send((request_id, False, f"Result could not be sent: {e}"))
+
+
+@dataclass
+class _WorkerSlot:
+    """Supervisor-side state of one worker process"""
+    index: int
+    process: Any = None
+    connection: Optional[Connection] = None
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    in_flight: Dict[str, Tuple[Dict[str, Any], Future, int]] = field(default_factory=dict)
+    completed: int = 0
+    restarts: int = 0
+    started_at: float = 0.0
+    # False while the worker is dead or its pipe is broken; _dispatch skips it
+    available: bool = False
+    # True between the worker's exit and its replacement being spawned
+    restarting: bool = False
+
+
+class WorkerSupervisor:
+    """
+    Pool of worker processes fed over pipes.
+
+    submit() sends a request record to the available worker with the fewest
+    requests in flight and returns a Future for its result; if every worker
+    is restarting, the record waits until one comes back. When a worker dies,
+    its in-flight requests are sent to other workers (up to max_attempts
+    deliveries each) and the worker is restarted, backing off if it keeps
+    crashing right after start.
+    """
+
+    def __init__(self, name: str, handler: str, worker_count: int = 1, initializer: Optional[str] = None,
+                 initargs: tuple = (), start_method: str = 'spawn', max_attempts: int = 2,
+                 restart_backoff_seconds: float = 1.0):
+        if worker_count < 1:
+            raise ValueError("worker_count must be at least 1")
+        self.name = name
+        self.handler = handler
+        self.worker_count = worker_count
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_attempts = max(1, max_attempts)
+        self.restart_backoff = restart_backoff_seconds
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = [_WorkerSlot(index) for index in range(worker_count)]
+        self._lock = threading.Lock()
+        self._running = False
+        self._stopping = threading.Event()
+        self._receiver: Optional[threading.Thread] = None
+        # Records submitted while no worker was available: (request_id, record, future, attempt)
+        self._pending: List[Tuple[str, Dict[str, Any], Future, int]] = []
+        # Wakes the receiver when the set of connections changes
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'redispatched': 0, 'restarts': 0}
+
+    def start(self):
+        """Start the worker processes and the result receiver"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._stopping.clear()
+            for slot in self._slots:
+                self._spawn(slot)
+
+        self._receiver = threading.Thread(target=self._receive_loop, name=f"supervisor-{self.name}",
+                                          daemon=True)
+        self._receiver.start()
+        logger.info(f"Worker supervisor {self.name} started {self.worker_count} processes")
+
+    def stop(self, timeout: float = 10.0):
+        """Ask workers to exit, fail anything still in flight and stop the receiver"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._stopping.set()
+            slots = list(self._slots)
+
+        for slot in slots:
+            try:
+                with slot.send_lock:
+                    slot.connection.send(None)
+            except (OSError, ValueError):
+                pass
+        self._wake_receiver()
+
+        deadline = time.monotonic() + timeout
+        for slot in slots:
+            slot.process.join(max(0.0, deadline - time.monotonic()))
+            if slot.process.is_alive():
+                slot.process.terminate()
+                slot.process.join(1)
+        if self._receiver is not None:
+            self._receiver.join(timeout=5)
+
+        with self._lock:
+            orphaned = [future for slot in slots for _, future, _ in slot.in_flight.values()]
+            orphaned.extend(future for _, _, future, _ in self._pending)
+            self._pending.clear()
+            for slot in slots:
+                slot.in_flight.clear()
+                slot.available = False
+                slot.connection.close()
+        for future in orphaned:
+            self._fail(future, RuntimeError(f"Worker supervisor {self.name} stopped"))
+        logger.info(f"Worker supervisor {self.name} stopped")
+
+    def submit(self, request_id: str, record: Dict[str, Any]) -> Future:
+        """Send a request record to a worker; the Future resolves to the handler's result"""
+        future: Future = Future()
+        with self._lock:
+            if not self._running:
+                raise ValueError(f"Worker supervisor {self.name} is not running")
+            self.stats['submitted'] += 1
+        self._dispatch(request_id, record, future, 1)
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Supervisor counters and per-worker state"""
+        with self._lock:
+            return {
+                **self.stats,
+                'name': self.name,
+                'worker_count': self.worker_count,
+                'in_flight': sum(len(slot.in_flight) for slot in self._slots),
+                'pending': len(self._pending),
+                'workers': [{
+                    'pid': slot.process.pid if slot.process else None,
+                    'alive': bool(slot.process and slot.process.is_alive()),
+                    'available': slot.available,
+                    'in_flight': len(slot.in_flight),
+                    'completed': slot.completed,
+                    'restarts': slot.restarts
+                } for slot in self._slots]
+            }
+
+    def _spawn(self, slot: _WorkerSlot):
+        """Start (or restart) a slot's process (caller holds the lock)"""
+        parent_connection, child_connection = self._context.Pipe(duplex=True)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_connection, self.handler, self.initializer, self.initargs),
+            name=f"{self.name}-worker-{slot.index}",
+            daemon=True
+        )
+        process.start()
+        child_connection.close()
+        slot.process, slot.connection, slot.started_at = process, parent_connection, time.monotonic()
+        slot.available, slot.restarting = True, False
+
+    def _dispatch(self, request_id: str, record: Dict[str, Any], future: Future, attempt: int):
+        """Send to the least-loaded available worker, or park until one is back"""
+        with self._lock:
+            if not self._running:
+                slot = None
+            else:
+                candidates = [candidate for candidate in self._slots if candidate.available]
+                if not candidates:
+                    self._pending.append((request_id, record, future, attempt))
+                    return
+                slot = min(candidates, key=lambda candidate: len(candidate.in_flight))
+                slot.in_flight[request_id] = (record, future, attempt)
+                connection = slot.connection
+        if slot is None:
+            self._fail(future, RuntimeError(f"Worker supervisor {self.name} stopped"))
+            return
+
+        try:
+            with slot.send_lock:
+                connection.send((request_id, record))
+        except (OSError, ValueError) as e:
+            # Broken pipe: the worker never got the record, so take the slot
+            # out of rotation and send the record elsewhere
+            logger.warning(f"Worker supervisor {self.name} could not send {request_id}: {e}")
+            with self._lock:
+                entry = slot.in_flight.pop(request_id, None)
+                slot.available = False
+                process = slot.process
+            if process is not None and process.is_alive():
+                # Make sure its sentinel fires so the slot gets restarted
+                process.terminate()
+            if entry is not None:
+                self._dispatch(request_id, record, future, attempt)
+        except Exception as e:
+            # Record could not be pickled
+            with self._lock:
+                slot.in_flight.pop(request_id, None)
+            self._fail(future, ValueError(f"Request {request_id} cannot be sent to a worker: {e}"))
+
+    def _receive_loop(self):
+        """Deliver results and supervise worker processes"""
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                live = [slot for slot in self._slots if not slot.restarting]
+                by_connection = {slot.connection: slot for slot in live}
+                by_sentinel = {slot.process.sentinel: slot for slot in live}
+
+            ready = wait_connections(list(by_connection) + list(by_sentinel) + [self._wakeup_reader])
+            for item in ready:
+                if item is self._wakeup_reader:
+                    self._wakeup_reader.recv_bytes()
+                elif item in by_connection:
+                    self._receive_result(by_connection[item])
+                elif item in by_sentinel:
+                    self._handle_exit(by_sentinel[item])
+
+    def _receive_result(self, slot: _WorkerSlot) -> bool:
+        """Resolve one result; False once the pipe is at EOF or closed"""
+        try:
+            request_id, ok, value = slot.connection.recv()
+        except (EOFError, OSError):
+            return False  # Worker exiting; its sentinel handles the rest
+
+        with self._lock:
+            entry = slot.in_flight.pop(request_id, None)
+            slot.completed += 1
+            self.stats['completed' if ok else 'failed'] += 1
+        if entry is None:
+            return True
+
+        future = entry[1]
+        if ok:
+            if not future.done():
+                future.set_result(value)
+        else:
+            self._fail(future, RuntimeError(value))
+        return True
+
+    def _handle_exit(self, slot: _WorkerSlot):
+        """A worker process exited: redispatch its work and schedule a restart"""
+        # Drain results it sent before exiting; poll() stays true at EOF
+        try:
+            while slot.connection.poll() and self._receive_result(slot):
+                pass
+        except OSError:
+            pass
+        # The sentinel fires before the exit code is collected
+        slot.process.join(1)
+
+        with self._lock:
+            if not self._running:
+                return
+            exitcode = slot.process.exitcode
+            orphaned = list(slot.in_flight.items())
+            slot.in_flight.clear()
+            slot.available, slot.restarting = False, True
+            crashed_fast = time.monotonic() - slot.started_at < self.restart_backoff
+            slot.connection.close()
+            slot.restarts += 1
+            self.stats['restarts'] += 1
+
+        logger.warning(f"Worker {slot.process.name} exited with code {exitcode}; restarting")
+        # Don't spin if the worker dies at startup (e.g. a bad handler path),
+        # and don't hold up the receiver while backing off
+        delay = self.restart_backoff if crashed_fast else 0.0
+        threading.Thread(target=self._restart, args=(slot, delay),
+                         name=f"supervisor-{self.name}-restart-{slot.index}", daemon=True).start()
+
+        for request_id, (record, future, attempt) in orphaned:
+            if attempt < self.max_attempts:
+                with self._lock:
+                    self.stats['redispatched'] += 1
+                self._dispatch(request_id, record, future, attempt + 1)
+            else:
+                self._fail(future, RuntimeError(
+                    f"Worker process exited with code {exitcode} while handling request {request_id}"
+                ))
+
+    def _restart(self, slot: _WorkerSlot, delay: float):
+        """Respawn a slot after its backoff and hand it any parked records"""
+        if delay and self._stopping.wait(delay):
+            return
+        with self._lock:
+            if not self._running:
+                return
+            self._spawn(slot)
+            pending, self._pending = self._pending, []
+        self._wake_receiver()
+        for request_id, record, future, attempt in pending:
+            self._dispatch(request_id, record, future, attempt)
+
+    def _wake_receiver(self):
+        try:
+            self._wakeup_writer.send_bytes(b'\0')
+        except OSError:
+            pass
+
+    @staticmethod
+    def _fail(future: Future, error: Exception):
+        if not future.done():
+            future.set_exception(error)
@@ -0,0 +1,149 @@
+"""
+Tests for adaptive concurrency limits
+"""
+
+import asyncio
+import threading
+import pytest
+from swarm_director.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter, AdaptiveLimitConfig
+from swarm_director.utils.async_processor import AsyncProcessor, AsyncProcessorConfig
+from swarm_director.utils.concurrency import ConcurrencyManager, ResourceContext, ResourceError
+
+
+def simulate(limiter, capacity_at, duration, base_latency=0.01, tick=0.001):
+    """
+    Synthetic latency-vs-load server with unlimited demand: requests share
+    `capacity` units of processing, so each takes base_latency while at most
+    capacity are in flight and proportionally longer beyond that. Returns
+    (time, limit) after every tick.
+    """
+    now, in_flight, trace = 0.0, {}, []
+    next_id = 0
+    while now < duration:
+        while limiter.try_acquire():
+            in_flight[next_id] = (now, 1.0)
+            next_id += 1
+
+        progress = min(1.0, capacity_at(now) / max(1, len(in_flight))) * tick / base_latency
+        now += tick
+        for request_id, (started, remaining) in list(in_flight.items()):
+            if remaining - progress <= 0:
+                del in_flight[request_id]
+                limiter.release(now - started)
+            else:
+                in_flight[request_id] = (started, remaining - progress)
+        trace.append((now, limiter.limit))
+    return trace
+
+
+def mean_limit(trace, start, end):
+    values = [limit for at, limit in trace if start <= at < end]
+    return sum(values) / len(values)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test suite for AdaptiveConcurrencyLimiter convergence"""
+
+    @pytest.mark.parametrize('config', [
+        AdaptiveLimitConfig(algorithm='gradient'),
+        AdaptiveLimitConfig(algorithm='aimd', latency_threshold_seconds=0.015)
+    ], ids=['gradient', 'aimd'])
+    def test_limit_converges_to_capacity_and_follows_changes(self, config):
+        """Test that the limit settles near capacity and tracks it down and back up"""
+        limiter = AdaptiveConcurrencyLimiter(config)
+        trace = simulate(limiter, lambda at: 50 if at < 3 or at >= 6 else 10, 9)
+
+        assert 45 <= mean_limit(trace, 1.5, 3) <= 90
+        assert 8 <= mean_limit(trace, 4.5, 6) <= 20
+        assert 45 <= mean_limit(trace, 7.5, 9) <= 90
+
+    def test_limit_stays_within_bounds(self):
+        """Test that min_limit and max_limit clamp the limit"""
+        limiter = AdaptiveConcurrencyLimiter(AdaptiveLimitConfig(min_limit=5, max_limit=30))
+        simulate(limiter, lambda at: 1000, 1)
+        assert limiter.limit == 30
+
+        limiter = AdaptiveConcurrencyLimiter(AdaptiveLimitConfig(min_limit=5, max_limit=30))
+        for _ in range(500):
+            assert limiter.try_acquire()
+            limiter.release(0.01, success=False)
+        assert limiter.limit == 5
+        assert limiter.get_history()[-1][1] == 5
+
+    def test_rejects_beyond_limit(self):
+        """Test that slots beyond the limit are refused until one is released"""
+        limiter = AdaptiveConcurrencyLimiter(AdaptiveLimitConfig(initial_limit=2))
+        assert limiter.try_acquire() and limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+        limiter.release(0.01)
+        assert limiter.try_acquire()
+        assert limiter.get_stats()['rejected'] == 1
+
+    def test_resource_context_holds_a_slot(self):
+        """Test that ResourceContext takes a limiter slot and reports failures"""
+        limiter = AdaptiveConcurrencyLimiter(AdaptiveLimitConfig(algorithm='aimd', initial_limit=2,
+                                                                 backoff_ratio=0.5))
+        with ResourceContext(limiter=limiter):
+            assert limiter.in_flight == 1
+
+        with pytest.raises(KeyError):
+            with ResourceContext(limiter=limiter):
+                raise KeyError('boom')
+        assert limiter.in_flight == 0
+        assert limiter.get_stats()['failed'] == 1
+        assert limiter.limit == 1
+
+        with ResourceContext(limiter=limiter):
+            with pytest.raises(ResourceError):
+                with ResourceContext(limiter=limiter):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_concurrency_manager_sheds_above_limit(self):
+        """Test that submit_task holds a slot until the task finishes"""
+        manager = ConcurrencyManager(limit_config=AdaptiveLimitConfig(initial_limit=1))
+        manager.async_processor = AsyncProcessor(AsyncProcessorConfig(worker_thread_count=2, enable_metrics=False))
+        await manager.async_processor.start()
+        manager.is_initialized = True
+        release = threading.Event()
+        try:
+            task_id = await manager.submit_task(release.wait, 5, check_resources=False)
+            with pytest.raises(ResourceError):
+                await manager.submit_task(release.wait, 5, check_resources=False)
+
+            release.set()
+            assert await manager.get_task_result(task_id, timeout=5) is True
+            await asyncio.sleep(0)
+            assert manager.limiter.in_flight == 0
+            assert manager.get_status()['concurrency_limit']['succeeded'] == 1
+        finally:
+            await manager.async_processor.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_tasks_do_not_shrink_the_limit(self):
+        """Test that tasks cancelled before running return their slot without a failure sample"""
+        manager = ConcurrencyManager(limit_config=AdaptiveLimitConfig(algorithm='aimd', initial_limit=4))
+        manager.async_processor = AsyncProcessor(AsyncProcessorConfig(
+            max_concurrent_tasks=1, worker_thread_count=1, enable_metrics=False
+        ))
+        await manager.async_processor.start()
+        manager.is_initialized = True
+        release = threading.Event()
+        try:
+            blocker = await manager.submit_task(release.wait, 5, check_resources=False)
+            queued = [await manager.submit_task(release.wait, 5, check_resources=False) for _ in range(3)]
+            assert all(manager.cancel_task(task_id) for task_id in queued)
+            await asyncio.sleep(0)
+
+            stats = manager.limiter.get_stats()
+            assert stats['abandoned'] == 3
+            assert stats['failed'] == 0
+            assert manager.limiter.limit == 4
+            assert manager.limiter.in_flight == 1
+
+            release.set()
+            assert await manager.get_task_result(blocker, timeout=5) is True
+        finally:
+            release.set()
+            await manager.async_processor.stop()
@@ -3,6 +3,8 @@ Tests for Adaptive Throttling System
 Tests system monitoring, load prediction, and dynamic throttling
 """
 
+import json
+import math
 import pytest
 import time
 import threading
@@ -16,9 +18,21 @@ from src.swarm_director.utils.system_monitor import (
 )
 from src.swarm_director.utils.adaptive_throttling import (
     AdaptiveThrottlingManager, AdaptiveThrottlingConfig, ThrottlingThresholds,
-    LoadLevel, ThrottleAction, LoadPredictor, ThrottlingMetrics,
+    LoadLevel, ThrottleAction, LoadPredictor, ThrottlingMetrics, HoltWintersPredictor,
+    backtest_predictor, load_recorded_metrics,
     initialize_throttling_manager, shutdown_throttling_manager
 )
+from src.swarm_director.utils.request_queue import (
+    RequestQueueManager, RequestQueueConfig, RequestType, QueuePriority
+)
+
+
+def seasonal_series(season_length, seasons, interval=5.0):
+    """Evenly spaced (timestamp, load) samples following a sine-shaped daily cycle"""
+    start = datetime(2026, 1, 1)
+    return [(start + timedelta(seconds=i * interval),
+             50 + 30 * math.sin(2 * math.pi * i / season_length))
+            for i in range(season_length * seasons)]
 
 
 class TestSystemResourceMonitor:
@@ -150,6 +164,97 @@ class TestLoadPredictor:
         assert predicted == 50.0  # Should return last value
 
 
+class TestHoltWintersPredictor:
+    """Test seasonal load forecasting"""
+    
+    def test_ewma_until_two_seasons_seen(self):
+        """Test the EWMA fallback before seasonal components exist"""
+        predictor = HoltWintersPredictor(season_length=4, alpha=0.5)
+        assert predictor.predict_load(30) == 50.0
+        
+        predictor.add_sample(40.0)
+        predictor.add_sample(60.0)
+        assert not predictor.seasonal
+        assert predictor.predict_load(30) == 50.0
+    
+    def test_forecasts_the_seasonal_peak(self):
+        """Test that a peak one season ago is forecast ahead of time"""
+        predictor = HoltWintersPredictor(season_length=24)
+        samples = seasonal_series(24, 4)
+        for timestamp, load in samples:
+            predictor.add_sample(load, timestamp)
+        
+        assert predictor.seasonal
+        assert predictor.sample_interval == pytest.approx(5.0)
+        # The next sample starts a new season; the peak is 6 samples (30s) ahead
+        assert predictor.predict_load(30) == pytest.approx(80.0, abs=2.0)
+        assert predictor.predict_peak(60) == pytest.approx(80.0, abs=2.0)
+        assert predictor.predict_load(5) == pytest.approx(50.0, abs=2.0)
+        assert predictor.predict_load(10) == pytest.approx(57.8, abs=2.0)
+    
+    def test_invalid_parameters(self):
+        """Test parameter validation"""
+        with pytest.raises(ValueError):
+            HoltWintersPredictor(season_length=1)
+        with pytest.raises(ValueError):
+            HoltWintersPredictor(alpha=0)
+        with pytest.raises(ValueError):
+            HoltWintersPredictor(sample_interval=0)
+    
+    def test_late_samples_stay_in_phase(self):
+        """Test that jittered sample times map to their clock slot, not a sample count"""
+        predictor = HoltWintersPredictor(season_length=24, sample_interval=5.0)
+        # Every sample lands 0.2s later than the last, as a loop that sleeps
+        # a fixed interval after its work drifts; 24 samples lose about one slot
+        start = datetime(2026, 1, 1)
+        for i in range(24 * 8):
+            timestamp = start + timedelta(seconds=i * 5.2 + 1)
+            elapsed = (timestamp - start).total_seconds()
+            predictor.add_sample(50 + 30 * math.sin(2 * math.pi * elapsed / 120), timestamp)
+        
+        last = start + timedelta(seconds=(24 * 8 - 1) * 5.2 + 1)
+        for steps in (1, 6, 12):
+            elapsed = (int((last - start).total_seconds() // 5) + steps) * 5
+            expected = 50 + 30 * math.sin(2 * math.pi * elapsed / 120)
+            assert predictor.forecast(steps) == pytest.approx(expected, abs=6.0)
+    
+    def test_missed_slots_are_skipped(self):
+        """Test that an outage does not shift later samples onto the wrong slots"""
+        predictor = HoltWintersPredictor(season_length=24, sample_interval=5.0)
+        samples = seasonal_series(24, 6)
+        # Lose a quarter season in the middle of the fourth season
+        for timestamp, load in samples[:80] + samples[86:]:
+            predictor.add_sample(load, timestamp)
+        
+        assert predictor.predict_load(5) == pytest.approx(50.0, abs=2.0)
+        assert predictor.predict_load(30) == pytest.approx(79.0, abs=2.0)
+    
+    def test_backtest_beats_linear_trend_on_seasonal_load(self):
+        """Test walk-forward backtesting of both predictors"""
+        samples = seasonal_series(24, 6)
+        seasonal = backtest_predictor(HoltWintersPredictor(season_length=24), samples,
+                                      horizon_steps=6, warmup=48)
+        linear = backtest_predictor(LoadPredictor(), samples, horizon_steps=6, warmup=48)
+        
+        assert seasonal['forecasts'] == linear['forecasts'] == 24 * 6 - 48 - 6
+        assert seasonal['mae'] < 1.0
+        assert seasonal['mae'] < linear['mae'] / 5
+    
+    def test_load_recorded_metrics(self, tmp_path):
+        """Test reading the metrics API response and CSV exports"""
+        records = [{'timestamp': (datetime(2026, 1, 1) + timedelta(seconds=5 * i)).isoformat(),
+                    'cpu_usage': 40.0 + i, 'memory_usage': 60.0} for i in range(3)]
+        json_path = tmp_path / 'metrics.json'
+        json_path.write_text(json.dumps({'success': True, 'data': {'metrics': records[::-1]}}))
+        csv_path = tmp_path / 'metrics.csv'
+        csv_path.write_text('timestamp,cpu_usage,memory_usage\n' +
+                            ''.join(f"{r['timestamp']},{r['cpu_usage']},{r['memory_usage']}\n" for r in records))
+        
+        for path in (json_path, csv_path):
+            samples = load_recorded_metrics(str(path))
+            assert [load for _, load in samples] == [50.0, 50.5, 51.0]
+
+
 class TestAdaptiveThrottlingManager:
     """Test adaptive throttling manager functionality"""
     
@@ -321,6 +426,79 @@ class TestAdaptiveThrottlingManager:
         assert history[0].system_health_score == 80.0
 
 
+class TestPredictiveAdmission:
+    """Test forecast-driven pre-scaling and admission control"""
+    
+    def setup_method(self):
+        """Setup a manager whose forecast is pinned"""
+        self.config = AdaptiveThrottlingConfig(
+            thresholds=ThrottlingThresholds(min_concurrency=1, max_concurrency=20, default_concurrency=10),
+            admission_control=True
+        )
+        self.manager = AdaptiveThrottlingManager(self.config)
+        self.manager._load_predictor = Mock()
+        self.snapshot = Mock(cpu_percent=40.0, memory_percent=40.0)
+    
+    def test_predicted_peak_pre_scales_limits(self):
+        """Test that a forecast peak scales down before the load arrives"""
+        self.manager._load_predictor.predict_peak.return_value = 50.0
+        assert self.manager._calculate_target_concurrency(self.snapshot, 90.0, LoadLevel.NORMAL, 5, 5) == 10
+        
+        self.manager._load_predictor.predict_peak.return_value = 85.0
+        assert self.manager._calculate_target_concurrency(self.snapshot, 90.0, LoadLevel.NORMAL, 5, 5) == 8
+        
+        self.manager._load_predictor.predict_peak.return_value = 97.0
+        assert self.manager._calculate_target_concurrency(self.snapshot, 90.0, LoadLevel.NORMAL, 5, 5) == 7
+        assert self.manager.get_predicted_load() == 97.0
+    
+    def test_sheds_low_priority_before_saturation(self):
+        """Test that shed priorities follow current or predicted load"""
+        self.manager._predicted_load = 50.0
+        assert self.manager._calculate_shed_priorities(40.0) == frozenset()
+        
+        self.manager._predicted_load = 75.0
+        assert self.manager._calculate_shed_priorities(40.0) == {QueuePriority.LOW}
+        
+        self.manager._predicted_load = 50.0
+        assert self.manager._calculate_shed_priorities(90.0) == {QueuePriority.LOW, QueuePriority.NORMAL}
+    
+    @pytest.mark.asyncio
+    async def test_queue_refuses_shed_priorities(self):
+        """Test that the installed admission policy rejects at RequestQueueManager"""
+        queue_manager = RequestQueueManager(RequestQueueConfig(
+            enable_metrics=False, enable_blackboard=False, process_groups_enabled=False
+        ))
+        queue_manager.admission_policy = self.manager.should_admit
+        self.manager._shed_priorities = frozenset((QueuePriority.LOW,))
+        await queue_manager.start()
+        try:
+            with pytest.raises(ValueError):
+                await queue_manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.LOW,
+                                                  client_id='tests')
+            await queue_manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.HIGH,
+                                              client_id='tests')
+            
+            assert queue_manager.get_status()['metrics']['requests_shed_admission'] == 1
+            assert self.manager.get_admission_status()['requests_shed'] == 1
+        finally:
+            await queue_manager.stop()
+    
+    def test_shed_count_is_exact_across_threads(self):
+        """Test that concurrent admission checks count every shed request"""
+        self.manager._shed_priorities = frozenset((QueuePriority.LOW,))
+        
+        def check():
+            for _ in range(2000):
+                self.manager.should_admit(QueuePriority.LOW)
+        
+        threads = [threading.Thread(target=check) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert self.manager.get_admission_status()['requests_shed'] == 16000
+
+
 class TestThrottlingIntegration:
     """Test integration between components"""
     
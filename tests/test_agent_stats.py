@@ -0,0 +1,77 @@
+"""
+Tests for live agent statistics used by DirectorAgent routing
+"""
+
+import pytest
+from swarm_director.agents.agent_stats import AgentStatsTracker
+
+
+class TestAgentStatsTracker:
+    """Test suite for AgentStatsTracker"""
+
+    @pytest.fixture
+    def tracker(self):
+        """Create a tracker with a fast-moving average"""
+        return AgentStatsTracker(alpha=0.5, window=4)
+
+    def test_in_flight_accounting(self, tracker):
+        """Test that begin/end track outstanding executions"""
+        tracker.begin('analysis')
+        tracker.begin('analysis')
+        assert tracker.in_flight('analysis') == 2
+
+        tracker.end('analysis', 1.0, True)
+        assert tracker.in_flight_counts() == {'analysis': 1}
+        assert tracker.in_flight('unknown') == 0
+
+    def test_ewma_latency_and_success(self, tracker):
+        """Test exponentially weighted latency and success updates"""
+        tracker.record('analysis', 1.0, True)
+        tracker.record('analysis', 3.0, False)
+
+        stats = tracker.snapshot()['analysis']
+        assert stats['ewma_latency_seconds'] == pytest.approx(2.0)
+        assert stats['ewma_success_rate'] == pytest.approx(0.5)
+        assert stats['failures'] == 1
+
+    def test_percentiles_use_recent_window(self, tracker):
+        """Test that percentiles only consider the most recent samples"""
+        for seconds in (100.0, 1.0, 2.0, 3.0, 4.0):
+            tracker.record('analysis', seconds)
+
+        assert tracker.sample_count('analysis') == 4
+        assert tracker.percentile('analysis', 0.5) == 2.0
+        assert tracker.percentile('analysis', 0.95) == 4.0
+        assert tracker.percentile('unknown', 0.95) is None
+
+    def test_choose_prefers_less_outstanding_work(self, tracker):
+        """Test that power-of-two-choices picks the cheaper of two agents"""
+        tracker.record('busy', 1.0)
+        tracker.record('idle', 1.0)
+        for _ in range(3):
+            tracker.begin('busy')
+
+        assert tracker.choose(['busy', 'idle']) == 'idle'
+        assert tracker.rank(['busy', 'idle']) == ['idle', 'busy']
+
+    def test_unobserved_agents_are_explored(self, tracker):
+        """Test that agents without observations are tried before slower-than-average ones"""
+        tracker.record('slow', 10.0)
+        tracker.record('fast', 2.0)
+
+        assert tracker.cost('new') == pytest.approx(6.0)
+        assert tracker.choose(['slow', 'new']) == 'new'
+        assert tracker.choose(['only']) == 'only'
+        assert tracker.choose([]) is None
+
+    def test_cold_agents_pay_for_in_flight_work(self, tracker):
+        """Test that a cold agent stops attracting every request once work piles up on it"""
+        assert tracker.cost('cold') == pytest.approx(1.0)
+
+        tracker.record('warm', 2.0)
+        for _ in range(3):
+            tracker.begin('cold')
+
+        assert tracker.cost('cold') == pytest.approx(8.0)
+        assert tracker.choose(['warm', 'cold']) == 'warm'
+        assert tracker.rank(['cold', 'warm']) == ['warm', 'cold']
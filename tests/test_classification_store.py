@@ -0,0 +1,138 @@
+"""
+Tests for the shared on-disk classification cache
+"""
+
+import os
+import subprocess
+import sys
+import time
+import pytest
+from swarm_director.app import create_app
+from swarm_director.models.base import db
+from swarm_director.models.agent import Agent, AgentType, AgentStatus
+from swarm_director.agents.director import DirectorAgent, DirectorConfig
+from swarm_director.agents.llm_classifier import LLMClassificationProvider
+from swarm_director.agents.classification_store import SQLiteClassificationStore
+
+
+class CountingProvider(LLMClassificationProvider):
+    """Provider that always answers ANALYSIS and counts calls"""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, prompt, max_tokens=50):
+        self.calls += 1
+        return "ANALYSIS|0.85"
+
+
+class TestSQLiteClassificationStore:
+    """Test suite for SQLiteClassificationStore"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store in a temporary directory"""
+        store = SQLiteClassificationStore(str(tmp_path / "cache" / "classifications.db"),
+                                          max_entries=3, ttl_seconds=60)
+        yield store
+        store.close()
+
+    def test_write_behind_round_trip(self, store):
+        """Test that queued writes become readable after a flush"""
+        store.put('key-1', 'llm:v1', 'analysis', 0.9)
+        assert store.flush()
+
+        assert store.get('key-1') == ('analysis', 0.9)
+        assert store.get('missing') is None
+        stats = store.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_operations_apply_in_order(self, store):
+        """Test that a delete followed by a put in the same batch keeps the put"""
+        store.put('key-1', 'llm:v1', 'analysis', 0.9)
+        store.invalidate('key-1')
+        store.put('key-1', 'llm:v1', 'automation', 0.7)
+        store.flush()
+
+        assert store.get('key-1') == ('automation', 0.7)
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test that entries older than the TTL are not returned"""
+        store = SQLiteClassificationStore(str(tmp_path / "ttl.db"), ttl_seconds=0.05)
+        store.put('key-1', 'llm:v1', 'analysis', 0.9)
+        store.flush()
+        time.sleep(0.1)
+
+        assert store.get('key-1') is None
+        assert store.get_stats()['expired'] == 1
+        store.close()
+
+    def test_prune_evicts_oldest_beyond_capacity(self, store):
+        """Test size-based eviction of the oldest rows"""
+        for i in range(5):
+            store.put(f'key-{i}', 'llm:v1', 'analysis', 0.9)
+            store.flush()
+        store.prune()
+
+        assert store.get_stats()['entries'] == 3
+        assert store.get('key-0') is None
+        assert store.get('key-4') == ('analysis', 0.9)
+
+    def test_entries_are_visible_to_other_processes(self, store):
+        """Test that another process on the host reads the same entries"""
+        store.put('shared-key', 'llm:v1', 'coordination', 0.8)
+        store.flush()
+
+        src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+        script = (
+            f"import sys; sys.path.insert(0, {src_path!r});"
+            "from swarm_director.agents.classification_store import SQLiteClassificationStore;"
+            f"print(SQLiteClassificationStore({store.path!r}).get('shared-key'))"
+        )
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+
+        assert "('coordination', 0.8)" in output.stdout
+
+
+class TestDirectorPersistentCache:
+    """Test suite for DirectorAgent read-through of the shared cache"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    def test_classification_shared_between_directors(self, app, tmp_path):
+        """Test that a classification paid for by one director is reused by another"""
+        path = str(tmp_path / "shared.db")
+        directors = []
+        with app.app_context():
+            for name in ('WorkerOneDirector', 'WorkerTwoDirector'):
+                db_agent = Agent(name=name, agent_type=AgentType.SUPERVISOR, status=AgentStatus.ACTIVE)
+                db_agent.save()
+                directors.append(DirectorAgent(db_agent, DirectorConfig(
+                    enable_llm_classification=True, llm_batch_window_ms=1, persistent_cache_path=path
+                )))
+
+            first_provider, second_provider = CountingProvider(), CountingProvider()
+            directors[0].set_llm_providers([first_provider])
+            directors[1].set_llm_providers([second_provider])
+
+            assert directors[0]._classify_intent_llm('review quarterly numbers') == ('analysis', 0.85)
+            directors[0].persistent_cache.flush()
+            assert directors[1]._classify_intent_llm('review quarterly numbers') == ('analysis', 0.85)
+
+            assert first_provider.calls == 1
+            assert second_provider.calls == 0
+            assert directors[1]._get_cache_performance()['persistent_cache']['hits'] >= 1
+
+        for director in directors:
+            director.shutdown()
@@ -0,0 +1,135 @@
+"""
+Tests for as-completed streaming in the concurrency utilities
+"""
+
+import threading
+import time
+import pytest
+import pytest_asyncio
+from swarm_director.utils import concurrency
+from swarm_director.utils.async_processor import AsyncProcessor, AsyncProcessorConfig
+from swarm_director.utils.concurrency import (
+    AsyncBatch, ConcurrencyManager, iter_concurrent_tasks, run_concurrent_tasks
+)
+
+
+def sleeper(seconds, value):
+    """Task that sleeps then returns value"""
+    return lambda: (time.sleep(seconds), value)[1]
+
+
+@pytest_asyncio.fixture
+async def manager(monkeypatch):
+    """Install a global ConcurrencyManager backed by a fresh AsyncProcessor"""
+    manager = ConcurrencyManager()
+    manager.async_processor = AsyncProcessor(AsyncProcessorConfig(
+        max_concurrent_tasks=4, worker_thread_count=4, enable_metrics=False, enable_resource_monitoring=False
+    ))
+    await manager.async_processor.start()
+    manager.is_initialized = True
+    monkeypatch.setattr(concurrency, 'concurrency_manager', manager)
+    yield manager
+    await manager.async_processor.stop()
+
+
+class TestAsCompletedStreaming:
+    """Test suite for iter_concurrent_tasks and AsyncBatch.as_completed"""
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self, manager):
+        """Test that a slow task does not hold back results that finished earlier"""
+        tasks = [sleeper(0.5, 'slow'), sleeper(0.01, 'fast-1'), sleeper(0.05, 'fast-2')]
+        outcomes = [outcome async for outcome in iter_concurrent_tasks(tasks)]
+
+        assert [outcome.result for outcome in outcomes] == ['fast-1', 'fast-2', 'slow']
+        assert [outcome.index for outcome in outcomes] == [1, 2, 0]
+        assert all(outcome.ok for outcome in outcomes)
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_bounds_in_flight_work(self, manager):
+        """Test that a lazily generated batch never has more than max_concurrent running"""
+        lock = threading.Lock()
+        running, peak, generated = [0], [0], [0]
+
+        def task():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return True
+
+        def tasks():
+            for _ in range(12):
+                generated[0] += 1
+                yield task
+
+        count = 0
+        async for outcome in iter_concurrent_tasks(tasks(), max_concurrent=2):
+            assert outcome.ok
+            count += 1
+            # Only the in-flight window is drawn from the generator ahead of consumption
+            assert generated[0] <= count + 2
+        assert count == 12
+        assert peak[0] <= 2
+
+    @pytest.mark.asyncio
+    async def test_partial_failures_and_per_item_timeouts_are_yielded(self, manager):
+        """Test that failed and timed-out items come back as outcomes without stopping the rest"""
+        def fail():
+            raise KeyError('missing')
+
+        outcomes = {outcome.index: outcome async for outcome in
+                    iter_concurrent_tasks([sleeper(0.01, 'ok'), fail, sleeper(1.0, 'late')], timeout=0.2)}
+
+        assert outcomes[0].result == 'ok'
+        assert isinstance(outcomes[1].error, KeyError)
+        assert isinstance(outcomes[2].error, TimeoutError)
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_remaining_work(self, manager):
+        """Test that the first error is raised and queued tasks never start"""
+        ran = []
+
+        def fail():
+            raise KeyError('missing')
+
+        def record():
+            time.sleep(0.2)
+            ran.append(True)
+
+        # Leave one free worker so the tasks after the failure are still queued when it is raised
+        release = threading.Event()
+        blockers = [await manager.submit_task(release.wait, 5, check_resources=False) for _ in range(3)]
+        try:
+            with pytest.raises(KeyError):
+                async for _ in iter_concurrent_tasks([fail, record, record], max_concurrent=3, fail_fast=True):
+                    pass
+        finally:
+            release.set()
+        for task_id in blockers:
+            await manager.get_task_result(task_id, timeout=5)
+        time.sleep(0.3)  # Let a record task that had already started finish
+
+        stats = manager.async_processor.get_status()['metrics']
+        assert stats['tasks_cancelled'] >= 1
+        assert len(ran) + stats['tasks_cancelled'] == 2
+
+    @pytest.mark.asyncio
+    async def test_run_concurrent_tasks_keeps_input_order(self, manager):
+        """Test that the list API still returns results in input order"""
+        results = await run_concurrent_tasks([sleeper(0.1, 'a'), sleeper(0.01, 'b')], max_concurrent=2)
+        assert results == ['a', 'b']
+
+    @pytest.mark.asyncio
+    async def test_async_batch_as_completed(self, manager):
+        """Test that a batch yields submitted and not-yet-submitted tasks as they finish"""
+        async with AsyncBatch(batch_size=2) as batch:
+            await batch.add_task(sleeper(0.3, 'first'))
+            await batch.add_task(sleeper(0.01, 'second'))  # Fills the batch: both submitted
+            await batch.add_task(sleeper(0.01, 'third'))
+            outcomes = [outcome async for outcome in batch.as_completed()]
+
+        assert [outcome.result for outcome in outcomes] == ['second', 'third', 'first']
+        assert [outcome.index for outcome in outcomes] == [1, 2, 0]
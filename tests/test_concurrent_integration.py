@@ -1,6 +1,7 @@
 """Integration test for concurrent request handling"""
 import pytest
 import asyncio
+import os
 import time
 from unittest.mock import patch, MagicMock
 
@@ -142,6 +143,165 @@ class TestConcurrentProcessingIntegration:
         finally:
             await processor.stop()
 
+    @pytest.mark.asyncio
+    async def test_result_delivered_without_polling_delay(self):
+        """Test that waiters wake as soon as a task finishes"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=2, worker_thread_count=1))
+        await processor.start()
+        
+        try:
+            async def quick_task():
+                return "done"
+            
+            task_id = await processor.submit_task(quick_task)
+            start = time.perf_counter()
+            assert await processor.get_task_result(task_id, timeout=5.0) == "done"
+            assert time.perf_counter() - start < 0.05
+        finally:
+            await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_result_failure_and_timeout(self):
+        """Test that failures raise the task error and slow tasks time out"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=2, worker_thread_count=1))
+        await processor.start()
+        
+        try:
+            async def failing_task():
+                raise KeyError("missing")
+            
+            async def slow_task():
+                await asyncio.sleep(1.0)
+            
+            failing_id = await processor.submit_task(failing_task)
+            with pytest.raises(KeyError):
+                await processor.get_task_result(failing_id, timeout=5.0)
+            
+            slow_id = await processor.submit_task(slow_task)
+            with pytest.raises(TimeoutError):
+                await processor.get_task_result(slow_id, timeout=0.05)
+            
+            with pytest.raises(ValueError):
+                await processor.get_task_result("unknown", timeout=0.05)
+        finally:
+            await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_releases_waiters(self):
+        """Test that stopping the processor fails tasks that never finished"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=1, worker_thread_count=1))
+        await processor.start()
+        
+        async def slow_task():
+            await asyncio.sleep(10)
+        
+        task_id = await processor.submit_task(slow_task)
+        waiter = asyncio.create_task(processor.get_task_result(task_id))
+        await asyncio.sleep(0.05)
+        await processor.stop()
+        
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, timeout=1.0)
+
+    
+    @pytest.mark.asyncio
+    async def test_cpu_bound_tasks_run_in_process_lane(self):
+        """Test that CPU-bound tasks run in worker processes with their own lane metrics"""
+        processor = AsyncProcessor(AsyncProcessorConfig(
+            max_concurrent_tasks=2, worker_thread_count=1, process_worker_count=2,
+            cpu_bound_task_types=['analytics_aggregation'], enable_resource_monitoring=False
+        ))
+        await processor.start()
+        
+        try:
+            pid_task = await processor.submit_task(os.getpid, cpu_bound=True)
+            sum_task = await processor.submit_task(sum, [1, 2, 3], task_type='analytics_aggregation')
+            thread_task = await processor.submit_task(os.getpid)
+            
+            assert await processor.get_task_result(pid_task, timeout=30) != os.getpid()
+            assert await processor.get_task_result(sum_task, timeout=30) == 6
+            assert await processor.get_task_result(thread_task, timeout=5) == os.getpid()
+            
+            lanes = processor.get_status()['lanes']
+            assert lanes['process']['tasks_completed'] == 2
+            assert lanes['default']['tasks_completed'] == 1
+            assert lanes['process']['queue_size'] == 0
+        finally:
+            await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_process_lane_timeout_holds_worker_until_process_is_free(self):
+        """Test that a timed-out process task keeps its lane slot instead of queuing work in the pool"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=1, worker_thread_count=1,
+                                                        process_worker_count=1, enable_metrics=True,
+                                                        enable_resource_monitoring=False))
+        await processor.start()
+        
+        try:
+            # Warm the pool so the timeout below is not spent starting a process
+            assert await processor.get_task_result(
+                await processor.submit_task(os.getpid, cpu_bound=True), timeout=30) != os.getpid()
+            
+            slow_id = await processor.submit_task(time.sleep, 1.0, cpu_bound=True, timeout=0.2)
+            with pytest.raises(TimeoutError):
+                await processor.get_task_result(slow_id, timeout=5)
+            next_id = await processor.submit_task(os.getpid, cpu_bound=True)
+            await asyncio.sleep(0.1)
+            
+            lane = processor.get_status()['lanes']['process']
+            assert lane['queue_size'] == 1
+            assert lane['overrunning_tasks'] == 1
+            assert lane['busy_processes'] == 1
+            
+            assert await processor.get_task_result(next_id, timeout=30) != os.getpid()
+            assert processor.get_status()['lanes']['process']['overrunning_tasks'] == 0
+            assert processor.get_status()['metrics']['tasks_timeout'] == 1
+        finally:
+            await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_runaway_process_task_recycles_pool(self):
+        """Test that a task running past its timeout and grace period is stopped by recycling the pool"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=1, worker_thread_count=1,
+                                                        process_worker_count=1, enable_metrics=False,
+                                                        enable_resource_monitoring=False,
+                                                        process_overrun_grace_seconds=0.2))
+        await processor.start()
+        
+        try:
+            first_pid = await processor.get_task_result(
+                await processor.submit_task(os.getpid, cpu_bound=True), timeout=30)
+            runaway_id = await processor.submit_task(time.sleep, 60, cpu_bound=True, timeout=0.2)
+            with pytest.raises(TimeoutError):
+                await processor.get_task_result(runaway_id, timeout=5)
+            
+            next_pid = await processor.get_task_result(
+                await processor.submit_task(os.getpid, cpu_bound=True), timeout=30)
+            assert next_pid != first_pid
+            assert processor.get_status()['lanes']['process']['pool_recycles'] == 1
+        finally:
+            await processor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_process_lane_rejects_unpicklable_tasks(self):
+        """Test that tasks that cannot be sent to a worker process are refused at submit"""
+        processor = AsyncProcessor(AsyncProcessorConfig(max_concurrent_tasks=1, worker_thread_count=1,
+                                                        process_worker_count=1,
+                                                        enable_resource_monitoring=False))
+        await processor.start()
+        
+        async def coroutine_task():
+            return 1
+        
+        try:
+            with pytest.raises(ValueError):
+                await processor.submit_task(lambda: 1, cpu_bound=True)
+            with pytest.raises(ValueError):
+                await processor.submit_task(coroutine_task, cpu_bound=True)
+            assert processor.get_status()['lanes']['process']['tasks_queued'] == 0
+        finally:
+            await processor.stop()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
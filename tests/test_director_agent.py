@@ -134,6 +134,173 @@ class TestDirectorAgent:
             updated_stats = director_agent.get_routing_stats()
             assert updated_stats['total_routed'] == initial_total + 1
             assert updated_stats['successful_routes'] >= initial_stats['successful_routes']
+    
+    def test_compiled_keyword_matcher_matches_substring_scan(self, app, director_agent):
+        """Test that the compiled matcher gives the same result as per-keyword scans"""
+        def legacy_classify(text):
+            scores, total = {}, 0
+            for dept, keywords in director_agent.intent_keywords.items():
+                scores[dept] = sum(1 for k in keywords if k in text)
+                total += scores[dept]
+            best = max(scores.items(), key=lambda x: x[1])
+            if best[1] == 0:
+                return director_agent.config.fallback_department, 0.0
+            return best[0], min(1.0, best[1] / max(1, total))
+        
+        texts = [
+            'send email reminder about the weekly schedule',
+            'analyze performance data and report metrics to the team',
+            'automate the recurring api integration pipeline',
+            'coordinate project timeline and track meeting notes',
+            'rapid prototyping of the reply tool',
+            'nothing relevant here',
+            ''
+        ]
+        with app.app_context():
+            for text in texts:
+                assert director_agent._classify_intent_keyword(text) == legacy_classify(text)
+    
+    def test_keyword_matcher_rebuilds_when_keywords_change(self, app, director_agent):
+        """Test that keyword edits are picked up without manual recompilation"""
+        with app.app_context():
+            assert director_agent._classify_intent_keyword('deploy the cluster')[0] == 'coordination'
+            assert director_agent._classify_intent_keyword('deploy the cluster')[1] == 0.0
+            
+            director_agent.intent_keywords['automation'].append('deploy')
+            assert director_agent._classify_intent_keyword('deploy the cluster') == ('automation', 1.0)
+            
+            director_agent.intent_keywords = {'analysis': ['cluster']}
+            assert director_agent._classify_intent_keyword('deploy the cluster') == ('analysis', 1.0)
+    
+    def test_keyword_classification_uses_cache(self, app, director_agent):
+        """Test that repeated keyword classifications are served from the cache"""
+        with app.app_context():
+            first = director_agent._classify_intent_keyword('send email  to the team')
+            second = director_agent._classify_intent_keyword('Send email to the TEAM')
+            
+            assert first == second
+            perf = director_agent._get_cache_performance()
+            assert perf['cache_entries'] == 1
+            assert perf['total_hits'] == 1
+            assert perf['total_misses'] == 1
+            assert perf['hit_rate'] == 0.5
+            
+            # Changing keywords changes the classifier version, so the entry is not reused
+            director_agent.intent_keywords['analysis'].append('team')
+            director_agent._classify_intent_keyword('send email to the team')
+            assert director_agent._get_cache_performance()['cache_entries'] == 2
+    
+    def test_classify_many(self, app, director_agent):
+        """Test batch classification of tasks and raw text"""
+        with app.app_context():
+            task = Task(
+                title='Send email notification',
+                description='Send an email to notify users',
+                status=TaskStatus.PENDING
+            )
+            task.save()
+            
+            results = director_agent.classify_many([
+                task,
+                'Analyze sales data',
+                'Unknown task type'
+            ] * 100)
+            
+            assert len(results) == 300
+            assert results[0] == director_agent.classify_intent_with_confidence(task)
+            assert results[1][0] == 'analysis'
+            assert results[2] == ('coordination', 0.0)
+            assert results[3:6] == results[0:3]
+
+    def test_feedback_history_is_bounded(self, app):
+        """Test that feedback history is capped while analytics count every item"""
+        from swarm_director.agents.director import DirectorConfig
+        with app.app_context():
+            db_agent = Agent(name='BoundedDirector', agent_type=AgentType.SUPERVISOR,
+                             status=AgentStatus.ACTIVE)
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig(feedback_history_size=5))
+
+            for i in range(20):
+                actual = 'analysis' if i % 4 == 0 else 'communications'
+                director.add_classification_feedback(i, 'communications', 0.8, actual)
+
+            analytics = director.get_classification_analytics()
+            assert len(director.feedback_history) == 5
+            assert analytics['total_feedback'] == 20
+            assert analytics['accuracy'] == 0.75
+            assert analytics['method_performance']['keyword']['total_samples'] == 20
+            assert analytics['common_misclassifications'] == [('communications -> analysis', 5)]
+            assert analytics['confusion_matrix']['communications'] == {'analysis': 5, 'communications': 15}
+            director.shutdown()
+
+    def test_routing_decisions_are_bounded(self, app):
+        """Test that routing decision history is capped while totals keep counting"""
+        from swarm_director.agents.director import DirectorConfig
+        with app.app_context():
+            db_agent = Agent(name='RoutingDirector', agent_type=AgentType.SUPERVISOR,
+                             status=AgentStatus.ACTIVE)
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig(routing_history_size=3))
+            task = Task(title='Analyze data', description='Review metrics', status=TaskStatus.PENDING)
+            task.save()
+
+            for _ in range(12):
+                director.make_routing_decision(task, 'analysis', 0.9)
+
+            analytics = director.get_routing_analytics()
+            assert len(director.routing_decisions) == 3
+            assert analytics['routing_decisions'] == 12
+            assert len(analytics['recent_decisions']) == 3
+            director.shutdown()
+
+
+class TestClassificationLRUCache:
+    """Test suite for the bounded classification cache"""
+    
+    def _entry(self, intent='analysis'):
+        from datetime import datetime
+        from swarm_director.agents.director import ClassificationCache
+        return ClassificationCache(text_hash='k', intent=intent, confidence=0.9,
+                                   method='keyword', timestamp=datetime.utcnow())
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full"""
+        from swarm_director.agents.director import ClassificationLRUCache
+        cache = ClassificationLRUCache(max_entries=2, ttl_seconds=60)
+        cache.put('a', self._entry())
+        cache.put('b', self._entry())
+        assert cache.get('a') is not None  # 'b' is now least recently used
+        cache.put('c', self._entry())
+        
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['cache_entries'] == 2
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses and removed"""
+        from swarm_director.agents.director import ClassificationLRUCache
+        cache = ClassificationLRUCache(max_entries=10, ttl_seconds=0)
+        cache.put('a', self._entry())
+        
+        assert cache.get('a') is None
+        stats = cache.get_stats()
+        assert stats['expirations'] == 1
+        assert stats['total_misses'] == 1
+        assert len(cache) == 0
+    
+    def test_cleanup_expired(self):
+        """Test explicit cleanup by maximum age"""
+        from swarm_director.agents.director import ClassificationLRUCache
+        cache = ClassificationLRUCache(max_entries=10, ttl_seconds=60)
+        cache.put('a', self._entry())
+        cache.put('b', self._entry())
+        
+        assert cache.cleanup_expired(max_age_seconds=60) == 0
+        assert cache.cleanup_expired(max_age_seconds=0) == 2
+        assert len(cache) == 0
 
 
 class TestTaskEndpoint:
@@ -258,5 +425,155 @@ class TestTaskEndpoint:
             assert routed_to == expected_dept
 
 
+class TestDirectorRegistry:
+    """Test suite for the shared DirectorAgent registry"""
+    
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+    
+    @pytest.fixture
+    def registry(self, app):
+        """Get the registry attached to the app"""
+        from swarm_director.agents.director_registry import get_director_registry
+        registry = get_director_registry(app)
+        yield registry
+        registry.shutdown()
+    
+    def test_director_reused_across_calls(self, app, registry):
+        """Test that the director is built once and then reused"""
+        with app.app_context():
+            first = registry.get_director()
+            second = registry.get_director()
+            
+            assert first is second
+            assert 'communications' in first.department_agents
+            stats = registry.get_stats()
+            assert stats['builds'] == 1
+            assert stats['hits'] >= 1
+    
+    def test_director_reused_across_requests(self, app, registry):
+        """Test that /task requests share one director"""
+        client = app.test_client()
+        payload = {'type': 'analysis', 'title': 'Analyze data', 'description': 'Review metrics'}
+        
+        for _ in range(3):
+            response = client.post('/task', data=json.dumps(payload), content_type='application/json')
+            assert response.status_code == 201
+        
+        assert registry.get_stats()['builds'] == 1
+        assert registry.get_stats()['rebuilds'] == 0
+    
+    def test_director_rebuilt_when_agent_rows_change(self, app, registry):
+        """Test that agent table changes hot-swap the director"""
+        with app.app_context():
+            first = registry.get_director()
+            
+            Agent(name='NewDepartment', agent_type=AgentType.WORKER).save()
+            
+            second = registry.get_director()
+            assert second is not first
+            assert registry.get_stats()['rebuilds'] == 1
+            assert registry.get_director() is second
+    
+    def test_status_updates_from_requests_do_not_rebuild(self, app, registry):
+        """Test that shared agents save status in each request's own session without a rebuild"""
+        import threading
+        from swarm_director.models.agent import AgentStatus
+        with app.app_context():
+            bystander = Agent(name='Bystander', agent_type=AgentType.WORKER)
+            bystander.save()
+            director = registry.get_director()
+            # Only the director's own rows are detached from the building session
+            assert bystander in db.session
+            department = director.department_agents['communications']
+        
+        errors = []
+        # Writes take turns (the in-memory test database shares one connection)
+        # while every request keeps its session open until all have saved
+        write_lock = threading.Lock()
+        saved = threading.Barrier(4)
+        
+        def request_thread(status):
+            try:
+                with app.app_context():
+                    with write_lock:
+                        department.update_status(status)
+                    saved.wait(5)
+                    db.session.remove()
+            except Exception as e:
+                errors.append(e)
+        
+        for status in (AgentStatus.BUSY, AgentStatus.ACTIVE):
+            saved.reset()
+            threads = [threading.Thread(target=request_thread, args=(status,)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert errors == []
+        with app.app_context():
+            assert registry.get_director() is director
+            assert registry.get_stats()['rebuilds'] == 0
+            assert db.session.get(Agent, department.agent_id).status == AgentStatus.ACTIVE
+    
+    def test_update_config_swaps_director(self, app, registry):
+        """Test that update_config installs a director with the new configuration"""
+        from swarm_director.agents.director import DirectorConfig
+        with app.app_context():
+            first = registry.get_director()
+            
+            new_config = DirectorConfig(max_concurrent_tasks=42)
+            swapped = registry.update_config(new_config)
+            
+            assert swapped is not first
+            assert registry.get_director() is swapped
+            assert swapped.config.max_concurrent_tasks == 42
+    
+    def test_concurrent_access_builds_once(self, app, registry):
+        """Test that concurrent request threads share a single build"""
+        import threading
+        directors = []
+        
+        def fetch():
+            with app.app_context():
+                directors.append(registry.get_director())
+        
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(directors) == 8
+        assert all(d is directors[0] for d in directors)
+        assert registry.get_stats()['builds'] == 1
+    
+    def test_concurrent_hits_are_all_counted(self, app, registry):
+        """Test that hit counting from many request threads loses no updates"""
+        import threading
+        with app.app_context():
+            registry.get_director()
+        
+        def fetch():
+            with app.app_context():
+                for _ in range(500):
+                    registry.get_director()
+        
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert registry.get_stats()['hits'] == 8 * 500
+
+
 if __name__ == '__main__':
     pytest.main([__file__]) 
\ No newline at end of file
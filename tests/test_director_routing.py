@@ -0,0 +1,406 @@
+"""
+Tests for DirectorAgent parallel, scatter-gather and hedged routing
+"""
+
+import time
+import threading
+import pytest
+from swarm_director.app import create_app
+from swarm_director.models.base import db
+from swarm_director.models.task import Task, TaskStatus
+from swarm_director.models.agent import Agent, AgentType, AgentStatus
+from swarm_director.agents.director import DirectorAgent, DirectorConfig, RoutingStrategy
+
+
+class StubDepartmentAgent:
+    """Department agent that answers after a fixed delay (needs an app context to build)"""
+
+    def __init__(self, name, answer, delay=0.0, fail=False, fail_times=0):
+        self.name = name
+        self.answer = answer
+        self.delay = delay
+        self.fail = fail
+        self.fail_times = fail_times
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.db_agent = Agent(name=name, agent_type=AgentType.WORKER, status=AgentStatus.ACTIVE)
+        self.db_agent.save()
+
+    def is_available(self):
+        return True
+
+    def execute_task(self, task):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if self.fail or calls <= self.fail_times:
+            raise RuntimeError(f"{self.name} failed")
+        return {"status": "completed", "answer": self.answer, "timestamp": time.time()}
+
+
+def _seed_latency(director, department, seconds, count):
+    """Give a department an observed latency history"""
+    for _ in range(count):
+        director.agent_stats.record(department, seconds)
+
+
+class TestParallelExecution:
+    """Test suite for parallel and scatter-gather execution in enhanced_route_task"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    @pytest.fixture
+    def make_director(self, app):
+        """Build directors whose routing decisions use the registered stub agents"""
+        directors = []
+
+        def build(agents, **config):
+            db_agent = Agent(name=f'ParallelDirector{len(directors)}',
+                             agent_type=AgentType.SUPERVISOR, status=AgentStatus.ACTIVE)
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig(**config))
+            # Every registered stub also serves the other stubs' intents
+            for department, agent in agents.items():
+                director.register_department_agent(department, agent, intents=list(agents))
+            directors.append(director)
+            return director
+
+        with app.app_context():
+            yield build
+        for director in directors:
+            director.shutdown()
+
+    @pytest.fixture
+    def task(self, app):
+        """Create a persisted task"""
+        task = Task(title='Review the launch plan', description='Check the plan', status=TaskStatus.PENDING)
+        task.save()
+        return task
+
+    def test_quorum_returns_before_straggler(self, make_director, task):
+        """Test that quorum mode answers once enough agents agree and drops the straggler"""
+        agents = {
+            'a': StubDepartmentAgent('A', 'approve'),
+            'b': StubDepartmentAgent('B', 'approve', delay=0.05),
+            'c': StubDepartmentAgent('C', 'reject', delay=2.0),
+        }
+        director = make_director(agents, consensus_threshold=0.6, routing_confidence_threshold=0.9)
+
+        start = time.perf_counter()
+        result = director.enhanced_route_task(task, 'a', confidence=0.5)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.5
+        assert result['status'] == 'success'
+        assert result['routing_decision']['strategy'] == RoutingStrategy.PARALLEL_AGENTS.value
+        assert result['result']['answer'] == 'approve'
+        aggregation = result['aggregation']
+        assert aggregation['method'] == 'quorum'
+        assert aggregation['consensus_score'] == 1.0
+        assert aggregation['execution_summary']['abandoned_agents'] == ['c']
+        assert director.metrics.parallel_executions == 1
+        assert director.metrics.aggregated_results == 1
+
+    def test_first_n_wins(self, make_director, task):
+        """Test that first_n mode returns the fastest successful answer"""
+        agents = {
+            'a': StubDepartmentAgent('A', 'slow', delay=1.0),
+            'b': StubDepartmentAgent('B', 'fast'),
+        }
+        director = make_director(agents, parallel_completion_mode='first_n', parallel_first_n=1,
+                                 routing_confidence_threshold=0.9)
+
+        result = director.enhanced_route_task(task, 'a', confidence=0.5)
+
+        assert result['result']['answer'] == 'fast'
+        assert result['agent_name'] == 'B'
+
+    def test_scatter_gather_prefers_primary_department(self, make_director, task):
+        """Test that scatter-gather waits for all agents and keeps each department's answer"""
+        agents = {
+            'analysis': StubDepartmentAgent('Analysis', 'numbers', delay=0.1),
+            'communications': StubDepartmentAgent('Comms', 'summary'),
+        }
+        director = make_director(agents)
+        director._determine_routing_strategy = lambda task, intent, confidence: RoutingStrategy.SCATTER_GATHER
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['status'] == 'success'
+        assert result['routed_to'] == 'analysis'
+        assert result['result']['answer'] == 'numbers'
+        aggregation = result['aggregation']
+        assert aggregation['method'] == 'scatter_gather'
+        assert aggregation['conflicts_detected'] is True
+        assert set(aggregation['department_results']) == {'analysis', 'communications'}
+
+    def test_complex_task_scatters_to_complementary_departments(self, make_director, app):
+        """Test that a complex task reaches scatter-gather through the real strategy selection"""
+        agents = {
+            'analysis': StubDepartmentAgent('Analysis', 'numbers'),
+            'communications': StubDepartmentAgent('Comms', 'summary'),
+        }
+        director = make_director(agents)
+        task = Task(title='Analyze the integration', status=TaskStatus.PENDING,
+                    description='A comprehensive, detailed and complex multi-step review ' * 20)
+        task.save()
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['routing_decision']['strategy'] == RoutingStrategy.SCATTER_GATHER.value
+        assert set(result['aggregation']['department_results']) == {'analysis', 'communications'}
+
+    def test_failures_do_not_count_towards_quorum(self, make_director, task):
+        """Test that failed agents are reported and the surviving answer is used"""
+        agents = {
+            'a': StubDepartmentAgent('A', 'approve', fail=True),
+            'b': StubDepartmentAgent('B', 'approve', delay=0.05),
+        }
+        director = make_director(agents, routing_confidence_threshold=0.9)
+
+        result = director.enhanced_route_task(task, 'a', confidence=0.5)
+
+        assert result['status'] == 'success'
+        assert result['aggregation']['execution_summary']['failed'] == 1
+        assert result['result']['answer'] == 'approve'
+
+    def test_timeout_without_results_is_an_error(self, make_director, task):
+        """Test that a fan-out with no answers inside the timeout reports an error"""
+        agents = {
+            'a': StubDepartmentAgent('A', 'late', delay=1.0),
+            'b': StubDepartmentAgent('B', 'late', delay=1.0),
+        }
+        director = make_director(agents, parallel_timeout_seconds=0.1, routing_confidence_threshold=0.9)
+
+        result = director.enhanced_route_task(task, 'a', confidence=0.5)
+
+        assert result['status'] == 'error'
+        assert director.metrics.parallel_executions == 1
+        assert director.metrics.aggregated_results == 0
+
+
+class TestHedgedRequests:
+    """Test suite for hedging slow primary agents onto fallback agents"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    @pytest.fixture
+    def make_director(self, app):
+        """Build single-agent routing directors with an 'analysis' primary and 'coordination' fallback"""
+        directors = []
+
+        def build(primary, fallback, **config):
+            db_agent = Agent(name=f'HedgeDirector{len(directors)}',
+                             agent_type=AgentType.SUPERVISOR, status=AgentStatus.ACTIVE)
+            db_agent.save()
+            config.setdefault('enable_parallel_execution', False)
+            director = DirectorAgent(db_agent, DirectorConfig(**config))
+            director.register_department_agent('analysis', primary)
+            director.register_department_agent('coordination', fallback)
+            # Observed primary latency history: p95 of 10ms
+            _seed_latency(director, 'analysis', 0.01, 20)
+            directors.append(director)
+            return director
+
+        with app.app_context():
+            yield build
+        for director in directors:
+            director.shutdown()
+
+    @pytest.fixture
+    def task(self, app):
+        """Create a persisted task"""
+        task = Task(title='Analyze churn', description='Quarterly numbers', status=TaskStatus.PENDING)
+        task.save()
+        return task
+
+    def test_slow_primary_is_hedged(self, make_director, task):
+        """Test that the fallback answers when the primary exceeds its p95 latency"""
+        director = make_director(StubDepartmentAgent('Analysis', 'slow', delay=0.5),
+                                 StubDepartmentAgent('Coordination', 'fast'),
+                                 hedge_budget_ratio=1.0)
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['status'] == 'success'
+        assert result['routed_to'] == 'coordination'
+        assert result['hedge']['hedged'] is True
+        hedging = director.get_routing_analytics()['hedging']
+        assert hedging['hedged_requests'] == 1
+        assert hedging['hedge_wins'] == 1
+        assert hedging['hedge_rate'] == 1.0
+
+    def test_fast_primary_is_not_hedged(self, make_director, task):
+        """Test that a primary answering within its p95 latency is not hedged"""
+        fallback = StubDepartmentAgent('Coordination', 'fast')
+        director = make_director(StubDepartmentAgent('Analysis', 'primary'), fallback,
+                                 hedge_budget_ratio=1.0)
+        _seed_latency(director, 'analysis', 1.0, 20)
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['routed_to'] == 'analysis'
+        assert result['hedge']['hedged'] is False
+        assert fallback.calls == 0
+
+    def test_hedge_budget_limits_hedges(self, make_director, task):
+        """Test that hedges are limited to the configured fraction of primary requests"""
+        director = make_director(StubDepartmentAgent('Analysis', 'slow', delay=0.1),
+                                 StubDepartmentAgent('Coordination', 'fast'),
+                                 hedge_budget_ratio=0.5)
+        _seed_latency(director, 'analysis', 0.01, 100)
+
+        for _ in range(4):
+            director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        stats = director.get_routing_analytics()['hedging']['per_department']['analysis']
+        assert stats['eligible'] == 4
+        assert stats['hedged'] == 2
+        assert stats['budget_exhausted'] == 2
+
+    def test_hedge_delay_starts_when_primary_runs(self, make_director, task):
+        """Test that time a primary spends queued for a thread does not trigger a hedge"""
+        fallback = StubDepartmentAgent('Coordination', 'fast')
+        director = make_director(StubDepartmentAgent('Analysis', 'primary'), fallback,
+                                 hedge_budget_ratio=1.0, hedge_pool_size=1)
+        _seed_latency(director, 'analysis', 0.5, 20)
+        blocker = director.hedge_pool.submit(time.sleep, 1.0)
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        blocker.result()
+        assert result['routed_to'] == 'analysis'
+        assert result['hedge']['hedged'] is False
+        assert fallback.calls == 0
+
+    def test_hedged_primary_is_assigned_and_retried(self, make_director, task):
+        """Test that hedged executions go through task assignment and auto-retry"""
+        primary = StubDepartmentAgent('Analysis', 'primary', fail_times=1)
+        fallback = StubDepartmentAgent('Coordination', 'fast')
+        director = make_director(primary, fallback, hedge_budget_ratio=1.0)
+        _seed_latency(director, 'analysis', 1.0, 20)
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['routed_to'] == 'analysis'
+        assert result['hedge']['failed_over'] is False
+        assert primary.calls == 2 and fallback.calls == 0
+        db.session.expire_all()
+        assert db.session.get(Task, task.id).assigned_agent_id == primary.db_agent.id
+
+    def test_failed_primary_fails_over(self, make_director, task):
+        """Test that a failed primary is retried on the fallback without using hedge budget"""
+        director = make_director(StubDepartmentAgent('Analysis', 'broken', fail=True),
+                                 StubDepartmentAgent('Coordination', 'fast'),
+                                 hedge_budget_ratio=0.0)
+        _seed_latency(director, 'analysis', 1.0, 20)
+
+        result = director.enhanced_route_task(task, 'analysis', confidence=0.9)
+
+        assert result['status'] == 'success'
+        assert result['routed_to'] == 'coordination'
+        assert result['hedge']['failed_over'] is True
+        assert director.metrics.hedged_requests == 0
+
+
+class TestLatencyAwareRouting:
+    """Test suite for routing with live agent statistics"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    @pytest.fixture
+    def director(self, app):
+        """Create a director with two interchangeable analysis agents"""
+        with app.app_context():
+            db_agent = Agent(name='StatsDirector', agent_type=AgentType.SUPERVISOR,
+                             status=AgentStatus.ACTIVE)
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig())
+            director.register_department_agent('analysis', StubDepartmentAgent('analysis', 'ok'))
+            director.register_department_agent('analysis_backup', StubDepartmentAgent('analysis_backup', 'ok'),
+                                               intents=['analysis'])
+            yield director
+            director.shutdown()
+
+    @pytest.fixture
+    def task(self, app):
+        """Create a persisted task"""
+        task = Task(title='Summarize notes', description='Short task', status=TaskStatus.PENDING)
+        task.save()
+        return task
+
+    def test_candidates_include_departments_serving_the_intent(self, director, task):
+        """Test that departments registered for, or capable of, an intent become routing candidates"""
+        assert director._get_available_agents_for_intent('analysis') == ['analysis', 'analysis_backup']
+        assert director._get_available_agents_for_intent('analysis_backup') == ['analysis_backup']
+
+        capable = StubDepartmentAgent('automation', 'ok')
+        capable.capabilities = ['automation', 'analysis']
+        director.register_department_agent('automation', capable)
+        assert director._get_available_agents_for_intent('analysis') == \
+            ['analysis', 'analysis_backup', 'automation']
+
+        director.unregister_department_agent('analysis_backup')
+        decision = director.make_routing_decision(task, 'analysis', 0.9)
+        assert decision.strategy == RoutingStrategy.LOAD_BALANCED
+        assert decision.selected_agents[0] in ('analysis', 'automation')
+
+    def test_load_balanced_avoids_busy_agent(self, director, task):
+        """Test that load balancing steers away from an agent with outstanding work"""
+        _seed_latency(director, 'analysis', 1.0, 5)
+        _seed_latency(director, 'analysis_backup', 1.0, 5)
+        director.agent_stats.begin('analysis')
+        director.agent_stats.begin('analysis')
+
+        selected = director._select_agents_for_strategy(RoutingStrategy.LOAD_BALANCED, 'analysis', task)
+
+        assert selected == ['analysis_backup']
+        assert director.agent_workload['analysis'] == 2
+
+    def test_expected_execution_time_uses_observed_latency(self, director, task):
+        """Test that routing estimates come from observed latencies once available"""
+        heuristic = director._estimate_execution_time(RoutingStrategy.SINGLE_AGENT, ['analysis'], task)
+        assert heuristic >= 30.0
+
+        _seed_latency(director, 'analysis', 0.2, 10)
+        _seed_latency(director, 'analysis_backup', 0.8, 10)
+
+        assert director._estimate_execution_time(
+            RoutingStrategy.SINGLE_AGENT, ['analysis'], task) == pytest.approx(0.2)
+        assert director._estimate_execution_time(
+            RoutingStrategy.SCATTER_GATHER, ['analysis', 'analysis_backup'], task) == pytest.approx(0.8)
+
+    def test_parallel_execution_updates_agent_stats(self, director, task):
+        """Test that executions feed in-flight counts, latencies and performance scores"""
+        decision = director.make_routing_decision(task, 'analysis', 0.9)
+        decision.strategy = RoutingStrategy.SCATTER_GATHER
+        decision.selected_agents = ['analysis', 'analysis_backup']
+
+        director._execute_parallel(task, 'analysis', decision)
+
+        snapshot = director.get_routing_analytics()['agent_stats']
+        assert snapshot['analysis']['completed'] == 1
+        assert snapshot['analysis']['in_flight'] == 0
+        assert director.metrics.agent_performance_scores['analysis_backup'] == 1.0
@@ -0,0 +1,220 @@
+"""
+Tests for the durable SQLite work queue
+"""
+
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from swarm_director.utils.durable_queue import SQLiteDurableQueue, HAS_FCNTL
+from swarm_director.utils.request_queue import (
+    RequestQueueManager, RequestQueueConfig, RequestType, RequestStatus, QueuePriority
+)
+
+
+class TestSQLiteDurableQueue:
+    """Test suite for SQLiteDurableQueue"""
+
+    @pytest.fixture
+    def durable(self, tmp_path):
+        """Create a queue in a temporary directory"""
+        durable = SQLiteDurableQueue(str(tmp_path / "queue" / "work.db"), visibility_timeout_seconds=60)
+        yield durable
+        durable.close()
+
+    def test_dequeue_by_priority_then_age(self, durable):
+        """Test that leased items come out best priority first, FIFO within a priority"""
+        durable.enqueue({'n': 1}, priority=3)
+        durable.enqueue({'n': 2}, priority=1)
+        durable.enqueue_many([{'n': 3}, {'n': 4}], priority=3)
+
+        items = durable.dequeue(max_items=10)
+        assert [item.payload['n'] for item in items] == [2, 1, 3, 4]
+        assert durable.dequeue() == []
+
+        assert durable.ack_many(items).result(5) == 4
+        assert durable.qsize() == 0
+
+    def test_expired_lease_is_redelivered(self, durable):
+        """Test that an item not acked within its visibility timeout is delivered again"""
+        durable.enqueue({'job': 'report'})
+        first = durable.dequeue(visibility_timeout=0.05)[0]
+        assert durable.dequeue() == []
+
+        time.sleep(0.1)
+        second = durable.dequeue()[0]
+        assert second.item_id == first.item_id
+        assert second.attempts == 2
+
+        # The stale lease can no longer ack the item
+        assert durable.ack(first.item_id, first.lease_token).result(5) is False
+        assert durable.ack(second.item_id, second.lease_token).result(5) is True
+        assert durable.get_stats()['redelivered'] == 1
+
+    def test_nack_and_extend_lease(self, durable):
+        """Test giving an item back and keeping a long-running item leased"""
+        durable.enqueue({'job': 'retry'})
+        item = durable.dequeue(visibility_timeout=0.05)[0]
+        assert durable.extend_lease(item.item_id, item.lease_token, 60)
+        time.sleep(0.1)
+        assert durable.dequeue() == []
+        assert durable.get_stats()['in_flight'] == 1
+
+        assert durable.nack(item.item_id, item.lease_token)
+        assert durable.dequeue()[0].item_id == item.item_id
+
+    def test_items_survive_reopen_and_dead_owner(self, durable):
+        """Test that leases held by an exited process are released by recover()"""
+        durable.enqueue({'job': 'in-flight'})
+        item = durable.dequeue()[0]
+        durable.close()
+
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        reopened = SQLiteDurableQueue(durable.path)
+        reopened._connect().execute("UPDATE queue_items SET lease_owner = ?", (exited.pid,))
+        try:
+            assert reopened.dequeue() == []
+            assert reopened.recover() == 1
+            redelivered = reopened.dequeue()[0]
+            assert redelivered.item_id == item.item_id
+            assert redelivered.payload == {'job': 'in-flight'}
+        finally:
+            reopened.close()
+
+    @pytest.mark.skipif(not HAS_FCNTL, reason="owner lock needs fcntl")
+    def test_exclusive_owner_lock(self, tmp_path):
+        """Test that a second exclusive opener is refused, or waits for the owner to close"""
+        path = str(tmp_path / "owned.db")
+        owner = SQLiteDurableQueue(path, exclusive=True)
+        with pytest.raises(RuntimeError, match='in use'):
+            SQLiteDurableQueue(path, exclusive=True)
+
+        threading.Timer(0.2, owner.close).start()
+        successor = SQLiteDurableQueue(path, exclusive=True, lock_timeout_seconds=5)
+        successor.close()
+
+    def test_concurrent_producers_share_commits(self, durable):
+        """Test that writes from many threads are grouped into fewer transactions"""
+        def produce():
+            futures = [durable.put({'n': i}) for i in range(200)]
+            for future in futures:
+                future.result(5)
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = durable.get_stats()
+        assert stats['queued'] == 800
+        assert stats['commits'] < 800
+
+
+class TestDurableRequestQueue:
+    """Test suite for RequestQueueManager redelivery from the durable queue"""
+
+    def make_manager(self, path, **overrides):
+        """Create a durable manager without background metrics or blackboard"""
+        config = RequestQueueConfig(max_concurrent_requests=1, enable_metrics=False, enable_blackboard=False,
+                                    process_groups_enabled=False, durable_queue_path=path, **overrides)
+        manager = RequestQueueManager(config)
+        manager.handler_factory = lambda replay: (lambda: {'echo': replay['value']})
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_unfinished_requests_redelivered_after_restart(self, tmp_path):
+        """Test that requests queued before a stop run when a new manager starts"""
+        path = str(tmp_path / "requests.db")
+        release = threading.Event()
+        first = self.make_manager(path)
+        await first.start()
+
+        blocked_id = await first.queue_request(RequestType.API_CALL, {}, client_id='tests',
+                                               handler=release.wait, replay={'value': 'blocked'})
+        queued_id = await first.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.HIGH,
+                                              client_id='tests', handler=release.wait,
+                                              replay={'value': 'queued'})
+        await first.stop(timeout=0.5)
+        release.set()
+        assert first.durable_queue.qsize() == 2
+        first.durable_queue.close()
+
+        second = self.make_manager(path)
+        await second.start()
+        try:
+            assert await second.get_request_result(queued_id, timeout=5) == {'echo': 'queued'}
+            assert await second.get_request_result(blocked_id, timeout=5) == {'echo': 'blocked'}
+            assert second.get_request(queued_id).status == RequestStatus.COMPLETED
+            assert second.durable_queue.flush()
+            assert second.durable_queue.qsize() == 0
+        finally:
+            await second.stop()
+            second.durable_queue.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not HAS_FCNTL, reason="owner lock needs fcntl")
+    async def test_second_manager_cannot_recover_live_work(self, tmp_path):
+        """Test that a manager opening a file another live manager owns is refused"""
+        path = str(tmp_path / "requests.db")
+        release = threading.Event()
+        first = self.make_manager(path)
+        await first.start()
+        try:
+            request_id = await first.queue_request(RequestType.API_CALL, {}, client_id='tests',
+                                                   handler=release.wait, replay={'value': 'held'})
+            with pytest.raises(RuntimeError, match='in use'):
+                self.make_manager(path)
+
+            release.set()
+            await first.get_request_result(request_id, timeout=5)
+            assert first.durable_queue.flush()
+            assert first.durable_queue.qsize() == 0
+        finally:
+            release.set()
+            await first.stop()
+            first.durable_queue.close()
+
+        successor = self.make_manager(path)
+        successor.durable_queue.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('overrides, expected_status', [
+        ({}, RequestStatus.COMPLETED),
+        ({'durable_recovery_deadline': 'original'}, RequestStatus.EXPIRED),
+        ({'durable_recovery_deadline': 'original', 'durable_recovery_grace_seconds': 30}, RequestStatus.COMPLETED),
+    ])
+    async def test_recovery_deadline_policy(self, tmp_path, overrides, expected_status):
+        """Test that an outage longer than the timeout only expires recovered work under 'original'"""
+        path = str(tmp_path / "requests.db")
+        release = threading.Event()
+        first = self.make_manager(path)
+        await first.start()
+        await first.queue_request(RequestType.API_CALL, {}, client_id='tests', handler=release.wait,
+                                  replay={'value': 'blocked'})
+        request_id = await first.queue_request(RequestType.API_CALL, {}, client_id='tests', timeout=0.2,
+                                               handler=release.wait, replay={'value': 'short'})
+        await first.stop(timeout=0.5)
+        release.set()
+        first.durable_queue.close()
+        time.sleep(0.3)  # The outage outlasts the request's timeout
+
+        second = self.make_manager(path, **overrides)
+        await second.start()
+        try:
+            if expected_status == RequestStatus.COMPLETED:
+                assert await second.get_request_result(request_id, timeout=5) == {'echo': 'short'}
+            else:
+                with pytest.raises(TimeoutError):
+                    await second.get_request_result(request_id, timeout=5)
+            assert second.get_request(request_id).status == expected_status
+        finally:
+            await second.stop()
+            second.durable_queue.close()
+
+    def test_unknown_recovery_deadline_rejected(self, tmp_path):
+        """Test that the recovery deadline policy is validated"""
+        with pytest.raises(ValueError):
+            self.make_manager(str(tmp_path / "requests.db"), durable_recovery_deadline='forever')
@@ -0,0 +1,237 @@
+"""
+Tests for batched LLM intent classification
+"""
+
+import queue
+import re
+import threading
+import time
+import pytest
+from swarm_director.app import create_app
+from swarm_director.models.base import db
+from swarm_director.models.task import Task, TaskStatus
+from swarm_director.models.agent import Agent, AgentType, AgentStatus
+from swarm_director.agents.director import DirectorAgent, DirectorConfig
+from swarm_director.agents.llm_classifier import (
+    ClassificationBatcher, LLMClassificationProvider, parse_batch_response, get_llm_provider
+)
+
+
+class FakeProvider(LLMClassificationProvider):
+    """Local provider that answers like an LLM, keyed on words in each request"""
+
+    name = "fake"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, max_tokens=50):
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.fail:
+            return None
+
+        if 'Requests:' in prompt:
+            requests = re.findall(r'^(\d+)\. (.+)$', prompt.split('Requests:')[1], re.MULTILINE)
+            return "\n".join(f"{number}. {self._answer(text)}" for number, text in requests)
+        return self._answer(prompt.rsplit('Request: ', 1)[1])
+
+    @staticmethod
+    def _answer(text):
+        if 'email' in text:
+            return "COMMUNICATIONS|0.9"
+        if 'analyze' in text:
+            return "ANALYSIS|0.8"
+        return "COORDINATION|0.6"
+
+
+def _parse_line(line):
+    department, confidence = line.split('|')
+    return department.strip().lower(), float(confidence)
+
+
+def _build_prompt(texts):
+    if len(texts) == 1:
+        return "Request: " + texts[0]
+    return "Requests:\n" + "".join(f"{i}. {t}\n" for i, t in enumerate(texts, 1))
+
+
+class TestBatchParsing:
+    """Test suite for multi-item response parsing"""
+
+    def test_parse_numbered_lines(self):
+        """Test that numbered answers are mapped back to their requests"""
+        response = "2. ANALYSIS|0.8\n1) COMMUNICATIONS|0.9\nnoise line"
+        results = parse_batch_response(response, 3, _parse_line)
+
+        assert results == [('communications', 0.9), ('analysis', 0.8), None]
+
+    def test_parse_single_unnumbered_answer(self):
+        """Test that a lone request may be answered without numbering"""
+        assert parse_batch_response("AUTOMATION|0.7", 1, _parse_line) == [('automation', 0.7)]
+
+
+class TestClassificationBatcher:
+    """Test suite for the classification batcher"""
+
+    def test_concurrent_requests_share_one_provider_call(self):
+        """Test that requests inside the window are sent as one prompt"""
+        provider = FakeProvider()
+        batcher = ClassificationBatcher([provider], _build_prompt, _parse_line,
+                                        batch_window_ms=200, max_batch_size=16)
+        texts = ['send email to team', 'analyze sales', 'plan offsite'] * 3
+        results = [None] * len(texts)
+
+        def classify(index):
+            results[index] = batcher.classify(texts[index], timeout=5)
+
+        threads = [threading.Thread(target=classify, args=(i,)) for i in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        assert len(provider.prompts) == 1
+        assert batcher.stats['batches'] == 1
+        assert batcher.stats['max_batch_size_seen'] == len(texts)
+        assert results == [('communications', 0.9), ('analysis', 0.8), ('coordination', 0.6)] * 3
+
+    def test_max_batch_size_splits_batches(self):
+        """Test that batches never exceed the configured size"""
+        provider = FakeProvider()
+        batcher = ClassificationBatcher([provider], _build_prompt, _parse_line,
+                                        batch_window_ms=200, max_batch_size=2)
+        futures = [batcher.submit('send email') for _ in range(5)]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+
+        assert all(result == ('communications', 0.9) for result in results)
+        assert batcher.stats['max_batch_size_seen'] == 2
+        assert batcher.stats['batches'] == 3
+
+    def test_falls_back_to_next_provider(self):
+        """Test that a failing provider is skipped for the next one"""
+        broken, working = FakeProvider(fail=True), FakeProvider()
+        batcher = ClassificationBatcher([broken, working], _build_prompt, _parse_line,
+                                        batch_window_ms=1)
+
+        assert batcher.classify('analyze churn', timeout=5) == ('analysis', 0.8)
+        batcher.close()
+        assert len(broken.prompts) == 1
+        assert len(working.prompts) == 1
+
+    def test_unanswered_requests_resolve_to_none(self):
+        """Test that callers are released when no provider answers"""
+        batcher = ClassificationBatcher([FakeProvider(fail=True)], _build_prompt, _parse_line,
+                                        batch_window_ms=1)
+
+        assert batcher.classify('analyze churn', timeout=5) is None
+        batcher.close()
+        assert batcher.stats['failed_items'] == 1
+
+    def test_submit_racing_close_is_still_dispatched(self):
+        """Test that a submit already past the closed check is not stranded behind close()"""
+        batcher = ClassificationBatcher([FakeProvider()], _build_prompt, _parse_line, batch_window_ms=1)
+        enqueuing = threading.Event()
+
+        class StallingQueue(queue.Queue):
+            def put(self, item, *args, **kwargs):
+                if item is not None:
+                    # The submitter is preempted between its closed check and the put
+                    enqueuing.set()
+                    time.sleep(0.1)
+                super().put(item, *args, **kwargs)
+
+        batcher._queue = StallingQueue()
+        submitted = []
+        submitter = threading.Thread(target=lambda: submitted.append(batcher.submit('analyze churn')))
+        submitter.start()
+        assert enqueuing.wait(5)
+        batcher.close()
+        submitter.join()
+
+        assert submitted[0].result(timeout=2) == ('analysis', 0.8)
+
+    def test_provider_clients_are_pooled(self):
+        """Test that providers are reused for the same API key"""
+        provider = get_llm_provider('openai', 'test-key')
+        if provider is None:
+            pytest.skip("openai SDK not installed")
+
+        assert get_llm_provider('openai', 'test-key') is provider
+        assert get_llm_provider('openai', 'other-key') is not provider
+
+
+class TestDirectorLLMClassification:
+    """Test suite for DirectorAgent LLM classification through the batcher"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    @pytest.fixture
+    def director(self, app):
+        """Create a DirectorAgent using a fake LLM provider"""
+        with app.app_context():
+            db_agent = Agent(
+                name='TestDirectorAgent',
+                agent_type=AgentType.SUPERVISOR,
+                status=AgentStatus.ACTIVE
+            )
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig(enable_llm_classification=True,
+                                                              llm_batch_window_ms=5))
+            yield director
+            director.shutdown()
+
+    def test_llm_classification_uses_provider_and_cache(self, app, director):
+        """Test that results come from the provider once and then from the cache"""
+        provider = FakeProvider()
+        director.set_llm_providers([provider])
+
+        with app.app_context():
+            task = Task(title='Analyze churn', description='quarterly numbers', status=TaskStatus.PENDING)
+            task.save()
+
+            assert director.classify_intent_with_confidence(task) == ('analysis', 0.8)
+            assert director.classify_intent_with_confidence(task) == ('analysis', 0.8)
+
+        assert len(provider.prompts) == 1
+        assert director._get_cache_performance()['total_hits'] == 1
+
+    def test_llm_failure_falls_back_to_keywords(self, app, director):
+        """Test keyword fallback when the provider does not answer"""
+        director.set_llm_providers([FakeProvider(fail=True)])
+
+        with app.app_context():
+            assert director._classify_intent_llm('send email to the team') == \
+                director._classify_intent_keyword('send email to the team')
+
+    def test_no_providers_falls_back_to_keywords(self, app, director):
+        """Test keyword fallback when no API keys are configured"""
+        with app.app_context():
+            intent, _ = director._classify_intent_llm('send email to the team')
+            assert intent == 'communications'
+
+    def test_classify_many_submits_one_batch(self, app, director):
+        """Test that a bulk classification shares one provider call instead of one per text"""
+        provider = FakeProvider()
+        director.set_llm_providers([provider])
+        texts = ['send email to sales', 'analyze churn', 'plan the offsite',
+                 'analyze churn', 'send email to support']
+
+        with app.app_context():
+            results = director.classify_many(texts)
+
+        assert results == [('communications', 0.9), ('analysis', 0.8), ('coordination', 0.6),
+                           ('analysis', 0.8), ('communications', 0.9)]
+        assert len(provider.prompts) == 1
+        assert director._llm_batcher.stats['requests'] == 4
@@ -0,0 +1,190 @@
+"""
+Tests for asynchronous dispatch through QueueMiddleware
+"""
+
+import json
+import sqlite3
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import pytest
+from flask import Flask, jsonify, request
+from swarm_director.app import create_app
+from swarm_director.utils.request_queue import RequestQueueManager, RequestQueueConfig, RequestType
+from swarm_director.utils.queue_middleware import QueueMiddleware
+
+
+class TestQueueMiddleware:
+    """Test suite for QueueMiddleware"""
+
+    @pytest.fixture
+    def setup(self):
+        """Create a small app whose /work and /fail routes are queueable"""
+        app = Flask(__name__)
+        release = threading.Event()
+        release.set()
+
+        @app.route('/work', methods=['POST'])
+        def work():
+            release.wait(5)
+            return jsonify({'echo': request.get_json(), 'thread': threading.current_thread().name}), 201
+
+        @app.route('/fail', methods=['POST'])
+        def fail():
+            raise RuntimeError('view failed')
+
+        @app.route('/cheap')
+        def cheap():
+            return jsonify({'ok': True})
+
+        manager = RequestQueueManager(RequestQueueConfig(
+            max_concurrent_requests=2, enable_metrics=False, enable_blackboard=False,
+            process_groups_enabled=False
+        ))
+        middleware = QueueMiddleware(app, manager)
+        middleware.queue_route('work', RequestType.API_CALL)
+        middleware.queue_route('fail', RequestType.API_CALL)
+
+        yield app.test_client(), middleware, release
+        release.set()
+        manager.stop_background()
+
+    def test_inline_when_not_loaded(self, setup):
+        """Test that matched routes run inline below the load threshold"""
+        client, middleware, _ = setup
+        response = client.post('/work', json={'n': 1})
+
+        assert response.status_code == 201
+        assert not middleware.queue_manager._running
+        assert middleware._inline_requests == 0
+
+    def test_prefer_async_returns_accepted_and_long_poll_result(self, setup):
+        """Test the 202 + status URL flow and replay of the final response"""
+        client, _, _ = setup
+        response = client.post('/work', json={'n': 2}, headers={'Prefer': 'respond-async'})
+
+        assert response.status_code == 202
+        status_url = response.get_json()['data']['status_url']
+        assert response.headers['Location'] == status_url
+        assert int(response.headers['Retry-After']) >= 1
+
+        result = client.get(f'{status_url}?wait=5')
+        assert result.status_code == 201
+        assert result.get_json()['echo'] == {'n': 2}
+        assert result.get_json()['thread'].startswith('RequestQueueHandler')
+        assert result.headers['X-Queued-Request-Id'] in status_url
+
+    def test_replay_rebuilds_handler(self, setup):
+        """Test that a stored replay description re-runs the original request"""
+        _, middleware, _ = setup
+        captured = {
+            'path': '/work', 'base_url': 'http://localhost/', 'method': 'POST', 'query_string': 'a=1',
+            'headers': [('Content-Type', 'application/json')], 'data': b'{"n": 3}',
+            'environ_overrides': {'REMOTE_ADDR': '127.0.0.1'}
+        }
+        replay = json.loads(json.dumps(middleware._replay_from_captured(captured)))
+
+        result = middleware.queue_manager.handler_factory(replay)()
+        assert result['status_code'] == 201
+        assert json.loads(result['body'])['echo'] == {'n': 3}
+
+    def test_queues_under_load(self, setup):
+        """Test that matched requests are queued once load reaches the threshold"""
+        client, middleware, _ = setup
+        middleware._inline_requests = 2
+
+        assert client.post('/work', json={}).status_code == 202
+        assert client.get('/cheap').status_code == 200
+
+    def test_pending_and_unknown_status(self, setup):
+        """Test status responses for unfinished and unknown requests"""
+        client, _, release = setup
+        release.clear()
+        accepted = client.post('/work', json={}, headers={'Prefer': 'respond-async'})
+        status_url = accepted.get_json()['data']['status_url']
+
+        pending = client.get(status_url)
+        assert pending.status_code == 202
+        assert pending.get_json()['data']['state'] in ('queued', 'processing')
+        assert 'Retry-After' in pending.headers
+
+        release.set()
+        assert client.get(f'{status_url}?wait=5').status_code == 201
+        assert client.get('/api/queue/requests/unknown').status_code == 404
+
+    def test_failed_request_reports_error(self, setup):
+        """Test that a view failure in the worker surfaces through the status endpoint"""
+        client, _, _ = setup
+        accepted = client.post('/fail', headers={'Prefer': 'respond-async'})
+        result = client.get(accepted.get_json()['data']['status_url'] + '?wait=5')
+
+        assert result.status_code == 500
+        assert result.get_json()['error']['code'] == 'QUEUED_REQUEST_FAILED'
+
+    @pytest.mark.parametrize('failure', [
+        FuturesTimeoutError(), RuntimeError('Event loop is closed'), ValueError('Queue is full')
+    ])
+    def test_queue_failures_shed_with_503(self, setup, monkeypatch, failure):
+        """Test that a queue that cannot take the request answers 503 with Retry-After"""
+        client, middleware, _ = setup
+        def fail(*args, **kwargs):
+            raise failure
+        monkeypatch.setattr(middleware.queue_manager, 'queue_request_threadsafe', fail)
+
+        response = client.post('/work', json={}, headers={'Prefer': 'respond-async'})
+        assert response.status_code == 503
+        assert int(response.headers['Retry-After']) >= 1
+
+    def test_failed_background_start_sheds_with_503(self, setup, monkeypatch):
+        """Test that a queue loop that cannot start answers 503 rather than an unhandled error"""
+        client, middleware, _ = setup
+        def fail():
+            raise RuntimeError('cannot start queue loop')
+        monkeypatch.setattr(middleware.queue_manager, 'start_background', fail)
+
+        response = client.post('/work', json={}, headers={'Prefer': 'respond-async'})
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
+
+    def test_durable_queue_omits_credential_headers(self, tmp_path):
+        """Test that credentials reach the view but are not written to the durable queue file"""
+        app = Flask(__name__)
+        release = threading.Event()
+
+        @app.route('/work', methods=['POST'])
+        def work():
+            release.wait(5)
+            return jsonify({'auth': request.headers.get('Authorization')}), 201
+
+        path = str(tmp_path / 'queue.db')
+        manager = RequestQueueManager(RequestQueueConfig(
+            enable_metrics=False, enable_blackboard=False, process_groups_enabled=False,
+            durable_queue_path=path
+        ))
+        middleware = QueueMiddleware(app, manager)
+        middleware.queue_route('work', RequestType.API_CALL)
+        client = app.test_client()
+        try:
+            accepted = client.post('/work', json={}, headers={
+                'Prefer': 'respond-async', 'Authorization': 'Bearer secret-token',
+                'Cookie': 'session=secret-cookie', 'X-API-Key': 'secret-key', 'X-Trace': 'kept'
+            })
+            manager.durable_queue.flush()
+            with sqlite3.connect(path) as connection:
+                (payload,), = connection.execute("SELECT payload FROM queue_items").fetchall()
+            assert 'secret' not in payload
+            assert ['X-Trace', 'kept'] in json.loads(payload)['replay']['headers']
+
+            release.set()
+            result = client.get(accepted.get_json()['data']['status_url'] + '?wait=5')
+            assert result.get_json()['auth'] == 'Bearer secret-token'
+        finally:
+            release.set()
+            manager.stop_background()
+
+    def test_app_registers_task_route(self):
+        """Test that the application queues POST /task through the middleware"""
+        app = create_app('testing')
+        middleware = app.extensions['queue_middleware']
+
+        assert 'submit_task' in middleware.routes
+        assert 'queued_request_status' in app.view_functions
@@ -0,0 +1,102 @@
+"""
+Tests for the GCRA rate limiter
+"""
+
+import threading
+import pytest
+from flask import Flask, jsonify
+from swarm_director.utils import rate_limiter as rate_limiter_module
+from swarm_director.utils.rate_limiter import RateLimiter, rate_limit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manually advanced monotonic clock for the limiter"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter"""
+
+    def test_burst_then_one_per_interval(self, clock):
+        """Test that a full burst is allowed and then requests are spaced window/limit apart"""
+        limiter = RateLimiter()
+        results = [limiter.is_allowed('ip:a', 5, 10) for _ in range(6)]
+
+        assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+        assert [info['remaining'] for _, info in results] == [4, 3, 2, 1, 0, 0]
+        assert results[-1][1]['retry_after'] == 2
+
+        clock[0] += 1.9
+        assert not limiter.is_allowed('ip:a', 5, 10)[0]
+        clock[0] += 0.1
+        assert limiter.is_allowed('ip:a', 5, 10)[0]
+        assert not limiter.is_allowed('ip:a', 5, 10)[0]
+
+        # Idle for a whole window restores the full burst
+        clock[0] += 10
+        assert limiter.is_allowed('ip:a', 5, 10)[1]['remaining'] == 4
+        assert limiter.is_allowed('ip:b', 5, 10)[1]['remaining'] == 4
+
+    def test_key_table_is_lru_bounded(self, clock):
+        """Test that each shard keeps only its most recently used keys"""
+        limiter = RateLimiter(max_keys=8, num_shards=2)
+        for i in range(100):
+            limiter.is_allowed('ip:hot', 1, 60)
+            limiter.is_allowed(f'ip:{i}', 1, 60)
+
+        stats = limiter.get_stats()
+        assert stats['keys'] <= 8
+        assert stats['evicted'] == 101 - stats['keys']
+        # The hot key was never evicted, so it is still limited
+        assert stats['allowed'] == 101
+        assert not limiter.is_allowed('ip:hot', 1, 60)[0]
+
+    def test_rejects_invalid_limits(self):
+        """Test that non-positive limits are refused"""
+        with pytest.raises(ValueError):
+            RateLimiter().is_allowed('ip:a', 0, 60)
+
+    def test_concurrent_checks_are_counted(self):
+        """Test that no decisions are lost across threads and contention is reported"""
+        limiter = RateLimiter(num_shards=4)
+        barrier = threading.Barrier(8)
+
+        def worker(index):
+            barrier.wait()
+            for i in range(2000):
+                limiter.is_allowed(f'ip:{i % 50}', 100, 3600)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = limiter.get_stats()
+        assert stats['acquisitions'] == 16000
+        assert stats['allowed'] == 50 * 100
+        assert stats['denied'] == 16000 - 5000
+        assert 0 <= stats['contention_ratio'] <= 1
+        assert stats['contended'] == 0 or stats['lock_wait_seconds'] > 0
+
+    def test_decorator_returns_429_with_retry_after(self, monkeypatch):
+        """Test that the Flask decorator reports limits from the GCRA state"""
+        monkeypatch.setattr(rate_limiter_module, 'rate_limiter', RateLimiter())
+        app = Flask(__name__)
+
+        @app.route('/limited')
+        @rate_limit('tests', custom_limit=(2, 60))
+        def limited():
+            return jsonify(ok=True)
+
+        client = app.test_client()
+        assert client.get('/limited').status_code == 200
+        response = client.get('/limited')
+        assert response.headers['X-RateLimit-Remaining'] == '0'
+
+        response = client.get('/limited')
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '30'
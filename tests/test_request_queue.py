@@ -0,0 +1,693 @@
+"""
+Tests for the request queue result delivery
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import pytest
+from swarm_director.utils.metrics import metrics_collector
+from swarm_director.utils.request_queue import (
+    RequestQueueManager, RequestQueueConfig, RequestType, RequestStatus,
+    PriorityScheduler, QueuedRequest, QueuePriority, RequestCoordinator, BlackboardSystem
+)
+
+
+def make_request(request_id, priority, enqueued_at=None, client_id='tests'):
+    """Build a bare queued request"""
+    return QueuedRequest(request_id=request_id, request_type=RequestType.API_CALL, priority=priority,
+                         flask_request_data={}, client_id=client_id, enqueued_at=enqueued_at)
+
+
+class TestPriorityScheduler:
+    """Test suite for PriorityScheduler"""
+
+    def test_orders_by_priority_then_arrival(self):
+        """Test that fresh requests come out by priority, FIFO within a level"""
+        scheduler = PriorityScheduler(aging_seconds=10.0)
+        now = time.monotonic()
+        scheduler.push(make_request('low', QueuePriority.LOW, now))
+        scheduler.push(make_request('normal-1', QueuePriority.NORMAL, now))
+        scheduler.push(make_request('critical', QueuePriority.CRITICAL, now))
+        scheduler.push(make_request('normal-2', QueuePriority.NORMAL, now + 0.001))
+
+        order = [scheduler.pop_nowait().request_id for _ in range(4)]
+        assert order == ['critical', 'normal-1', 'normal-2', 'low']
+        assert scheduler.pop_nowait() is None
+
+    def test_aging_prevents_starvation(self):
+        """Test that a LOW request that has waited long enough beats fresh CRITICAL work"""
+        scheduler = PriorityScheduler(aging_seconds=1.0)
+        now = time.monotonic()
+        scheduler.push(make_request('old-low', QueuePriority.LOW, now - 3.5))
+        scheduler.push(make_request('fresh-critical', QueuePriority.CRITICAL, now))
+
+        assert scheduler.pop_nowait().request_id == 'old-low'
+        assert scheduler.size_by_priority()['CRITICAL'] == 1
+
+    def test_capacity_and_wait_percentiles(self):
+        """Test the size limit and per-priority wait-time percentiles"""
+        scheduler = PriorityScheduler(max_size=2)
+        now = time.monotonic()
+        scheduler.push(make_request('a', QueuePriority.HIGH, now - 0.2))
+        scheduler.push(make_request('b', QueuePriority.HIGH, now - 0.1))
+        with pytest.raises(asyncio.QueueFull):
+            scheduler.push(make_request('c', QueuePriority.HIGH))
+
+        scheduler.pop_nowait()
+        scheduler.pop_nowait()
+        percentiles = scheduler.wait_time_percentiles()
+        assert percentiles['HIGH']['count'] == 2
+        assert percentiles['HIGH']['p50'] >= 0.1
+        assert percentiles['HIGH']['p99'] >= 0.2
+        assert percentiles['LOW'] == {'count': 0, 'p50': None, 'p95': None, 'p99': None}
+
+    @pytest.mark.asyncio
+    async def test_pop_wakes_on_push(self):
+        """Test that a blocked consumer wakes as soon as a request is pushed"""
+        scheduler = PriorityScheduler()
+        consumer = asyncio.create_task(scheduler.pop())
+        await asyncio.sleep(0.01)
+        assert not consumer.done()
+
+        scheduler.push(make_request('wake', QueuePriority.NORMAL))
+        request = await asyncio.wait_for(consumer, timeout=0.05)
+        assert request.request_id == 'wake'
+
+    @pytest.mark.asyncio
+    async def test_cancelled_consumer_passes_wakeup_on(self):
+        """Test that cancelling a woken consumer does not strand the request"""
+        scheduler = PriorityScheduler()
+        first = asyncio.create_task(scheduler.pop())
+        second = asyncio.create_task(scheduler.pop())
+        await asyncio.sleep(0.01)
+
+        scheduler.push(make_request('only', QueuePriority.NORMAL))
+        first.cancel()
+        request = await asyncio.wait_for(second, timeout=0.05)
+        assert request.request_id == 'only'
+
+
+class TestClientFairQueuing:
+    """Test suite for fair queuing across clients within a priority"""
+
+    def test_noisy_client_does_not_delay_others(self):
+        """Test that a quiet client's request is served among a noisy client's backlog"""
+        scheduler = PriorityScheduler()
+        now = time.monotonic()
+        for i in range(100):
+            scheduler.push(make_request(f'noisy-{i}', QueuePriority.NORMAL, now, client_id='noisy'))
+        scheduler.push(make_request('quiet-0', QueuePriority.NORMAL, now + 1, client_id='quiet'))
+        scheduler.push(make_request('quiet-1', QueuePriority.NORMAL, now + 1, client_id='quiet'))
+
+        order = [scheduler.pop_nowait().request_id for _ in range(4)]
+        assert order == ['noisy-0', 'quiet-0', 'noisy-1', 'quiet-1']
+
+    def test_weights_set_service_share(self):
+        """Test that a client with twice the weight is served twice as often"""
+        scheduler = PriorityScheduler(client_weights={'gold': 2.0, 'bronze': 0.5})
+        now = time.monotonic()
+        for client in ('gold', 'silver', 'bronze'):
+            for i in range(40):
+                scheduler.push(make_request(f'{client}-{i}', QueuePriority.NORMAL, now, client_id=client))
+
+        served = [scheduler.pop_nowait().client_id for _ in range(35)]
+        assert served.count('gold') == 20
+        assert served.count('silver') == 10
+        assert served.count('bronze') == 5
+
+    def test_non_positive_weights_rejected(self):
+        """Test that weights which could never earn a turn are refused up front"""
+        for weight in (0, -1.0, float('nan')):
+            with pytest.raises(ValueError, match='must be positive'):
+                PriorityScheduler(client_weights={'stuck': weight})
+        with pytest.raises(ValueError):
+            RequestQueueManager(RequestQueueConfig(client_weights={'stuck': 0}))
+
+    def test_repushed_request_served_out_of_arrival_order(self):
+        """Test that a shed-and-requeued request leaves no live arrival entry once served"""
+        scheduler = PriorityScheduler(client_weights={'heavy': 2.0})
+        now = time.monotonic()
+        scheduler.push(make_request('heavy-0', QueuePriority.NORMAL, now + 10, client_id='heavy'))
+        scheduler.push(make_request('heavy-1', QueuePriority.NORMAL, now + 11, client_id='heavy'))
+        scheduler.push(make_request('light-0', QueuePriority.NORMAL, now, client_id='light'))
+
+        # shed_lowest evicts the newest request of the deepest client and may queue it again
+        victim = scheduler.pop_lowest()
+        assert victim.request_id == 'heavy-1'
+        scheduler.push(victim)
+
+        # Deficit round robin serves both heavy requests ahead of the older light one
+        order = [scheduler.pop_nowait().request_id for _ in range(3)]
+        assert order == ['heavy-0', 'heavy-1', 'light-0']
+        assert scheduler.size_by_priority()['NORMAL'] == 0
+
+        scheduler.push(make_request('low-0', QueuePriority.LOW, now + 100))
+        assert scheduler.pop_nowait().request_id == 'low-0'
+        assert scheduler.pop_nowait() is None
+        assert len(scheduler) == 0
+
+    def test_tracked_clients_are_bounded(self):
+        """Test that clients beyond the limit share one overflow queue"""
+        scheduler = PriorityScheduler(max_clients=2)
+        for client in ('a', 'b', 'c', 'd'):
+            scheduler.push(make_request(f'{client}-0', QueuePriority.NORMAL, client_id=client))
+
+        stats = scheduler.client_stats()
+        assert set(stats) == {'a', 'b', '__overflow__'}
+        assert stats['__overflow__']['queued'] == 2
+
+        while scheduler.pop_nowait():
+            pass
+        assert len(scheduler.client_stats()) <= 2
+
+    def test_client_stats_in_manager_status(self):
+        """Test per-client depth and served-rate reporting"""
+        manager = RequestQueueManager(RequestQueueConfig())
+        for i in range(3):
+            manager._scheduler.push(make_request(f'a-{i}', QueuePriority.NORMAL, client_id='a'))
+        manager._scheduler.push(make_request('b-0', QueuePriority.HIGH, client_id='b'))
+        manager._scheduler.pop_nowait()
+
+        clients = manager.get_status()['clients']
+        assert clients['a']['queued'] == 3
+        assert clients['b'] == {'queued': 0, 'served': 1, 'served_per_second': pytest.approx(1 / 60, rel=0.1)}
+
+
+    def test_status_readers_race_the_queue_loop(self):
+        """Test that status reads from other threads see consistent scheduler state"""
+        manager = RequestQueueManager(RequestQueueConfig(enable_metrics=False, enable_blackboard=False))
+        assert all(scheduler._lock is manager._scheduler._lock for scheduler in manager._all_schedulers())
+
+        scheduler = manager._scheduler
+        stop = threading.Event()
+        errors = []
+
+        def read_status():
+            while not stop.is_set():
+                try:
+                    status = manager.get_status()
+                    assert sum(status['queue_size_by_priority'].values()) == status['queue_size']
+                    manager.get_load()
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=read_status) for _ in range(4)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Interleave the threads as often as possible
+        for reader in readers:
+            reader.start()
+        try:
+            for i in range(3000):
+                scheduler.push(make_request(f'r-{i}', QueuePriority(i % 4 + 1), client_id=f'client-{i % 500}'))
+                if i % 4:
+                    scheduler.pop_nowait()
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
+
+
+class TestDeadlineScheduling:
+    """Test suite for request deadlines and early expiry"""
+
+    def make_manager(self, **overrides):
+        """Create a single-worker manager without background metrics or blackboard"""
+        settings = dict(max_concurrent_requests=1, enable_metrics=False, enable_blackboard=False,
+                        process_groups_enabled=False)
+        return RequestQueueManager(RequestQueueConfig(**{**settings, **overrides}))
+
+    def test_earliest_deadline_first_within_client(self):
+        """Test that deadline_first serves a client's requests by deadline, not arrival"""
+        now = time.monotonic()
+        for deadline_first, expected in ((True, ['soon', 'later', 'latest']),
+                                         (False, ['latest', 'soon', 'later'])):
+            scheduler = PriorityScheduler(deadline_first=deadline_first)
+            for request_id, deadline in (('latest', 30), ('soon', 10), ('later', 20)):
+                request = make_request(request_id, QueuePriority.NORMAL, now)
+                request.deadline = now + deadline
+                scheduler.push(request)
+
+            assert [scheduler.pop_nowait().request_id for _ in range(3)] == expected
+
+        scheduler = PriorityScheduler(deadline_first=True)
+        for request_id, deadline in (('a', 5), ('b', 50), ('c', 1)):
+            request = make_request(request_id, QueuePriority.NORMAL, now)
+            request.deadline = now + deadline
+            scheduler.push(request)
+        assert scheduler.pop_lowest().request_id == 'b'
+
+    @pytest.mark.asyncio
+    async def test_request_past_deadline_is_not_executed(self):
+        """Test that a request whose deadline passed in the queue expires without running"""
+        manager = self.make_manager()
+        calls = []
+
+        def slow():
+            time.sleep(0.2)
+            calls.append('slow')
+            return 'slow'
+
+        await manager.start()
+        try:
+            slow_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', handler=slow)
+            late_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', timeout=0.05,
+                                                  handler=lambda: calls.append('late'))
+
+            assert await manager.get_request_result(slow_id, timeout=5) == 'slow'
+            with pytest.raises(TimeoutError):
+                await manager.get_request_result(late_id, timeout=5)
+
+            assert calls == ['slow']
+            assert manager.get_request(late_id).status == RequestStatus.EXPIRED
+            metrics = manager.get_status()['metrics']
+            assert metrics['requests_expired'] == 1
+            assert metrics['expired_work_saved_seconds'] == pytest.approx(0.2, abs=0.1)
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_failure_with_metrics_enabled(self):
+        """Test that expired and failed requests are recorded when metrics are on"""
+        manager = self.make_manager(enable_metrics=True)
+        before = dict(metrics_collector.error_counts)
+
+        def slow():
+            time.sleep(0.2)
+            return 'slow'
+
+        def broken():
+            raise KeyError('missing')
+
+        await manager.start()
+        try:
+            slow_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', handler=slow)
+            late_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', timeout=0.05,
+                                                  handler=lambda: 'late')
+            broken_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', handler=broken)
+
+            assert await manager.get_request_result(slow_id, timeout=5) == 'slow'
+            with pytest.raises(TimeoutError):
+                await manager.get_request_result(late_id, timeout=5)
+            with pytest.raises(KeyError):
+                await manager.get_request_result(broken_id, timeout=5)
+
+            assert manager.get_request(late_id).status == RequestStatus.EXPIRED
+            assert manager.get_request(broken_id).status == RequestStatus.FAILED
+            for key in ('request_queue:expired', 'request_queue:KeyError'):
+                assert metrics_collector.error_counts[key] == before.get(key, 0) + 1
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejected_when_deadline_cannot_be_met(self):
+        """Test admission rejection when the predicted finish is after the deadline"""
+        manager = self.make_manager()
+        await manager.start()
+        try:
+            manager._service_times[RequestType.API_CALL] = 5.0
+            with pytest.raises(ValueError):
+                await manager.queue_request(RequestType.API_CALL, {}, client_id='tests', timeout=1)
+            await manager.queue_request(RequestType.HEALTH_CHECK, {}, client_id='tests', timeout=1)
+
+            assert manager.get_status()['metrics']['requests_rejected_deadline'] == 1
+        finally:
+            await manager.stop()
+
+
+class TestBlackboardSystem:
+    """Test suite for the sharded, expiring blackboard"""
+
+    def test_ttl_expires_lazily_and_by_sweep(self):
+        """Test that expired keys disappear on read and in a purge"""
+        blackboard = BlackboardSystem(num_shards=4, sweep_interval_seconds=3600)
+        blackboard.write('request_1', {'status': 'done'}, ttl_seconds=0.05)
+        blackboard.write('request_2', {'status': 'done'}, ttl_seconds=0.05)
+        blackboard.write('queue_status', 'running')
+        time.sleep(0.1)
+
+        assert blackboard.read('request_1', 'gone') == 'gone'
+        assert blackboard.purge_expired() == 1
+        assert blackboard.get_all_data() == {'queue_status': 'running'}
+        assert blackboard.get_stats()['expired'] == 2
+
+    def test_caps_evict_least_recently_written(self):
+        """Test that a shard over its entry or byte cap evicts its oldest keys"""
+        blackboard = BlackboardSystem(num_shards=1, max_entries=3)
+        for i in range(5):
+            blackboard.write(f'key_{i}', i)
+
+        assert sorted(blackboard.get_all_data()) == ['key_2', 'key_3', 'key_4']
+        assert blackboard.get_stats()['evicted'] == 2
+
+        small = BlackboardSystem(num_shards=1, max_bytes=2000)
+        with pytest.raises(ValueError):
+            small.write('huge', 'x' * 5000)
+        for i in range(20):
+            small.write(f'key_{i}', 'x' * 100)
+        assert small.get_stats()['bytes'] <= 2000
+
+    def test_compare_and_set(self):
+        """Test versioned writes"""
+        blackboard = BlackboardSystem()
+        assert blackboard.compare_and_set('leader', 0, 'worker-1')
+        assert not blackboard.compare_and_set('leader', 0, 'worker-2')
+
+        value, version = blackboard.read_versioned('leader')
+        assert value == 'worker-1'
+        assert blackboard.compare_and_set('leader', version, 'worker-2')
+        assert not blackboard.compare_and_set('leader', version, 'worker-3')
+        assert blackboard.read('leader') == 'worker-2'
+
+        assert blackboard.delete('leader')
+        assert blackboard.read_versioned('leader') == (None, 0)
+
+    def test_striped_updates_are_atomic(self):
+        """Test concurrent updates across shards lose no increments"""
+        blackboard = BlackboardSystem(num_shards=8)
+
+        def increment():
+            for i in range(500):
+                blackboard.update(f'counter_{i % 4}', lambda value: value + 1, default=0)
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(blackboard.read(f'counter_{i}') for i in range(4)) == 2000
+
+    @pytest.mark.asyncio
+    async def test_watch_streams_prefix_changes(self):
+        """Test that watchers are notified of changes under their prefix, from any thread"""
+        blackboard = BlackboardSystem()
+        async with blackboard.watch('request_') as changes:
+            blackboard.write('queue_size', 3)
+            threading.Thread(target=blackboard.write, args=('request_1', {'status': 'completed'})).start()
+
+            change = await changes.get(timeout=1)
+            assert change.key == 'request_1'
+            assert change.value == {'status': 'completed'}
+            assert change.version == blackboard.read_versioned('request_1')[1]
+
+            blackboard.delete('request_1')
+            removed = await changes.get(timeout=1)
+            assert (removed.value, removed.old_value, removed.version) == (None, {'status': 'completed'}, 0)
+
+        assert [change async for change in changes] == []
+        assert blackboard.get_stats()['watches'] == 0
+
+
+class TestRequestResultDelivery:
+    """Test suite for RequestQueueManager.get_request_result"""
+
+    def make_manager(self, **overrides):
+        """Create a manager without background metrics or blackboard"""
+        config = RequestQueueConfig(max_concurrent_requests=2, enable_metrics=False,
+                                    enable_blackboard=False, process_groups_enabled=False, **overrides)
+        return RequestQueueManager(config)
+
+    @pytest.mark.asyncio
+    async def test_result_returned_when_request_finishes(self):
+        """Test that the waiter wakes as soon as the request completes"""
+        manager = self.make_manager()
+
+        async def execute(request):
+            await asyncio.sleep(0.02)
+            return {'request_id': request.request_id}
+
+        manager._execute_request = execute
+        await manager.start()
+        try:
+            request_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+            start = time.perf_counter()
+            result = await manager.get_request_result(request_id, timeout=5)
+
+            assert result == {'request_id': request_id}
+            assert time.perf_counter() - start < 0.5
+            assert manager._completed_requests[request_id].status == RequestStatus.COMPLETED
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_failure_and_timeout(self):
+        """Test that failures raise the request error and slow requests time out"""
+        manager = self.make_manager()
+
+        async def execute(request):
+            if request.flask_request_data.get('fail'):
+                raise KeyError('boom')
+            await asyncio.sleep(1.0)
+
+        manager._execute_request = execute
+        await manager.start()
+        try:
+            failing_id = await manager.queue_request(RequestType.API_CALL, {'fail': True}, client_id='tests')
+            with pytest.raises(KeyError):
+                await manager.get_request_result(failing_id, timeout=5)
+
+            slow_id = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+            with pytest.raises(TimeoutError):
+                await manager.get_request_result(slow_id, timeout=0.05)
+
+            with pytest.raises(ValueError):
+                await manager.get_request_result('unknown', timeout=0.05)
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_queued_requests(self):
+        """Test that stopping the manager releases waiters on requests that never ran"""
+        manager = self.make_manager()
+        manager._execute_request = lambda request: asyncio.sleep(10)
+        await manager.start()
+
+        request_ids = [await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+                       for _ in range(4)]
+        waiters = [asyncio.create_task(manager.get_request_result(request_id))
+                   for request_id in request_ids]
+        await asyncio.sleep(0.05)
+        await manager.stop()
+
+        results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1.0)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert {manager._completed_requests[request_id].status for request_id in request_ids} == {
+            RequestStatus.CANCELLED
+        }
+
+    @pytest.mark.asyncio
+    async def test_status_reports_wait_percentiles(self):
+        """Test that queue status exposes per-priority wait-time percentiles"""
+        manager = self.make_manager()
+
+        async def execute(request):
+            return 'ok'
+
+        manager._execute_request = execute
+        await manager.start()
+        try:
+            request_id = await manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.HIGH,
+                                                     client_id='tests')
+            await manager.get_request_result(request_id, timeout=5)
+
+            status = manager.get_status()
+            assert status['metrics']['wait_time_percentiles']['HIGH']['count'] == 1
+            assert status['queue_size_by_priority']['HIGH'] == 0
+        finally:
+            await manager.stop()
+
+
+class TestProcessGroupBulkheads:
+    """Test suite for per-process-group queues and workers"""
+
+    def make_manager(self, **group_settings):
+        """Create a manager with process groups and a configured general group"""
+        manager = RequestQueueManager(RequestQueueConfig(
+            enable_metrics=False, enable_blackboard=False, backpressure_threshold=1.0
+        ))
+        manager.process_groups.configure_group('general', **group_settings)
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_saturated_group_does_not_block_others(self):
+        """Test that a full API group rejects work while analytics still completes"""
+        manager = self.make_manager(max_workers=1, max_queue_size=1)
+        release = asyncio.Event()
+
+        async def execute(request):
+            if request.request_type == RequestType.API_CALL:
+                await release.wait()
+            return request.request_type.value
+
+        manager._execute_request = execute
+        await manager.start()
+        try:
+            running = await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+            await asyncio.sleep(0.01)
+            await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+            with pytest.raises(ValueError, match='general'):
+                await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+
+            analytics = await manager.queue_request(RequestType.ANALYTICS_QUERY, {}, client_id='tests')
+            assert await manager.get_request_result(analytics, timeout=1) == 'analytics_query'
+
+            status = manager.get_status()['process_groups']
+            assert status['general']['queue_size'] == 1
+            assert status['general']['total_rejected'] == 1
+            assert status['analytics']['total_rejected'] == 0
+
+            release.set()
+            assert await manager.get_request_result(running, timeout=1) == 'api_call'
+        finally:
+            release.set()
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_shed_lowest_policy(self):
+        """Test that higher-priority arrivals evict the worst queued request"""
+        manager = self.make_manager(max_workers=1, max_queue_size=1, rejection_policy='shed_lowest')
+        release = asyncio.Event()
+
+        async def execute(request):
+            await release.wait()
+
+        manager._execute_request = execute
+        await manager.start()
+        try:
+            await manager.queue_request(RequestType.API_CALL, {}, client_id='tests')
+            await asyncio.sleep(0.01)
+            low = await manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.LOW,
+                                              client_id='tests')
+            await manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.HIGH,
+                                        client_id='tests')
+
+            with pytest.raises(RuntimeError, match='shed'):
+                await manager.get_request_result(low, timeout=1)
+            assert manager.get_request(low).status == RequestStatus.CANCELLED
+
+            with pytest.raises(ValueError):
+                await manager.queue_request(RequestType.API_CALL, {}, priority=QueuePriority.LOW,
+                                            client_id='tests')
+            group = manager.get_status()['process_groups']['general']
+            assert (group['total_shed'], group['total_rejected']) == (1, 1)
+        finally:
+            release.set()
+            await manager.stop()
+
+    def test_unknown_policy_rejected(self):
+        """Test that group configuration validates the rejection policy"""
+        manager = self.make_manager()
+        with pytest.raises(ValueError):
+            manager.process_groups.configure_group('general', rejection_policy='drop_everything')
+
+
+class TestRequestCoordinator:
+    """Test suite for the asyncio-native RequestCoordinator"""
+
+    @pytest.fixture
+    def coordinator(self):
+        """Create a coordinator with a single processing slot"""
+        return RequestCoordinator(RequestQueueConfig(queue_timeout_seconds=5), max_concurrent=1)
+
+    @pytest.mark.asyncio
+    async def test_unrelated_coroutines_progress_while_contended(self, coordinator):
+        """Test that waiting for a busy slot does not stall the event loop"""
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def holder():
+            async with coordinator.acquire_processing_slot('holder'):
+                await asyncio.sleep(0.3)
+
+        async def contender():
+            async with coordinator.acquire_processing_slot('contender'):
+                return ticks
+
+        ticker_task = asyncio.create_task(ticker())
+        holder_task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        ticks_when_acquired = await contender()
+        stop.set()
+        await asyncio.gather(ticker_task, holder_task)
+
+        assert ticks_when_acquired >= 10
+        assert coordinator.get_active_request_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_timeout(self, coordinator):
+        """Test that a contended slot times out without holding the loop"""
+        async with coordinator.acquire_processing_slot('holder'):
+            with pytest.raises(TimeoutError):
+                async with coordinator.acquire_processing_slot('late', timeout=0.05):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_ordered_acquisition_avoids_deadlock(self, coordinator):
+        """Test that opposite request orders for the same resources cannot deadlock"""
+        completed = []
+
+        async def worker(name, resources):
+            for _ in range(20):
+                async with coordinator.acquire_resources(*resources):
+                    await asyncio.sleep(0)
+            completed.append(name)
+
+        await asyncio.wait_for(asyncio.gather(
+            worker('ab', ('agent:a', 'agent:b')),
+            worker('ba', ('agent:b', 'agent:a'))
+        ), timeout=2)
+        assert sorted(completed) == ['ab', 'ba']
+
+    @pytest.mark.asyncio
+    async def test_partial_acquisition_released_on_timeout(self, coordinator):
+        """Test that a timed-out multi-resource acquire holds nothing afterwards"""
+        async with coordinator.acquire_resources('agent:b'):
+            with pytest.raises(TimeoutError, match='agent:b'):
+                async with coordinator.acquire_resources('agent:a', 'agent:b', timeout=0.05):
+                    pass
+
+        async with coordinator.acquire_resources('agent:a', timeout=0):
+            pass
+
+    def test_threadsafe_facade(self, coordinator):
+        """Test that threads outside the loop share locks with coroutines"""
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        coordinator.bind_loop(loop)
+
+        async def try_acquire():
+            try:
+                async with coordinator.acquire_resources('shared', timeout=0.05):
+                    return True
+            except TimeoutError:
+                return False
+
+        try:
+            with coordinator.acquire_resources_threadsafe('shared', timeout=1):
+                assert not asyncio.run_coroutine_threadsafe(try_acquire(), loop).result(timeout=2)
+            assert asyncio.run_coroutine_threadsafe(try_acquire(), loop).result(timeout=2)
+
+            with coordinator.acquire_processing_slot_threadsafe('sync-caller'):
+                assert coordinator.get_active_request_count() == 1
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join(timeout=5)
+            loop.close()
+
+    def test_facade_requires_running_loop(self, coordinator):
+        """Test that the sync facade refuses to run without a loop"""
+        with pytest.raises(RuntimeError):
+            with coordinator.acquire_resources_threadsafe('shared'):
+                pass
@@ -0,0 +1,139 @@
+"""
+Tests for offline similarity-based intent classification
+"""
+
+import pytest
+from swarm_director.app import create_app
+from swarm_director.models.base import db
+from swarm_director.models.agent import Agent, AgentType, AgentStatus
+from swarm_director.agents.director import (
+    DirectorAgent, DirectorConfig, IntentDatasetManager, IntentExample
+)
+from swarm_director.agents.similarity_classifier import SimilarityIntentClassifier, HAS_NUMPY
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+
+
+class TestSimilarityIntentClassifier:
+    """Test suite for the similarity classifier"""
+
+    @pytest.fixture
+    def classifier(self):
+        """Create a classifier over the curated dataset"""
+        return SimilarityIntentClassifier(IntentDatasetManager())
+
+    def test_classifies_paraphrased_requests(self, classifier):
+        """Test that close paraphrases of curated examples are classified correctly"""
+        assert classifier.classify("send an email to the whole team")[0] == 'communications'
+        assert classifier.classify("analyze the quarterly sales data")[0] == 'analysis'
+
+    def test_batch_matches_single(self, classifier):
+        """Test that batch classification agrees with one-at-a-time classification"""
+        texts = ["send an email to the whole team", "analyze the quarterly sales data",
+                 "schedule a meeting with stakeholders", "automate the deployment pipeline"]
+        classifier.batch_size = 3
+
+        assert classifier.classify_many(texts) == [classifier.classify(text) for text in texts]
+
+    def test_unrelated_text_falls_back(self, classifier):
+        """Test that text sharing no features with the examples gets zero confidence"""
+        assert classifier.classify("") == ('coordination', 0.0)
+
+    def test_incremental_refresh_on_new_examples(self, classifier):
+        """Test that examples added to the dataset are picked up on the next call"""
+        dataset = classifier.dataset_manager
+        assert classifier.refresh() > 0
+        assert classifier.refresh() == 0
+        before = classifier.get_stats()['examples']
+
+        for text in ("zorblax quux frobnicate", "frobnicate zorblax widgets", "zorblax frobnicate report"):
+            dataset.add_example(IntentExample(text=text, department='automation', source='feedback'))
+
+        intent, confidence = classifier.classify("zorblax frobnicate")
+        assert classifier.get_stats()['examples'] == before + 3
+        assert intent == 'automation'
+        assert confidence > 0.5
+
+
+    def test_feedback_appends_rows_until_idf_is_stale(self, classifier):
+        """Test that small additions append rows and growth past idf_refresh_growth rebuilds"""
+        dataset = classifier.dataset_manager
+        classifier.refresh()
+        examples = classifier.get_stats()['examples']
+        assert classifier.get_stats()['matrix_rebuilds'] == 1
+
+        dataset.add_example(IntentExample(text="zorblax quux frobnicate", department='automation',
+                                          source='feedback'))
+        assert classifier.classify("zorblax frobnicate")[0] == 'automation'
+        assert classifier.get_stats()['matrix_rebuilds'] == 1
+
+        for i in range(int(examples * classifier.idf_refresh_growth) + 1):
+            dataset.add_example(IntentExample(text=f"frobnicate widget batch {i}", department='automation',
+                                              source='feedback'))
+        classifier.refresh()
+        assert classifier.get_stats()['matrix_rebuilds'] == 2
+
+        fresh = SimilarityIntentClassifier(dataset)
+        texts = ["send an email to the whole team", "zorblax frobnicate", "analyze the quarterly sales data"]
+        assert classifier.classify_many(texts) == fresh.classify_many(texts)
+
+
+class TestDirectorSimilarityClassification:
+    """Test suite for DirectorAgent integration of similarity classification"""
+
+    @pytest.fixture
+    def app(self):
+        """Create test Flask application"""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.drop_all()
+
+    @pytest.fixture
+    def director(self, app):
+        """Create a DirectorAgent with similarity classification enabled"""
+        with app.app_context():
+            db_agent = Agent(
+                name='TestDirectorAgent',
+                agent_type=AgentType.SUPERVISOR,
+                status=AgentStatus.ACTIVE
+            )
+            db_agent.save()
+            director = DirectorAgent(db_agent, DirectorConfig(enable_similarity_classification=True))
+            yield director
+            director.shutdown()
+
+    def test_confident_match_skips_keyword_path(self, app, director):
+        """Test that a confident similarity match is returned without keyword classification"""
+        with app.app_context():
+            result = director._classify_intent_similarity("zorblax frobnicate")
+            assert result is None
+
+            for text in ("zorblax frobnicate", "frobnicate zorblax", "zorblax frobnicate now"):
+                director.dataset_manager.add_example(IntentExample(text=text, department='analysis'))
+
+            intent, confidence = director._classify_intent_similarity("zorblax frobnicate")
+            assert intent == 'analysis'
+            assert confidence >= director.config.similarity_confidence_threshold
+
+    def test_classify_many_mixes_similarity_and_keywords(self, app, director):
+        """Test that low-confidence batch items fall through to keyword classification"""
+        with app.app_context():
+            texts = ["send an email to the whole team", "please review the code"]
+            results = director.classify_many(texts)
+
+            assert len(results) == 2
+            assert results[0][0] == 'communications'
+            assert results[1] == (director._classify_intent_similarity(texts[1])
+                                  or director._classify_intent_keyword(texts[1]))
+
+    def test_disabled_by_default(self, app):
+        """Test that the similarity classifier is not built unless enabled"""
+        with app.app_context():
+            db_agent = Agent(name='PlainDirector', agent_type=AgentType.SUPERVISOR,
+                             status=AgentStatus.ACTIVE)
+            db_agent.save()
+            director = DirectorAgent(db_agent)
+            assert director._get_similarity_classifier() is None
+            director.shutdown()
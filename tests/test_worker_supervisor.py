@@ -0,0 +1,161 @@
+"""
+Tests for the worker process supervisor
+"""
+
+import os
+import pytest
+from swarm_director.utils.worker_supervisor import WorkerSupervisor
+from swarm_director.utils.request_queue import (
+    RequestQueueManager, RequestQueueConfig, RequestType, RequestStatus
+)
+
+
+def echo(record):
+    """Worker handler: return the record with the worker's pid"""
+    return {'pid': os.getpid(), 'record': record}
+
+
+def crash_once(record):
+    """Worker handler: kill the worker the first time a marker file is seen missing"""
+    if not os.path.exists(record['marker']):
+        open(record['marker'], 'w').close()
+        os._exit(3)
+    return os.getpid()
+
+
+def crash_first(record):
+    """Worker handler: kill only the worker that handles the record marked crash"""
+    if record.get('crash'):
+        os._exit(3)
+    return os.getpid()
+
+
+def fail(record):
+    """Worker handler: raise inside the worker"""
+    raise KeyError(record['missing'])
+
+
+class TestWorkerSupervisor:
+    """Test suite for WorkerSupervisor"""
+
+    def make_supervisor(self, handler, worker_count=2, **kwargs):
+        supervisor = WorkerSupervisor('tests', f'tests.test_worker_supervisor:{handler}',
+                                      worker_count=worker_count, restart_backoff_seconds=0.1, **kwargs)
+        supervisor.start()
+        return supervisor
+
+    def test_results_come_back_from_worker_processes(self):
+        """Test that records run in separate OS processes and results reach the caller"""
+        supervisor = self.make_supervisor('echo')
+        try:
+            futures = [supervisor.submit(str(i), {'n': i}) for i in range(20)]
+            results = [future.result(30) for future in futures]
+            assert [result['record']['n'] for result in results] == list(range(20))
+            assert os.getpid() not in {result['pid'] for result in results}
+
+            stats = supervisor.get_stats()
+            assert stats['completed'] == 20
+            assert len({worker['pid'] for worker in stats['workers']}) == 2
+        finally:
+            supervisor.stop()
+
+    def test_handler_errors_fail_only_that_request(self):
+        """Test that an exception in the handler is reported without restarting the worker"""
+        supervisor = self.make_supervisor('fail', worker_count=1)
+        try:
+            with pytest.raises(RuntimeError, match='KeyError'):
+                supervisor.submit('bad', {'missing': 'key'}).result(30)
+            assert supervisor.get_stats()['restarts'] == 0
+        finally:
+            supervisor.stop()
+
+    def test_crashed_worker_is_restarted_and_request_redispatched(self, tmp_path):
+        """Test that a worker that dies mid-request is replaced and the request retried"""
+        supervisor = self.make_supervisor('crash_once', worker_count=1)
+        try:
+            first_pid = supervisor.get_stats()['workers'][0]['pid']
+            pid = supervisor.submit('r1', {'marker': str(tmp_path / 'crashed')}).result(60)
+
+            stats = supervisor.get_stats()
+            assert pid != first_pid
+            assert stats['restarts'] == 1
+            assert stats['redispatched'] == 1
+        finally:
+            supervisor.stop()
+
+    def test_submissions_during_restart_go_to_healthy_workers(self):
+        """Test that a worker waiting out its restart backoff is skipped and doesn't stall results"""
+        supervisor = WorkerSupervisor('tests', 'tests.test_worker_supervisor:crash_first',
+                                      worker_count=2, restart_backoff_seconds=60, max_attempts=1)
+        supervisor.start()
+        try:
+            crashed = supervisor.submit('crash', {'crash': True})
+            with pytest.raises(RuntimeError, match='exited with code 3'):
+                crashed.result(30)
+
+            stats = supervisor.get_stats()
+            assert stats['restarts'] == 1
+            dead = [worker for worker in stats['workers'] if not worker['available']]
+            assert len(dead) == 1
+
+            # The dead slot has nothing in flight but must not be chosen
+            futures = [supervisor.submit(f'r{i}', {}) for i in range(6)]
+            pids = {future.result(10) for future in futures}
+            assert len(pids) == 1 and dead[0]['pid'] not in pids
+
+            stats = supervisor.get_stats()
+            assert stats['in_flight'] == 0
+            assert stats['pending'] == 0
+        finally:
+            supervisor.stop()
+
+    def test_submissions_wait_while_every_worker_restarts(self, tmp_path):
+        """Test that records are parked while no worker is available and sent once one respawns"""
+        supervisor = WorkerSupervisor('tests', 'tests.test_worker_supervisor:crash_once',
+                                      worker_count=1, restart_backoff_seconds=1.0)
+        supervisor.start()
+        try:
+            first = supervisor.submit('r1', {'marker': str(tmp_path / 'crashed')})
+            second = supervisor.submit('r2', {'marker': str(tmp_path / 'crashed')})
+            assert first.result(60) == second.result(60)
+            assert supervisor.get_stats()['restarts'] == 1
+        finally:
+            supervisor.stop()
+
+    def test_stopped_supervisor_rejects_work(self):
+        """Test that submit fails once the supervisor is stopped"""
+        supervisor = self.make_supervisor('echo', worker_count=1)
+        supervisor.stop()
+        with pytest.raises(ValueError):
+            supervisor.submit('late', {})
+
+
+class TestQueueWorkerProcesses:
+    """Test suite for running a process group in worker processes"""
+
+    @pytest.mark.asyncio
+    async def test_group_requests_run_in_worker_processes(self):
+        """Test that a group with worker_processes executes requests out of process"""
+        config = RequestQueueConfig(enable_metrics=False, enable_blackboard=False,
+                                    worker_handler='tests.test_worker_supervisor:echo')
+        manager = RequestQueueManager(config)
+        manager.process_groups.configure_group('analytics', worker_processes=2)
+        await manager.start()
+        try:
+            request_id = await manager.queue_request(RequestType.ANALYTICS_QUERY, {'query': 'load'},
+                                                     timeout=30, replay={'path': '/analytics'})
+            result = await manager.get_request_result(request_id, timeout=30)
+            assert result['pid'] != os.getpid()
+            assert result['record']['replay'] == {'path': '/analytics'}
+            assert result['record']['request_id'] == request_id
+            assert manager.get_request(request_id).status == RequestStatus.COMPLETED
+
+            # Groups without worker processes keep running handlers in-process
+            other_id = await manager.queue_request(RequestType.API_CALL, {}, handler=os.getpid)
+            assert await manager.get_request_result(other_id, timeout=30) == os.getpid()
+
+            group_status = manager.get_status()['process_groups']['analytics']
+            assert group_status['worker_processes'] == 2
+            assert group_status['worker_supervisor']['completed'] == 1
+        finally:
+            await manager.stop()